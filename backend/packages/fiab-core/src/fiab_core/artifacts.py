@@ -63,6 +63,7 @@ class CommonArtifactMetadata(FiabCoreBaseModel):
         default_factory=dict, description="Arbitrary KV structure. Key is the Tag, Value is optional detail"
     )
     disk_size_bytes: int = Field(description="Physical storage footprint of the checkpoint")
+    sha256: str | None = Field(default=None, description="Hex digest of the artifact content, verified after download if published")
     supported_platforms: list[Platform] = Field(
         description="Platforms this model has been tested and verified on"
     )  # NOTE we may want to move this out of the common metadata -- and keep in the UI just the universal isCompatible
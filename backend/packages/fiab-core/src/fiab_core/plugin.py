@@ -61,6 +61,16 @@ Compiler = Callable[[ActionLookup, BlockFactoryId, BlockInstance], Either[Action
 """Given a cascade builder, represented as lookup of fluent actions, a factory id from this Plugin, and a block instance corresponding to it, either return the fluent action resulting from this block or an error"""
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class BlockCompilation:
+    action: Action
+    output: BlockInstanceOutput
+
+
+OutputCompiler = Callable[[ActionLookup, BlockFactoryId, BlockInstance, dict[str, BlockInstanceOutput]], Either[BlockCompilation, Error]]  # ty:ignore[invalid-type-arguments] # semigroup
+"""Like Compiler, but additionally given the outputs of the block's inputs, and returning the block's output along with its action -- ie, compile and validate in a single pass"""
+
+
 @dataclass(frozen=True, eq=True, slots=True)
 class Plugin:
     """Base plugin with a block catalogue and default validate/expand/compile behavior.
@@ -74,3 +84,24 @@ class Plugin:
     expander: Expander
     compiler: Compiler
     blueprint_templates: tuple[BlueprintTemplate, ...] = field(default_factory=tuple)
+    output_compiler: OutputCompiler | None = None
+    """Optional single pass alternative to compiler + validator, see compile_with_output"""
+
+    def compile_with_output(
+        self, lookup: ActionLookup, factory_id: BlockFactoryId, block: BlockInstance, inputs: dict[str, BlockInstanceOutput]
+    ) -> Either[BlockCompilation, Error]:  # ty:ignore[invalid-type-arguments] # semigroup
+        """Compile the block and determine its output, via output_compiler if provided, otherwise by running
+        compiler and validator one after another"""
+        if self.output_compiler is not None:
+            return self.output_compiler(lookup, factory_id, block, inputs)
+        compiled = self.compiler(lookup, factory_id, block)
+        if compiled.t is None:
+            return Either.error(compiled.e)
+        try:
+            validated = self.validator(factory_id, block, inputs).result
+        except Exception as exc:
+            # NOTE the compile of a block the validator raises on is failed like any other compile, rather than crashing the caller
+            return Either.error(repr(exc))
+        if validated.t is None:
+            return Either.error(validated.e.reason)
+        return Either.ok(BlockCompilation(action=compiled.t, output=validated.t))
@@ -30,6 +30,7 @@ from fiab_core.fable import (
     Error,
     QubedOutput,
 )
+from fiab_core.plugin import BlockCompilation
 from fiab_core.tools.convert import GeoDomainWrapper
 from fiab_core.types import ArtifactType, ClosedEnumType, DatetimeType, DateType, FloatType, IntType, ListType, OpenEnumType, StringType
 
@@ -231,6 +232,19 @@ class QubedBlockBuilder(abc.ABC):
     ) -> Either[Action, Error]:  # ty:ignore[invalid-type-arguments] # semigroup
         raise NotImplementedError
 
+    def compile_with_output(
+        self,
+        inputs: ActionLookup,
+        block: "BlockInstanceRich",
+        input_outputs: dict[str, QubedOutput],
+    ) -> Either[BlockCompilation, Error]:  # ty:ignore[invalid-type-arguments] # semigroup
+        """Validate and compile in one step. Override when compile repeats expensive work of validate, eg, building a qube"""
+        output = self.validate(block, input_outputs, {})
+        compiled = self.compile(inputs, block)
+        if compiled.t is None:
+            return Either.error(compiled.e)
+        return Either.ok(BlockCompilation(action=compiled.t, output=output))
+
     def intersect(self, other: QubedOutput) -> bool:
         raise NotImplementedError
 
@@ -16,7 +16,7 @@ from fiab_core.fable import (
     ConfigurationOptionRestriction,
     QubedOutput,
 )
-from fiab_core.plugin import BlockValidation, BlockValidationError, Error, Plugin
+from fiab_core.plugin import BlockCompilation, BlockValidation, BlockValidationError, Error, Plugin
 from fiab_core.tools.blocks import BlockInstanceConfigurationError, BlockInstanceRich, QubedBlockBuilder
 
 
@@ -86,6 +86,24 @@ class QubedPluginBuilder:
             except BlockInstanceConfigurationError as exc:
                 return Either.error(str(exc))
 
+    def compile_with_output(
+        self,
+        inputs: ActionLookup,
+        factory_id: BlockFactoryId,
+        block: BlockInstance,
+        input_outputs: dict[str, QubedOutput],
+    ) -> Either[BlockCompilation, Error]:  # ty:ignore[invalid-type-arguments] # semigroup
+        """Like compile, but additionally given the outputs of the inputs, and returning the block output too"""
+        with PayloadBuildingContext(environment=self.base_environment):
+            factory = self.block_builders[factory_id]
+            rich_block = BlockInstanceRich.from_block(factory_id, block, factory.configuration_options)
+            try:
+                return factory.compile_with_output(inputs, rich_block, input_outputs)
+            except BlockInstanceConfigurationError as exc:
+                return Either.error(str(exc))
+            except Exception as exc:
+                return Either.error(repr(exc))
+
     def as_plugin(self) -> Callable[[], Plugin]:
         def _generic_expand(block: BlockInstanceOutput) -> list[BlockExpansion]:
             if isinstance(block, QubedOutput):
@@ -105,6 +123,14 @@ class QubedPluginBuilder:
                 inputs_validated = cast(dict[str, QubedOutput], inputs)
                 return self.validate(factory_id, block, inputs_validated)
 
+        def _generic_compile_with_output(
+            lookup: ActionLookup, factory_id: BlockFactoryId, block: BlockInstance, inputs: dict[str, BlockInstanceOutput]
+        ) -> Either[BlockCompilation, Error]:  # ty:ignore[invalid-type-arguments] # semigroup
+            invalid = [f"{key}->{value.__class__.__name__}" for key, value in inputs.items() if not isinstance(value, QubedOutput)]
+            if any(invalid):
+                return Either.error(f"Expected only QubedOutputs in inputs, gotten {','.join(invalid)}")
+            return self.compile_with_output(lookup, factory_id, block, cast(dict[str, QubedOutput], inputs))
+
         return lambda: Plugin(
             catalogue=BlockFactoryCatalogue(
                 factories={factory_id: factory.as_catalogue() for factory_id, factory in self.block_builders.items()}
@@ -112,4 +138,5 @@ class QubedPluginBuilder:
             validator=_generic_validate,
             expander=_generic_expand,
             compiler=self.compile,
+            output_compiler=_generic_compile_with_output,
         )
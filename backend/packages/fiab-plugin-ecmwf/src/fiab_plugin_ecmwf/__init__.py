@@ -23,6 +23,7 @@ from fiab_plugin_ecmwf.blocks import (
     Select,
     TemporalStatistics,
     ZarrSink,
+    warm_up_dataset_qubes,
 )
 from fiab_plugin_ecmwf.templates.aifs_forecast import template as _aifs_forecast_template
 from fiab_plugin_ecmwf.templates.ifs_ensemble_statistics import template as _ensemble_statistics_template
@@ -45,6 +46,7 @@ _base_plugin = QubedPluginBuilder(block_builders=blocks, base_environment=["fiab
 
 
 def plugin() -> Plugin:
+    warm_up_dataset_qubes()
     # Declaration order is presentation order.
     return dataclasses.replace(
         _base_plugin(),
@@ -24,10 +24,11 @@ from fiab_core.fable import (
     ConfigurationOptionRestriction,
     QubedOutput,
 )
-from fiab_core.plugin import Error
+from fiab_core.plugin import BlockCompilation, Error
 from fiab_core.tools.blocks import BlockInstanceRich, Source, Transform
 from fiab_core.tools.validators import positive
 from fiab_core.types import DatetimeType, IntType, OpenEnumType
+from qubed import Qube
 
 from fiab_plugin_ecmwf.qubed_utils import axes, contains, expand
 
@@ -55,6 +56,13 @@ def strip_timezone(dt: datetime) -> datetime:
     return dt
 
 
+def _model_output(checkpoint: CheckpointArtifact, lead_time: int) -> Qube | dict[str, Qube]:
+    validation_error = checkpoint.validate_lead_time(lead_time)
+    if validation_error is not None:
+        raise ValueError(validation_error)
+    return checkpoint.get_model_output(lead_time)
+
+
 class AnemoiBuilder:
     """Utility to build an Inference from an Anemoi checkpoint, for use in both Source and Transform blocks"""
 
@@ -67,8 +75,15 @@ class AnemoiBuilder:
         "Get local path to the checkpoint artifact, assumes it is already locally available, does not trigger download"
         return self.checkpoint.get_local_path()
 
-    def inference(self, lead_time: int, *, extra_environment: list[str] | None = None) -> Inference:
-        """Build an Inference action for this checkpoint and lead time, with the appropriate environment for the input source if specified"""
+    def inference(
+        self,
+        lead_time: int,
+        *,
+        extra_environment: list[str] | None = None,
+        model_output: Qube | dict[str, Qube] | None = None,
+    ) -> Inference:
+        """Build an Inference action for this checkpoint and lead time, with the appropriate environment for the input source if specified.
+        The model output qube for the lead time is built unless given"""
         env = self.checkpoint.get_environment()
         env.extend(extra_environment or [])
 
@@ -76,13 +91,22 @@ class AnemoiBuilder:
             ckpt=self._local_path,
             lead_time=lead_time,
             environment=env,
-            expansion_qube=self.checkpoint.get_model_output(lead_time=lead_time),
+            expansion_qube=model_output if model_output is not None else self.checkpoint.get_model_output(lead_time=lead_time),
             **self.checkpoint.get_additional_kwargs(),
         )
 
-    def from_input(self, input_source: str, date: datetime, lead_time: int, ensemble: int = 1, **k: Any) -> Action:
+    def from_input(
+        self,
+        input_source: str,
+        date: datetime,
+        lead_time: int,
+        ensemble: int = 1,
+        model_output: Qube | dict[str, Qube] | None = None,
+        **k: Any,
+    ) -> Action:
         input_configuration = self.checkpoint.get_input_configuration(input_source)
-        return self.inference(lead_time=lead_time, extra_environment=INPUT_SOURCE_EXTRAS.get(input_source)).from_input(
+        inference = self.inference(lead_time=lead_time, extra_environment=INPUT_SOURCE_EXTRAS.get(input_source), model_output=model_output)
+        return inference.from_input(
             input=input_configuration,
             date=strip_timezone(date),
             lead_time=lead_time,
@@ -91,8 +115,10 @@ class AnemoiBuilder:
             payload_metadata={"artifacts": [self.artifact_id]},
         )
 
-    def from_initial_conditions(self, initial_conditions: Any, lead_time: int, **k: Any) -> Action:
-        return self.inference(lead_time=lead_time).from_initial_conditions(
+    def from_initial_conditions(
+        self, initial_conditions: Any, lead_time: int, model_output: Qube | dict[str, Qube] | None = None, **k: Any
+    ) -> Action:
+        return self.inference(lead_time=lead_time, model_output=model_output).from_initial_conditions(
             initial_conditions, **k, payload_metadata={"artifacts": [self.artifact_id]}
         )
 
@@ -147,38 +173,45 @@ class AnemoiSource(Source):
         ),
     }
 
-    def validate(
-        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
-    ) -> BlockInstanceOutput:
+    def _output(self, block: BlockInstanceRich, checkpoint: CheckpointArtifact, model_output: Qube | dict[str, Qube]) -> QubedOutput:
         ensemble_members = block.config_as_int(ENSEMBLE, validator=positive)
-        checkpoint = CheckpointArtifact(block.config_as_artifactid(CHECKPOINT))
-        lead_time = block.config_as_int(LEAD_TIME, validator=positive)
-
-        validation_error = checkpoint.validate_lead_time(lead_time)
-        if validation_error is not None:
-            raise ValueError(validation_error)
-
-        qubed_output = checkpoint.combine_if_nested_qube(checkpoint.get_model_output(lead_time))
+        qubed_output = checkpoint.combine_if_nested_qube(model_output)
         if ensemble_members > 1:
             qubed_output = expand(qubed_output, {"number": range(1, ensemble_members + 1)})
         return QubedOutput(dataqube=qubed_output)
 
+    def _action(self, block: BlockInstanceRich, builder: AnemoiBuilder, model_output: Qube | dict[str, Qube] | None = None) -> Action:
+        return builder.from_input(
+            input_source=block.config_as_str(INPUT_SOURCE),
+            lead_time=block.config_as_int(LEAD_TIME, validator=positive),
+            date=strip_timezone(block.config_as_datetime(BASE_TIME)),
+            ensemble=block.config_as_int(ENSEMBLE, validator=positive),
+            model_output=model_output,
+        )
+
+    def validate(
+        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
+    ) -> BlockInstanceOutput:
+        checkpoint = CheckpointArtifact(block.config_as_artifactid(CHECKPOINT))
+        return self._output(block, checkpoint, _model_output(checkpoint, block.config_as_int(LEAD_TIME, validator=positive)))
+
     def compile(  # type:ignore[invalid-argument] # semigroup
         self,
         inputs: ActionLookup,
         block: BlockInstanceRich,
     ) -> Either[Action, Error]:  # type:ignore[invalid-argument] # semigroup
+        return Either.ok(self._action(block, AnemoiBuilder(block.config_as_artifactid(CHECKPOINT))))
 
-        input_source = block.config_as_str(INPUT_SOURCE)
+    def compile_with_output(
+        self,
+        inputs: ActionLookup,
+        block: BlockInstanceRich,
+        input_outputs: dict[str, QubedOutput],
+    ) -> Either[BlockCompilation, Error]:  # type:ignore[invalid-argument] # semigroup
         builder = AnemoiBuilder(block.config_as_artifactid(CHECKPOINT))
-
-        action = builder.from_input(
-            input_source=input_source,
-            lead_time=block.config_as_int(LEAD_TIME, validator=positive),
-            date=strip_timezone(block.config_as_datetime(BASE_TIME)),
-            ensemble=block.config_as_int(ENSEMBLE, validator=positive),
-        )
-        return Either.ok(action)
+        model_output = _model_output(builder.checkpoint, block.config_as_int(LEAD_TIME, validator=positive))
+        output = self._output(block, builder.checkpoint, model_output)
+        return Either.ok(BlockCompilation(action=self._action(block, builder, model_output), output=output))
 
 
 class AnemoiInputSource(Source):
@@ -255,39 +288,54 @@ class AnemoiTransform(Transform):
         ),
     }
 
-    def validate(
-        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
-    ) -> BlockInstanceOutput:
-        checkpoint = CheckpointArtifact(block.config_as_artifactid(CHECKPOINT))
+    def _output(
+        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], checkpoint: CheckpointArtifact
+    ) -> tuple[QubedOutput, Qube | dict[str, Qube]]:
+        """The output of the block, and the model output qube it is expanded from"""
         lead_time = block.config_as_int(LEAD_TIME, validator=positive)
         qubed_input = checkpoint.combine_if_nested_qube(checkpoint.get_model_input())
         if not contains(inputs["dataset"], qubed_input):
             difference_qube = qubed_input ^ inputs["dataset"].dataqube
             raise ValueError(f"Input dataset is not compatible with the model checkpoint. Difference in qubes: {difference_qube}")
 
-        validation_error = checkpoint.validate_lead_time(lead_time)
-        if validation_error is not None:
-            raise ValueError(validation_error)
-
-        qubed_output = checkpoint.combine_if_nested_qube(checkpoint.get_model_output(lead_time=lead_time))
+        model_output = _model_output(checkpoint, lead_time)
+        qubed_output = checkpoint.combine_if_nested_qube(model_output)
         input_dataset = inputs["dataset"]
         if contains(input_dataset, ENSEMBLE):
             qubed_output = expand(qubed_output, {ENSEMBLE: axes(input_dataset)[ENSEMBLE]})
-        return QubedOutput(dataqube=qubed_output)
+        return QubedOutput(dataqube=qubed_output), model_output
+
+    def _action(
+        self, inputs: ActionLookup, block: BlockInstanceRich, builder: AnemoiBuilder, model_output: Qube | dict[str, Qube] | None = None
+    ) -> Action:
+        return builder.from_initial_conditions(
+            inputs[block.input_ids["initial conditions"]],
+            lead_time=block.config_as_int(LEAD_TIME, validator=positive),
+            model_output=model_output,
+        )
+
+    def validate(
+        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
+    ) -> BlockInstanceOutput:
+        output, _ = self._output(block, inputs, CheckpointArtifact(block.config_as_artifactid(CHECKPOINT)))
+        return output
 
     def compile(  # type:ignore[invalid-argument] # semigroup
         self,
         inputs: ActionLookup,
         block: BlockInstanceRich,
     ) -> Either[Action, Error]:  # type:ignore[invalid-argument] # semigroup
-        input_task = block.input_ids["initial conditions"]
+        return Either.ok(self._action(inputs, block, AnemoiBuilder(block.config_as_artifactid(CHECKPOINT))))
 
+    def compile_with_output(
+        self,
+        inputs: ActionLookup,
+        block: BlockInstanceRich,
+        input_outputs: dict[str, QubedOutput],
+    ) -> Either[BlockCompilation, Error]:  # type:ignore[invalid-argument] # semigroup
         builder = AnemoiBuilder(block.config_as_artifactid(CHECKPOINT))
-        action = builder.from_initial_conditions(
-            inputs[input_task],
-            lead_time=block.config_as_int(LEAD_TIME, validator=positive),
-        )
-        return Either.ok(action)
+        output, model_output = self._output(block, input_outputs, builder.checkpoint)
+        return Either.ok(BlockCompilation(action=self._action(inputs, block, builder, model_output), output=output))
 
     def intersect(self, other: QubedOutput) -> bool:
         return contains(other, "param")  # Basic check to see if the input contains params, cannot validate further
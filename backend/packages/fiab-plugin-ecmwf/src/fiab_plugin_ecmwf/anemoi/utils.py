@@ -9,14 +9,15 @@
 
 import importlib.metadata
 import logging
+import threading
 from copy import deepcopy
 from functools import reduce
 from operator import or_
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, Literal, cast
 
 from earthkit.data.utils.dates import to_timedelta
-from fiab_core.artifacts import AnemoiCheckpoint, ArtifactsProvider, CompositeArtifactId
+from fiab_core.artifacts import AnemoiCheckpoint, ArtifactsLookup, ArtifactsProvider, CompositeArtifactId
 from fiab_core.fable import QubedOutput
 from fiab_core.tools.plugins import _detect_editable_install
 from fiab_core.types import ArtifactType, ClosedEnumType, FableType
@@ -36,13 +37,59 @@ def _timestep_seconds(timestep: str) -> int:
     return timestep_seconds
 
 
+class _CheckpointIndex:
+    """Locally compatible checkpoints of the artifact catalog by id, along with their parsed qubes.
+
+    Rebuilt whenever the artifacts lookup changes -- the host replaces the lookup mapping on every catalog
+    refresh, so its identity is used to detect changes, and lookups are then not rescanned per call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._lookup: ArtifactsLookup | None = None
+        self._checkpoints: dict[CompositeArtifactId, AnemoiCheckpoint] = {}
+        self._qubes: dict[tuple[CompositeArtifactId, str], Qube | dict[str, Qube]] = {}
+
+    def checkpoints(self) -> dict[CompositeArtifactId, AnemoiCheckpoint]:
+        """The current index, shared by all callers, thus not to be modified"""
+        lookup = ArtifactsProvider.get_artifacts_lookup()
+        with self._lock:
+            if lookup is not self._lookup:
+                self._checkpoints = {
+                    composite_id: artifact.specific
+                    for composite_id, artifact in lookup.items()
+                    if artifact.artifact_type == "AnemoiCheckpoint" and artifact.is_locally_compatible
+                }
+                self._qubes = {}
+                self._lookup = lookup
+            return self._checkpoints
+
+    def qube(self, artifact: CompositeArtifactId, checkpoint: AnemoiCheckpoint, kind: Literal["input", "output"]) -> Qube | dict[str, Qube]:
+        """The parsed input or output qube of the checkpoint, which must come from the current index"""
+        with self._lock:
+            qube = self._qubes.get((artifact, kind))
+        if qube is None:
+            qube = _open_qube_json(checkpoint.input_qube if kind == "input" else checkpoint.output_qube)
+            with self._lock:
+                # NOTE the index may have been rebuilt meanwhile, in which case the qube is not kept
+                if self._checkpoints.get(artifact) is checkpoint:
+                    self._qubes[(artifact, kind)] = qube
+        # NOTE qubes are not modified in place by their users, but the nesting dict may be
+        return dict(qube) if isinstance(qube, dict) else qube
+
+
+_index = _CheckpointIndex()
+
+
+def _open_qube_json(qube_json: dict) -> Qube | dict[str, Qube]:
+    """Open a qube from a json representation, handling both single qube and multiple qube cases."""
+    if not "key" in qube_json:
+        return {key: Qube.from_json(value) for key, value in qube_json.items()}
+    return Qube.from_json(qube_json)
+
+
 def get_available_checkpoints() -> dict[CompositeArtifactId, AnemoiCheckpoint]:
-    all_artifacts = ArtifactsProvider.get_artifacts_lookup()
-    return {
-        composite_id: artifact.specific
-        for composite_id, artifact in all_artifacts.items()
-        if artifact.artifact_type == "AnemoiCheckpoint" and artifact.is_locally_compatible
-    }
+    return dict(_index.checkpoints())
 
 
 def get_checkpoint_enum_type() -> FableType:
@@ -65,7 +112,7 @@ class CheckpointArtifact:
 
     def checkpoint(self) -> AnemoiCheckpoint:
         """Get the AnemoiCheckpoint artifact from the artifact store."""
-        available_checkpoints = get_available_checkpoints()
+        available_checkpoints = _index.checkpoints()
         if self.artifact not in available_checkpoints:
             raise ValueError(
                 f"Checkpoint artifact {CompositeArtifactId.to_str(self.artifact)} not found in available checkpoints: {[CompositeArtifactId.to_str(k) for k in available_checkpoints.keys()]}"
@@ -76,12 +123,6 @@ class CheckpointArtifact:
         """Get local path to the checkpoint artifact, assumes it is already locally available, does not trigger download"""
         return Path(ArtifactsProvider.get_artifact_local_path(self.artifact))
 
-    def _open_qube_json(self, qube_json: dict) -> Qube | dict[str, Qube]:
-        """Open a qube from a json representation, handling both single qube and multiple qube cases."""
-        if not "key" in qube_json:
-            return {key: Qube.from_json(value) for key, value in qube_json.items()}
-        return Qube.from_json(qube_json)
-
     def combine_if_nested_qube(self, dataset_qube: dict[str, Qube] | Qube) -> Qube:
         """Combine multiple dataset qubes into a single qube with a dataset dimension, using the dataset name as the coordinate value."""
         if isinstance(dataset_qube, Qube):
@@ -90,8 +131,7 @@ class CheckpointArtifact:
 
     def get_model_input(self) -> Qube | dict[str, Qube]:
         """Get the model input qube from the checkpoint artifact"""
-        checkpoint = self.checkpoint()
-        return self._open_qube_json(checkpoint.input_qube)
+        return _index.qube(self.artifact, self.checkpoint(), "input")
 
     def validate_lead_time(self, lead_time: int) -> str | None:
         """Validate configured lead time against the checkpoint timestep."""
@@ -108,7 +148,7 @@ class CheckpointArtifact:
     def get_model_output(self, lead_time: int) -> Qube | dict[str, Qube]:
         """Get the model output qube from the checkpoint artifact"""
         checkpoint = self.checkpoint()
-        qube = self._open_qube_json(checkpoint.output_qube)
+        qube = _index.qube(self.artifact, checkpoint, "output")
 
         lead_time_seconds = lead_time * 3600
         model_step_seconds = _timestep_seconds(checkpoint.timestep)
@@ -25,7 +25,7 @@ from fiab_core.fable import (
     QubedOutput,
     RawOutput,
 )
-from fiab_core.plugin import Error
+from fiab_core.plugin import BlockCompilation, Error
 from fiab_core.tools.blocks import BlockInstanceConfigurationError, BlockInstanceRich, Product, Sink, Source, Transform
 from fiab_core.types import ClosedEnumType, DatetimeType, GeoDomainType, ListType, ParameterType, StringType
 from qubed import Qube
@@ -70,6 +70,13 @@ PLOT_FORMAT_TO_MIME: dict[str, str] = {
 FORECAST_DATASETS = load_datasets()
 
 
+def warm_up_dataset_qubes() -> None:
+    """Build the qubes of all forecast datasets in the variants the blocks use, so that validations only look them up"""
+    for dataset in FORECAST_DATASETS.values():
+        dataset.as_qube(ens_dim=ENSEMBLE, include_member_zero=True)
+        dataset.as_qube(ens_dim=ENSEMBLE)
+
+
 def _extract_dataset(inputs: dict[str, QubedOutput], name: str) -> QubedOutput:
     input_dataset = inputs.get(name)
     if not isinstance(input_dataset, QubedOutput):
@@ -132,32 +139,47 @@ class OperationalForecastSource(Source):
     def _convert_time(cls, time: int) -> str:
         return f"{time:02d}00"
 
-    def validate(
-        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
-    ) -> BlockInstanceOutput:
-        forecast = block.config_as_str(FORECAST)
+    def _date_time(self, block: BlockInstanceRich) -> tuple[str, str]:
         basetime = block.config_as_datetime(BASETIME)
-        time = self._convert_time(basetime.time().hour)
+        return basetime.strftime("%Y%m%d"), self._convert_time(basetime.time().hour)
 
+    def _output(self, forecast: str, time: str) -> BlockInstanceOutput:
         ifs_qoutput = QubedOutput(dataqube=FORECAST_DATASETS[forecast].as_qube(ens_dim=ENSEMBLE, include_member_zero=True))
         if not contains(ifs_qoutput, {"time": time}):
             raise ValueError(f"Invalid time: must be in {axes(ifs_qoutput)['time']}")
 
         return select(ifs_qoutput, {"time": time})
 
+    def validate(
+        self, block: BlockInstanceRich, inputs: dict[str, QubedOutput], restrictions: ConfigurationOptionRestriction
+    ) -> BlockInstanceOutput:
+        _, time = self._date_time(block)
+        return self._output(block.config_as_str(FORECAST), time)
+
     def compile(
         self,
         inputs: ActionLookup,
         block: BlockInstanceRich,
     ) -> Either[Action, Error]:  # type:ignore[invalid-argument] # semigroup
+        date, time = self._date_time(block)
+        return Either.ok(self._action(block, block.config_as_str(FORECAST), date, time))
+
+    def compile_with_output(
+        self,
+        inputs: ActionLookup,
+        block: BlockInstanceRich,
+        input_outputs: dict[str, QubedOutput],
+    ) -> Either[BlockCompilation, Error]:  # type:ignore[invalid-argument] # semigroup
         forecast = block.config_as_str(FORECAST)
+        date, time = self._date_time(block)
+        output = self._output(forecast, time)
+        return Either.ok(BlockCompilation(action=self._action(block, forecast, date, time), output=output))
+
+    def _action(self, block: BlockInstanceRich, forecast: str, date: str, time: str) -> Action:
         fc_preset = FORECAST_DATASETS[forecast]
+        # NOTE unlike the output, the action is built from the qube without member zero, which is marked by is_member_zero instead
         fc_qube = fc_preset.as_qube(ens_dim=ENSEMBLE)
 
-        basetime = block.config_as_datetime(BASETIME)
-        date = basetime.strftime("%Y%m%d")
-        time = self._convert_time(basetime.time().hour)
-
         subqube = fc_qube.select({"time": time}).compress()
         actions = []
         for levtype in subqube.axes()[LEVTYPE]:
@@ -211,8 +233,7 @@ class OperationalForecastSource(Source):
             for branch in ens_branches:
                 merged = merged.combine_branches(dim=ENSEMBLE, path=branch)
             actions.append(merged)
-        final_action = merge(*actions)
-        return Either.ok(final_action)
+        return merge(*actions)
 
 
 class EnsembleStatistics(Product):
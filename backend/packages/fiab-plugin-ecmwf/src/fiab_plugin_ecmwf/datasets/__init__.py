@@ -1,5 +1,5 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from importlib.resources import files
 from typing import Optional
 
@@ -11,8 +11,19 @@ from qubed import Qube
 class ForecastDataset:
     datacubes: list[dict]
     member_zero: Optional[dict] = None
+    _qubes: dict[tuple[str, bool], Qube] = field(default_factory=dict, init=False, repr=False, compare=False)
+    """Built qubes per as_qube arguments -- datasets are static, so each variant is built once per process"""
 
     def as_qube(self, ens_dim: str = "number", include_member_zero: bool = False) -> Qube:
+        """The dataset as a qube. The result is shared by all callers, thus must not be modified in place"""
+        key = (ens_dim, include_member_zero)
+        qube = self._qubes.get(key)
+        if qube is None:
+            # NOTE concurrent first calls may build the qube twice, which is harmless
+            qube = self._qubes[key] = self._build_qube(ens_dim, include_member_zero)
+        return qube
+
+    def _build_qube(self, ens_dim: str, include_member_zero: bool) -> Qube:
         qube = Qube.empty()
         for datacube in self.datacubes:
             if ens_dim and self.is_member_zero(datacube):
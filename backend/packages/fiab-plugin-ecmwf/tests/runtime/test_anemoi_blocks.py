@@ -7,6 +7,8 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
+from collections.abc import Callable
+from contextlib import AbstractContextManager as ContextManager
 from datetime import datetime
 from unittest.mock import MagicMock
 
@@ -145,6 +147,19 @@ class TestCheckpointArtifact:
         assert axes(selected)["step"] == {6, 12, 24, 30}
         assert list(selected.leaves(metadata=True))
 
+    def test_index_and_qubes_follow_catalog_changes(
+        self, six_hour_dummy_checkpoint: CompositeArtifactId, dummy_provider_factory: Callable[..., ContextManager[None]]
+    ) -> None:
+        checkpoint = CheckpointArtifact(six_hour_dummy_checkpoint)
+        assert checkpoint.checkpoint() is checkpoint.checkpoint()
+        model_input = checkpoint.get_model_input()
+        assert checkpoint.get_model_input() is model_input
+
+        with dummy_provider_factory(timestep="1h"):
+            assert checkpoint.checkpoint().timestep == "1h"
+            assert checkpoint.get_model_input() is not model_input
+            assert checkpoint.get_model_input() == model_input
+
 
 # ===================================================================
 # AnemoiSource
@@ -257,6 +257,15 @@ def mock_forecast_preset(monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setitem(FORECAST_DATASETS, name, dataset)
 
 
+def test_forecast_dataset_qubes_are_built_once() -> None:
+    dataset = ForecastDataset(FORECAST_DATASETS["ifs-ens"].datacubes, FORECAST_DATASETS["ifs-ens"].member_zero)
+    qube = dataset.as_qube(ens_dim=ENSEMBLE, include_member_zero=True)
+    assert dataset.as_qube(ens_dim=ENSEMBLE, include_member_zero=True) is qube
+    assert qube == dataset._build_qube(ENSEMBLE, True)
+    assert dataset.as_qube(ens_dim=ENSEMBLE) is not qube
+    assert dataset == FORECAST_DATASETS["ifs-ens"]
+
+
 class TestOperationalForecastSource:
     @pytest.mark.parametrize("forecast", FORECAST_DATASETS.keys())
     def test_creation(self, dummy_blockinstance_output: QubedOutput, forecast: str) -> None:
@@ -309,6 +318,20 @@ class TestOperationalForecastSource:
             assert array.sizes[ENSEMBLE] == 5
         assert "levelist" in nodetree_dimensions(action.nodes)
 
+    def test_compile_with_output_matches_validate_and_compile(self, mock_forecast_preset: pytest.FixtureRequest) -> None:
+        block = OperationalForecastSource()
+        block_instance = BlockInstance.from_block(
+            BlockFactoryId("operationalForecastSource"),
+            _block_instance(
+                "operationalForecastSource",
+                {"source": "ecmwf-open-data", "base_time": datetime(2024, 1, 1, 6), "forecast": "ifs-ens"},
+            ),
+            OperationalForecastSource.configuration_options,
+        )
+        compilation = block.compile_with_output({}, block_instance, {}).get_or_raise()
+        assert compilation.output == block.validate(block=block_instance, inputs={}, restrictions={})
+        assert nodetree_dimensions(compilation.action.nodes) == nodetree_dimensions(block.compile({}, block_instance).get_or_raise().nodes)
+
     @pytest.mark.parametrize(
         "config, error",
         [
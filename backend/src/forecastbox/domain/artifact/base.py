@@ -56,6 +56,19 @@ class MlModelDetail:
     local_compatibility_detail: str | None
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class DownloadProgress:
+    """State of an ongoing artifact download"""
+
+    percent: int
+    downloaded_bytes: int = 0
+    total_bytes: int | None = None
+    bytes_per_second: float = 0.0
+    """Throughput of this download attempt, thus excluding bytes resumed from an earlier one"""
+    retries: int = 0
+    """Requests retried after transient failures, across all segments"""
+
+
 ArtifactCatalog = PMap[CompositeArtifactId, ArtifactResolved]
 
 artifacts_subdir = "artifacts"
@@ -17,7 +17,7 @@ Artifact deletion or registry fetch both happen in a blocking manner, thus no ne
 from dataclasses import dataclass
 
 from forecastbox.domain.artifact.base import CompositeArtifactId
-from forecastbox.domain.notification.models import ClientNotification
+from forecastbox.domain.notification.models import ClientNotification, topic
 
 
 @dataclass(frozen=True, eq=True, slots=True)
@@ -40,4 +40,5 @@ class ArtifactDownloadFinishedEvent:
             },
             detailRoute="api/v1/artifacts/model_details",
             refreshRoutes=["api/v1/artifacts/list_models"],
+            topics=[topic("artifact", CompositeArtifactId.to_str(self.composite_id))],
         )
@@ -14,24 +14,41 @@ All the methods here are blocking -- see manager for nonblocking invocations.
 Supports both local (file://) and remote (ssh://) data directories.
 """
 
+import hashlib
 import logging
+import os
 import shlex
-import shutil
 import subprocess
-import tempfile
+import threading
+import time
 import urllib.parse
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import cast
 
 import httpx
+import orjson
 from fiab_core.artifacts import ArtifactLocalId, ArtifactResolved, ArtifactStoreId
 
-from forecastbox.domain.artifact.base import ArtifactCatalog, CompositeArtifactId, artifacts_subdir, get_artifact_local_path
+from forecastbox.domain.artifact.base import (
+    ArtifactCatalog,
+    CompositeArtifactId,
+    DownloadProgress,
+    artifacts_subdir,
+    get_artifact_local_path,
+)
 from forecastbox.utility import tunnel
+from forecastbox.utility.config import config
 from forecastbox.utility.tunnel import CommandHandle
 
 logger = logging.getLogger(__name__)
 
+# NOTE partial downloads are kept next to the artifact, so that they survive restarts and can be resumed
+partial_suffix = ".part"
+_state_suffix = ".part.json"
+
 
 def _parse_data_dir_url(data_dir_url: str) -> tuple[str, str, str]:
     """Parse a data_dir URL into (scheme, netloc, path). Raises ValueError on error."""
@@ -64,6 +81,8 @@ def _enumerate_artifacts_local(data_dir: str) -> list[tuple[str, str]]:
             if checkpoint_item.is_dir():
                 logger.warning(f"Found directory instead of file for checkpoint: {checkpoint_item.name}")
                 continue
+            if checkpoint_item.name.endswith((partial_suffix, _state_suffix, _state_suffix + ".tmp")):
+                continue
             entries.append((store_id, checkpoint_item.name))
     return entries
 
@@ -106,10 +125,32 @@ def _match_artifacts_to_catalog(catalog: ArtifactCatalog, entries: list[tuple[st
     return result
 
 
+def _discard_abandoned_partials_local(catalog: ArtifactCatalog, data_dir: str) -> None:
+    """Remove the partial downloads which will not be resumed -- of artifacts no longer in the catalog, or already stored.
+    Those of unknown stores are kept, as the store may be only temporarily missing from the catalog."""
+    artifacts_base = Path(data_dir) / artifacts_subdir
+    if not artifacts_base.exists():
+        return
+    known_store_ids = {artifact_id.artifact_store_id for artifact_id in catalog.keys()}
+    for store_item in artifacts_base.iterdir():
+        if not store_item.is_dir() or store_item.name not in known_store_ids:
+            continue
+        for part_path in store_item.glob(f"*{partial_suffix}"):
+            artifact_path = part_path.with_name(part_path.name.removesuffix(partial_suffix))
+            composite_id = CompositeArtifactId(
+                artifact_store_id=ArtifactStoreId(store_item.name),
+                artifact_local_id=ArtifactLocalId(artifact_path.name),
+            )
+            if composite_id not in catalog or artifact_path.exists():
+                logger.info(f"Removing abandoned partial download of {composite_id}")
+                _discard_partial(part_path, artifact_path.with_name(artifact_path.name + _state_suffix))
+
+
 def list_storage(catalog: ArtifactCatalog, data_dir_url: str, handle: CommandHandle | None = None) -> list[CompositeArtifactId]:
     """List stored artifacts at the given data_dir_url (file:// or ssh://)."""
     scheme, _netloc, path = _parse_data_dir_url(data_dir_url)
     if scheme == "file":
+        _discard_abandoned_partials_local(catalog, path)
         entries = _enumerate_artifacts_local(path)
     elif scheme == "ssh":
         if handle is None:
@@ -125,50 +166,284 @@ def list_storage(catalog: ArtifactCatalog, data_dir_url: str, handle: CommandHan
 # ---------------------------------------------------------------------------
 
 
+_chunk_size = 1024 * 1024
+_retryable_statuses = frozenset({408, 429, 500, 502, 503, 504})
+_retry_backoff_seconds = 1.0
+_retry_backoff_max_seconds = 30.0
+_report_interval_seconds = 0.5
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int | None
+    """Exclusive. None if the total size is not known, the segment then extends to the end of the response"""
+    done: int = 0
+
+
+@dataclass
+class _PartialState:
+    url: str
+    validator: str | None
+    """ETag or Last-Modified of the remote resource, to not resume a partial download of a since changed one"""
+    segments: list[_Segment]
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class _Probe:
+    total: int
+    validator: str | None
+    ranged: bool
+
+
+def _probe(client: httpx.Client, url: str) -> _Probe | None:
+    """Size, validator and range support of the remote resource, or None if the server does not tell."""
+    try:
+        response = client.head(url)
+    except httpx.HTTPError as e:
+        logger.debug(f"HEAD of {url} failed, assuming no range support: {repr(e)}")
+        return None
+    length = response.headers.get("Content-Length")
+    if response.status_code != 200 or not isinstance(length, str) or not length.isdigit():
+        return None
+    return _Probe(
+        total=int(length),
+        validator=response.headers.get("ETag") or response.headers.get("Last-Modified"),
+        ranged=response.headers.get("Accept-Ranges") == "bytes",
+    )
+
+
+def _plan_segments(probe: _Probe | None) -> list[_Segment]:
+    if probe is None or not probe.ranged or probe.total == 0:
+        return [_Segment(start=0, end=None if probe is None else probe.total)]
+    settings = config.backend.artifact_download
+    count = max(1, min(settings.segments, probe.total // (settings.min_segment_mb * 1024 * 1024)))
+    bounds = [probe.total * i // count for i in range(count + 1)]
+    return [_Segment(start=start, end=end) for start, end in zip(bounds, bounds[1:])]
+
+
+def _load_partial(state_path: Path, part_path: Path, url: str, probe: _Probe | None) -> _PartialState | None:
+    """The state of a previous attempt, if it can be resumed against the current remote resource."""
+    if probe is None or not probe.ranged or probe.validator is None or not part_path.exists():
+        return None
+    try:
+        raw = orjson.loads(state_path.read_bytes())
+        state = _PartialState(url=raw["url"], validator=raw["validator"], segments=[_Segment(**s) for s in raw["segments"]])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+    if state.url != url or state.validator != probe.validator or state.segments[-1].end != probe.total:
+        return None
+    return state
+
+
+def _fsync(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _save_partial(part_path: Path, state_path: Path, state: _PartialState) -> None:
+    # NOTE the offsets must not get ahead of the content on disk, else a resume after a crash would skip the lost bytes
+    _fsync(part_path)
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(orjson.dumps(state))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, state_path)
+
+
+def _discard_partial(part_path: Path, state_path: Path) -> None:
+    part_path.unlink(missing_ok=True)
+    state_path.unlink(missing_ok=True)
+    state_path.with_name(state_path.name + ".tmp").unlink(missing_ok=True)
+
+
+class _Download:
+    """Shared state of the segments of one download -- progress accounting and state persistence."""
+
+    def __init__(
+        self,
+        state: _PartialState,
+        part_path: Path,
+        state_path: Path | None,
+        total: int | None,
+        progress_callback: Callable[[DownloadProgress], None] | None,
+    ) -> None:
+        self.lock = threading.Lock()
+        self.state = state
+        self.part_path = part_path
+        self.state_path = state_path
+        """None if the download is not resumable, thus its state not persisted"""
+        self.total = total
+        self.progress_callback = progress_callback
+        self.downloaded = sum(segment.done for segment in state.segments)
+        self.fetched = 0
+        self.retries = 0
+        self.started = time.monotonic()
+        self.last_report = 0.0
+        self.aborted = threading.Event()
+
+    def advance(self, segment: _Segment, n: int) -> None:
+        with self.lock:
+            segment.done += n
+            self.downloaded += n
+            self.fetched += max(n, 0)
+            self.tick()
+
+    def retried(self) -> None:
+        with self.lock:
+            self.retries += 1
+            self.tick(force=True)
+
+    def tick(self, force: bool = False) -> None:
+        """Report progress and persist state, at most once per interval unless forced. Assumes lock held!"""
+        now = time.monotonic()
+        if not force and now - self.last_report < _report_interval_seconds:
+            return
+        self.last_report = now
+        if self.state_path is not None:
+            _save_partial(self.part_path, self.state_path, self.state)
+        if self.progress_callback is not None:
+            # NOTE capped below 100, which is reserved for the verified and stored artifact
+            percent = min(99, self.downloaded * 100 // self.total) if self.total else 0
+            elapsed = max(now - self.started, 1e-3)
+            self.progress_callback(
+                DownloadProgress(
+                    percent=percent,
+                    downloaded_bytes=self.downloaded,
+                    total_bytes=self.total,
+                    bytes_per_second=self.fetched / elapsed,
+                    retries=self.retries,
+                )
+            )
+
+
+def _fetch_segment_once(client: httpx.Client, url: str, part_path: Path, segment: _Segment, ranged: bool, download: _Download) -> None:
+    if not ranged and segment.done:
+        # NOTE without range support, every attempt starts from scratch
+        download.advance(segment, -segment.done)
+    offset = segment.start + segment.done
+    headers = {"Range": f"bytes={offset}-{cast(int, segment.end) - 1}"} if ranged else {}
+    with client.stream("GET", url, headers=headers) as response:
+        response.raise_for_status()
+        if ranged and response.status_code != 206:
+            raise ValueError(f"server ignored the range request for {url}")
+        if download.total is None:
+            length = response.headers.get("Content-Length")
+            download.total = int(length) if length else None
+        with open(part_path, "r+b") as file:
+            file.seek(offset)
+            for chunk in response.iter_bytes(_chunk_size):
+                if download.aborted.is_set():
+                    return
+                if segment.end is not None:
+                    chunk = chunk[: segment.end - segment.start - segment.done]
+                if chunk:
+                    file.write(chunk)
+                    # NOTE flushed before counted, so that the persisted offsets never cover unwritten bytes
+                    file.flush()
+                    download.advance(segment, len(chunk))
+            if not ranged:
+                file.truncate(segment.done)
+    if segment.end is not None and segment.start + segment.done < segment.end:
+        raise httpx.RemoteProtocolError(f"response ended at byte {segment.start + segment.done} of {segment.end}")
+
+
+def _fetch_segment(client: httpx.Client, url: str, part_path: Path, segment: _Segment, ranged: bool, download: _Download) -> None:
+    """Fetch the rest of the segment, retrying transient failures from where the previous attempt stopped."""
+    retries = config.backend.artifact_download.retries
+    for attempt in range(retries + 1):
+        try:
+            _fetch_segment_once(client, url, part_path, segment, ranged, download)
+            return
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            transient = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in _retryable_statuses
+            if not transient or attempt == retries or download.aborted.is_set():
+                download.aborted.set()
+                raise
+            logger.warning(f"retrying segment at byte {segment.start + segment.done} of {url} after {repr(e)}")
+            download.retried()
+            time.sleep(min(_retry_backoff_seconds * 2**attempt, _retry_backoff_max_seconds))
+        except BaseException:
+            download.aborted.set()
+            raise
+
+
+def _verify_digest(path: Path, expected: str | None) -> None:
+    if expected is None:
+        return
+    with open(path, "rb") as file:
+        actual = hashlib.file_digest(file, "sha256").hexdigest()
+    if actual != expected.lower():
+        raise ValueError(f"checksum mismatch: expected sha256 {expected}, got {actual}")
+
+
 def _download_artifact_local(
     composite_id: CompositeArtifactId,
     artifact: ArtifactResolved,
     data_dir_url: str,
-    progress_callback: Callable[[int], None] | None = None,
+    progress_callback: Callable[[DownloadProgress], None] | None = None,
 ) -> None:
-    """Download an artifact from its remote URL to local storage."""
+    """Download an artifact from its remote URL to local storage.
+
+    The content is fetched in parallel ranged segments if the server supports them, into a partial
+    file next to the artifact. An interrupted download resumes from the partial file, provided the
+    remote resource is unchanged. The content is verified against the digest in the catalog, if any.
+    """
     checkpoint = artifact.common
     artifact_path = get_artifact_local_path(composite_id, data_dir_url)
     artifact_path.parent.mkdir(parents=True, exist_ok=True)
-
-    temp_file = tempfile.NamedTemporaryFile(prefix="artifact_", suffix=".ckpt", delete=False)
-    temp_path = Path(temp_file.name)
-    temp_file.close()
-
+    part_path = artifact_path.with_name(artifact_path.name + partial_suffix)
+    state_path = artifact_path.with_name(artifact_path.name + _state_suffix)
+
+    with httpx.Client(follow_redirects=True, timeout=300.0) as client:
+        probe = _probe(client, checkpoint.url)
+        state = _load_partial(state_path, part_path, checkpoint.url, probe)
+        if state is not None:
+            logger.info(f"Resuming download for {composite_id} at {sum(s.done for s in state.segments)} bytes")
+        else:
+            _discard_partial(part_path, state_path)
+            state = _PartialState(url=checkpoint.url, validator=None if probe is None else probe.validator, segments=_plan_segments(probe))
+            with open(part_path, "wb") as file:
+                if probe is not None and probe.ranged:
+                    file.truncate(probe.total)
+        ranged = probe is not None and probe.ranged
+        resumable = ranged and state.validator is not None
+        download = _Download(state, part_path, state_path if resumable else None, None if probe is None else probe.total, progress_callback)
+        remaining = [segment for segment in state.segments if segment.end is None or segment.start + segment.done < segment.end]
+
+        logger.debug(f"Starting download for {composite_id} from {checkpoint.url} to {part_path} in {len(remaining)} segment(s)")
+        try:
+            if len(remaining) == 1:
+                _fetch_segment(client, checkpoint.url, part_path, remaining[0], ranged, download)
+            elif remaining:
+                with ThreadPoolExecutor(max_workers=len(remaining), thread_name_prefix="artifact-segment") as executor:
+                    futures = [executor.submit(_fetch_segment, client, checkpoint.url, part_path, s, ranged, download) for s in remaining]
+                for future in futures:
+                    future.result()
+        except Exception as e:
+            if not resumable:
+                _discard_partial(part_path, state_path)
+                logger.error(f"Failed to download artifact {composite_id}: {repr(e)}")
+                raise
+            with download.lock:
+                download.tick(force=True)
+            logger.error(f"Failed to download artifact {composite_id}, {download.downloaded} bytes kept for resuming: {repr(e)}")
+            raise
+
+    logger.debug(f"Download completed for {composite_id}, total bytes: {download.downloaded}")
     try:
-        with httpx.Client(follow_redirects=True, timeout=300.0) as client:
-            logger.debug(f"Starting download for {composite_id} from {checkpoint.url} to {temp_path}")
-            with client.stream("GET", checkpoint.url) as response:
-                response.raise_for_status()
-                total = int(response.headers.get("Content-Length", 0))
-                downloaded = 0
-                chunk_size = 1024 * 1024  # 1MB chunks
-
-                with open(temp_path, "wb") as file:
-                    for chunk in response.iter_bytes(chunk_size):
-                        if chunk:
-                            file.write(chunk)
-                            downloaded += len(chunk)
-                            if total > 0:
-                                progress = int(float(downloaded) / total * 100)
-                                logger.debug(f"Download progress: {progress}%")
-                                if progress_callback:
-                                    progress_callback(progress)
-
-        logger.debug(f"Download completed for {composite_id}, total bytes: {downloaded}")
-        shutil.move(str(temp_path), str(artifact_path))
-        logger.info(f"Successfully downloaded artifact {composite_id} to {artifact_path}")
-
-    except Exception as e:
-        if temp_path.exists():
-            temp_path.unlink()
-        logger.error(f"Failed to download artifact {composite_id}: {e}")
+        _verify_digest(part_path, checkpoint.sha256)
+    except ValueError as e:
+        _discard_partial(part_path, state_path)
+        logger.error(f"Failed to verify artifact {composite_id}: {e}")
         raise
+    os.replace(part_path, artifact_path)
+    state_path.unlink(missing_ok=True)
+    logger.info(f"Successfully downloaded artifact {composite_id} to {artifact_path}")
 
 
 def _download_artifact_remote(
@@ -186,7 +461,10 @@ def _download_artifact_remote(
 
     tunnel.run(handle, f"mkdir -p {shlex.quote(str(artifact_path.parent))}")
 
-    curl_cmd = f"curl -fsSL -o {shlex.quote(temp_path)} {shlex.quote(checkpoint.url)} && mv {shlex.quote(temp_path)} {shlex.quote(str(artifact_path))}"
+    verify_cmd = (
+        "" if checkpoint.sha256 is None else f"echo {shlex.quote(f'{checkpoint.sha256.lower()}  {temp_path}')} | sha256sum -c --status && "
+    )
+    curl_cmd = f"curl -fsSL -o {shlex.quote(temp_path)} {shlex.quote(checkpoint.url)} && {verify_cmd}mv {shlex.quote(temp_path)} {shlex.quote(str(artifact_path))}"
     try:
         tunnel.run(handle, curl_cmd)
     except subprocess.CalledProcessError as e:
@@ -205,7 +483,7 @@ def download_artifact(
     artifact: ArtifactResolved,
     data_dir_url: str,
     handle: CommandHandle | None = None,
-    progress_callback: Callable[[int], None] | None = None,
+    progress_callback: Callable[[DownloadProgress], None] | None = None,
 ) -> None:
     """Download an artifact to local or remote storage, dispatching on the data_dir_url scheme.
     `handle` required for `ssh://` scheme."""
@@ -226,11 +504,14 @@ def download_artifact(
 
 
 def _delete_artifact_local(composite_id: CompositeArtifactId, data_dir_url: str) -> None:
-    """Delete a locally stored artifact file."""
+    """Delete a locally stored artifact file, along with any partial download of it."""
     artifact_path = get_artifact_local_path(composite_id, data_dir_url)
     if not artifact_path.exists():
         raise FileNotFoundError(f"Artifact file not found: {artifact_path}")
     artifact_path.unlink()
+    _discard_partial(
+        artifact_path.with_name(artifact_path.name + partial_suffix), artifact_path.with_name(artifact_path.name + _state_suffix)
+    )
     logger.info(f"Deleted artifact {composite_id} from {artifact_path}")
 
 
@@ -28,7 +28,7 @@ from cascade.low.func import Either
 from pyrsistent import pmap, pset
 from pyrsistent.typing import PMap, PSet
 
-from forecastbox.domain.artifact.base import ArtifactCatalog, CompositeArtifactId, MlModelDetail, MlModelOverview
+from forecastbox.domain.artifact.base import ArtifactCatalog, CompositeArtifactId, DownloadProgress, MlModelDetail, MlModelOverview
 from forecastbox.domain.artifact.catalog import get_artifacts_catalog
 from forecastbox.domain.artifact.events import ArtifactDownloadFinishedEvent
 from forecastbox.domain.artifact.io import delete_artifact, download_artifact, list_storage
@@ -54,7 +54,7 @@ class ArtifactManager:
     ssh_handle_lock: threading.Lock = threading.Lock()
     catalog: ArtifactCatalog = pmap()
     locally_available: PSet[CompositeArtifactId] = pset()
-    ongoing_downloads: PMap[CompositeArtifactId, int | str] = pmap()
+    ongoing_downloads: PMap[CompositeArtifactId, DownloadProgress | str] = pmap()
     executor: ThreadPoolExecutor | None = None
     refresh_error: str | None = None
     ssh_handle: CommandHandle | None = None
@@ -133,7 +133,7 @@ def _download_artifact_task(composite_id: CompositeArtifactId) -> None:
         if checkpoint is None:
             raise KeyError(f"Artifact not found in catalog: {composite_id}")
 
-        def progress_callback(progress: int) -> None:
+        def progress_callback(progress: DownloadProgress) -> None:
             report_artifact_download_progress(composite_id, progress=progress)
 
         handle = _ssh_handle_if_needed()
@@ -177,18 +177,27 @@ def submit_artifact_download(composite_id: CompositeArtifactId) -> Either[int, s
             return Either.ok(100)
         if composite_id in ArtifactManager.ongoing_downloads:
             progress = ArtifactManager.ongoing_downloads[composite_id]
-            if isinstance(progress, int):
-                return Either.ok(progress)
+            if isinstance(progress, DownloadProgress):
+                return Either.ok(progress.percent)
             else:
                 return Either.error(progress)
         ArtifactManager._ensure_pool()
-        ArtifactManager.ongoing_downloads = ArtifactManager.ongoing_downloads.set(composite_id, 0)
+        ArtifactManager.ongoing_downloads = ArtifactManager.ongoing_downloads.set(composite_id, DownloadProgress(percent=0))
 
     ArtifactManager.executor.submit(_download_artifact_task, composite_id)
     return Either.ok(0)
 
 
-def report_artifact_download_progress(composite_id: CompositeArtifactId, progress: int | None = None, failure: str | None = None) -> None:
+def get_artifact_download_progress(composite_id: CompositeArtifactId) -> DownloadProgress | None:
+    """Return the progress of an ongoing download, None if there is none or it failed."""
+    # NOTE lock-free read of pyrsistent structure
+    progress = ArtifactManager.ongoing_downloads.get(composite_id)
+    return progress if isinstance(progress, DownloadProgress) else None
+
+
+def report_artifact_download_progress(
+    composite_id: CompositeArtifactId, progress: DownloadProgress | None = None, failure: str | None = None
+) -> None:
     """Report progress or failure for an ongoing artifact download."""
     # NOTE we block shortly even though we are in a background thread because we dont
     # want to get a timeout on ongoing download
@@ -20,15 +20,18 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any, cast
 
-from sqlalchemy import func, or_, select, update
+from sqlalchemy import delete, func, or_, select, update
 
 import forecastbox.schemata.jobs as _jobs_module
 from forecastbox.domain.blueprint.exceptions import BlueprintAccessDenied, BlueprintNotFound, BlueprintVersionConflict
 from forecastbox.domain.blueprint.types import BlueprintId
 from forecastbox.domain.plugin.compatibility import get_fiabcore_version
 from forecastbox.schemata.blueprint import Blueprint, BlueprintSource
+from forecastbox.schemata.experiment import ExperimentDefinition
+from forecastbox.schemata.run import Run
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.db import dbRetry, executeAndCommit, querySingle
+from forecastbox.utility.db import dbRetry, dbRetryRead, executeAndCommit, querySingle
+from forecastbox.utility.pagination import KeysetCursor
 from forecastbox.utility.time import current_time
 
 
@@ -194,12 +197,14 @@ def list_blueprints(
     source: BlueprintSource | None = None,
     blueprint_id: BlueprintId | None = None,
     version: int | None = None,
+    after: KeysetCursor | None = None,
 ) -> Iterable[BlueprintLatest]:
     """Return the latest (or a pinned) non-deleted version of every Blueprint visible to the caller, with optional paging.
 
     Admins and passthrough callers (``auth_context.has_admin()``) see all blueprints.
     Authenticated non-admin users see only their own blueprints and plugin templates.
-    Orders by creation time, descending.
+    Orders by creation time of the returned version, descending. Paging is either by ``offset``
+    or, more efficiently for deep pages, by the keyset cursor ``after``.
 
     ``created_by`` and ``source`` are optional caller-supplied filters applied at the
     outer query level so that paging counts and ordering remain correct.
@@ -257,13 +262,15 @@ def list_blueprints(
                 query = query.where(Blueprint.created_by == created_by)
             if source is not None:
                 query = query.where(Blueprint.source == source)
-            query = query.order_by(Blueprint.created_at.desc()).offset(offset)
+            if after is not None:
+                query = query.where(after.follows(Blueprint.created_at, Blueprint.blueprint_id))
+            query = query.order_by(Blueprint.created_at.desc(), Blueprint.blueprint_id.desc()).offset(offset)
             if limit is not None:
                 query = query.limit(limit)
             result = session.execute(query)
             return [BlueprintLatest(blueprint=_to_blueprint_record(r[0]), created_at=r[1]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_blueprints(*, auth_context: AuthContext, created_by: str | None = None, source: BlueprintSource | None = None) -> int:
@@ -289,7 +296,7 @@ def count_blueprints(*, auth_context: AuthContext, created_by: str | None = None
             result = session.execute(query)
             return result.scalar() or 0
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def find_plugin_template_id(*, created_by: str, display_name: str) -> BlueprintId | None:
@@ -317,7 +324,7 @@ def find_plugin_template_id(*, created_by: str, display_name: str) -> BlueprintI
             row = result.first()
             return BlueprintId(str(row[0])) if row is not None else None
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def soft_delete_blueprint(blueprint_id: BlueprintId, *, expected_version: int, auth_context: AuthContext) -> None:
@@ -375,3 +382,32 @@ def soft_delete_all_plugin_templates(*, created_by: str) -> None:
         .values(is_deleted=True)
     )
     executeAndCommit(stmt, _jobs_module.sync_session_maker)
+
+
+def purge_deleted_blueprints(limit: int) -> int:
+    """Hard-delete all versions of at most ``limit`` soft-deleted Blueprints, returning how many.
+
+    A Blueprint is purged only once no version of it is referenced by any Run or
+    ExperimentDefinition, including soft-deleted ones. Internal system operation, without auth.
+    """
+
+    def function(i: int) -> int:
+        with _jobs_module.sync_session_maker() as session:
+            by_run = select(Run.run_id).where(Run.blueprint_id == Blueprint.blueprint_id)
+            by_experiment = select(ExperimentDefinition.experiment_definition_id).where(
+                ExperimentDefinition.blueprint_id == Blueprint.blueprint_id
+            )
+            query = (
+                select(Blueprint.blueprint_id)
+                .where(~by_run.exists(), ~by_experiment.exists())
+                .group_by(Blueprint.blueprint_id)
+                .having(func.min(Blueprint.is_deleted).is_(True))
+                .limit(limit)
+            )
+            blueprint_ids = [str(r[0]) for r in session.execute(query).all()]
+            if blueprint_ids:
+                session.execute(delete(Blueprint).where(Blueprint.blueprint_id.in_(blueprint_ids)))
+            session.commit()
+            return len(blueprint_ids)
+
+    return dbRetry(function)
@@ -23,6 +23,7 @@ No HTTP exceptions are raised here; callers are responsible for mapping
 import datetime as dt
 import logging
 from collections import defaultdict
+from dataclasses import dataclass, field, replace
 from functools import partial
 from itertools import groupby
 from typing import Any, cast
@@ -40,14 +41,18 @@ from fiab_core.fable import (
     PluginCompositeId,
     QubedOutput,
 )
+from fiab_core.plugin import Plugin
 from pydantic import Field
+from pyrsistent.typing import PMap
 
+from forecastbox.domain.artifact.manager import ArtifactManager
 from forecastbox.domain.blueprint import db
 from forecastbox.domain.blueprint.cascade import EnvironmentSpecification
 from forecastbox.domain.blueprint.configuration_values import convert_known_configuration_values
 from forecastbox.domain.blueprint.db import upsert_blueprint
 from forecastbox.domain.blueprint.exceptions import BlueprintNotFound
 from forecastbox.domain.blueprint.types import BlueprintId
+from forecastbox.domain.blueprint.validation_cache import ValidationCache, block_key
 from forecastbox.domain.glyphs import global_db, resolution
 from forecastbox.domain.glyphs.exceptions import GlyphCircularReferenceError
 from forecastbox.domain.glyphs.intrinsic import get_values_and_examples
@@ -192,6 +197,160 @@ class BlueprintSaveCommand(FiabBaseModel):
 # ---------------------------------------------------------------------------
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class _BlockValidation:
+    """Outcome of validating a single block -- what ``_validation_cache`` keeps per block key."""
+
+    configuration_values: dict[ConfigurationOptionId, Any]
+    """The block's configuration values after glyph resolution and conversion"""
+    errors: list[str] = field(default_factory=list)
+    missing_glyphs: dict[ConfigurationOptionId, list[str]] | None = None
+    resolved_options: dict[ConfigurationOptionId, str] | None = None
+    restrictions: dict[ConfigurationOptionId, str] | None = None
+    output: BlockInstanceOutput | None = None
+    """None if the block is invalid, or any of its inputs is"""
+    qube: dict[str, Any] | None = None
+    expansions: list[SerializedBlockExpansion] | None = None
+    """None until computed, ie, when validated with ``validate_only`` only"""
+
+
+_validation_cache: ValidationCache[_BlockValidation] = ValidationCache()
+
+
+def _block_key(routable: RoutableBlock, all_glyphs: dict[str, str], keys: dict[BlockInstanceId, str | None]) -> str | None:
+    """Key of the block's validation result, None if any of its upstream blocks has none."""
+    upstream_keys: dict[str, str] = {}
+    for input_id, source_id in routable.instance.input_ids.items():
+        source_key = keys.get(source_id)
+        if source_key is None:
+            return None
+        upstream_keys[input_id] = source_key
+    extract_result = resolution.extract_glyphs(routable.instance)
+    # NOTE a failed extraction is deterministic in the configuration values, which are part of the key
+    glyphs = set() if extract_result.t is None else cast(ExtractedGlyphs, extract_result.t).glyphs
+    glyph_values = {glyph: all_glyphs.get(glyph) for glyph in glyphs}
+    return block_key(routable.plugin, routable.factory, routable.instance, glyph_values, upstream_keys)
+
+
+def _validate_block(
+    routable: RoutableBlock,
+    plugins: PMap[PluginCompositeId, Plugin],
+    all_glyphs: dict[str, str],
+    available_glyphs: set[str],
+    inputs: dict[str, BlockInstanceOutput] | None,
+) -> _BlockValidation:
+    """Resolve glyphs in the block's configuration and run its plugin's validator.
+
+    ``inputs`` is None if any of the upstream blocks is invalid, in which case the validator
+    is not run. The block instance is mutated in place, the result carries its final values.
+    """
+    instance = routable.instance
+    errors: list[str] = []
+
+    def failed() -> _BlockValidation:
+        return _BlockValidation(configuration_values=dict(instance.configuration_values), errors=errors)
+
+    plugin = plugins.get(routable.plugin, None)
+    if not plugin:
+        errors += ["Plugin not found"]
+        return failed()
+    blockFactory = plugin.catalogue.factories.get(routable.factory, None)
+    if not blockFactory:
+        errors += ["BlockFactory not found in the catalogue"]
+        return failed()
+    extraConfig = instance.configuration_values.keys() - blockFactory.configuration_options.keys()
+    if extraConfig:
+        errors += [f"Block contains extra config: {extraConfig}"]
+    extract_result = resolution.extract_glyphs(instance)
+    if extract_result.e is not None:
+        errors += extract_result.e
+        return failed()
+    extracted = cast(ExtractedGlyphs, extract_result.t)
+    missing_glyphs: dict[ConfigurationOptionId, list[str]] = {}
+    unknown_glyphs = extracted.glyphs - available_glyphs
+    if unknown_glyphs:
+        # Soft path: omit options referencing unknown glyphs and record them,
+        # rather than failing the whole block.
+        option_glyph_map = resolution.extract_glyphs_per_option(instance)
+        for opt_id, opt_glyphs in option_glyph_map.items():
+            opt_unknown = opt_glyphs & unknown_glyphs
+            if opt_unknown:
+                missing_glyphs[opt_id] = sorted(opt_unknown)
+                del instance.configuration_values[opt_id]
+        # Re-extract after removing affected options to get an accurate extracted state.
+        extract_result = resolution.extract_glyphs(instance)
+        if extract_result.e is not None:
+            errors += extract_result.e
+            return replace(failed(), missing_glyphs=missing_glyphs or None)
+        extracted = cast(ExtractedGlyphs, extract_result.t)
+    try:
+        resolution.resolve_configurations(instance, all_glyphs)
+    except Exception as exc:
+        errors += [f"Jinja expression error: {exc}"]
+        return replace(failed(), missing_glyphs=missing_glyphs or None)
+    # A glyph value may itself reference an unknown glyph (e.g. myPath="${root}/${missing}").
+    # After substitution those unresolved ${...} patterns survive in the config values;
+    # a second extract_glyphs pass surfaces them.
+    extract_after = resolution.extract_glyphs(instance)
+    nested_unknowns = cast(ExtractedGlyphs, extract_after.t).glyphs
+    if nested_unknowns:
+        # Soft path: omit options with unresolved nested glyph references.
+        option_glyph_map_after = resolution.extract_glyphs_per_option(instance)
+        for opt_id, opt_glyphs in option_glyph_map_after.items():
+            opt_nested = opt_glyphs & nested_unknowns
+            if opt_nested:
+                existing = set(missing_glyphs.get(opt_id, []))
+                missing_glyphs[opt_id] = sorted(existing | opt_nested)
+                del instance.configuration_values[opt_id]
+    # We dont want to return resolutions of nested glyphs, just the top levels. For this reason
+    # we need to run the extraction twice, not just once after the substitution
+    resolved_options = {k: instance.configuration_values[k] for k in extracted.glyphed_options if k in instance.configuration_values}
+    converted_values = convert_known_configuration_values(instance, blockFactory)
+    if converted_values.e is not None:
+        errors += converted_values.e
+        return replace(failed(), missing_glyphs=missing_glyphs or None, resolved_options=resolved_options)
+    instance.configuration_values = cast(dict[ConfigurationOptionId, Any], converted_values.t)
+    resolved = replace(failed(), missing_glyphs=missing_glyphs or None, resolved_options=resolved_options)
+
+    if inputs is None:
+        return resolved
+
+    validation = plugin.validator(routable.factory, instance, inputs)
+    output_or_error = validation.result
+    restrictions = {k: v.serialize() for k, v in validation.restrictions.items()}
+    if output_or_error.t is None:
+        errors += [output_or_error.e.reason]
+        return replace(resolved, errors=errors, restrictions=restrictions)
+    return replace(resolved, restrictions=restrictions, output=output_or_error.t)
+
+
+def _expand_block(blockId: BlockInstanceId, block: _BlockValidation, plugins: PMap[PluginCompositeId, Plugin]) -> _BlockValidation:
+    """Serialize the output qube of a valid block, and collect the possible expansions from all plugins."""
+    output = cast(BlockInstanceOutput, block.output)
+    qube = None
+    if isinstance(output, QubedOutput):
+        # Serialize the block's output qube for the frontend qube lens. Best
+        # effort only — a malformed/edge-case qube must never fail validation.
+        try:
+            qube = output.dataqube.to_json()
+        except Exception as exc:  # viz extra, never fatal
+            logger.error(f"Could not serialize output qube for {blockId=}: {repr(exc)}")
+    expansions = (
+        [
+            SerializedBlockExpansion(
+                plugin=any_plugin_id,
+                factory=expansion.factory,
+                restrictions={k: v.serialize() for k, v in expansion.restrictions.items()},
+            )
+            for any_plugin_id, any_plugin in plugins.items()
+            for expansion in any_plugin.expander(output)
+        ]
+        if not isinstance(output, NoOutput)
+        else []
+    )
+    return replace(block, qube=qube, expansions=expansions)
+
+
 def _validate_expand_with_buckets(
     blueprint: BlueprintBuilder,
     auth_context: AuthContext,
@@ -212,8 +371,13 @@ def _validate_expand_with_buckets(
     that ``resolve_configurations`` mutations do not affect the caller's object.
     When ``validate_only`` is False (the default, used by the expand endpoint),
     the passed-in blueprint may be mutated in place and expansion data is computed.
+
+    Validation is incremental -- per-block results are memoized per caller, see
+    ``validation_cache``, thus only the blocks changed since the previous call and
+    their downstream cone are validated again.
     """
     plugins = PluginManager.plugins
+    catalog = ArtifactManager.catalog
     if validate_only:
         blueprint = blueprint.model_copy(deep=True)
     possible_sources = (
@@ -271,117 +435,45 @@ def _validate_expand_with_buckets(
 
     invalidable: set[BlockInstanceId] = set()
     visited: set[BlockInstanceId] = set()
+    keys: dict[BlockInstanceId, str | None] = {}
+    session = auth_context.user_id
 
     for blockId in topological_order(block_lookup.items(), lambda block: block.instance.input_ids.values()):
         visited.add(blockId)
         routable = block_lookup[blockId]
-        plugin = plugins.get(routable.plugin, None)
-        if not plugin:
-            block_errors[blockId] += ["Plugin not found"]
-            invalidable.add(blockId)
-            continue
-        blockFactory = plugin.catalogue.factories.get(routable.factory, None)
-        if not blockFactory:
-            block_errors[blockId] += ["BlockFactory not found in the catalogue"]
-            invalidable.add(blockId)
-            continue
-        extraConfig = routable.instance.configuration_values.keys() - blockFactory.configuration_options.keys()
-        if extraConfig:
-            block_errors[blockId] += [f"Block contains extra config: {extraConfig}"]
-        extract_result = resolution.extract_glyphs(routable.instance)
-        if extract_result.e is not None:
-            block_errors[blockId] += extract_result.e
-            invalidable.add(blockId)
-            continue
-        extracted = cast(ExtractedGlyphs, extract_result.t)
-        unknown_glyphs = extracted.glyphs - available_glyphs
-        if unknown_glyphs:
-            # Soft path: omit options referencing unknown glyphs and record them,
-            # rather than failing the whole block.
-            option_glyph_map = resolution.extract_glyphs_per_option(routable.instance)
-            for opt_id, opt_glyphs in option_glyph_map.items():
-                opt_unknown = opt_glyphs & unknown_glyphs
-                if opt_unknown:
-                    missing_glyphs_result.setdefault(blockId, {})[opt_id] = sorted(opt_unknown)
-                    del routable.instance.configuration_values[opt_id]
-            # Re-extract after removing affected options to get an accurate extracted state.
-            extract_result = resolution.extract_glyphs(routable.instance)
-            if extract_result.e is not None:
-                block_errors[blockId] += extract_result.e
-                invalidable.add(blockId)
-                continue
-            extracted = cast(ExtractedGlyphs, extract_result.t)
-        try:
-            resolution.resolve_configurations(routable.instance, all_glyphs)
-        except Exception as exc:
-            block_errors[blockId] += [f"Jinja expression error: {exc}"]
-            invalidable.add(blockId)
-            continue
-        # A glyph value may itself reference an unknown glyph (e.g. myPath="${root}/${missing}").
-        # After substitution those unresolved ${...} patterns survive in the config values;
-        # a second extract_glyphs pass surfaces them.
-        extract_after = resolution.extract_glyphs(routable.instance)
-        nested_unknowns = cast(ExtractedGlyphs, extract_after.t).glyphs
-        if nested_unknowns:
-            # Soft path: omit options with unresolved nested glyph references.
-            option_glyph_map_after = resolution.extract_glyphs_per_option(routable.instance)
-            for opt_id, opt_glyphs in option_glyph_map_after.items():
-                opt_nested = opt_glyphs & nested_unknowns
-                if opt_nested:
-                    block_opts = missing_glyphs_result.setdefault(blockId, {})
-                    existing = set(block_opts.get(opt_id, []))
-                    block_opts[opt_id] = sorted(existing | opt_nested)
-                    del routable.instance.configuration_values[opt_id]
-        # We dont want to return resolutions of nested glyphs, just the top levels. For this reason
-        # we need to run the extraction twice, not just once after the substitution
-        resolved_configuration_options[blockId] = {
-            k: routable.instance.configuration_values[k] for k in extracted.glyphed_options if k in routable.instance.configuration_values
-        }
-        converted_values = convert_known_configuration_values(routable.instance, blockFactory)
-        if converted_values.t is None:
-            block_errors[blockId] += converted_values.e
-            invalidable.add(blockId)
-            continue
-        routable.instance.configuration_values = converted_values.t
-
-        if any(source_id in invalidable for source_id in routable.instance.input_ids.values()):
-            invalidable.add(blockId)
-            continue
-
-        inputs = {input_id: outputs[source_id] for input_id, source_id in routable.instance.input_ids.items()}
-        validation = plugin.validator(routable.factory, routable.instance, inputs)
-        output_or_error = validation.result
-        restrictions = validation.restrictions
-        if not validate_only and restrictions:
-            configuration_restrictions[blockId] = {k: v.serialize() for k, v in restrictions.items()}
-        if output_or_error.t is None:
-            block_errors[blockId] += [output_or_error.e.reason]
+        key = keys[blockId] = _block_key(routable, all_glyphs, keys)
+        block = None if key is None else _validation_cache.get(session, key, plugins, catalog)
+        is_computed = block is None
+        if block is None:
+            inputs = (
+                None
+                if any(source_id in invalidable for source_id in routable.instance.input_ids.values())
+                else {input_id: outputs[source_id] for input_id, source_id in routable.instance.input_ids.items()}
+            )
+            block = _validate_block(routable, plugins, all_glyphs, available_glyphs, inputs)
+        if not validate_only and block.output is not None and block.expansions is None:
+            block = _expand_block(blockId, block, plugins)
+            is_computed = True
+        if is_computed and key is not None:
+            _validation_cache.put(session, key, plugins, catalog, block)
+
+        routable.instance.configuration_values = dict(block.configuration_values)
+        if block.errors:
+            block_errors[blockId] += block.errors
+        if block.missing_glyphs is not None:
+            missing_glyphs_result[blockId] = {k: list(v) for k, v in block.missing_glyphs.items()}
+        if block.resolved_options is not None:
+            resolved_configuration_options[blockId] = dict(block.resolved_options)
+        if not validate_only and block.restrictions:
+            configuration_restrictions[blockId] = dict(block.restrictions)
+        if block.output is None:
             invalidable.add(blockId)
             continue
-        outputs[blockId] = output_or_error.t
-
-        if not validate_only and isinstance(output_or_error.t, QubedOutput):
-            # Serialize the block's output qube for the frontend qube lens. Best
-            # effort only — a malformed/edge-case qube must never fail validation.
-            try:
-                block_output_qubes[blockId] = output_or_error.t.dataqube.to_json()
-            except Exception as exc:  # viz extra, never fatal
-                logger.error(f"Could not serialize output qube for {blockId=}: {repr(exc)}")
-
+        outputs[blockId] = block.output
         if not validate_only:
-            possible_expansions[blockId] = (
-                [
-                    SerializedBlockExpansion(
-                        plugin=any_plugin_id,
-                        factory=expansion.factory,
-                        restrictions={k: v.serialize() for k, v in expansion.restrictions.items()},
-                    )
-                    for any_plugin_id, any_plugin in plugins.items()
-                    for expansion in any_plugin.expander(output_or_error.t)
-                ]
-                if not isinstance(output_or_error.t, NoOutput)
-                else []
-            )
+            if block.qube is not None:
+                block_output_qubes[blockId] = block.qube
+            possible_expansions[blockId] = list(cast(list[SerializedBlockExpansion], block.expansions))
 
     # the topological search *omits* nodes in cycles or with missing ancestors -- thus we need to report and detect them
     for blockId, routable in block_lookup.items():
@@ -438,7 +530,7 @@ async def validate_expand(
     """Validate and expand a partially-constructed BlueprintBuilder."""
     global_buckets = cast(
         global_db.GlyphResolutionBuckets,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "glyph.resolution",
             partial(global_db.get_glyphs_for_resolution, auth_context),
         ),
@@ -607,7 +699,7 @@ async def load_builder(blueprint_id: BlueprintId, version: int | None, auth_cont
     results = list(
         cast(
             list[db.BlueprintLatest],
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "blueprint.list",
                 partial(db.list_blueprints, auth_context=auth_context, blueprint_id=blueprint_id, version=version, limit=1),
             ),
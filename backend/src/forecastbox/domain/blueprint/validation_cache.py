@@ -0,0 +1,102 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Per-session memo of block validation results, for incremental blueprint re-validation.
+
+The key of a block is a hash of its plugin, factory and raw configuration values, the values of
+the glyphs it references, and the keys of its upstream blocks -- thus a change to a block changes
+the keys of its whole downstream cone, while the results of all other blocks are reused. Sessions
+are the callers' user ids, as the editor keeps no other session state with the backend.
+
+Results are only valid for the plugins and the artifact catalog they were computed with, as
+validators may look up artifacts such as checkpoints -- the memo is dropped whenever the published
+plugin snapshot or the artifact catalog changes. Lookups are counted in the metrics.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Generic, TypeVar
+
+import orjson
+from fiab_core.fable import BlockFactoryId, BlockInstance, PluginCompositeId
+from fiab_core.plugin import Plugin
+from pyrsistent.typing import PMap
+
+from forecastbox.domain.artifact.base import ArtifactCatalog
+from forecastbox.utility.config import config
+from forecastbox.utility.metrics import Counter
+
+V = TypeVar("V")
+
+lookups = Counter("fiab_validation_cache_lookups", "Block validation cache lookups by whether they were hits or misses", ("result",))
+
+
+def block_key(
+    plugin: PluginCompositeId,
+    factory: BlockFactoryId,
+    instance: BlockInstance,
+    glyph_values: Mapping[str, str | None],
+    upstream_keys: Mapping[str, str],
+) -> str:
+    """Hash everything the validation of a block depends on, given the plugin snapshot."""
+    content = {
+        "plugin": PluginCompositeId.to_str(plugin),
+        "factory": factory,
+        "configuration": instance.configuration_values,
+        "glyphs": glyph_values,
+        "inputs": upstream_keys,
+    }
+    return hashlib.sha256(orjson.dumps(content, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+
+
+class ValidationCache(Generic[V]):
+    """Thread-safe LRU of block results keyed by session and block key, tied to a plugin snapshot and an artifact catalog."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], V] = OrderedDict()
+        self._plugins: PMap[PluginCompositeId, Plugin] | None = None
+        self._catalog: ArtifactCatalog | None = None
+
+    def _sync(self, plugins: PMap[PluginCompositeId, Plugin], catalog: ArtifactCatalog) -> None:
+        # NOTE both the plugin snapshot and the artifact catalog are immutable maps, replaced on every change
+        if plugins is not self._plugins or catalog is not self._catalog:
+            self._entries.clear()
+            self._plugins = plugins
+            self._catalog = catalog
+
+    def get(self, session: str, key: str, plugins: PMap[PluginCompositeId, Plugin], catalog: ArtifactCatalog) -> V | None:
+        with self._lock:
+            self._sync(plugins, catalog)
+            value = self._entries.get((session, key))
+            if value is None:
+                lookups.inc(result="miss")
+                return None
+            self._entries.move_to_end((session, key))
+            lookups.inc(result="hit")
+            return value
+
+    def put(self, session: str, key: str, plugins: PMap[PluginCompositeId, Plugin], catalog: ArtifactCatalog, value: V) -> None:
+        max_size = config.backend.validation_cache_size
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._sync(plugins, catalog)
+            self._entries[(session, key)] = value
+            self._entries.move_to_end((session, key))
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plugins = None
+            self._catalog = None
@@ -28,7 +28,8 @@ from forecastbox.domain.experiment.exceptions import ExperimentAccessDenied, Exp
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
 from forecastbox.schemata.experiment import ExperimentDefinition, ExperimentType
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.db import dbRetry, executeAndCommit, querySingle
+from forecastbox.utility.db import dbRetry, dbRetryRead, executeAndCommit, querySingle
+from forecastbox.utility.pagination import KeysetCursor
 from forecastbox.utility.time import current_time
 
 
@@ -191,11 +192,14 @@ def list_experiment_definitions(
     limit: int | None = None,
     experiment_definition_id: ExperimentDefinitionId | None = None,
     version: int | None = None,
+    after: KeysetCursor | None = None,
 ) -> Iterable[ExperimentLatest]:
     """Return the latest (or a pinned) non-deleted version of every ExperimentDefinition visible to the caller.
 
     Admins and passthrough callers (``auth_context.has_admin()``) see all experiment definitions.
     Authenticated non-admin users see only their own experiment definitions.
+    Orders by creation time of the returned version, descending. Paging is either by ``offset``
+    or, more efficiently for deep pages, by the keyset cursor ``after``.
 
     ``experiment_definition_id`` narrows the result to a single entity; combined
     with ``limit=1`` this backs a single "get" lookup while still applying the
@@ -243,13 +247,17 @@ def list_experiment_definitions(
                 query = query.where(ExperimentDefinition.experiment_type == experiment_type)
             if not auth_context.has_admin():
                 query = query.where(ExperimentDefinition.created_by == auth_context.user_id)
-            query = query.offset(offset)
+            if after is not None:
+                query = query.where(after.follows(ExperimentDefinition.created_at, ExperimentDefinition.experiment_definition_id))
+            query = query.order_by(ExperimentDefinition.created_at.desc(), ExperimentDefinition.experiment_definition_id.desc()).offset(
+                offset
+            )
             if limit is not None:
                 query = query.limit(limit)
             result = session.execute(query)
             return [ExperimentLatest(experiment=_to_experiment_record(r[0]), created_at=r[1]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_experiment_definitions(
@@ -287,7 +295,7 @@ def count_experiment_definitions(
             result = session.execute(query)
             return result.scalar() or 0
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def soft_delete_experiment_definition(experiment_id: ExperimentDefinitionId, *, auth_context: AuthContext) -> None:
@@ -14,9 +14,11 @@ Runs in its own thread.
 import datetime as dt
 import logging
 import threading
+from dataclasses import dataclass
 
 from forecastbox.domain.experiment.scheduling import db
-from forecastbox.domain.experiment.scheduling.job_utils import experiment2runnable
+from forecastbox.domain.experiment.scheduling.dt_utils import plan_catch_up
+from forecastbox.domain.experiment.scheduling.job_utils import RunnableExperiment, records2runnable
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
 from forecastbox.domain.run.service import submit_run_sync
 from forecastbox.utility.auth import AuthContext
@@ -35,93 +37,149 @@ timeout_acquire_lifecycle = 5  # moderate timeout during scheduler startup/shutd
 timeout_acquire_background = 60  # leisure timeout for the scheduler background thread
 
 # NOTE this does not really affect how often scheduler checks for new jobs --
-# if anything is scheduled for earlier, we sleep for shorter time in advance,
+# if anything is scheduled for earlier, we sleep exactly until then,
 # or are `prod`ed explicitly. The actual importance of this interval is to
 # implement liveness checks correctly
 sleep_duration_min: int = 15 * 60
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class _Submission:
+    runnable: RunnableExperiment
+    experiment_version: int
+
+
 class SchedulerThread(threading.Thread):
     def __init__(self) -> None:
         super().__init__()
         self.stop_event = threading.Event()
         self.sleep_condition = threading.Condition()
+        self.prodded = False
+        """Set by prods arriving while not sleeping, eg during submissions, to not sleep past them"""
         self.liveness_timestamp: dt.datetime | None = None
         self.liveness_signal = threading.Event()
+        # NOTE shared across passes, as submissions of one pass may still be in flight during the next
+        self.in_flight = threading.BoundedSemaphore(config.backend.scheduler.max_concurrent_submissions)
 
     def mark_alive(self) -> dt.datetime:
         self.liveness_timestamp = current_time("liveness")
         self.liveness_signal.set()
         return self.liveness_timestamp
 
-    def _try_schedule(self) -> int:
-        """Check and submit due ExperimentDefinition scheduled runs."""
+    def _submit(self, submission: _Submission) -> None:
+        runnable = submission.runnable
+        try:
+            exec_result = submit_run_sync(
+                runnable.blueprint,
+                # NOTE the is_admin may be True, but we dont know and its not important for this call
+                AuthContext(
+                    user_id=runnable.created_by,
+                    is_admin=False,
+                ),
+                experiment_id=runnable.experiment_id,
+                experiment_version=submission.experiment_version,
+                compiler_runtime_context=runnable.compiler_runtime_context,
+                experiment_context=f"scheduled_at={runnable.scheduled_at.isoformat()}",
+                on_finished=self.in_flight.release,
+            )
+        except Exception as e:
+            self.in_flight.release()
+            logger.error(f"Failed to submit experiment {runnable.experiment_id}: {repr(e)}")
+            return
+        if exec_result.t is not None:
+            logger.debug(f"Execution {exec_result.t.run_id} submitted for experiment {runnable.experiment_id}")
+        else:
+            self.in_flight.release()
+            logger.error(f"Failed to submit experiment {runnable.experiment_id}: {exec_result.e}")
+
+    def _submit_all(self, submissions: list[_Submission]) -> None:
+        """Submit the runs onto the run-submission pool, with at most `max_concurrent_submissions` in flight."""
+        for i, submission in enumerate(submissions):
+            while not self.in_flight.acquire(timeout=1):
+                self.mark_alive()
+                if self.stop_event.is_set():
+                    self._restore_pending(submissions[i:])
+                    return
+            self._submit(submission)
+
+    def _restore_pending(self, pending: list[_Submission]) -> None:
+        """Move the next runs back to the earliest not submitted, for the next start to catch them up."""
+        earliest: dict[ExperimentDefinitionId, dt.datetime] = {}
+        for submission in pending:
+            experiment_id, scheduled_at = submission.runnable.experiment_id, submission.runnable.scheduled_at
+            earliest[experiment_id] = min(earliest.get(experiment_id, scheduled_at), scheduled_at)
+        logger.warning(f"Scheduler stopping with {len(pending)} due run(s) not submitted, restoring them for catch-up")
+        # NOTE without the scheduler_lock, which the stopping thread holds while joining us -- the update
+        # only ever moves existing entries earlier, thus does not undo a concurrent schedule change
+        try:
+            db.restore_experiment_next(earliest)
+        except Exception as e:
+            logger.error(f"Failed to restore {len(pending)} due run(s) for catch-up: {repr(e)}")
+
+    def _try_schedule(self) -> tuple[list[_Submission], dt.datetime | None]:
+        """Plan the due ExperimentDefinition scheduled runs and persist the next ones.
+
+        Returns the runs to submit, and the earliest next run time across all experiments.
+        """
         now = self.mark_alive()
         logger.debug(f"Scheduler inquiry at {now}")
 
-        schedulable = db.get_schedulable_experiments(now)
+        settings = config.backend.scheduler
+        submissions: list[_Submission] = []
+        next_runs: dict[ExperimentDefinitionId, dt.datetime | None] = {}
 
-        for exp_next, exp_def in schedulable:
-            experiment_id = ExperimentDefinitionId(str(exp_next.experiment_id))
-            scheduled_at = exp_next.scheduled_at
+        for schedulable in db.get_schedulable_experiments(now):
+            exp_def = schedulable.experiment
+            experiment_id = schedulable.experiment_next.experiment_id
+            scheduled_at = schedulable.experiment_next.scheduled_at
             logger.debug(f"Processing scheduled experiment {experiment_id} at {scheduled_at}")
+            next_runs[experiment_id] = None
 
-            get_spec_result = experiment2runnable(experiment_id, scheduled_at)
+            if schedulable.blueprint is None:
+                logger.error(
+                    f"Could not create runnable for experiment {experiment_id}: Blueprint {exp_def.blueprint_id!r} v{exp_def.blueprint_version} not found"
+                )
+                continue
             try:
                 is_valid = (not exp_def.is_deleted) and bool((exp_def.experiment_definition or {}).get("enabled"))
             except (TypeError, KeyError) as e:
                 logger.error(f"unexpected parsing failure for {experiment_id=}: {repr(e)} on {exp_def.experiment_definition}")
                 is_valid = False
+            if not is_valid:
+                # NOTE this should not happen -- we have locks etc preventing this
+                logger.error(f"Skipping {experiment_id} at {scheduled_at}: it is not valid!")
+                continue
 
-            if get_spec_result.t is not None:
-                runnable = get_spec_result.t
-                if (now - scheduled_at).total_seconds() / 3600 > runnable.max_acceptable_delay_hours:
-                    logger.warning(
-                        f"Skipping experiment {experiment_id} at {scheduled_at}: "
-                        f"older than max_acceptable_delay_hours ({runnable.max_acceptable_delay_hours} hours)."
-                    )
-                elif not is_valid:
-                    # NOTE this should not happen -- we have locks etc preventing this
-                    logger.error("Skipping {experiment_id} at {scheduled_at}: it is not valid!")
-                else:
-                    exec_result = submit_run_sync(
-                        runnable.blueprint,
-                        # NOTE the is_admin may be True, but we dont know and its not important for this call
-                        AuthContext(
-                            user_id=runnable.created_by,
-                            is_admin=False,
-                        ),
-                        experiment_id=experiment_id,
-                        experiment_version=exp_def.version,
-                        compiler_runtime_context=runnable.compiler_runtime_context,
-                        experiment_context=f"scheduled_at={runnable.scheduled_at.isoformat()}",
-                    )
-                    if exec_result.t is not None:
-                        logger.debug(f"Execution {exec_result.t.run_id} submitted for experiment {experiment_id}")
-                    else:
-                        logger.error(f"Failed to submit experiment {experiment_id}: {exec_result.e}")
-
-                db.delete_experiment_next(experiment_id)
-                if runnable.next_run_at and is_valid:
-                    db.upsert_experiment_next(experiment_id=experiment_id, scheduled_at=runnable.next_run_at)
-                    logger.debug(f"Next run for {experiment_id}: {runnable.next_run_at}")
-                else:
-                    logger.warning(f"No next run computed for {experiment_id}")
-            else:
-                logger.error(f"Could not create runnable for experiment {experiment_id}: {get_spec_result.e}")
-                db.delete_experiment_next(experiment_id)
-
-        next_schedulable_at = db.next_schedulable_experiment()
-
-        sleep_duration = sleep_duration_min
-        if next_schedulable_at:
-            time_to_next_schedulable_at = int((next_schedulable_at - current_time("scheduling")).total_seconds())
-            if time_to_next_schedulable_at > 0:
-                sleep_duration = min(time_to_next_schedulable_at, sleep_duration_min)
+            try:
+                runnable = records2runnable(exp_def, schedulable.blueprint, scheduled_at)
+                plan = plan_catch_up(
+                    scheduled_at,
+                    now,
+                    runnable.cron_expr,
+                    dt.timedelta(hours=runnable.max_acceptable_delay_hours),
+                    settings.catch_up,
+                    settings.catch_up_max_runs,
+                )
+            except ValueError as e:
+                logger.error(f"Could not create runnable for experiment {experiment_id}: {repr(e)}")
+                continue
+            if plan.skipped:
+                logger.warning(
+                    f"Skipping {plan.skipped} run(s) of experiment {experiment_id} due since {scheduled_at}: "
+                    f"older than max_acceptable_delay_hours ({runnable.max_acceptable_delay_hours} hours) "
+                    f"or excluded by the {settings.catch_up!r} catch-up policy."
+                )
+            submissions.extend(_Submission(runnable.at(run_at), exp_def.version) for run_at in plan.runs)
+            next_runs[experiment_id] = plan.next_run_at
+            if plan.next_run_at:
+                logger.debug(f"Next run for {experiment_id}: {plan.next_run_at}")
             else:
-                sleep_duration = 0
+                logger.warning(f"No next run computed for {experiment_id}")
 
-        return sleep_duration
+        # NOTE the next runs are persisted before the submissions, so that the lock is not held during them. Runs
+        # not submitted due to a stop are restored afterwards, see _restore_pending
+        db.replace_experiment_next(next_runs)
+        return submissions, db.next_schedulable_experiment()
 
     def run(self) -> None:
         logger.info("Scheduler thread started.")
@@ -130,12 +188,18 @@ class SchedulerThread(threading.Thread):
                 if not acquired:
                     logger.warning("Scheduler could not acquire scheduler_lock within timeout, skipping iteration.")
                     continue
-                sleep_duration = self._try_schedule()
-
-            if sleep_duration > 0:
-                with self.sleep_condition:
+                submissions, next_schedulable_at = self._try_schedule()
+            self._submit_all(submissions)
+
+            # NOTE computed after the submissions, which may have taken a while, so that we wake exactly when due
+            sleep_duration = float(sleep_duration_min)
+            if next_schedulable_at:
+                sleep_duration = min(max((next_schedulable_at - current_time("scheduling")).total_seconds(), 0.0), sleep_duration)
+            with self.sleep_condition:
+                if sleep_duration > 0:
                     logger.debug(f"Scheduler sleeping for {sleep_duration} seconds.")
-                    self.sleep_condition.wait(sleep_duration)
+                    self.sleep_condition.wait_for(lambda: self.prodded or self.stop_event.is_set(), sleep_duration)
+                self.prodded = False
 
     def stop(self) -> None:
         self.stop_event.set()
@@ -147,6 +211,7 @@ class SchedulerThread(threading.Thread):
     def prod(self) -> None:
         with self.sleep_condition:
             logger.debug("Prodding possibly sleeping scheduler.")
+            self.prodded = True
             self.sleep_condition.notify()
 
 
@@ -15,16 +15,19 @@ single connection pool and in-process tests can monkeypatch a single attribute.
 
 import datetime as dt
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any, cast
 
 from sqlalchemy import delete, func, select, update
 
 import forecastbox.schemata.jobs as _jobs_module
+from forecastbox.domain.blueprint import db as blueprint_db
 from forecastbox.domain.experiment import db as experiment_db
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
+from forecastbox.schemata.blueprint import Blueprint
 from forecastbox.schemata.experiment import ExperimentDefinition, ExperimentNext
-from forecastbox.utility.db import addAndCommit, dbRetry, executeAndCommit, querySingle
+from forecastbox.utility.db import addAndCommit, dbRetry, dbRetryRead, executeAndCommit, querySingle
 from forecastbox.utility.time import current_time
 
 
@@ -82,16 +85,74 @@ def delete_experiment_next(experiment_id: ExperimentDefinitionId) -> None:
     executeAndCommit(stmt, _jobs_module.sync_session_maker)
 
 
-def get_schedulable_experiments(now: dt.datetime) -> list[tuple[ExperimentNextRecord, experiment_db.ExperimentDefinitionRecord]]:
-    """Return (ExperimentNext, ExperimentDefinition) pairs due for execution.
+def replace_experiment_next(scheduled: Mapping[ExperimentDefinitionId, dt.datetime | None]) -> None:
+    """Set the next scheduled run times of many experiments in a single transaction.
+
+    Experiments mapped to None have their entry removed, clearing the pending tick.
+    """
+    if not scheduled:
+        return
+    ref_time = current_time("dbref")
+
+    def function(i: int) -> None:
+        with _jobs_module.sync_session_maker() as session:
+            session.execute(delete(ExperimentNext).where(ExperimentNext.experiment_id.in_(list(scheduled))))
+            session.add_all(
+                ExperimentNext(
+                    experiment_next_id=str(uuid.uuid4()),
+                    experiment_id=experiment_id,
+                    scheduled_at=scheduled_at,
+                    updated_at=ref_time,
+                )
+                for experiment_id, scheduled_at in scheduled.items()
+                if scheduled_at is not None
+            )
+            session.commit()
+
+    dbRetry(function)
+
+
+def restore_experiment_next(pending: Mapping[ExperimentDefinitionId, dt.datetime]) -> None:
+    """Move the next scheduled run times of experiments back to earlier ones, eg of runs planned but not submitted.
+
+    Entries already earlier are kept, and experiments without any entry, ie no longer scheduled, are not restored.
+    """
+    if not pending:
+        return
+    ref_time = current_time("dbref")
+
+    def function(i: int) -> None:
+        with _jobs_module.sync_session_maker() as session:
+            for experiment_id, scheduled_at in pending.items():
+                session.execute(
+                    update(ExperimentNext)
+                    .where(ExperimentNext.experiment_id == experiment_id, ExperimentNext.scheduled_at > scheduled_at)
+                    .values(scheduled_at=scheduled_at, updated_at=ref_time)
+                )
+            session.commit()
+
+    dbRetry(function)
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class SchedulableExperiment:
+    experiment_next: ExperimentNextRecord
+    experiment: experiment_db.ExperimentDefinitionRecord
+    blueprint: blueprint_db.BlueprintRecord | None
+    """None if the linked Blueprint version is missing or deleted"""
+
+
+def get_schedulable_experiments(now: dt.datetime) -> list[SchedulableExperiment]:
+    """Return the experiments due for execution, together with their Blueprints.
 
     Joins ExperimentNext with the latest non-deleted ExperimentDefinition of type
-    'cron_schedule'. Disabled schedules have their ExperimentNext row deleted at
-    update time, so should not appear here -- but if they would, we handle at the
-    scheduler thread by logging error and deleting their ExperimentNext.
+    'cron_schedule', and that with its Blueprint version. Disabled schedules have
+    their ExperimentNext row deleted at update time, so should not appear here --
+    but if they would, we handle at the scheduler thread by logging error and
+    deleting their ExperimentNext.
     """
 
-    def function(i: int) -> list[tuple[ExperimentNextRecord, experiment_db.ExperimentDefinitionRecord]]:
+    def function(i: int) -> list[SchedulableExperiment]:
         with _jobs_module.sync_session_maker() as session:
             subq = (
                 select(
@@ -103,7 +164,7 @@ def get_schedulable_experiments(now: dt.datetime) -> list[tuple[ExperimentNextRe
                 .subquery()
             )
             query = (
-                select(ExperimentNext, ExperimentDefinition)
+                select(ExperimentNext, ExperimentDefinition, Blueprint)
                 .where(ExperimentNext.scheduled_at <= now)
                 .join(subq, ExperimentNext.experiment_id == subq.c.experiment_definition_id)
                 .join(
@@ -111,12 +172,26 @@ def get_schedulable_experiments(now: dt.datetime) -> list[tuple[ExperimentNextRe
                     (ExperimentDefinition.experiment_definition_id == subq.c.experiment_definition_id)
                     & (ExperimentDefinition.version == subq.c.max_version),
                 )
+                .outerjoin(
+                    Blueprint,
+                    (Blueprint.blueprint_id == ExperimentDefinition.blueprint_id)
+                    & (Blueprint.version == ExperimentDefinition.blueprint_version)
+                    & Blueprint.is_deleted.is_(False),
+                )
                 .where(ExperimentDefinition.experiment_type == "cron_schedule")
+                .order_by(ExperimentNext.scheduled_at)
             )
             result = session.execute(query)
-            return [(_to_experiment_next_record(row[0]), experiment_db._to_experiment_record(row[1])) for row in result.all()]
+            return [
+                SchedulableExperiment(
+                    experiment_next=_to_experiment_next_record(row[0]),
+                    experiment=experiment_db._to_experiment_record(row[1]),
+                    blueprint=None if row[2] is None else blueprint_db._to_blueprint_record(row[2]),
+                )
+                for row in result.all()
+            ]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def next_schedulable_experiment() -> dt.datetime | None:
@@ -128,4 +203,26 @@ def next_schedulable_experiment() -> dt.datetime | None:
             result = session.execute(query)
             return result.scalar_one_or_none()
 
+    return dbRetryRead(function)
+
+
+def purge_stale_experiment_next(limit: int) -> int:
+    """Delete at most ``limit`` ExperimentNext rows of experiments without any non-deleted definition.
+
+    Internal system operation of the garbage collector, without auth.
+    """
+
+    def function(i: int) -> int:
+        with _jobs_module.sync_session_maker() as session:
+            live = select(ExperimentDefinition.experiment_definition_id).where(
+                ExperimentDefinition.experiment_definition_id == ExperimentNext.experiment_id,
+                ExperimentDefinition.is_deleted.is_(False),
+            )
+            query = select(ExperimentNext.experiment_next_id).where(~live.exists()).limit(limit)
+            stale = [r[0] for r in session.execute(query).all()]
+            if stale:
+                session.execute(delete(ExperimentNext).where(ExperimentNext.experiment_next_id.in_(stale)))
+            session.commit()
+            return len(stale)
+
     return dbRetry(function)
@@ -10,8 +10,15 @@
 """Datetime-related utilities for scheduling."""
 
 import re
+from bisect import bisect_left
+from calendar import monthrange
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from itertools import islice, takewhile
+from typing import Literal
+
+from cascade.low.func import assert_never
 
 
 def _validate_field(field: str, min_val: int, max_val: int, label: str) -> None:
@@ -82,31 +89,134 @@ class Crontab:
     days_of_week: list[int]
 
 
+# NOTE the gregorian calendar repeats itself, weekdays included, every 400 years -- a crontab without
+# an occurrence within that horizon has none at all, eg, 30th of February
+_horizon_years = 400
+
+
+def _first_at_least(values: list[int], value: int) -> int | None:
+    idx = bisect_left(values, value)
+    return values[idx] if idx < len(values) else None
+
+
+def _next_occurrence(crontab: Crontab, start: datetime) -> datetime | None:
+    """First occurrence at or after the naive, minute-aligned ``start``, jumping field by field."""
+    year, month, day, hour, minute = start.year, start.month, start.day, start.hour, start.minute
+    while year <= start.year + _horizon_years:
+        next_month = _first_at_least(crontab.months, month)
+        if next_month is None:
+            year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+            continue
+        if next_month != month:
+            month, day, hour, minute = next_month, 1, 0, 0
+
+        days_in_month = monthrange(year, month)[1]
+        next_day = _first_at_least(crontab.days_of_month, day)
+        while next_day is not None and next_day <= days_in_month and date(year, month, next_day).weekday() not in crontab.days_of_week:
+            next_day = _first_at_least(crontab.days_of_month, next_day + 1)
+        if next_day is None or next_day > days_in_month:
+            month, day, hour, minute = month + 1, 1, 0, 0
+            if month > 12:
+                year, month = year + 1, 1
+            continue
+        if next_day != day:
+            day, hour, minute = next_day, 0, 0
+
+        next_hour = _first_at_least(crontab.hours, hour)
+        if next_hour is None:
+            following = date(year, month, day) + timedelta(days=1)
+            year, month, day, hour, minute = following.year, following.month, following.day, 0, 0
+            continue
+        if next_hour != hour:
+            hour, minute = next_hour, 0
+
+        next_minute = _first_at_least(crontab.minutes, minute)
+        if next_minute is None:
+            hour, minute = hour + 1, 0
+            if hour > 23:
+                following = date(year, month, day) + timedelta(days=1)
+                year, month, day, hour = following.year, following.month, following.day, 0
+            continue
+        return datetime(year, month, day, hour, next_minute)
+    return None
+
+
+def _occurrences(after: datetime, crontab: str) -> Iterator[datetime]:
+    """Occurrences strictly after ``after``, in the same timezone, in increasing order."""
+    crontab_values = parse_crontab(crontab)
+    current = after.replace(second=0, microsecond=0, tzinfo=None) + timedelta(minutes=1)
+    while (occurrence := _next_occurrence(crontab_values, current)) is not None:
+        yield occurrence.replace(tzinfo=after.tzinfo)
+        current = occurrence + timedelta(minutes=1)
+
+
 def calculate_next_run(after: datetime, crontab: str) -> datetime:
     """Calculates the next run datetime according to the crontab expression."""
-    crontab_values = parse_crontab(crontab)
+    occurrence = next(_occurrences(after, crontab), None)
+    if occurrence is None:
+        raise ValueError(f"cron next run failure for {after} and {crontab}")
+    return occurrence
+
+
+def calculate_next_runs(after: datetime, crontab: str, count: int) -> list[datetime]:
+    """Calculates the next ``count`` run datetimes, fewer only if the crontab has no more occurrences."""
+    return list(islice(_occurrences(after, crontab), count))
+
 
-    # TODO naive search, optimize!
-    current_time = after + timedelta(minutes=1)
-    for year in (current_time.year, current_time.year + 1):
-        for month in crontab_values.months:
-            if month < current_time.month and year == current_time.year:
-                continue
-            for day_of_month in crontab_values.days_of_month:
-                try:
-                    test_date = datetime(year, month, day_of_month)
-                except ValueError:  # NOTE february issues etc
-                    continue
-
-                if test_date.weekday() not in crontab_values.days_of_week:
-                    continue
-
-                for hour in crontab_values.hours:
-                    for minute in crontab_values.minutes:
-                        candidate_run = datetime(year, month, day_of_month, hour, minute, tzinfo=after.tzinfo)
-                        if candidate_run > after:
-                            return candidate_run
-    raise ValueError(f"cron next run failure for {after} and {crontab}")
+def calculate_runs_between(after: datetime, until: datetime, crontab: str, limit: int | None = None) -> list[datetime]:
+    """Calculates all run datetimes in the (after, until] window, or only the first ``limit`` of them."""
+    runs = takewhile(lambda occurrence: occurrence <= until, _occurrences(after, crontab))
+    return list(runs if limit is None else islice(runs, limit))
+
+
+CatchUpPolicy = Literal["skip", "latest", "all"]
+"""What to do with the runs due while the scheduler was not running -- submit all of them, only the most
+recent one, or none -- in which case the scheduled run is submitted only if no later one is due yet"""
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class CatchUpPlan:
+    runs: list[datetime]
+    """Due runs to be submitted, oldest first"""
+    skipped: int
+    """Due runs not to be submitted, due to the policy or being older than the acceptable delay. Not
+    exact if the scheduled time itself was already older than that"""
+    next_run_at: datetime | None
+    """First run after now, None if the crontab has no more occurrences or is not given"""
+
+
+def plan_catch_up(
+    scheduled_at: datetime, now: datetime, crontab: str | None, max_delay: timedelta, policy: CatchUpPolicy, max_runs: int
+) -> CatchUpPlan:
+    """Determines which of the runs due at ``now`` to submit, given the first due one was at ``scheduled_at``.
+
+    The due runs are ``scheduled_at`` itself, which need not be an occurrence of the crontab, followed
+    by all the crontab occurrences until ``now``. Runs older than ``max_delay`` are never submitted,
+    and at most ``max_runs`` most recent ones are.
+    """
+    cutoff = now - max_delay
+    if not crontab:
+        due = [scheduled_at] if scheduled_at <= now else []
+        next_run_at = None
+    else:
+        # NOTE occurrences older than the cutoff are not enumerated at all, there may be arbitrarily many.
+        # The enumeration is exclusive of its start, and an occurrence right at the cutoff is still acceptable
+        first = max(scheduled_at, cutoff - timedelta(minutes=1))
+        due = ([scheduled_at] if scheduled_at >= cutoff and scheduled_at <= now else []) + calculate_runs_between(first, now, crontab)
+        next_run_at = next(_occurrences(max(now, scheduled_at), crontab), None)
+    skipped = int(scheduled_at < cutoff)
+    acceptable = [run for run in due if run >= cutoff]
+    skipped += len(due) - len(acceptable)
+
+    if policy == "all":
+        runs = acceptable[-max_runs:] if max_runs > 0 else []
+    elif policy == "latest":
+        runs = acceptable[-1:]
+    elif policy == "skip":
+        runs = [scheduled_at] if due == [scheduled_at] else []
+    else:
+        assert_never(policy)
+    return CatchUpPlan(runs=runs, skipped=skipped + len(acceptable) - len(runs), next_run_at=next_run_at)
 
 
 def parse_crontab(crontab: str) -> Crontab:
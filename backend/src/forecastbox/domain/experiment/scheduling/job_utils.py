@@ -10,7 +10,7 @@
 """Job and graph utilities for scheduling."""
 
 import datetime as dt
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from cascade.low.func import Either
 
@@ -37,36 +37,49 @@ class RunnableExperiment:
     blueprint_version: int
     max_acceptable_delay_hours: int
     compiler_runtime_context: CompilerRuntimeContext
+    cron_expr: str | None = None
 
+    def at(self, exec_time: dt.datetime) -> "RunnableExperiment":
+        """The same experiment for another execution time, eg, a missed run being caught up."""
+        return replace(
+            self,
+            scheduled_at=exec_time,
+            compiler_runtime_context=CompilerRuntimeContext(glyphs={"submitDatetime": value_dt2str(exec_time)}),
+        )
 
-def experiment2runnable(experiment_id: ExperimentDefinitionId, exec_time: dt.datetime) -> Either[RunnableExperiment, str]:  # type: ignore[invalid-argument]
-    """Convert an ExperimentDefinition into a RunnableExperiment for the given execution time.
-
-    Loads the linked Blueprint and builds a CompilerRuntimeContext for the run.
-    """
-    exp = experiment_db.get_experiment_definition(experiment_id)
-    if exp is None:
-        return Either.error(f"ExperimentDefinition {experiment_id!r} not found")
 
+def records2runnable(exp: experiment_db.ExperimentDefinitionRecord, job_def: BlueprintRecord, exec_time: dt.datetime) -> RunnableExperiment:
+    """Convert already loaded ExperimentDefinition and Blueprint into a RunnableExperiment for the given execution time."""
     exp_def = exp.experiment_definition or {}
     cron_expr = str(exp_def.get("cron_expr", ""))
     max_acceptable_delay_hours = int(exp_def.get("max_acceptable_delay_hours", 24))
-
-    job_def = blueprint_db.get_blueprint(exp.blueprint_id, exp.blueprint_version)
-    if job_def is None:
-        return Either.error(f"Blueprint {exp.blueprint_id!r} v{exp.blueprint_version} not found")
-
     next_run_at = calculate_next_run(exec_time, cron_expr) if cron_expr else None
 
-    rv = RunnableExperiment(
+    return RunnableExperiment(
         blueprint=job_def,
         created_by=exp.created_by,
         next_run_at=next_run_at,
         scheduled_at=exec_time,
-        experiment_id=experiment_id,
+        experiment_id=exp.experiment_definition_id,
         blueprint_id=exp.blueprint_id,
         blueprint_version=exp.blueprint_version,
         max_acceptable_delay_hours=max_acceptable_delay_hours,
         compiler_runtime_context=CompilerRuntimeContext(glyphs={"submitDatetime": value_dt2str(exec_time)}),
+        cron_expr=cron_expr or None,
     )
-    return Either.ok(rv)
+
+
+def experiment2runnable(experiment_id: ExperimentDefinitionId, exec_time: dt.datetime) -> Either[RunnableExperiment, str]:  # type: ignore[invalid-argument]
+    """Convert an ExperimentDefinition into a RunnableExperiment for the given execution time.
+
+    Loads the linked Blueprint and builds a CompilerRuntimeContext for the run.
+    """
+    exp = experiment_db.get_experiment_definition(experiment_id)
+    if exp is None:
+        return Either.error(f"ExperimentDefinition {experiment_id!r} not found")
+
+    job_def = blueprint_db.get_blueprint(exp.blueprint_id, exp.blueprint_version)
+    if job_def is None:
+        return Either.error(f"Blueprint {exp.blueprint_id!r} v{exp.blueprint_version} not found")
+
+    return Either.ok(records2runnable(exp, job_def, exec_time))
@@ -86,7 +86,7 @@ async def create_schedule(
 
     job_def = cast(
         blueprint_db.BlueprintRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "blueprint.get",
             partial(blueprint_db.get_blueprint, blueprint_id, blueprint_version),
         ),
@@ -141,7 +141,7 @@ async def get_schedule(
     results = list(
         cast(
             Iterable[experiment_db.ExperimentLatest],
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "experiment.definition.list",
                 partial(
                     experiment_db.list_experiment_definitions,
@@ -164,16 +164,17 @@ async def list_schedules(
 ) -> tuple[list[experiment_db.ExperimentLatest], int, int]:
     """Return (schedules, total, total_pages) for cron-schedule experiments visible to the actor.
 
-    Raises ValueError if page is out of range.
+    Raises ValueError if page is out of range or the cursor is malformed.
     """
+    after = pagination.keyset()
     total = cast(
         int,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "experiment.definition.count",
             partial(experiment_db.count_experiment_definitions, auth_context=auth_context, experiment_type="cron_schedule"),
         ),
     )
-    start = pagination.start()
+    start = pagination.start() if after is None else 0
 
     if start >= total and total > 0:
         raise ValueError("Page number out of range.")
@@ -181,7 +182,7 @@ async def list_schedules(
     experiments = list(
         cast(
             Iterable[experiment_db.ExperimentLatest],
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "experiment.definition.list",
                 partial(
                     experiment_db.list_experiment_definitions,
@@ -189,6 +190,7 @@ async def list_schedules(
                     experiment_type="cron_schedule",
                     offset=start,
                     limit=pagination.page_size,
+                    after=after,
                 ),
             ),
         )
@@ -217,7 +219,7 @@ async def update_schedule(
 
         current = cast(
             experiment_db.ExperimentDefinitionRecord | None,
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "experiment.definition.get",
                 partial(experiment_db.get_experiment_definition, experiment_id),
             ),
@@ -281,7 +283,7 @@ async def update_schedule(
     updated = list(
         cast(
             Iterable[experiment_db.ExperimentLatest],
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "experiment.definition.list",
                 partial(
                     experiment_db.list_experiment_definitions, auth_context=auth_context, experiment_definition_id=experiment_id, limit=1
@@ -320,7 +322,7 @@ async def get_next_run(auth_context: AuthContext, experiment_id: ExperimentDefin
     """
     exp_def = cast(
         experiment_db.ExperimentDefinitionRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "experiment.definition.get",
             partial(experiment_db.get_experiment_definition, experiment_id),
         ),
@@ -329,7 +331,7 @@ async def get_next_run(auth_context: AuthContext, experiment_id: ExperimentDefin
         raise ExperimentNotFound(f"Schedule {experiment_id} not found")
     next_entry = cast(
         scheduling_db.ExperimentNextRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "experiment.next.get",
             partial(scheduling_db.get_experiment_next, experiment_id),
         ),
@@ -347,12 +349,13 @@ async def get_schedule_runs(
     """Return (executions, total, total_pages) for runs linked to a cron schedule experiment.
 
     Raises ExperimentNotFound if the schedule does not exist.
-    Raises ValueError if page is out of range.
+    Raises ValueError if page is out of range or the cursor is malformed.
     Will return empty if the user is not authenticated to see the resource.
     """
+    after = pagination.keyset()
     exp_def = cast(
         experiment_db.ExperimentDefinitionRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "experiment.definition.get",
             partial(experiment_db.get_experiment_definition, experiment_id),
         ),
@@ -362,21 +365,28 @@ async def get_schedule_runs(
 
     total = cast(
         int,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "run.count-by-experiment",
             partial(run_db.count_runs_by_experiment, experiment_id, auth_context=auth_context),
         ),
     )
-    start = pagination.start()
+    start = pagination.start() if after is None else 0
 
     if start >= total and total > 0:
         raise ValueError("Page number out of range.")
 
     executions = cast(
         Iterable[RunRecord],
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "run.list-by-experiment",
-            partial(run_db.list_runs_by_experiment, experiment_id, auth_context=auth_context, offset=start, limit=pagination.page_size),
+            partial(
+                run_db.list_runs_by_experiment,
+                experiment_id,
+                auth_context=auth_context,
+                offset=start,
+                limit=pagination.page_size,
+                after=after,
+            ),
         ),
     )
     return executions, total, pagination.total_pages(total)
@@ -9,7 +9,8 @@
 
 """
 Manages the Gateway domain -- process lifecycle and connection URL used by
-other domains to execute and inspect workflow jobs.
+other domains to execute and inspect workflow jobs, and the non-blocking client
+(`client.py`) for talking to the gateway from the async loop.
 
 Depends on utility config and Cascade runtime bindings.
 Depended on by Run domain and gateway/status routes.
@@ -0,0 +1,170 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Non-blocking request/response client for the cascade gateway, for use from the async loop.
+
+Wire-compatible with ``cascade.gateway.client.request_response``, which remains the client of
+choice for synchronous code running in pools or threads -- via ``request_response_sync``, for its
+latency to be observed the same. Connected sockets are kept in a small
+pool and reused across requests. A socket whose request did not complete -- due to a timeout,
+a cancellation of the awaiting task or any other failure -- is discarded rather than returned
+to the pool, because a REQ socket cannot be reused before it receives the pending response.
+"""
+
+import logging
+import threading
+import time
+from typing import cast
+
+import orjson
+import zmq
+import zmq.asyncio
+from cascade.gateway import api
+from cascade.gateway.client import request_response as cascade_request_response
+from cascade.low.exceptions import CascadeInfrastructureError
+
+from forecastbox.domain.gateway.exceptions import GatewayRequestFailed, GatewayTimeout
+from forecastbox.utility.config import config
+from forecastbox.utility.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class _SocketPool:
+    """Idle connected sockets for the gateway url most recently used.
+
+    The pool holds sockets for a single url only -- when the gateway gets relaunched under a
+    different url, the sockets for the old one are closed on the next acquire.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._context: zmq.asyncio.Context | None = None
+        self._url: str | None = None
+        self._idle: list[zmq.asyncio.Socket] = []
+
+    def acquire(self, url: str) -> zmq.asyncio.Socket:
+        with self._lock:
+            if url != self._url:
+                self._close_idle()
+                self._url = url
+            if self._idle:
+                return self._idle.pop()
+            if self._context is None:
+                self._context = zmq.asyncio.Context()
+            socket = self._context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(url)
+        return socket
+
+    def release(self, url: str, socket: zmq.asyncio.Socket, reusable: bool) -> None:
+        with self._lock:
+            if reusable and url == self._url and len(self._idle) < config.cascade.client.max_idle_sockets:
+                self._idle.append(socket)
+                return
+        socket.close(linger=0)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._close_idle()
+            self._url = None
+
+    def _close_idle(self) -> None:
+        for socket in self._idle:
+            socket.close(linger=0)
+        self._idle = []
+
+
+_pool = _SocketPool()
+_latency = Histogram("fiab_gateway_request_seconds", "Latency of requests to the cascade gateway", ("request", "outcome"))
+
+
+def _serialize_request(m: api.CascadeGatewayAPI) -> bytes:
+    d = m.model_dump(mode="json")
+    clazz = type(m).__name__
+    if "clazz" in d or not clazz.endswith("Request"):
+        raise GatewayRequestFailed(f"not a valid gateway request: {clazz}")
+    d["clazz"] = clazz
+    return orjson.dumps(d)
+
+
+def _parse_response(m: api.CascadeGatewayAPI, raw: bytes) -> api.CascadeGatewayAPI:
+    try:
+        rd = orjson.loads(raw)
+        clazz = rd.pop("clazz")
+    except Exception as e:
+        raise GatewayRequestFailed(f"failed to parse gateway response: {raw[:32]!r}") from e
+    expected = type(m).__name__.removesuffix("Request") + "Response"
+    if clazz != expected or not hasattr(api, clazz):
+        raise GatewayRequestFailed(f"unexpected gateway response {clazz!r} to {type(m).__name__}")
+    try:
+        return cast(api.CascadeGatewayAPI, getattr(api, clazz)(**rd))
+    except Exception as e:
+        raise GatewayRequestFailed(f"failed to parse gateway response {clazz!r}") from e
+
+
+async def request_response(m: api.CascadeGatewayAPI, url: str, timeout_ms: int | None = None) -> api.CascadeGatewayAPI:
+    """Send a Request message to the gateway at ``url`` and await the corresponding Response message.
+
+    Raises ``GatewayTimeout`` if no response arrives within ``timeout_ms`` (by default as configured in
+    ``config.cascade.client``), and ``GatewayRequestFailed`` on any other communication failure. Cancelling
+    the awaiting task abandons the request.
+    """
+    timeout = timeout_ms if timeout_ms is not None else config.cascade.client.timeout_ms
+    payload = _serialize_request(m)
+    socket = _pool.acquire(url)
+    completed = False
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        await socket.send(payload)
+        if await socket.poll(timeout) == 0:  # NOTE polls for POLLIN by default
+            outcome = "timeout"
+            raise GatewayTimeout(f"gateway at {url} did not respond to {type(m).__name__} within {timeout}ms")
+        raw = await socket.recv()
+        completed = True
+        outcome = "ok"
+    except GatewayRequestFailed:
+        raise
+    except zmq.ZMQError as e:
+        logger.warning(f"failed to communicate with gateway at {url}: {repr(e)}")
+        raise GatewayRequestFailed(f"failed to communicate with gateway at {url}") from e
+    finally:
+        _latency.observe(time.perf_counter() - start, request=type(m).__name__, outcome=outcome)
+        _pool.release(url, socket, completed)
+    return _parse_response(m, raw)
+
+
+def reset_pool() -> None:
+    """Close all idle sockets, eg on gateway shutdown."""
+    _pool.reset()
+
+
+def request_response_sync(m: api.CascadeGatewayAPI, url: str, timeout_ms: int | None = None) -> api.CascadeGatewayAPI:
+    """Blocking variant of ``request_response`` for pools and threads, neither pooling sockets nor translating errors.
+
+    Raises whatever ``cascade.gateway.client.request_response`` raises.
+    """
+    timeout = timeout_ms if timeout_ms is not None else config.cascade.client.timeout_ms
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = cascade_request_response(m, url, timeout)
+        outcome = "ok"
+        return response
+    except CascadeInfrastructureError as e:
+        if isinstance(e.parent, TimeoutError):
+            outcome = "timeout"
+        raise
+    finally:
+        _latency.observe(time.perf_counter() - start, request=type(m).__name__, outcome=outcome)
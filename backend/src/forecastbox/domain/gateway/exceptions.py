@@ -32,3 +32,11 @@ class GatewayExited(GatewayError):
     def __init__(self, exitcode: int) -> None:
         self.exitcode = exitcode
         super().__init__(f"Gateway exited with code {exitcode}")
+
+
+class GatewayRequestFailed(GatewayError):
+    """Raised when a request to the gateway could not be completed or its response not understood."""
+
+
+class GatewayTimeout(GatewayRequestFailed, TimeoutError):
+    """Raised when the gateway does not respond to a request in time."""
@@ -24,6 +24,7 @@ from cascade.gateway import api, client
 from cascade.gateway.server import serve
 from cascade.low.func import Either, assert_never
 
+from forecastbox.domain.gateway import client as async_client
 from forecastbox.domain.gateway.exceptions import (
     GatewayAlreadyRunning,
     GatewayExited,
@@ -260,6 +261,7 @@ def stop_gateway() -> None:
 
 async def shutdown_processes() -> None:
     """Terminate all running gateway processes on app shutdown."""
+    async_client.reset_pool()
     gateway_connection = GatewayConnectionManager.gateway_connection
     logger.debug(f"initiating graceful gateway shutdown of {gateway_connection}")
     if gateway_connection is None:
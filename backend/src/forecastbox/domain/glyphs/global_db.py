@@ -21,7 +21,7 @@ import forecastbox.schemata.jobs as _jobs_module
 from forecastbox.domain.glyphs.types import GlobalGlyphId
 from forecastbox.schemata.glyphs import GlobalGlyph
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.db import dbRetry, querySingle
+from forecastbox.utility.db import dbRetry, dbRetryRead, querySingle
 from forecastbox.utility.time import current_time
 
 
@@ -165,7 +165,7 @@ def list_global_glyphs(
             result = session.execute(query)
             return [_to_global_glyph_record(r[0]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_global_glyphs(auth_context: AuthContext, key: str | None = None) -> int:
@@ -182,7 +182,7 @@ def count_global_glyphs(auth_context: AuthContext, key: str | None = None) -> in
             result = session.execute(query)
             return result.scalar() or 0
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def get_glyphs_for_resolution(auth_context: AuthContext) -> GlyphResolutionBuckets:
@@ -222,7 +222,7 @@ def get_glyphs_for_resolution(auth_context: AuthContext) -> GlyphResolutionBucke
                 public_nonoverridable=pub_nonoverridable,
             )
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def delete_global_glyph(global_glyph_id: GlobalGlyphId, auth_context: AuthContext) -> GlobalGlyphRecord | None:
@@ -14,23 +14,31 @@ Variables whose values match the canonical datetime format (``YYYY-MM-DD HH:MM:S
 variants) are auto-coerced to :class:`datetime` objects so that date filters and arithmetic
 work directly. The auto-coercion is bound to fiab-core.types.DatetimeType, as they are
 inherently coupled.
+
+Compiled templates and extracted glyph names are kept in bounded LRU caches keyed by the raw
+expression, as the same expressions get parsed repeatedly during validation and submission. Their
+sizes and hit ratios are exposed as metrics.
 """
 
 import logging
 import re
+import threading
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Literal
+from typing import Any, Generic, Literal, TypeVar
 
 from cascade.low.func import Either
 from fiab_core.types import DatetimeType, WrongType
-from jinja2 import Environment, StrictUndefined, TemplateSyntaxError, nodes
+from jinja2 import Environment, StrictUndefined, Template, TemplateSyntaxError, nodes
 from jinja2.sandbox import SandboxedEnvironment
 
+from forecastbox.utility.metrics import Gauge
 from forecastbox.utility.time import value_dt2str
 
 logger = logging.getLogger(__name__)
+V = TypeVar("V")
 _dt_instance = DatetimeType()
 
 
@@ -164,12 +172,81 @@ def _make_env() -> SandboxedEnvironment:
 
 
 _ENV = _make_env()
+# NOTE plain environment for parsing only, as the glyph extraction normalises to the default delimiters
+_parse_env = Environment()
+_dollar_expression = re.compile(r"\$\{([^}]+)\}")
 
 # Names that are part of the jinja2 environment (filters + globals) rather than user variables.
 _GLOBALS = frozenset(_ENV.globals)
 _FILTER_NAMES: frozenset[str] = frozenset(_ENV.filters) | _GLOBALS
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class ParseCacheStats:
+    size: int
+    hits: int
+    misses: int
+
+
+class _ParseCache(Generic[V]):
+    """Thread-safe LRU of values derived from a raw expression, with hit and miss counters."""
+
+    def __init__(self, max_size: int) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, V] = OrderedDict()
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_compute(self, raw: str, compute: Callable[[str], V]) -> V:
+        with self._lock:
+            if raw in self._entries:
+                self._entries.move_to_end(raw)
+                self._hits += 1
+                return self._entries[raw]
+            self._misses += 1
+        # NOTE computed outside of the lock, a concurrent miss on the same expression just computes twice
+        value = compute(raw)
+        with self._lock:
+            self._entries[raw] = value
+            self._entries.move_to_end(raw)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            return ParseCacheStats(size=len(self._entries), hits=self._hits, misses=self._misses)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+parse_cache_size = 4096
+_template_cache: _ParseCache[Template] = _ParseCache(parse_cache_size)
+_glyph_names_cache: _ParseCache[tuple[frozenset[str], str | None]] = _ParseCache(parse_cache_size)
+
+
+def get_parse_cache_stats() -> dict[str, ParseCacheStats]:
+    """Return the statistics of the compiled template and glyph name caches."""
+    return {"templates": _template_cache.stats(), "glyph_names": _glyph_names_cache.stats()}
+
+
+def _parse_cache_samples() -> dict[tuple[str, ...], float]:
+    samples: dict[tuple[str, ...], float] = {}
+    for cache, stats in get_parse_cache_stats().items():
+        samples[(cache, "entries")] = stats.size
+        samples[(cache, "hits")] = stats.hits
+        samples[(cache, "misses")] = stats.misses
+    return samples
+
+
+Gauge("fiab_glyph_parse_cache", "Entries, hits and misses of the glyph expression parse caches", _parse_cache_samples, ("cache", "stat"))
+
+
 def get_custom_functions() -> list[CustomFunction]:
     """Return all custom functions registered in the interpolation environment."""
     return list(CUSTOM_FUNCTIONS)
@@ -191,7 +268,7 @@ def render_expression(raw: str, variables: dict[str, str]) -> str:
     Raises :class:`jinja2.UndefinedError` if any referenced variable is absent from
     ``variables``, and :class:`jinja2.TemplateSyntaxError` if ``raw`` is malformed.
     """
-    template = _ENV.from_string(raw)
+    template = _template_cache.get_or_compute(raw, _ENV.from_string)
     ctx: dict[str, object] = {**_coerce_variables(variables)}
     return template.render(ctx)
 
@@ -210,13 +287,19 @@ def extract_glyph_names(raw: str) -> Either[set[str], str]:  # type: ignore[inva
     contains a syntax error.  Filter names, globals (``timedelta``, ``datetime``), and
     built-in Jinja2 names are excluded from the returned set.
     """
+    glyphs, error = _glyph_names_cache.get_or_compute(raw, _parse_glyph_names)
+    if error is not None:
+        return Either.error(error)
+    return Either.ok(set(glyphs))
+
+
+def _parse_glyph_names(raw: str) -> tuple[frozenset[str], str | None]:
     # Normalise ${expr} → {{ expr }} so we can parse with a standard-delimiter environment.
-    normalised = re.sub(r"\$\{([^}]+)\}", r"{{ \1 }}", raw)
-    parse_env = Environment()
+    normalised = _dollar_expression.sub(r"{{ \1 }}", raw)
     try:
-        ast = parse_env.parse(normalised)
+        ast = _parse_env.parse(normalised)
     except TemplateSyntaxError as exc:
-        return Either.error(str(exc))
+        return frozenset(), str(exc)
 
     glyphs: set[str] = set()
     _collect_glyph_names(ast, glyphs)
@@ -224,4 +307,4 @@ def extract_glyph_names(raw: str) -> Either[set[str], str]:  # type: ignore[inva
     # an expression like ${myGlyph | aFilter(var1, var2)} will not return aFilter
     # as a node anyway due to jinja ast typing. And in case user malforms by providing
     # ${aFilter}, which oddly is valid in jinja, we *do* want to return it
-    return Either.ok(glyphs)
+    return frozenset(glyphs), None
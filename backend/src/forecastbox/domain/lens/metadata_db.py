@@ -24,7 +24,7 @@ from sqlalchemy import Select, delete, func, or_, select, update
 import forecastbox.schemata.jobs as _jobs_module
 from forecastbox.schemata.lens import LensMetadata
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.db import dbRetry
+from forecastbox.utility.db import dbRetry, dbRetryRead
 from forecastbox.utility.time import current_time
 
 
@@ -158,7 +158,7 @@ def list_lens_metadata(
             result = session.execute(query)
             return [_to_record(r[0]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_lens_metadata(lens_id: str, auth_context: AuthContext, lens_metadata_id: str | None = None) -> int:
@@ -172,7 +172,7 @@ def count_lens_metadata(lens_id: str, auth_context: AuthContext, lens_metadata_i
             result = session.execute(query)
             return result.scalar() or 0
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def delete_lens_metadata(lens_id: str, lens_metadata_id: str, auth_context: AuthContext) -> LensMetadataRecord | None:
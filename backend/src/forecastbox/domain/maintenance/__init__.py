@@ -0,0 +1,16 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""
+Periodic maintenance of the jobs database -- hard-deletes what was soft-deleted or has expired,
+and returns the freed space to the filesystem.
+
+Depends on the persistence of Run, Blueprint and Experiment domains.
+Used only by the entrypoint, which runs it as a managed thread.
+"""
@@ -0,0 +1,172 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""The database garbage collector -- a managed thread running a collection pass periodically.
+
+Every pass consists of steps, each of which works in batches of ``batch_size`` rows, one
+transaction per batch, so that the jobs write lock is never held for long. Steps are run until
+they have nothing more to do, the stop event is checked between batches. Which steps run is
+driven by ``config.backend.garbage_collector``, re-read at the start of every pass.
+"""
+
+import datetime as dt
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import forecastbox.schemata.jobs as _jobs_module
+from forecastbox.domain.blueprint import db as blueprint_db
+from forecastbox.domain.experiment.scheduling import db as scheduling_db
+from forecastbox.domain.run import db as run_db
+from forecastbox.domain.run import output_cache
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.concurrency.manager import StatusModel
+from forecastbox.utility.config import GarbageCollectorSettings, config
+from forecastbox.utility.db import incrementalVacuum
+from forecastbox.utility.time import current_time
+
+logger = logging.getLogger(__name__)
+
+
+class GarbageCollectorStatus(StatusModel):
+    running: bool
+    passes: int
+    runs_purged: int
+    attempts_purged: int
+    outputs_purged: int
+    blueprints_purged: int
+    experiment_next_purged: int
+    pages_vacuumed: int
+    last_pass_started_at: dt.datetime | None
+    last_pass_duration_seconds: float | None
+    last_error: str | None
+
+    def is_ready(self) -> bool:
+        return self.running
+
+
+class GarbageCollector:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running = False
+        self._counters = dict.fromkeys(
+            ("passes", "runs_purged", "attempts_purged", "outputs_purged", "blueprints_purged", "experiment_next_purged", "pages_vacuumed"),
+            0,
+        )
+        self._last_pass_started_at: dt.datetime | None = None
+        self._last_pass_duration_seconds: float | None = None
+        self._last_error: str | None = None
+
+    def _count(self, counter: str, amount: int) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _batches(self, step: Callable[[int], int], settings: GarbageCollectorSettings, stop_event: threading.Event) -> int:
+        """Run the step until it affects less than a full batch, returning the total affected."""
+        total = 0
+        while not stop_event.is_set():
+            affected = step(settings.batch_size)
+            total += affected
+            if affected < settings.batch_size:
+                break
+            stop_event.wait(settings.batch_pause_seconds)
+        return total
+
+    def _purge_runs(self, purge: Callable[[int], list[RunId]]) -> Callable[[int], int]:
+        def step(limit: int) -> int:
+            run_ids = purge(limit)
+            for run_id in run_ids:
+                output_cache.drop_run(run_id)
+            self._count("runs_purged", len(run_ids))
+            return len(run_ids)
+
+        return step
+
+    def _purge_attempts(self, max_attempts: int) -> Callable[[int], int]:
+        def step(limit: int) -> int:
+            attempts = run_db.purge_excess_attempts(max_attempts, limit)
+            for run_id, attempt_count in attempts:
+                output_cache.drop_attempt(run_id, attempt_count)
+            self._count("attempts_purged", len(attempts))
+            return len(attempts)
+
+        return step
+
+    def _purge_outputs(self, updated_before: dt.datetime, settings: GarbageCollectorSettings, stop_event: threading.Event) -> None:
+        after: tuple[RunId, int] | None = None
+        while not stop_event.is_set():
+            purged, after = run_db.purge_stored_outputs(updated_before, settings.output_purge_min_kb * 1024, settings.batch_size, after)
+            self._count("outputs_purged", purged)
+            if after is None:
+                break
+            stop_event.wait(settings.batch_pause_seconds)
+
+    def collect(self, stop_event: threading.Event) -> None:
+        """Run a single collection pass."""
+        settings = config.backend.garbage_collector
+        now = current_time("retention")
+        start = time.perf_counter()
+        with self._lock:
+            self._last_pass_started_at = now
+        try:
+            if settings.purge_deleted:
+                self._batches(self._purge_runs(run_db.purge_deleted_runs), settings, stop_event)
+            if settings.run_max_age_days > 0:
+                cutoff = now - dt.timedelta(days=settings.run_max_age_days)
+                self._batches(self._purge_runs(lambda limit: run_db.purge_expired_runs(cutoff, limit)), settings, stop_event)
+            if settings.run_max_attempts > 0:
+                self._batches(self._purge_attempts(settings.run_max_attempts), settings, stop_event)
+            if settings.output_purge_after_days > 0:
+                self._purge_outputs(now - dt.timedelta(days=settings.output_purge_after_days), settings, stop_event)
+            if settings.purge_deleted:
+                self._count("blueprints_purged", self._batches(blueprint_db.purge_deleted_blueprints, settings, stop_event))
+            self._count("experiment_next_purged", self._batches(scheduling_db.purge_stale_experiment_next, settings, stop_event))
+            if settings.vacuum_pages > 0 and not stop_event.is_set():
+                self._count("pages_vacuumed", incrementalVacuum(settings.vacuum_pages, _jobs_module.sync_session_maker))
+            error = None
+        except Exception as e:
+            logger.exception(f"garbage collection pass failed: {repr(e)}")
+            error = repr(e)
+        with self._lock:
+            self._counters["passes"] += 1
+            self._last_pass_duration_seconds = time.perf_counter() - start
+            self._last_error = error
+
+    def entrypoint(self, stop_event: threading.Event) -> None:
+        with self._lock:
+            self._running = True
+        try:
+            # NOTE the first pass waits for the interval too, to keep clear of the startup
+            while not stop_event.wait(config.backend.garbage_collector.interval_seconds):
+                self.collect(stop_event)
+        finally:
+            with self._lock:
+                self._running = False
+
+    def status(self) -> GarbageCollectorStatus:
+        with self._lock:
+            return GarbageCollectorStatus(
+                running=self._running,
+                last_pass_started_at=self._last_pass_started_at,
+                last_pass_duration_seconds=self._last_pass_duration_seconds,
+                last_error=self._last_error,
+                **self._counters,
+            )
+
+
+_collector = GarbageCollector()
+
+
+def garbage_collector_entrypoint(stop_event: threading.Event) -> None:
+    _collector.entrypoint(stop_event)
+
+
+def status() -> GarbageCollectorStatus:
+    return _collector.status()
@@ -12,7 +12,8 @@
 
 Matches on the `ClientNotificationSource` protocol rather than any concrete event type or name --
 any domain's event that implements `as_client_notification` gets converted and forwarded to the
-websocket broadcaster, regardless of which domain emitted it.
+websocket broadcaster, regardless of which domain emitted it. Ordered, so that clients receive
+the notifications in the order of the events.
 """
 
 from forecastbox.domain.notification.models import ClientNotificationSource
@@ -33,5 +34,6 @@ dispatchers = (
         handler_type=ClientNotificationSource,
         pool_name=ConcurrentPools.General,
         handler=_handle_client_notification_source,
+        ordered=True,
     ),
 )
@@ -13,6 +13,8 @@ protocol that other domains' events implement to produce one.
 
 from typing import Any, Protocol, runtime_checkable
 
+from pydantic import Field
+
 from forecastbox.utility.pydantic import FiabBaseModel
 
 
@@ -25,6 +27,13 @@ class ClientNotification(FiabBaseModel):
     context: dict[str, Any]  # arbitrary key-value, with schema specific to the sourceDomainEvent
     detailRoute: str | None  # optionally a direct route that the client could visit for more details
     refreshRoutes: list[str]  # possibly empty list of routes that the client should refresh to update its internal state
+    topics: list[str] = Field(default_factory=list)  # subjects of the notification, see `topic`; clients may subscribe to some only
+    coalesceKey: str | None = None  # notifications with the same key supersede each other, for high-frequency ones such as progress
+
+
+def topic(kind: str, identifier: str) -> str:
+    """Topic of a single subject, eg `topic("run", run_id)` or `topic("experiment", experiment_id)`."""
+    return f"{kind}:{identifier}"
 
 
 @runtime_checkable
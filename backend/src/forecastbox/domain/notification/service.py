@@ -10,6 +10,13 @@
 """Bridges the synchronous event dispatcher to the async websocket connections that deliver
 ClientNotification messages to clients.
 
+Every client has its own bounded outbound queue, drained by its own sender task -- publishing only
+appends to the queues, thus its cost does not depend on how fast the clients are. A client falling
+behind loses its oldest queued notifications, and one not accepting a notification within the send
+timeout is disconnected. Notifications with a ``coalesceKey`` are not queued but kept per key, only
+the latest one, and delivered in batches once per coalescing interval. A client which subscribed to
+some topics receives only the notifications about them, plus those without any topic.
+
 Concurrency notes for `NotificationBroadcaster`:
 - `_loop` is written exactly once, from `entrypoint.app`'s lifespan (`init_broadcaster`), on the
   event loop thread, before the app starts serving requests. It is later read from arbitrary
@@ -17,48 +24,119 @@ Concurrency notes for `NotificationBroadcaster`:
   atomic under CPython's GIL -- there is no risk of observing a torn/half-initialized value -- so no
   lock is needed here. `publish` still captures it into a local variable once, to avoid any
   conceptual check-then-use race.
-- `asyncio.run_coroutine_threadsafe` (used by `publish`) is documented to be safe to call
-  concurrently from multiple threads, so no additional lock is needed to serialize `publish` calls
-  either.
-- `_clients` is a pyrsistent `PSet`, mutated only on the event loop thread: `register`/`unregister`
-  run inside the websocket route coroutine, and `_broadcast` runs as a coroutine scheduled via
-  `run_coroutine_threadsafe` onto that same loop. Because asyncio is cooperative, none of these can
-  interleave except at `await` points, so plain reference swaps (`NotificationBroadcaster._clients =
-  ...`) are sufficient -- no lock is needed. `_broadcast` snapshots `_clients` once before its first
-  `await`, and folds any disconnected clients back into the *current* `_clients` (not the stale
-  snapshot) with a single swap at the end, so a client registered mid-broadcast is never lost even
-  though it may miss that one broadcast.
+- `loop.call_soon_threadsafe` (used by `publish`) is documented to be safe to call concurrently from
+  multiple threads, so no additional lock is needed to serialize `publish` calls either.
+- `_clients` is a pyrsistent `PMap`, and it as well as every `_ClientChannel` is mutated only on the
+  event loop thread: `register`/`unregister`/`subscribe` run inside the websocket route coroutine,
+  `_fan_out` is scheduled via `call_soon_threadsafe` onto that same loop, and the sender tasks run
+  there too. Because asyncio is cooperative, none of these can interleave except at `await` points,
+  and `_fan_out` has none -- so plain reference swaps and in-place queue mutations are sufficient.
+- `status` may be called from any thread, and only reads sizes and counters -- possibly slightly
+  stale, but never inconsistent.
 - All of the above relies on CPython's GIL providing atomic reference reads/writes and a strict
   single-bytecode-at-a-time execution order. This would need revisiting under a no-GIL build.
 """
 
 import asyncio
+import contextlib
 import logging
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from fastapi import WebSocket
-from pyrsistent import pset
-from pyrsistent.typing import PSet
+from pyrsistent import pmap
+from pyrsistent.typing import PMap
 
 from forecastbox.domain.notification.models import ClientNotification
+from forecastbox.utility.config import config
 
 logger = logging.getLogger(__name__)
 
-PUBLISH_TIMEOUT_SECONDS = 5.0
-
 
 class NotificationBroadcasterNotInitialized(Exception):
     """Raised when `publish` is called before `init_broadcaster` has run."""
 
 
-class NotificationPublishTimedOut(Exception):
-    """Raised when the notifications to the clients failed to be sent in due time"""
+@dataclass(frozen=True, eq=True, slots=True)
+class NotificationStatus:
+    clients: int
+    queued: int
+    dropped: int
+
+
+class _ClientChannel:
+    """Outbound side of a single websocket client."""
+
+    def __init__(self, websocket: WebSocket, topics: Iterable[str]) -> None:
+        self.websocket = websocket
+        self.topics: set[str] = set(topics)
+        self.queue: deque[str] = deque()
+        self.coalesced: dict[str, str] = {}
+        self.flush_at = 0.0
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.sender: asyncio.Task[None] | None = None
+
+    def wants(self, notification: ClientNotification) -> bool:
+        return not self.topics or not notification.topics or not self.topics.isdisjoint(notification.topics)
+
+    def offer(self, notification: ClientNotification, payload: str) -> None:
+        limit = config.backend.notification.client_queue_size
+        if notification.coalesceKey is None:
+            if len(self.queue) >= limit:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(payload)
+            self.wakeup.set()
+            return
+        if not self.coalesced:
+            # NOTE the sender recomputes its wait, as it may have been waiting without a deadline
+            self.flush_at = max(self.flush_at, asyncio.get_running_loop().time())
+            self.wakeup.set()
+        self.coalesced.pop(notification.coalesceKey, None)
+        self.coalesced[notification.coalesceKey] = payload
+        if len(self.coalesced) > limit:
+            del self.coalesced[next(iter(self.coalesced))]
+            self.dropped += 1
+
+    async def _send(self, payload: str) -> None:
+        await asyncio.wait_for(self.websocket.send_text(payload), timeout=config.backend.notification.send_timeout_seconds)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = config.backend.notification.coalesce_interval_seconds
+        try:
+            while True:
+                timeout = max(self.flush_at - loop.time(), 0) if self.coalesced else None
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+                except TimeoutError:
+                    pass
+                self.wakeup.clear()
+                while self.queue:
+                    await self._send(self.queue.popleft())
+                if self.coalesced and loop.time() >= self.flush_at:
+                    batch, self.coalesced = self.coalesced, {}
+                    self.flush_at = loop.time() + interval
+                    for payload in batch.values():
+                        await self._send(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"dropping notification client after failed send: {repr(e)}")
+            unregister_client(self.websocket)
+            with contextlib.suppress(Exception):
+                await self.websocket.close()
 
 
 class NotificationBroadcaster:
     """Process-local singleton state. See module docstring for the concurrency reasoning."""
 
     _loop: asyncio.AbstractEventLoop | None = None
-    _clients: PSet[WebSocket] = pset()
+    _clients: PMap[WebSocket, _ClientChannel] = pmap()
+    _dropped: int = 0
+    """Dropped notifications of clients already unregistered"""
 
 
 def init_broadcaster(loop: asyncio.AbstractEventLoop) -> None:
@@ -66,41 +144,63 @@ def init_broadcaster(loop: asyncio.AbstractEventLoop) -> None:
     NotificationBroadcaster._loop = loop
 
 
-def register_client(websocket: WebSocket) -> None:
-    """Must be called from the event loop thread (the websocket route handler)."""
-    NotificationBroadcaster._clients = NotificationBroadcaster._clients.add(websocket)
+def register_client(websocket: WebSocket, topics: Iterable[str] = ()) -> None:
+    """Must be called from the event loop thread (the websocket route handler).
+
+    Starts the client's sender task. With no ``topics``, the client receives all notifications.
+    """
+    channel = _ClientChannel(websocket, topics)
+    channel.sender = asyncio.get_running_loop().create_task(channel.run())
+    NotificationBroadcaster._clients = NotificationBroadcaster._clients.set(websocket, channel)
 
 
 def unregister_client(websocket: WebSocket) -> None:
     """Must be called from the event loop thread (the websocket route handler)."""
-    NotificationBroadcaster._clients = NotificationBroadcaster._clients.discard(websocket)
+    channel = NotificationBroadcaster._clients.get(websocket)
+    if channel is None:
+        return
+    NotificationBroadcaster._clients = NotificationBroadcaster._clients.remove(websocket)
+    NotificationBroadcaster._dropped += channel.dropped
+    if channel.sender is not None and channel.sender is not asyncio.current_task():
+        channel.sender.cancel()
 
 
-async def _broadcast(notification: ClientNotification) -> None:
-    clients = NotificationBroadcaster._clients
-    payload = notification.model_dump_json()
-    dead: list[WebSocket] = []
-    for client in clients:
-        try:
-            await client.send_text(payload)
-        except Exception:
-            dead.append(client)
-    if dead:
-        NotificationBroadcaster._clients = NotificationBroadcaster._clients.difference(dead)
+def subscribe(websocket: WebSocket, topics: Iterable[str]) -> None:
+    """Must be called from the event loop thread (the websocket route handler)."""
+    channel = NotificationBroadcaster._clients.get(websocket)
+    if channel is not None:
+        channel.topics.update(topics)
+
+
+def unsubscribe(websocket: WebSocket, topics: Iterable[str]) -> None:
+    """Must be called from the event loop thread (the websocket route handler)."""
+    channel = NotificationBroadcaster._clients.get(websocket)
+    if channel is not None:
+        channel.topics.difference_update(topics)
+
+
+def _fan_out(notification: ClientNotification, payload: str) -> None:
+    for channel in NotificationBroadcaster._clients.values():
+        if channel.wants(notification):
+            channel.offer(notification, payload)
 
 
 def publish(notification: ClientNotification) -> None:
     """Synchronous entrypoint, callable from any thread -- in particular, from a dispatcher handler
-    running on a General-pool worker thread. Blocks until the broadcast to all currently connected
-    clients has completed (or raises on failure/timeout), so that the dispatcher can record a
-    failure the same way it would for any other handler.
+    running on a General-pool worker thread. Returns once the notification is scheduled to be queued
+    for the clients, not waiting for any of them.
     """
     loop = NotificationBroadcaster._loop
     if loop is None:
         logger.error("NotificationBroadcaster.publish called before initialization -- dropping notification")
         raise NotificationBroadcasterNotInitialized("notification broadcaster event loop is not initialized")
-    future = asyncio.run_coroutine_threadsafe(_broadcast(notification), loop)
-    try:
-        future.result(timeout=PUBLISH_TIMEOUT_SECONDS)
-    except TimeoutError:
-        raise NotificationPublishTimedOut() from None
+    loop.call_soon_threadsafe(_fan_out, notification, notification.model_dump_json())
+
+
+def status() -> NotificationStatus:
+    channels = list(NotificationBroadcaster._clients.values())
+    return NotificationStatus(
+        clients=len(channels),
+        queued=sum(len(channel.queue) + len(channel.coalesced) for channel in channels),
+        dropped=NotificationBroadcaster._dropped + sum(channel.dropped for channel in channels),
+    )
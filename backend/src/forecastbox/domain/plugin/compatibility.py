@@ -99,6 +99,8 @@ check_environment_baseline()
 install_plugin_compatibly(pip_source, version, module_name)
     Install or update a plugin, freezing and preserving the rest of the environment. Assumes the
     environment is already known-good; does not run the baseline check itself.
+install_plugins_compatibly(plugins)
+    The same for several plugins at once, with a single resolution, attributing failures per plugin.
 get_compatible_versions(plugin_settings, available_versions)
     Filter an iterable of version strings to only compatible ones.
 """
@@ -106,7 +108,9 @@ get_compatible_versions(plugin_settings, available_versions)
 import importlib
 import logging
 import sys
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import TypeVar
 
 import git
 from cascade.low.func import Either
@@ -139,6 +143,8 @@ from forecastbox.utility.pth_activation import (
 
 logger = logging.getLogger(__name__)
 
+K = TypeVar("K")
+
 
 def get_fiabcore_version() -> Version:
     """Return the currently installed version of ``fiab-core`` as a ``Version`` object."""
@@ -251,35 +257,25 @@ def _resolve_target_distribution_name(pip_source: str, module_name: str, python:
     return next(iter(candidates))
 
 
-def install_plugin_compatibly(pip_source: str, version: Version | None, module_name: str) -> Either[dict[str, str], str]:  # type: ignore[type-arg]
-    """Install or update a plugin, freezing and preserving every other currently-installed
-    distribution (as an exact pin or as its existing editable/local source) so that ``uv`` cannot
-    upgrade or downgrade anything else while resolving the requested plugin requirement.
-
-    Returns ``Either.ok(versions)`` on success, where ``versions`` maps newly-installed package
-    names to their version strings (from the real install only, never from the dry run), or
-    ``Either.error(msg)`` on failure. Never raises -- see the module docstring for the full
-    algorithm and its limitations.
-    """
-    python = sys.executable
-    plugin_requirement_args = _plugin_requirement_args(pip_source, version)
+@dataclass(frozen=True, eq=True, slots=True)
+class _InstallFailure:
+    stage: str
+    message: str
 
-    try:
-        target_name = _resolve_target_distribution_name(pip_source, module_name, python)
-    except PackagesError as e:
-        msg = f"stage=identify: {e!r}"
-        logger.error(msg)
-        return Either.error(msg)
 
+def _install_preserving_environment(
+    python: str, plugin_requirement_args: list[str], target_names: Iterable[str]
+) -> Either[dict[str, str], _InstallFailure]:  # type: ignore[type-arg]
+    """Steps 2. to 9. of ``install_plugin_compatibly``, for any number of plugin requirements at once."""
     try:
         raw_lines = freeze_environment(python)
         snapshot = parse_frozen_environment(raw_lines, python)
     except PackagesError as e:
         msg = f"stage=freeze: {e!r}"
         logger.error(msg)
-        return Either.error(msg)
+        return Either.error(_InstallFailure("freeze", msg))
 
-    if target_name is not None:
+    for target_name in target_names:
         snapshot = exclude_distribution(snapshot, target_name)
 
     constraints_text = render_constraints(snapshot)
@@ -298,13 +294,13 @@ def install_plugin_compatibly(pip_source: str, version: Version | None, module_n
         if not dry_run.ok:
             msg = f"stage=dry-run: dry-run resolution failed for {plugin_requirement_args}: {dry_run.stderr or dry_run.stdout}"
             logger.error(msg)
-            return Either.error(msg)
+            return Either.error(_InstallFailure("dry-run", msg))
 
         real_install = run_pip_install(python, constraints_path, extra_requirement_args, plugin_requirement_args, dry_run=False)
         if not real_install.ok:
             msg = f"stage=install: installing {plugin_requirement_args} failed: {real_install.stderr or real_install.stdout}"
             logger.error(msg)
-            return Either.error(msg)
+            return Either.error(_InstallFailure("install", msg))
 
     installed_versions = parse_install_output(real_install.stderr)
 
@@ -323,6 +319,78 @@ def install_plugin_compatibly(pip_source: str, version: Version | None, module_n
             f"this is detection, not rollback -- the environment may be broken: {post_check.stderr or post_check.stdout}"
         )
         logger.error(msg)
-        return Either.error(msg)
+        return Either.error(_InstallFailure("post-check", msg))
 
     return Either.ok(installed_versions)
+
+
+def install_plugin_compatibly(pip_source: str, version: Version | None, module_name: str) -> Either[dict[str, str], str]:  # type: ignore[type-arg]
+    """Install or update a plugin, freezing and preserving every other currently-installed
+    distribution (as an exact pin or as its existing editable/local source) so that ``uv`` cannot
+    upgrade or downgrade anything else while resolving the requested plugin requirement.
+
+    Returns ``Either.ok(versions)`` on success, where ``versions`` maps newly-installed package
+    names to their version strings (from the real install only, never from the dry run), or
+    ``Either.error(msg)`` on failure. Never raises -- see the module docstring for the full
+    algorithm and its limitations.
+    """
+    python = sys.executable
+    plugin_requirement_args = _plugin_requirement_args(pip_source, version)
+
+    try:
+        target_name = _resolve_target_distribution_name(pip_source, module_name, python)
+    except PackagesError as e:
+        msg = f"stage=identify: {e!r}"
+        logger.error(msg)
+        return Either.error(msg)
+
+    result = _install_preserving_environment(python, plugin_requirement_args, [target_name] if target_name is not None else [])
+    if result.e:
+        return Either.error(result.e.message)
+    return Either.ok(result.t)
+
+
+def install_plugins_compatibly(plugins: Mapping[K, PluginSettings]) -> dict[K, Either[dict[str, str], str]]:  # type: ignore[type-arg]
+    """Install or update several plugins at their default versions in a single resolution, with
+    the same policy as ``install_plugin_compatibly`` -- all of them are excluded from the frozen
+    environment, and their requirements are resolved and installed by one ``uv`` invocation.
+
+    Returns the outcome per plugin. If the joint dry run fails, nothing has been installed yet,
+    and the plugins are installed one by one instead, to attribute the failure to those causing
+    it. A failure of the joint install itself, or of its post-check, is attributed to every plugin.
+    Never raises.
+    """
+    python = sys.executable
+    results: dict[K, Either[dict[str, str], str]] = {}  # type: ignore[type-arg]
+    requirement_args: dict[K, list[str]] = {}
+    target_names: list[str] = []
+    for key, settings in plugins.items():
+        try:
+            target_name = _resolve_target_distribution_name(settings.pip_source, settings.module_name, python)
+        except PackagesError as e:
+            msg = f"stage=identify: {e!r}"
+            logger.error(msg)
+            results[key] = Either.error(msg)
+            continue
+        if target_name is not None:
+            target_names.append(target_name)
+        requirement_args[key] = _plugin_requirement_args(settings.pip_source, None)
+
+    if len(requirement_args) <= 1:
+        for key in requirement_args:
+            results[key] = install_plugin_compatibly(plugins[key].pip_source, None, plugins[key].module_name)
+        return results
+
+    joint_args = [arg for args in requirement_args.values() for arg in args]
+    joint = _install_preserving_environment(python, joint_args, target_names)
+    if joint.t is not None:
+        for key in requirement_args:
+            results[key] = Either.ok(joint.t)
+    elif joint.e.stage in ("freeze", "dry-run"):
+        logger.warning(f"joint installation of {len(requirement_args)} plugins failed, installing them one by one")
+        for key in requirement_args:
+            results[key] = install_plugin_compatibly(plugins[key].pip_source, None, plugins[key].module_name)
+    else:
+        for key in requirement_args:
+            results[key] = Either.error(joint.e.message)
+    return results
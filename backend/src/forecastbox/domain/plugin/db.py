@@ -34,7 +34,7 @@ import forecastbox.schemata.jobs as _jobs_module
 from forecastbox.domain.plugin.errors import PluginErrors
 from forecastbox.domain.plugin.exceptions import PluginNotFound
 from forecastbox.schemata.plugin import PluginState
-from forecastbox.utility.db import dbRetry, querySingle
+from forecastbox.utility.db import dbRetry, dbRetryRead, querySingle
 from forecastbox.utility.time import current_time
 
 logger = logging.getLogger(__name__)
@@ -165,7 +165,7 @@ def get_all_plugin_states() -> list[PluginStateRecord]:
             result = session.execute(select(PluginState))
             return [_to_plugin_state_record(row[0]) for row in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def update_template_errors(*, plugin_id: str, template_errors: dict[str, str]) -> None:
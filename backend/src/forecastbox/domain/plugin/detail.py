@@ -183,7 +183,7 @@ async def build_plugin_listing() -> PluginListing:
         plugins_snapshot: dict[PluginCompositeId, Plugin] = dict(PluginManager.plugins)
         errors_snapshot: dict[PluginCompositeId, PluginErrors] = dict(PluginManager.errors)
 
-    db_states = await execution_manager.await_jobs_db("plugin.state.list", partial(get_all_plugin_states))
+    db_states = await execution_manager.await_jobs_db_read("plugin.state.list", partial(get_all_plugin_states))
 
     store_detail = get_plugins_detail()
 
@@ -11,7 +11,7 @@
 
 from dataclasses import dataclass
 
-from forecastbox.domain.notification.models import ClientNotification
+from forecastbox.domain.notification.models import ClientNotification, topic
 
 
 @dataclass(frozen=True, eq=True, slots=True)
@@ -49,6 +49,7 @@ class PluginInstalledEvent:
             sourceDomainName="plugin",
             sourceDomainEvent="pluginInstalled",
             context={"plugin_id": self.plugin_id},
+            topics=[topic("plugin", self.plugin_id)],
             detailRoute="api/v1/plugin/list",
             refreshRoutes=["api/v1/plugin/list"],
         )
@@ -67,6 +68,7 @@ class PluginUpdatedEvent:
             sourceDomainName="plugin",
             sourceDomainEvent="pluginUpdated",
             context={"plugin_id": self.plugin_id},
+            topics=[topic("plugin", self.plugin_id)],
             detailRoute="api/v1/plugin/list",
             refreshRoutes=["api/v1/plugin/list"],
         )
@@ -86,6 +88,7 @@ class PluginSettingsAppliedEvent:
             sourceDomainName="plugin",
             sourceDomainEvent="pluginSettingsApplied",
             context={"plugin_id": self.plugin_id},
+            topics=[topic("plugin", self.plugin_id)],
             detailRoute="api/v1/plugin/list",
             refreshRoutes=["api/v1/plugin/list"],
         )
@@ -104,6 +107,7 @@ class PluginUnloadedEvent:
             sourceDomainName="plugin",
             sourceDomainEvent="pluginUnloaded",
             context={"plugin_id": self.plugin_id},
+            topics=[topic("plugin", self.plugin_id)],
             detailRoute="api/v1/plugin/list",
             refreshRoutes=["api/v1/plugin/list"],
         )
@@ -122,6 +126,7 @@ class PluginUninstalledEvent:
             sourceDomainName="plugin",
             sourceDomainEvent="pluginUninstalled",
             context={"plugin_id": self.plugin_id},
+            topics=[topic("plugin", self.plugin_id)],
             detailRoute="api/v1/plugin/list",
             refreshRoutes=["api/v1/plugin/list"],
         )
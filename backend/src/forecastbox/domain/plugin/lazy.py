@@ -0,0 +1,296 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Plugins registered from their catalogue, with their module imported on first use.
+
+Importing a plugin module pulls its runtime dependencies into the backend process, while most of
+the time only the catalogue is needed there. Once a plugin has been imported, its block catalogue
+and blueprint templates are kept on disk as a manifest, keyed by the installed versions of the
+plugin distribution and of fiab-core. Later loads of the same versions register a ``Plugin`` whose
+catalogue and templates come from the manifest, and whose validator, expander and compilers import
+the module on their first call. Plugins not installed from an index -- from a local path, in editable
+mode, or from a vcs -- may change without their version changing, so they never get a manifest and
+are always imported right away. Catalogues with options of artifact types, eg an enum of the
+checkpoints available, are derived from the artifact catalog at import time, so their manifests
+also record the artifact catalog and are not used once it has changed.
+
+The import time and the growth of the process RSS during the import are recorded per plugin module,
+and exposed as metrics. Imports may run concurrently, in which case the RSS growth is only approximate.
+"""
+
+import contextlib
+import hashlib
+import importlib.metadata
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import psutil
+from cascade.low.func import Either
+from earthkit.workflows.fluent import Action
+from fiab_core.artifacts import ArtifactsProvider, CompositeArtifactId
+from fiab_core.fable import (
+    ActionLookup,
+    BlockExpansion,
+    BlockFactoryCatalogue,
+    BlockFactoryId,
+    BlockInstance,
+    BlockInstanceOutput,
+    BlueprintTemplate,
+    Error,
+)
+from fiab_core.plugin import BlockCompilation, BlockValidation, BlockValidationError, Plugin
+from fiab_core.types.definitions import ArtifactType, ClosedEnumType, FableType, ListType, OpenEnumType, UnionType
+from packaging.utils import canonicalize_name
+from pydantic import ValidationError
+
+from forecastbox.utility.config import PluginSettings, config
+from forecastbox.utility.metrics import Gauge
+from forecastbox.utility.pydantic import FiabBaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class PluginManifest(FiabBaseModel):
+    module_name: str
+    version: str
+    fiab_core_version: str
+    catalogue: BlockFactoryCatalogue
+    blueprint_templates: list[BlueprintTemplate]
+    artifact_catalog: str | None = None
+    """Fingerprint of the artifact catalog at import time, for catalogues with options of artifact types"""
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class ImportStats:
+    seconds: float
+    rss_bytes: int
+    """Growth of the process resident memory during the import"""
+
+
+_stats_lock = threading.Lock()
+_import_stats: dict[str, ImportStats] = {}
+
+
+@contextlib.contextmanager
+def measured_import(module_name: str) -> Iterator[None]:
+    """Record the duration and RSS growth of the enclosed import of the plugin module"""
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = ImportStats(seconds=time.perf_counter() - start, rss_bytes=max(process.memory_info().rss - rss_before, 0))
+        logger.debug(f"imported plugin module {module_name} in {stats.seconds:.3f}s, rss grew by {stats.rss_bytes} bytes")
+        with _stats_lock:
+            _import_stats[module_name] = stats
+
+
+def import_stats() -> dict[str, ImportStats]:
+    """Stats of the latest import of every plugin module imported so far"""
+    with _stats_lock:
+        return dict(_import_stats)
+
+
+Gauge(
+    "fiab_plugin_import_seconds",
+    "Duration of the latest import of every plugin module imported so far",
+    lambda: {(module_name,): stats.seconds for module_name, stats in import_stats().items()},
+    ("module",),
+)
+Gauge(
+    "fiab_plugin_import_rss_bytes",
+    "Growth of the process resident memory during the latest import of every plugin module imported so far",
+    lambda: {(module_name,): stats.rss_bytes for module_name, stats in import_stats().items()},
+    ("module",),
+)
+
+
+def _static_version(pip_source: str) -> str | None:
+    """Installed version of the distribution, None if it is not installed from an index"""
+    try:
+        distribution = importlib.metadata.distribution(pip_source)
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        return None
+    # NOTE recorded for every install not from an index, see PEP 610
+    if distribution.read_text("direct_url.json") is not None:
+        return None
+    return distribution.version
+
+
+def _is_artifact_derived(value_type: FableType) -> bool:
+    if isinstance(value_type, ArtifactType):
+        return True
+    if isinstance(value_type, (ClosedEnumType, OpenEnumType)):
+        return _is_artifact_derived(value_type.subtype)
+    if isinstance(value_type, ListType):
+        return _is_artifact_derived(value_type.item_type)
+    if isinstance(value_type, UnionType):
+        return any(_is_artifact_derived(member) for member in value_type.types)
+    return False
+
+
+def _artifact_catalog_fingerprint(catalogue: BlockFactoryCatalogue) -> str | None:
+    """Of the current artifact catalog, None if no option of the catalogue is of an artifact type"""
+    if not any(
+        _is_artifact_derived(option.value_type)
+        for factory in catalogue.factories.values()
+        for option in factory.configuration_options.values()
+    ):
+        return None
+    try:
+        lookup = ArtifactsProvider.get_artifacts_lookup()
+    except RuntimeError:
+        return ""
+    return hashlib.sha256("\n".join(sorted(CompositeArtifactId.to_str(artifact_id) for artifact_id in lookup)).encode()).hexdigest()
+
+
+def _manifest_path(pip_source: str, version: str) -> Path:
+    return Path(config.backend.plugin_import.manifest_path) / f"{canonicalize_name(pip_source)}-{version}.json"
+
+
+def read_manifest(plugin: PluginSettings) -> PluginManifest | None:
+    """The manifest matching the currently installed versions, if any"""
+    version = _static_version(plugin.pip_source)
+    if version is None:
+        return None
+    path = _manifest_path(plugin.pip_source, version)
+    try:
+        manifest = PluginManifest.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError) as e:
+        logger.warning(f"ignoring unreadable plugin manifest {path}: {e!r}")
+        return None
+    if manifest.module_name != plugin.module_name or manifest.fiab_core_version != importlib.metadata.version("fiab-core"):
+        return None
+    if manifest.artifact_catalog is not None and manifest.artifact_catalog != _artifact_catalog_fingerprint(manifest.catalogue):
+        logger.debug(f"ignoring manifest of plugin {plugin.module_name}, as the artifact catalog has changed since")
+        return None
+    return manifest
+
+
+def _to_manifest(module_name: str, version: str, loaded: Plugin) -> PluginManifest:
+    return PluginManifest(
+        module_name=module_name,
+        version=version,
+        fiab_core_version=importlib.metadata.version("fiab-core"),
+        catalogue=loaded.catalogue,
+        blueprint_templates=list(loaded.blueprint_templates),
+        artifact_catalog=_artifact_catalog_fingerprint(loaded.catalogue),
+    )
+
+
+def write_manifest(plugin: PluginSettings, loaded: Plugin) -> None:
+    """Store the catalogue and templates of an imported plugin, if installed from an index"""
+    version = _static_version(plugin.pip_source)
+    if version is None:
+        return
+    manifest = _to_manifest(plugin.module_name, version, loaded)
+    path = _manifest_path(plugin.pip_source, version)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(manifest.model_dump_json())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.warning(f"failed to store manifest of plugin {plugin.module_name}: {e!r}")
+
+
+def drop_manifest(plugin: PluginSettings) -> None:
+    version = _static_version(plugin.pip_source)
+    if version is not None:
+        _manifest_path(plugin.pip_source, version).unlink(missing_ok=True)
+
+
+class _DeferredPlugin:
+    """Imports the plugin on first use and delegates to it"""
+
+    def __init__(self, plugin: PluginSettings, manifest: PluginManifest, load: Callable[[], Either[Plugin, str]]) -> None:  # type: ignore[invalid-argument]
+        self.plugin = plugin
+        self.manifest = manifest
+        self.load = load
+        self.lock = threading.Lock()
+        self.loaded: Either[Plugin, str] | None = None  # type: ignore[invalid-argument]
+
+    def resolve(self) -> Either[Plugin, str]:  # type: ignore[invalid-argument]
+        loaded = self.loaded
+        if loaded is not None:
+            return loaded
+        with self.lock:
+            if self.loaded is None:
+                logger.info(f"importing plugin {self.plugin.module_name} on first use")
+                self.loaded = self.load()
+                if self.loaded.t is None:
+                    logger.error(f"deferred import of plugin {self.plugin.module_name} failed: {self.loaded.e}")
+                    # NOTE the next load imports right away, surfacing the error in the plugin status
+                    drop_manifest(self.plugin)
+                elif (
+                    _to_manifest(self.manifest.module_name, self.manifest.version, self.loaded.t).model_dump_json()
+                    != self.manifest.model_dump_json()
+                ):
+                    logger.warning(f"plugin {self.plugin.module_name} differs from its manifest, replacing it for the next load")
+                    write_manifest(self.plugin, self.loaded.t)
+            return self.loaded
+
+    def validator(self, factory_id: BlockFactoryId, block: BlockInstance, inputs: dict[str, BlockInstanceOutput]) -> BlockValidation:
+        loaded = self.resolve()
+        if loaded.t is None:
+            return BlockValidation(Either.error(BlockValidationError(reason=loaded.e, is_hard=True)))  # type: ignore[arg-type]
+        return loaded.t.validator(factory_id, block, inputs)
+
+    def expander(self, output: BlockInstanceOutput) -> list[BlockExpansion]:
+        loaded = self.resolve()
+        if loaded.t is None:
+            return []
+        return loaded.t.expander(output)
+
+    def compiler(self, lookup: ActionLookup, factory_id: BlockFactoryId, block: BlockInstance) -> Either[Action, Error]:  # type: ignore[invalid-argument]
+        loaded = self.resolve()
+        if loaded.t is None:
+            return Either.error(loaded.e)
+        return loaded.t.compiler(lookup, factory_id, block)
+
+    def output_compiler(
+        self, lookup: ActionLookup, factory_id: BlockFactoryId, block: BlockInstance, inputs: dict[str, BlockInstanceOutput]
+    ) -> Either[BlockCompilation, Error]:  # type: ignore[invalid-argument]
+        loaded = self.resolve()
+        if loaded.t is None:
+            return Either.error(loaded.e)
+        return loaded.t.compile_with_output(lookup, factory_id, block, inputs)
+
+
+def deferred_plugin(plugin: PluginSettings, load: Callable[[], Either[Plugin, str]]) -> Plugin | None:  # type: ignore[invalid-argument]
+    """A plugin registered from its manifest, calling ``load`` on first use. None if lazy import is
+    disabled or there is no manifest for the installed versions"""
+    if not config.backend.plugin_import.lazy:
+        return None
+    manifest = read_manifest(plugin)
+    if manifest is None:
+        return None
+    deferred = _DeferredPlugin(plugin, manifest, load)
+    return Plugin(
+        catalogue=manifest.catalogue,
+        validator=deferred.validator,
+        expander=deferred.expander,
+        compiler=deferred.compiler,
+        blueprint_templates=tuple(manifest.blueprint_templates),
+        output_compiler=deferred.output_compiler,
+    )
@@ -20,6 +20,8 @@ non-raising completions, to be persisted in a structured form.
 import importlib
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from cascade.low.func import Either
 from fiab_core.fable import PluginCompositeId
@@ -27,14 +29,15 @@ from fiab_core.plugin import Plugin
 from packaging.version import Version
 from pydantic import ValidationError
 
-from forecastbox.domain.plugin.compatibility import check_environment_baseline, install_plugin_compatibly
+from forecastbox.domain.plugin.compatibility import check_environment_baseline, install_plugin_compatibly, install_plugins_compatibly
 from forecastbox.domain.plugin.db import delete_plugin_state, get_plugin_state, upsert_plugin_state
 from forecastbox.domain.plugin.errors import PluginError, PluginErrors
+from forecastbox.domain.plugin.lazy import deferred_plugin, measured_import, write_manifest
 from forecastbox.domain.plugin.state import publish_bulk_snapshot, publish_single_snapshot, publish_unloaded
 from forecastbox.domain.plugin.template_ingest import ingest_plugin_templates, unload_plugin_templates
 from forecastbox.utility.concurrency.synchronization import timed_acquire
 from forecastbox.utility.config import PluginSettings, PluginsSettings, config, config_edit_lock
-from forecastbox.utility.packages import try_import, try_version
+from forecastbox.utility.packages import is_installed, try_import, try_version
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +48,11 @@ def _load_single(plugin: PluginSettings) -> Either[Plugin, str]:  # type: ignore
 
     Not expected to raise -- import errors and pydantic validation errors are propagated as Either.e
     """
+    with measured_import(plugin.module_name):
+        return _import_single(plugin)
+
+
+def _import_single(plugin: PluginSettings) -> Either[Plugin, str]:  # type: ignore[invalid-argument]
     errors = []
     try:
         plugin_impl = try_import(plugin.module_name)
@@ -86,54 +94,72 @@ def _version_from_install(installed: dict[str, str], module_name: str) -> str |
     return None
 
 
+def _needs_install(plugin: PluginSettings) -> bool:
+    if plugin.update_strategy == "auto":
+        return True
+    # NOTE not importing the plugin, which would defeat the deferred import of plugins with a manifest
+    return not is_installed(plugin.module_name)
+
+
+def _register_single(plugin: PluginSettings) -> Either[Plugin, str]:  # type: ignore[invalid-argument]
+    """Registers the plugin from its manifest if there is one, otherwise imports it right away and stores its manifest"""
+    deferred = deferred_plugin(plugin, partial(_load_single, plugin))
+    if deferred is not None:
+        logger.debug(f"plugin {plugin.module_name} registered from its manifest, import deferred to first use")
+        return Either.ok(deferred)
+    result = _load_single(plugin)
+    if result.t is not None:
+        write_manifest(plugin, result.t)
+    return result
+
+
 def load_plugins(plugins: PluginsSettings) -> None:
     """Initial bulk load: install/import every configured, enabled plugin, publish the
     complete catalogue in one atomic snapshot, then run template ingestion for each
     successfully loaded plugin.
+
+    All plugins to be installed or auto-updated are installed by a single resolution, and the
+    plugins are then imported concurrently. Plugins with a manifest are not imported at all, see
+    ``domain.plugin.lazy``.
     """
     logger.info("starting initial plugin load")
     check_environment_baseline()
     lookup: dict[PluginCompositeId, Plugin] = {}
     errors: dict[PluginCompositeId, PluginErrors] = {}
+    enabled: dict[PluginCompositeId, PluginSettings] = {}
     for pluginKey, pluginSettings in plugins.items():
-        plugin_id_str = PluginCompositeId.to_str(pluginKey)
-        db_state = get_plugin_state(plugin_id_str)
+        db_state = get_plugin_state(PluginCompositeId.to_str(pluginKey))
         if db_state is not None and not db_state.enabled:
             logger.info(f"skipping disabled plugin {pluginKey}")
             continue
+        enabled[pluginKey] = pluginSettings
+
+    workers = config.backend.plugin_import.workers
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(enabled)))) as executor:
+        needs_install = dict(zip(enabled, executor.map(_needs_install, enabled.values())))
+    to_install = {pluginKey: pluginSettings for pluginKey, pluginSettings in enabled.items() if needs_install[pluginKey]}
+    if to_install:
+        logger.info(f"installing or updating {', '.join(settings.module_name for settings in to_install.values())}")
+        install_results = install_plugins_compatibly(to_install)
+        importlib.invalidate_caches()
+    else:
+        install_results = {}
+
+    to_load: dict[PluginCompositeId, PluginSettings] = {}
+    for pluginKey, pluginSettings in enabled.items():
+        plugin_id_str = PluginCompositeId.to_str(pluginKey)
         installed_versions: dict[str, str] = {}
-        install_error: str | None = None
-        # NOTE consider running all pip invocations at once -- worse error reporting but better perf
-        if pluginSettings.update_strategy == "auto":
-            logger.info(f"auto-updating {pluginSettings.module_name}")
-            result = install_plugin_compatibly(pluginSettings.pip_source, None, pluginSettings.module_name)
+        if (result := install_results.get(pluginKey)) is not None:
             if result.e:
-                install_error = result.e
-            else:
-                installed_versions = result.t or {}
-        else:
-            try:
-                is_found = try_import(pluginSettings.module_name) is None
-            except Exception:
-                # NOTE we just want to check whether we should run pip. This error will be resurfaced later during _load_single
-                is_found = True
-            if is_found:
-                logger.info(f"installing {pluginSettings.module_name} for the first time")
-                result = install_plugin_compatibly(pluginSettings.pip_source, None, pluginSettings.module_name)
-                if result.e:
-                    install_error = result.e
-                else:
-                    installed_versions = result.t or {}
-
-        if install_error is not None:
-            logger.error(f"install failed for {pluginKey}: {install_error}")
-            upsert_plugin_state(
-                plugin_id=plugin_id_str,
-                version="install failed",
-                enabled=True,
-                plugin_errors=PluginErrors([PluginError(source="install", severity="error", detail=install_error)]),
-            )
-            continue
+                logger.error(f"install failed for {pluginKey}: {result.e}")
+                upsert_plugin_state(
+                    plugin_id=plugin_id_str,
+                    version="install failed",
+                    enabled=True,
+                    plugin_errors=PluginErrors([PluginError(source="install", severity="error", detail=result.e)]),
+                )
+                continue
+            installed_versions = result.t or {}
         if installed_versions:
             version_str = _version_from_install(installed_versions, pluginSettings.module_name)
             if version_str is not None:
@@ -141,7 +167,13 @@ def load_plugins(plugins: PluginsSettings) -> None:
             else:
                 # pip does not report the version if it isn't changed -> this branch is not necessarily a bug
                 logger.warning(f"pip install of plugin {plugin_id_str} did not produce a version, assuming no change")
+        to_load[pluginKey] = pluginSettings
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_load)))) as executor:
+        load_results = dict(zip(to_load, executor.map(_register_single, to_load.values())))
 
+    for pluginKey, pluginSettings in to_load.items():
+        plugin_id_str = PluginCompositeId.to_str(pluginKey)
         if pluginKey in lookup:
             errors[pluginKey] = PluginErrors(
                 [
@@ -153,7 +185,7 @@ def load_plugins(plugins: PluginsSettings) -> None:
                 ]
             )
             continue
-        plugin_result = _load_single(pluginSettings)
+        plugin_result = load_results[pluginKey]
         if plugin_result.t is not None:
             lookup[pluginKey] = plugin_result.t
             version_imported = try_version(pluginSettings.pip_source, pluginSettings.module_name)
@@ -214,6 +246,8 @@ def update_single(pluginId: PluginCompositeId, pluginSettings: PluginSettings, i
     importlib.reload(importlib.import_module(pluginSettings.module_name))
     result = _load_single(pluginSettings)
     logger.debug(f"plugin {pluginId} loaded with success: {result.t is not None}")
+    if result.t is not None:
+        write_manifest(pluginSettings, result.t)
     version_install = _version_from_install(installed_versions, pluginSettings.module_name)
     version_imported = try_version(pluginSettings.pip_source, pluginSettings.module_name)
     version_mismatch_err: PluginError | None = None
@@ -18,6 +18,8 @@ Owns operations that modify the config file."""
 
 import logging
 import threading
+from collections.abc import Iterable
+from concurrent.futures import Future
 from functools import partial
 
 import httpx
@@ -34,6 +36,7 @@ from forecastbox.utility.concurrency.manager import ConcurrentPools, TaskName, e
 from forecastbox.utility.concurrency.synchronization import timed_acquire
 from forecastbox.utility.config import PluginSettings, PluginStoreConfig, PluginStoreId, PluginStoresConfig, config, config_edit_lock
 from forecastbox.utility.httpx import fetch_content
+from forecastbox.utility.package_index import get_latest_versions
 from forecastbox.utility.pydantic import FiabBaseModel
 
 logger = logging.getLogger(__name__)
@@ -60,19 +63,6 @@ class PluginRemoteInfo(FiabBaseModel):
     version: str
 
 
-def get_latest_version(package_name: str, client: httpx.Client) -> str:
-    url = f"https://pypi.org/pypi/{package_name}/json"
-    try:
-        response = client.get(url)
-        if response.status_code == 200:
-            return response.json()["info"]["version"]
-        else:
-            logger.warning(f"getting version of {package_name=} => failure {response=}")
-    except Exception:
-        logger.exception(f"getting version of {package_name=} => failure {response=}")
-    return "unknown"
-
-
 class PluginStore(FiabBaseModel):
     display_name: str
     plugins: dict[PluginId, PluginStoreEntry] = Field(default_factory=dict)
@@ -105,11 +95,13 @@ def fetch_store(client: httpx.Client, plugin_store_config: PluginStoreConfig) ->
             assert_never(s)
 
 
-def populate_store(store: PluginStore, client: httpx.Client) -> None:
-    for pluginId, storeEntry in store.plugins.items():
-        store.remote[pluginId] = PluginRemoteInfo(
-            version=get_latest_version(storeEntry.pip_source, client),
-        )
+def populate_stores(stores: Iterable[PluginStore]) -> None:
+    """Fill in the latest versions of all plugins of all stores, looked up concurrently"""
+    stores = list(stores)
+    latest = get_latest_versions(entry.pip_source for store in stores for entry in store.plugins.values())
+    for store in stores:
+        for pluginId, storeEntry in store.plugins.items():
+            store.remote[pluginId] = PluginRemoteInfo(version=latest[storeEntry.pip_source] or "unknown")
 
 
 class StoresManager:
@@ -122,8 +114,7 @@ def initialize_stores(plugin_stores_config: PluginStoresConfig) -> None:
     with httpx.Client() as client:
         # a thread pool / async could work here but we dont expect many stores here
         stores = {key: fetch_store(client, value) for key, value in plugin_stores_config.items()}
-        for store in stores.values():
-            populate_store(store, client)
+    populate_stores(stores.values())
     with timed_acquire(StoresManager.stores_lock, 600) as result:
         if not result:
             raise ValueError("failed to acquire lock")
@@ -142,23 +133,34 @@ def get_plugins_detail() -> dict[PluginCompositeId, tuple[PluginStoreEntry, Plug
     }
 
 
-def submit_initialize_stores() -> None:
+def submit_initialize_stores() -> Future[None]:
     """Submit store initialization as a monitored task on the shared ``Io`` pool.
 
-    Fire-and-forget: an unexpected exception is recorded by the execution manager's
-    monitored-failure history. Callers continue to see an empty store map (via
+    An unexpected exception is recorded by the execution manager's monitored-failure
+    history, and fails the returned future. Callers continue to see an empty store map (via
     ``get_plugins_detail``/``StoresManager.stores``) until a successful publication
     replaces it -- a partial store map is never published.
     """
 
+    initialized: Future[None] = Future()
+
+    def _initialize(plugin_stores: PluginStoresConfig) -> None:
+        try:
+            initialize_stores(plugin_stores)
+        except BaseException as error:
+            initialized.set_exception(error)
+            raise
+        initialized.set_result(None)
+
     # NOTE No need to protect from concurrent runs -- http fetches are safe, and
     # the last operation which mutates the global state is lock protected, and we
     # are ok with last one winning.
     execution_manager.submit_monitored(
         ConcurrentPools.Io,
         TaskName("plugin.stores.initialize"),
-        partial(initialize_stores, config.external.plugin_stores),
+        partial(_initialize, config.external.plugin_stores),
     )
+    return initialized
 
 
 async def submit_install_single(plugin_composite_key: PluginCompositeId) -> None:
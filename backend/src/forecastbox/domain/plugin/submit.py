@@ -109,13 +109,16 @@ def _run_load_all(plugins: PluginsSettings) -> None:
     _run_managed("Initial plugin load", partial(_load_plugins, plugins))
 
 
-def submit_load_all(start_after: Future[None]) -> None:
-    """Reserve and submit the initial load-all-plugins operation"""
+def submit_load_all(start_after: Future[None]) -> Future[None]:
+    """Reserve and submit the initial load-all-plugins operation. The returned future completes once
+    the load has finished, failing if it could not run or raised"""
+    loaded: Future[None] = Future()
     result = reserve_operation()
     if not result.accepted:
         logger.error(f"failed to submit load_plugins: {result.reason}")
         finish_with_error(f"failed to submit load_plugins: {result.reason}")
-        return
+        loaded.set_exception(RuntimeError(f"failed to submit load_plugins: {result.reason}"))
+        return loaded
 
     def _record_dependency_failure(done: Future[None]) -> None:
         # NOTE this is just a rollback -- we reserve prior to submit, but the callable
@@ -125,14 +128,24 @@ def submit_load_all(start_after: Future[None]) -> None:
             done.result()
         except BaseException as error:
             finish_with_error(f"catalog refresh dependency failed: {repr(error)}")
+            loaded.set_exception(error)
+
+    def _load_all(plugins: PluginsSettings) -> None:
+        try:
+            _run_load_all(plugins)
+        except BaseException as error:
+            loaded.set_exception(error)
+            raise
+        loaded.set_result(None)
 
     start_after.add_done_callback(_record_dependency_failure)
     execution_manager.submit_after(
         start_after,
         ConcurrentPools.PluginManagement,
         TaskName("plugin.initial-load"),
-        partial(_run_load_all, config.external.plugins),
+        partial(_load_all, config.external.plugins),
     )
+    return loaded
 
 
 async def submit_update_single(pluginId: PluginCompositeId, install: bool, version: Version | None) -> str:
@@ -0,0 +1,139 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Runs parked until their runtime artifacts become locally available.
+
+Instead of holding a RunSubmission worker for the duration of the downloads, a run with missing
+artifacts is parked here and its worker released. Parked runs are settled whenever an artifact
+download finishes -- see ``domain.run.dispatchers`` -- those with all artifacts available are
+resumed on the RunSubmission pool, those with a failed download are failed.
+
+The ArtifactManager makes an artifact available before emitting the event about it, and the
+availability is checked under the same lock as parking and settling, thus no event is missed.
+As a stalled download emits no event, every parked run also gets settled by a timer at its wait
+deadline. Parked runs live in this process only -- those left ``waiting`` by a previous one are
+failed at startup, see ``domain.run.db.fail_waiting_runs``.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Set
+from dataclasses import dataclass
+
+from forecastbox.domain.artifact.base import CompositeArtifactId
+from forecastbox.domain.artifact.manager import ArtifactManager
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.concurrency.manager import TaskName, execution_manager
+from forecastbox.utility.config import ConcurrentPools
+
+logger = logging.getLogger(__name__)
+
+max_wait_seconds = 3600
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class _ParkedRun:
+    run_id: RunId
+    attempt_count: int
+    artifacts: frozenset[CompositeArtifactId]
+    deadline: float
+    resume: Callable[[], None]
+    fail: Callable[[str], None]
+    expiry: threading.Timer
+    """Settles at the deadline, cancelled once the run is no longer parked"""
+
+    def missing(self) -> set[CompositeArtifactId]:
+        # NOTE lock-free reads of pyrsistent structures
+        return {artifact for artifact in self.artifacts if artifact not in ArtifactManager.locally_available}
+
+    def error(self, missing: set[CompositeArtifactId], now: float) -> str | None:
+        for artifact in missing:
+            progress = ArtifactManager.ongoing_downloads.get(artifact)
+            if progress is None:
+                return f"Download of runtime artifact {CompositeArtifactId.to_str(artifact)} is no longer in progress"
+            if isinstance(progress, str):
+                return f"Failed to download runtime artifact {CompositeArtifactId.to_str(artifact)}: {progress}"
+        if now >= self.deadline:
+            return "Timeout waiting for runtime artifacts to download"
+        return None
+
+
+_lock = threading.Lock()
+_parked: dict[tuple[RunId, int], _ParkedRun] = {}
+
+
+def park(
+    run_id: RunId,
+    attempt_count: int,
+    artifacts: Set[CompositeArtifactId],
+    resume: Callable[[], None],
+    fail: Callable[[str], None],
+) -> bool:
+    """Park the run until all its ``artifacts`` are locally available, False if none is missing.
+
+    Once they are, ``resume`` is submitted to the RunSubmission pool. If any of their downloads
+    fails or the wait times out, ``fail`` is called with the error instead -- possibly right away.
+    """
+    expiry = threading.Timer(max(max_wait_seconds, 0), settle)
+    expiry.daemon = True
+    parked = _ParkedRun(run_id, attempt_count, frozenset(artifacts), time.monotonic() + max_wait_seconds, resume, fail, expiry)
+    with _lock:
+        missing = parked.missing()
+        if not missing:
+            return False
+        error = parked.error(missing, time.monotonic())
+        if error is None:
+            _parked[(run_id, attempt_count)] = parked
+            expiry.start()
+    # NOTE not settling here, as resuming from a RunSubmission worker would submit to its own pool
+    if error is not None:
+        logger.error(f"run {run_id!r} attempt {attempt_count} cannot wait for artifacts: {error}")
+        fail(error)
+    else:
+        logger.info(
+            f"run {run_id!r} attempt {attempt_count} waiting for runtime artifacts {sorted(map(CompositeArtifactId.to_str, missing))}"
+        )
+    return True
+
+
+def settle() -> None:
+    """Resume the parked runs whose artifacts are all available, fail those which cannot get them."""
+    now = time.monotonic()
+    resumed: list[_ParkedRun] = []
+    failed: list[tuple[_ParkedRun, str]] = []
+    with _lock:
+        for key, parked in list(_parked.items()):
+            missing = parked.missing()
+            if not missing:
+                resumed.append(parked)
+            elif (error := parked.error(missing, now)) is not None:
+                failed.append((parked, error))
+            else:
+                continue
+            del _parked[key]
+            parked.expiry.cancel()
+
+    for parked in resumed:
+        logger.info(f"resuming run {parked.run_id!r} attempt {parked.attempt_count}, runtime artifacts available")
+        try:
+            execution_manager.submit_monitored(ConcurrentPools.RunSubmission, TaskName("run.submit.resume"), parked.resume)
+        except Exception as e:
+            failed.append((parked, f"Failed to resume submission: {repr(e)}"))
+    for parked, error in failed:
+        logger.error(f"run {parked.run_id!r} attempt {parked.attempt_count} failed waiting for artifacts: {error}")
+        try:
+            parked.fail(error)
+        except Exception as e:
+            logger.exception(f"failed to mark run {parked.run_id!r} attempt {parked.attempt_count} as failed: {repr(e)}")
+
+
+def parked_count() -> int:
+    with _lock:
+        return len(_parked)
@@ -10,12 +10,15 @@
 """Background execution of a run: compilation, context persistence, and cascade submission.
 
 Runs on a worker thread so the caller can return an ExecuteResult immediately
-without waiting for potentially slow cascade submission. Jobs-database access is
+without waiting for potentially slow cascade submission. A run whose runtime artifacts
+are not yet locally available is parked in the ``waiting`` status, releasing the worker,
+and submitted on another one once they are -- see ``domain.run.artifact_wait``. Jobs-database access is
 performed synchronously on the worker thread and serialized by the shared jobs RLock.
 """
 
 import logging
 from datetime import datetime
+from functools import partial
 from typing import cast
 
 from fiab_core.fable import BlockInstanceId
@@ -32,9 +35,9 @@ from forecastbox.domain.glyphs.resolution import (
     extract_glyphs,
     merge_glyph_values,
 )
-from forecastbox.domain.run import db
-from forecastbox.domain.run.cascade import execute_cascade
-from forecastbox.domain.run.compile import compile_builder, resolve_intrinsic_glyph_values
+from forecastbox.domain.run import artifact_wait, db
+from forecastbox.domain.run.cascade import execute_cascade, request_runtime_artifacts
+from forecastbox.domain.run.compile import CompilationResult, compile_builder, resolve_intrinsic_glyph_values
 from forecastbox.domain.run.db import CompilerRuntimeContext
 from forecastbox.domain.run.detail import store_compilation_detail
 from forecastbox.domain.run.types import RunId
@@ -107,7 +110,31 @@ def execute_background(
             status="preparing",
         )
 
-        logger.debug(f"starting background submission of {run_id=}")
+        artifacts = request_runtime_artifacts(compilation_result.execution_spec)
+        if artifacts.e:
+            db.update_run_runtime(run_id, attempt_count, status="failed", error=artifacts.e[:255])
+            return
+        if artifacts.t:
+            # NOTE marked before parking, as the run may get resumed right away
+            db.update_run_runtime(run_id, attempt_count, status="waiting")
+            resume = partial(submit_background, run_id, attempt_count, compilation_result)
+            fail = partial(_fail, run_id, attempt_count)
+            if artifact_wait.park(run_id, attempt_count, artifacts.t, resume=resume, fail=fail):
+                return
+    except Exception as e:
+        logger.exception(f"execute_background failed for run {run_id!r} attempt {attempt_count}: {repr(e)}")
+        _fail(run_id, attempt_count, repr(e))
+        return
+    submit_background(run_id, attempt_count, compilation_result)
+
+
+def submit_background(run_id: RunId, attempt_count: int, compilation_result: CompilationResult) -> None:
+    """Submit a compiled run to cascade, its runtime artifacts being locally available.
+
+    Called right after compilation, or on a fresh worker once the run stops waiting for artifacts.
+    """
+    logger.debug(f"starting background submission of {run_id=}")
+    try:
         response = execute_cascade(compilation_result.execution_spec)
         if response.job_id is not None:
             try:
@@ -120,14 +147,19 @@ def execute_background(
             db.update_run_runtime(
                 run_id,
                 attempt_count,
+                status="preparing",
                 cascade_job_id=response.job_id,
                 cascade_proc=get_current_cascade_proc(),
                 outputs=compilation_result.run_outputs.model_dump(),
             )
         else:
-            error = (response.error or "no error provided by cascade")[:255]
-            db.update_run_runtime(run_id, attempt_count, status="failed", error=error)
+            error = response.error or "no error provided by cascade"
+            _fail(run_id, attempt_count, error)
     except Exception as e:
-        logger.exception(f"execute_background failed for run {run_id!r} attempt {attempt_count}: {repr(e)}")
-        logger.debug(f"updating background data of {run_id=}")
-        db.update_run_runtime(run_id, attempt_count, status="failed", error=repr(e)[:255])
+        logger.exception(f"submit_background failed for run {run_id!r} attempt {attempt_count}: {repr(e)}")
+        _fail(run_id, attempt_count, repr(e))
+
+
+def _fail(run_id: RunId, attempt_count: int, error: str) -> None:
+    logger.debug(f"updating background data of {run_id=}")
+    db.update_run_runtime(run_id, attempt_count, status="failed", error=error[:255])
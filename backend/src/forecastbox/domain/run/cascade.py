@@ -9,18 +9,19 @@
 
 import logging
 import tempfile
-import time
 from pathlib import Path
 from typing import Literal
 
 from cascade.gateway.api import JobSpec, LocalProcesses, SlurmCluster, SshCluster, SubmitJobRequest, SubmitJobResponse
-from cascade.gateway.client import request_response
 from cascade.low.core import JobInstance, JobInstanceRich, TaskId
+from cascade.low.func import Either
 from fiab_core.fable import BlockInstanceId
 from pydantic import Field
 
+from forecastbox.domain.artifact.base import CompositeArtifactId
 from forecastbox.domain.artifact.manager import ArtifactManager, submit_artifact_download
 from forecastbox.domain.blueprint.cascade import EnvironmentSpecification
+from forecastbox.domain.gateway.client import request_response_sync
 from forecastbox.domain.gateway.service import get_gateway_url
 from forecastbox.utility.config import CascadeInfrastructureType, UnmanagedGateway, config
 from forecastbox.utility.pydantic import FiabBaseModel
@@ -94,43 +95,33 @@ class RunOutputs(FiabBaseModel):
     outputs: dict[TaskId, RunOutputCharacteristic]
 
 
-def execute_cascade(spec: ExecutionSpecification) -> SubmitJobResponse:
-    """Convert spec to JobInstance and submit to cascade api.
+def request_runtime_artifacts(spec: ExecutionSpecification) -> Either[set[CompositeArtifactId], str]:  # ty: ignore[invalid-type-arguments]
+    """Request the download of every runtime artifact of the spec not yet locally available.
 
-    ``spec.job.job_instance.ext_outputs`` must already be set by the caller
-    (``compile_builder`` sets it as part of compilation).
+    Returns the artifacts still missing, which the caller is expected to wait for before calling
+    ``execute_cascade``, or an error if any of the downloads could not be started.
     """
-    runtime_artifacts = spec.environment.runtime_artifacts
-    if runtime_artifacts:
-        missing_artifacts = [art for art in runtime_artifacts if art not in ArtifactManager.locally_available]
-
-        download_ids = []
-        for artifact_id in missing_artifacts:
-            result = submit_artifact_download(artifact_id)
-            if result.e:
-                error_msg = f"Failed to submit download for {artifact_id}: {result.e}"
-                logger.error(error_msg)
-                return SubmitJobResponse(job_id=None, error=error_msg)
-            download_ids.append(artifact_id)
-
-        if download_ids:
-            max_wait_seconds = 3600
-            start_time = time.time()
-
-            while True:
-                remaining = {e for e in download_ids if e not in ArtifactManager.locally_available}
+    missing: set[CompositeArtifactId] = set()
+    for artifact_id in spec.environment.runtime_artifacts:
+        if artifact_id in ArtifactManager.locally_available:
+            continue
+        result = submit_artifact_download(artifact_id)
+        if result.e:
+            error_msg = f"Failed to submit download for {CompositeArtifactId.to_str(artifact_id)}: {result.e}"
+            logger.error(error_msg)
+            return Either.error(error_msg)
+        if result.t != 100:
+            missing.add(artifact_id)
+    return Either.ok(missing)
 
-                if not remaining:
-                    logger.info(f"All runtime artifacts downloaded: {download_ids}")
-                    break
 
-                if time.time() - start_time > max_wait_seconds:
-                    error_msg = "Timeout waiting for runtime artifacts to download"
-                    logger.error(error_msg)
-                    return SubmitJobResponse(job_id=None, error=error_msg)
-
-                time.sleep(1)
+def execute_cascade(spec: ExecutionSpecification) -> SubmitJobResponse:
+    """Convert spec to JobInstance and submit to cascade api.
 
+    ``spec.job.job_instance.ext_outputs`` must already be set by the caller
+    (``compile_builder`` sets it as part of compilation), and the runtime artifacts
+    must already be locally available, see ``request_runtime_artifacts``.
+    """
     job = spec.job.job_instance
 
     environment = spec.environment
@@ -149,7 +140,7 @@ def execute_cascade(spec: ExecutionSpecification) -> SubmitJobResponse:
         )
     )
     try:
-        submit_job_response: SubmitJobResponse = request_response(r, get_gateway_url())  # type: ignore
+        submit_job_response: SubmitJobResponse = request_response_sync(r, get_gateway_url())  # type: ignore
     except Exception as e:
         return SubmitJobResponse(job_id=None, error=repr(e))
 
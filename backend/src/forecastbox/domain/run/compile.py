@@ -9,6 +9,7 @@
 
 """Compilation of a BlueprintBuilder into an ExecutionSpecification."""
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import cast
@@ -19,7 +20,9 @@ from earthkit.workflows.compilers import graph2job
 from earthkit.workflows.fluent import PayloadBuildingContext
 from earthkit.workflows.graph import Graph, deduplicate_nodes
 from fiab_core.artifacts import CompositeArtifactId
-from fiab_core.fable import BlockInstanceId, BlockInstanceOutput, ConfigurationOptionId, NoOutput, RawOutput
+from fiab_core.fable import BlockInstanceId, BlockInstanceOutput, ConfigurationOptionId, NoOutput, PluginCompositeId, RawOutput
+from fiab_core.plugin import Plugin
+from pyrsistent.typing import PMap
 
 from forecastbox.domain.blueprint.cascade import EnvironmentSpecification
 from forecastbox.domain.blueprint.configuration_values import convert_known_configuration_values
@@ -27,12 +30,16 @@ from forecastbox.domain.blueprint.service import BlueprintBuilder
 from forecastbox.domain.glyphs.intrinsic import AvailableIntrinsicGlyphs, get_values_and_examples
 from forecastbox.domain.glyphs.resolution import ExtractedGlyphs, extract_glyphs, merge_glyph_values, resolve_configurations
 from forecastbox.domain.plugin.state import PluginManager
+from forecastbox.domain.run import compile_cache
 from forecastbox.domain.run.cascade import ExecutionSpecification, RawCascadeJob, RunOutputCharacteristic, RunOutputs
+from forecastbox.domain.run.compile_cache import CompiledBlueprint
 from forecastbox.domain.run.detail import CompilationDetail, TaskDetail, _fluentName_to_taskId, fluentNode_to_detail
 from forecastbox.domain.run.types import RunId
 from forecastbox.utility.graph import topological_order
 from forecastbox.utility.time import value_dt2str
 
+logger = logging.getLogger(__name__)
+
 
 def resolve_intrinsic_glyph_values(
     run_id: RunId, submit_datetime: datetime, start_datetime: datetime, attempt_count: int
@@ -102,22 +109,14 @@ def compile_builder(blueprint: BlueprintBuilder, glyph_values: dict[str, str]) -
 
     Raises ``ValueError`` if any block cannot be validated/compiled. When ``glyph_values`` is
     non-empty, ${glyph} patterns in configuration values are resolved before compilation.
+    Compilations are reused when the resolved blueprint and its plugins are unchanged, see
+    ``compile_cache``.
     """
-    graph = Graph([])
     plugins = PluginManager.plugins
-    action_lookup = {}
-    block_outputs: dict[BlockInstanceId, BlockInstanceOutput] = {}
-    # Maps any produced cascade TaskId → TaskDetail.
-    task_detail: dict[TaskId, TaskDetail] = {}
-    # Maps sink block ids to mime type used in RunOutputs (only relevant for external outputs).
-    block_to_mime: dict[BlockInstanceId, str] = {}
-    sink_tasks: set[TaskId] = set()
     resolved_configuration_options: dict[BlockInstanceId, dict[ConfigurationOptionId, str]] = {}
 
-    block_lookup = {b.instance_id: b for b in blueprint.blocks}
-
-    for blockId in topological_order(block_lookup.items(), lambda block: block.instance.input_ids.values()):
-        routable = block_lookup[blockId]
+    for routable in blueprint.blocks:
+        blockId = routable.instance_id
         plugin = plugins.get(routable.plugin, None)
         if not plugin:
             raise ValueError(f"plugin for {blockId=} not found: {routable.plugin}")
@@ -133,31 +132,66 @@ def compile_builder(blueprint: BlueprintBuilder, glyph_values: dict[str, str]) -
         resolved_configuration_options[blockId] = {
             k: routable.instance.configuration_values[k] for k in extracted.glyphed_options if k in routable.instance.configuration_values
         }
+
+    key = compile_cache.compilation_key(blueprint)
+    cached = compile_cache.lookup(key) if key is not None else None
+    if cached is not None:
+        logger.debug(f"reusing compilation {key}")
+        return CompilationResult(
+            execution_spec=cached.execution_spec,
+            run_outputs=cached.run_outputs,
+            compilation_detail=cached.compilation_detail,
+            resolved_configuration_options=resolved_configuration_options,
+        )
+
+    result = _compile_resolved(blueprint, plugins, resolved_configuration_options)
+    if key is not None:
+        compile_cache.store(
+            key,
+            CompiledBlueprint(
+                execution_spec=result.execution_spec, run_outputs=result.run_outputs, compilation_detail=result.compilation_detail
+            ),
+        )
+    return result
+
+
+def _compile_resolved(
+    blueprint: BlueprintBuilder,
+    plugins: PMap[PluginCompositeId, Plugin],
+    resolved_configuration_options: dict[BlockInstanceId, dict[ConfigurationOptionId, str]],
+) -> CompilationResult:
+    graph = Graph([])
+    action_lookup = {}
+    block_outputs: dict[BlockInstanceId, BlockInstanceOutput] = {}
+    # Maps any produced cascade TaskId → TaskDetail.
+    task_detail: dict[TaskId, TaskDetail] = {}
+    # Maps sink block ids to mime type used in RunOutputs (only relevant for external outputs).
+    block_to_mime: dict[BlockInstanceId, str] = {}
+    sink_tasks: set[TaskId] = set()
+
+    block_lookup = {b.instance_id: b for b in blueprint.blocks}
+
+    for blockId in topological_order(block_lookup.items(), lambda block: block.instance.input_ids.values()):
+        routable = block_lookup[blockId]
+        plugin = plugins[routable.plugin]
+        block_factory = plugin.catalogue.factories[routable.factory]
         converted_values = convert_known_configuration_values(routable.instance, block_factory)
         if converted_values.t is None:
             raise ValueError(f"compile failed at {blockId=} with {converted_values.e}")
         routable.instance.configuration_values = converted_values.t
-        with PayloadBuildingContext(blockId=blockId):
-            result = plugin.compiler(action_lookup, routable.factory, routable.instance)
-        if result.t is None:
-            raise ValueError(f"compile failed at {blockId=} with {result.e}")
-        action_lookup[blockId] = result.t
-
-        # TODO we run validation again just to get the block outputs, to determine mime types
-        # This wasteful and redundant, ideally we'd return block output in the compile.
-        # At this stage the validation should pass, but we still approach it defensively
-        validator_inputs = {
+        # NOTE compiles and validates in one pass, to obtain the block outputs needed for mime types. Plugins
+        # without an output compiler fall back to running the validator after the compiler
+        inputs = {
             input_name: block_outputs[source_id]
             for input_name, source_id in routable.instance.input_ids.items()
             if source_id in block_outputs
         }
-        try:
-            validated = plugin.validator(routable.factory, routable.instance, validator_inputs).result
-            if validated.t is None:
-                raise ValueError(f"compile failed at {blockId=} with {validated.e}")
-            block_outputs[blockId] = validated.t
-        except Exception as e:
-            raise ValueError(f"compile failed at {blockId=} with {e}")
+        with PayloadBuildingContext(blockId=blockId):
+            result = plugin.compile_with_output(action_lookup, routable.factory, routable.instance, inputs)
+        if result.t is None:
+            raise ValueError(f"compile failed at {blockId=} with {result.e}")
+        action_lookup[blockId] = result.t.action
+        block_outputs[blockId] = result.t.output
 
         if block_factory.kind == "sink":
             block_graph = action_lookup[blockId].graph()
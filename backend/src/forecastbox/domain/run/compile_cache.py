@@ -0,0 +1,106 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Content-addressed cache of compiled blueprints.
+
+The key is a hash of the blueprint after glyph resolution, together with the versions of the
+plugins its blocks use and of the libraries compiling it -- runs which differ only in glyph values
+not affecting any configuration value thus share the compilation, and an upgrade changes the key.
+Plugins installed from a vcs or an archive contribute its commit or hash too, as their code may
+change without a version change. Entries live in the memcache, and in its disk tier if they
+survive a json roundtrip unchanged.
+
+Compilation is not cached at all when the installed code of any of the plugins cannot be
+identified, eg for editable or local directory installs, or while a plugin operation is in
+progress, as then the installed version may not correspond to the imported code.
+"""
+
+import hashlib
+import logging
+
+import orjson
+from fiab_core.fable import PluginCompositeId
+
+from forecastbox.domain.blueprint.service import BlueprintBuilder
+from forecastbox.domain.plugin.state import PluginManager
+from forecastbox.domain.run.cascade import ExecutionSpecification, RunOutputs
+from forecastbox.domain.run.detail import CompilationDetail
+from forecastbox.utility.config import config
+from forecastbox.utility.memcache import TooLargeEntry, get, insert
+from forecastbox.utility.packages import try_install_fingerprint, try_version
+from forecastbox.utility.pydantic import FiabBaseModel
+
+logger = logging.getLogger(__name__)
+
+# NOTE the libraries whose code compiles a blueprint, besides the plugins
+_libraries = (("fiab-core", "fiab_core"), ("earthkit-workflows", "earthkit.workflows"), ("forecast-in-a-box", "forecastbox"))
+
+
+class CompiledBlueprint(FiabBaseModel):
+    execution_spec: ExecutionSpecification
+    run_outputs: RunOutputs
+    compilation_detail: CompilationDetail
+
+
+def _plugin_version(plugin_id: PluginCompositeId) -> str | None:
+    settings = config.external.plugins.get(plugin_id)
+    if settings is None:
+        return None
+    version = try_version(settings.pip_source, settings.module_name)
+    if version == "unknown":
+        return None
+    fingerprint = try_install_fingerprint(settings.pip_source, settings.module_name)
+    if fingerprint is None:
+        return None
+    return f"{version}+{fingerprint}" if fingerprint else version
+
+
+def _library_versions() -> dict[str, str]:
+    return {pip_source: try_version(pip_source, module_name) for pip_source, module_name in _libraries}
+
+
+def compilation_key(resolved: BlueprintBuilder) -> str | None:
+    """Hash the resolved blueprint with the versions of the plugins it uses and of the libraries, or None if not cacheable."""
+    if not config.backend.compilation_cache or PluginManager.operation_in_progress:
+        return None
+    versions: dict[str, str] = {}
+    for plugin_id in {block.plugin for block in resolved.blocks}:
+        version = _plugin_version(plugin_id)
+        if version is None:
+            return None
+        versions[PluginCompositeId.to_str(plugin_id)] = version
+    # NOTE local glyphs are already substituted into the configuration values, thus irrelevant
+    content = {
+        "blueprint": resolved.model_dump(mode="json", exclude={"local_glyphs"}),
+        "plugins": versions,
+        "libraries": _library_versions(),
+    }
+    return hashlib.sha256(orjson.dumps(content, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def lookup(key: str) -> CompiledBlueprint | None:
+    """Return a copy of the cached compilation, safe to be modified by the caller."""
+    try:
+        compiled = get(("compilation", key), CompiledBlueprint)
+    except (KeyError, TypeError):
+        return None
+    return compiled.model_copy(deep=True)
+
+
+def store(key: str, compiled: CompiledBlueprint) -> None:
+    """Cache a copy of the compilation, in the disk tier too if it serializes faithfully."""
+    stored = compiled.model_copy(deep=True)
+    try:
+        spill = CompiledBlueprint.model_validate_json(stored.model_dump_json()) == stored
+    except Exception:
+        spill = False
+    try:
+        insert(("compilation", key), stored, spill=spill)
+    except TooLargeEntry as e:
+        logger.warning(f"compilation {key} not cached: {repr(e)}")
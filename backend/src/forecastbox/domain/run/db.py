@@ -26,16 +26,17 @@ from typing import Any, cast
 
 from fiab_core.fable import BlockInstanceId, ConfigurationOptionId
 from pydantic import Field
-from sqlalchemy import func, select, update
+from sqlalchemy import Select, delete, func, literal, or_, select, tuple_, update
 
 import forecastbox.schemata.jobs as _jobs_module
 from forecastbox.domain.blueprint.types import BlueprintId
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
 from forecastbox.domain.run.exceptions import RunAccessDenied, RunNotFound
 from forecastbox.domain.run.types import RunId
-from forecastbox.schemata.run import Run, RunStatus
+from forecastbox.schemata.run import Run, RunLatestAttempt, RunStatus
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.db import dbRetry, executeAndCommit, querySingle
+from forecastbox.utility.db import dbRetry, dbRetryRead, executeAndCommit, querySingle
+from forecastbox.utility.pagination import KeysetCursor
 from forecastbox.utility.pydantic import FiabBaseModel
 from forecastbox.utility.time import current_time
 
@@ -146,6 +147,16 @@ def upsert_run(
                     is_deleted=False,
                 )
             )
+            session.merge(
+                RunLatestAttempt(
+                    run_id=effective_run_id,
+                    attempt_count=new_attempt,
+                    created_by=created_by,
+                    created_at=ref_time,
+                    experiment_id=experiment_id,
+                    is_deleted=False,
+                )
+            )
             session.commit()
             return new_attempt
 
@@ -192,38 +203,42 @@ def update_run_runtime(run_id: RunId, attempt_count: int, **kwargs: object) -> N
     executeAndCommit(stmt, _jobs_module.sync_session_maker)
 
 
-def list_runs(*, auth_context: AuthContext, offset: int = 0, limit: int | None = None) -> Iterable[RunRecord]:
+def _latest_attempts_query(auth_context: AuthContext, after: KeysetCursor | None) -> Select[tuple[Run]]:
+    query = (
+        select(Run)
+        .join(
+            RunLatestAttempt,
+            (Run.run_id == RunLatestAttempt.run_id) & (Run.attempt_count == RunLatestAttempt.attempt_count),
+        )
+        .where(RunLatestAttempt.is_deleted.is_(False))
+        .order_by(RunLatestAttempt.created_at.desc(), RunLatestAttempt.run_id.desc())
+    )
+    if not auth_context.has_admin():
+        query = query.where(RunLatestAttempt.created_by == auth_context.user_id)
+    if after is not None:
+        query = query.where(after.follows(RunLatestAttempt.created_at, RunLatestAttempt.run_id))
+    return query
+
+
+def list_runs(
+    *, auth_context: AuthContext, offset: int = 0, limit: int | None = None, after: KeysetCursor | None = None
+) -> Iterable[RunRecord]:
     """Return the latest non-deleted attempt of every Run, with optional paging.
 
     Admins and anonymous actors see all executions.  Authenticated non-admins see only
-    executions they created.  Orders by creation time, descending.
+    executions they created.  Orders by creation time, descending. Paging is either by
+    ``offset`` or, more efficiently for deep pages, by the keyset cursor ``after``.
     """
 
     def function(i: int) -> list[RunRecord]:
         with _jobs_module.sync_session_maker() as session:
-            subq = (
-                select(Run.run_id, func.max(Run.attempt_count).label("max_attempt"))
-                .where(Run.is_deleted.is_(False))
-                .group_by(Run.run_id)
-                .subquery()
-            )
-            query = (
-                select(Run)
-                .join(
-                    subq,
-                    (Run.run_id == subq.c.run_id) & (Run.attempt_count == subq.c.max_attempt),
-                )
-                .order_by(Run.created_at.desc())
-                .offset(offset)
-            )
-            if not auth_context.has_admin():
-                query = query.where(Run.created_by == auth_context.user_id)
+            query = _latest_attempts_query(auth_context, after).offset(offset)
             if limit is not None:
                 query = query.limit(limit)
             result = session.execute(query)
             return [_to_run_record(r[0]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_runs(*, auth_context: AuthContext) -> int:
@@ -231,13 +246,13 @@ def count_runs(*, auth_context: AuthContext) -> int:
 
     def function(i: int) -> int:
         with _jobs_module.sync_session_maker() as session:
-            query = select(func.count(func.distinct(Run.run_id))).where(Run.is_deleted.is_(False))
+            query = select(func.count()).select_from(RunLatestAttempt).where(RunLatestAttempt.is_deleted.is_(False))
             if not auth_context.has_admin():
-                query = query.where(Run.created_by == auth_context.user_id)
+                query = query.where(RunLatestAttempt.created_by == auth_context.user_id)
             result = session.execute(query)
             return result.scalar() or 0
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def soft_delete_run(run_id: RunId, *, auth_context: AuthContext) -> None:
@@ -249,8 +264,14 @@ def soft_delete_run(run_id: RunId, *, auth_context: AuthContext) -> None:
     """
     # get_run raises if not found or access denied; ownership is already checked.
     get_run(run_id, auth_context=auth_context)
-    stmt = update(Run).where(Run.run_id == run_id).values(is_deleted=True)
-    executeAndCommit(stmt, _jobs_module.sync_session_maker)
+
+    def function(i: int) -> None:
+        with _jobs_module.sync_session_maker() as session:
+            session.execute(update(Run).where(Run.run_id == run_id).values(is_deleted=True))
+            session.execute(update(RunLatestAttempt).where(RunLatestAttempt.run_id == run_id).values(is_deleted=True))
+            session.commit()
+
+    dbRetry(function)
 
 
 def list_runs_by_experiment(
@@ -259,38 +280,23 @@ def list_runs_by_experiment(
     auth_context: AuthContext,
     offset: int = 0,
     limit: int | None = None,
+    after: KeysetCursor | None = None,
 ) -> Iterable[RunRecord]:
     """Return the latest non-deleted attempt of each execution linked to an experiment.
 
     Admins and anonymous actors see all.  Authenticated non-admins see only their own.
-    Orders by creation time, descending.
+    Orders by creation time, descending. Paging as in ``list_runs``.
     """
 
     def function(i: int) -> list[RunRecord]:
         with _jobs_module.sync_session_maker() as session:
-            subq = (
-                select(Run.run_id, func.max(Run.attempt_count).label("max_attempt"))
-                .where(Run.experiment_id == experiment_id, Run.is_deleted.is_(False))
-                .group_by(Run.run_id)
-                .subquery()
-            )
-            query = (
-                select(Run)
-                .join(
-                    subq,
-                    (Run.run_id == subq.c.run_id) & (Run.attempt_count == subq.c.max_attempt),
-                )
-                .order_by(Run.created_at.desc())
-                .offset(offset)
-            )
-            if not auth_context.has_admin():
-                query = query.where(Run.created_by == auth_context.user_id)
+            query = _latest_attempts_query(auth_context, after).where(RunLatestAttempt.experiment_id == experiment_id).offset(offset)
             if limit is not None:
                 query = query.limit(limit)
             result = session.execute(query)
             return [_to_run_record(r[0]) for r in result.all()]
 
-    return dbRetry(function)
+    return dbRetryRead(function)
 
 
 def count_runs_by_experiment(experiment_id: ExperimentDefinitionId, *, auth_context: AuthContext) -> int:
@@ -298,13 +304,179 @@ def count_runs_by_experiment(experiment_id: ExperimentDefinitionId, *, auth_cont
 
     def function(i: int) -> int:
         with _jobs_module.sync_session_maker() as session:
-            query = select(func.count(func.distinct(Run.run_id))).where(
-                Run.experiment_id == experiment_id,
-                Run.is_deleted.is_(False),
+            query = (
+                select(func.count())
+                .select_from(RunLatestAttempt)
+                .where(RunLatestAttempt.experiment_id == experiment_id, RunLatestAttempt.is_deleted.is_(False))
             )
             if not auth_context.has_admin():
-                query = query.where(Run.created_by == auth_context.user_id)
+                query = query.where(RunLatestAttempt.created_by == auth_context.user_id)
             result = session.execute(query)
             return result.scalar() or 0
 
+    return dbRetryRead(function)
+
+
+def backfill_latest_attempts() -> int:
+    """Point the latest attempt markers at the actual latest attempts, returning how many were fixed.
+
+    Needed for databases with Runs written before the markers were introduced, or by a version
+    of the backend which did not maintain them. Cheap when there is nothing to fix.
+    """
+
+    def function(i: int) -> int:
+        with _jobs_module.sync_session_maker() as session:
+            latest = select(Run.run_id, func.max(Run.attempt_count).label("max_attempt")).group_by(Run.run_id).subquery()
+            stale = (
+                select(Run.run_id, Run.attempt_count, Run.created_by, Run.created_at, Run.experiment_id, Run.is_deleted)
+                .join(latest, (Run.run_id == latest.c.run_id) & (Run.attempt_count == latest.c.max_attempt))
+                .outerjoin(RunLatestAttempt, RunLatestAttempt.run_id == Run.run_id)
+                .where(
+                    or_(
+                        RunLatestAttempt.run_id.is_(None),
+                        RunLatestAttempt.attempt_count != Run.attempt_count,
+                        RunLatestAttempt.is_deleted != Run.is_deleted,
+                    )
+                )
+            )
+            rows = session.execute(stale).all()
+            for row in rows:
+                session.merge(
+                    RunLatestAttempt(
+                        run_id=row.run_id,
+                        attempt_count=row.attempt_count,
+                        created_by=row.created_by,
+                        created_at=row.created_at,
+                        experiment_id=row.experiment_id,
+                        is_deleted=row.is_deleted,
+                    )
+                )
+            session.commit()
+            return len(rows)
+
+    return dbRetry(function)
+
+
+def fail_waiting_runs(error: str) -> int:
+    """Fail the Runs left waiting for runtime artifacts by a previous process, returning how many.
+
+    The compiled Runs waiting for their artifacts are held in memory only, see
+    ``domain.run.artifact_wait``, thus they cannot continue after a restart. To be called at
+    startup, before any Run gets parked.
+    """
+    stmt = update(Run).where(Run.status == "waiting").values(status="failed", error=error[:255], updated_at=current_time("dbref"))
+
+    def function(i: int) -> int:
+        with _jobs_module.sync_session_maker() as session:
+            result = session.execute(stmt)
+            session.commit()
+            failed: int = result.rowcount  # ty:ignore
+            return failed
+
+    return dbRetry(function)
+
+
+# NOTE the functions below are internal system operations of the garbage collector, no actor-level auth
+_finished_statuses: tuple[RunStatus, ...] = ("completed", "failed")
+
+
+def _delete_runs(session: Any, run_ids: list[RunId]) -> None:
+    if run_ids:
+        session.execute(delete(Run).where(Run.run_id.in_(run_ids)))
+        session.execute(delete(RunLatestAttempt).where(RunLatestAttempt.run_id.in_(run_ids)))
+
+
+def purge_deleted_runs(limit: int) -> list[RunId]:
+    """Hard-delete all attempts of at most ``limit`` soft-deleted Runs, returning their ids."""
+
+    def function(i: int) -> list[RunId]:
+        with _jobs_module.sync_session_maker() as session:
+            query = select(RunLatestAttempt.run_id).where(RunLatestAttempt.is_deleted.is_(True)).limit(limit)
+            run_ids = [RunId(str(r[0])) for r in session.execute(query).all()]
+            _delete_runs(session, run_ids)
+            session.commit()
+            return run_ids
+
+    return dbRetry(function)
+
+
+def purge_expired_runs(created_before: dt.datetime, limit: int) -> list[RunId]:
+    """Hard-delete all attempts of at most ``limit`` finished Runs whose latest attempt was created before the cutoff."""
+
+    def function(i: int) -> list[RunId]:
+        with _jobs_module.sync_session_maker() as session:
+            query = (
+                select(RunLatestAttempt.run_id)
+                .join(Run, (Run.run_id == RunLatestAttempt.run_id) & (Run.attempt_count == RunLatestAttempt.attempt_count))
+                .where(RunLatestAttempt.created_at < created_before, Run.status.in_(_finished_statuses))
+                .limit(limit)
+            )
+            run_ids = [RunId(str(r[0])) for r in session.execute(query).all()]
+            _delete_runs(session, run_ids)
+            session.commit()
+            return run_ids
+
+    return dbRetry(function)
+
+
+def purge_excess_attempts(max_attempts: int, limit: int) -> list[tuple[RunId, int]]:
+    """Hard-delete at most ``limit`` finished attempts which are not among the ``max_attempts`` latest
+    ones of their Run, returning their keys. Attempts still running are kept until they finish."""
+
+    def function(i: int) -> list[tuple[RunId, int]]:
+        with _jobs_module.sync_session_maker() as session:
+            query = (
+                select(Run.run_id, Run.attempt_count)
+                .join(RunLatestAttempt, Run.run_id == RunLatestAttempt.run_id)
+                .where(Run.attempt_count <= RunLatestAttempt.attempt_count - max_attempts, Run.status.in_(_finished_statuses))
+                .limit(limit)
+            )
+            rows = session.execute(query).all()
+            for run_id, attempt_count in rows:
+                session.execute(delete(Run).where(Run.run_id == run_id, Run.attempt_count == attempt_count))
+            session.commit()
+            return [(RunId(run_id), attempt_count) for run_id, attempt_count in rows]
+
+    return dbRetry(function)
+
+
+def purge_stored_outputs(
+    updated_before: dt.datetime, min_length: int, limit: int, after: tuple[RunId, int] | None = None
+) -> tuple[int, tuple[RunId, int] | None]:
+    """Drop the stored textual values from the outputs of finished attempts, scanning at most ``limit`` of them.
+
+    Affects only attempts not updated since the cutoff and whose serialized outputs exceed
+    ``min_length`` characters; the output characteristics themselves are kept. Attempts are
+    scanned in key order starting after ``after``. Returns the number of attempts changed, and
+    the key to continue the scan from, None once the scan is complete.
+    """
+
+    def function(i: int) -> tuple[int, tuple[RunId, int] | None]:
+        with _jobs_module.sync_session_maker() as session:
+            query = (
+                select(Run.run_id, Run.attempt_count, Run.outputs)
+                .where(
+                    Run.updated_at < updated_before,
+                    Run.status.in_(_finished_statuses),
+                    func.length(Run.outputs) > min_length,
+                )
+                .order_by(Run.run_id, Run.attempt_count)
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(tuple_(Run.run_id, Run.attempt_count) > tuple_(*(literal(value) for value in after)))
+            rows = session.execute(query).all()
+            purged = 0
+            for run_id, attempt_count, outputs in rows:
+                characteristics = cast(dict[str, dict[str, Any]], (outputs or {}).get("outputs", {}))
+                if all(char.get("value") is None for char in characteristics.values()):
+                    continue
+                stripped = {task_id: {**char, "value": None} for task_id, char in characteristics.items()}
+                stmt = update(Run).where(Run.run_id == run_id, Run.attempt_count == attempt_count).values(outputs={"outputs": stripped})
+                session.execute(stmt)
+                purged += 1
+            session.commit()
+            last = (RunId(str(rows[-1][0])), int(rows[-1][1])) if len(rows) == limit else None
+            return purged, last
+
     return dbRetry(function)
@@ -51,7 +51,7 @@ def fluentNode_to_detail(node: Node, block: BlockInstanceId) -> tuple[TaskId, Ta
 
 
 def store_compilation_detail(run_id: RunId, compilation_detail: CompilationDetail) -> None:
-    """Persist a CompilationDetail for the given run in the in-memory cache.
+    """Persist a CompilationDetail for the given run in the memcache, including its disk tier.
 
     May raise ``TooLargeEntry`` if the detail exceeds cache capacity.
     """
@@ -59,7 +59,7 @@ def store_compilation_detail(run_id: RunId, compilation_detail: CompilationDetai
 
 
 def retrieve_compilation_detail(run_id: RunId) -> CompilationDetail:
-    """Retrieve the CompilationDetail for the given run from the in-memory cache.
+    """Retrieve the CompilationDetail for the given run from the memcache, possibly from its disk tier.
 
     Raises
     ------
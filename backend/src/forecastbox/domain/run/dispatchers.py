@@ -0,0 +1,36 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Registers the run domain's dispatcher handler, auto-discovered by
+`entrypoint.app._discover_dispatchers`.
+
+Settles the runs parked in `domain.run.artifact_wait` whenever an artifact download finishes,
+successfully or not.
+"""
+
+from forecastbox.domain.artifact.events import ArtifactDownloadFinishedEvent
+from forecastbox.domain.run import artifact_wait
+from forecastbox.utility.config import ConcurrentPools
+from forecastbox.utility.dispatcher import DispatcherRegistration, Event
+
+
+def _handle_artifact_download_finished(event: Event) -> None:
+    if not isinstance(event.payload, ArtifactDownloadFinishedEvent):
+        raise TypeError(event.payload.__class__.__name__)
+    artifact_wait.settle()
+
+
+dispatchers = (
+    DispatcherRegistration(
+        handler_id="run.artifact_download_finished",
+        handler_type=ArtifactDownloadFinishedEvent,
+        pool_name=ConcurrentPools.General,
+        handler=_handle_artifact_download_finished,
+    ),
+)
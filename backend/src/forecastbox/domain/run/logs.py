@@ -0,0 +1,125 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Packaging of Run logs into a zip archive, produced incrementally.
+
+The archive is written into an in-memory sink which is drained after every chunk of input, so
+that the memory use is bounded by the chunk size regardless of the size of the logs. The zip
+is written in the streaming flavour -- sizes and checksums follow each member in data
+descriptors -- so nothing needs to be seeked back to.
+
+Log files of a cascade job are named ``job_<job_id>.<host>.<role>.<kind>.txt`` (or without the
+role for host-level processes), alongside the ``gateway.*`` files of the gateway itself.
+"""
+
+import logging
+import os
+import pathlib
+import zipfile
+from collections.abc import Generator, Iterator
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+chunk_size = 256 * 1024
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class LogsFilter:
+    host: str | None = None
+    """Include only the logs of processes of this host, eg `host0` or `host0.w1`, and not those of the gateway or controller"""
+    task: str | None = None
+    """Include only the log lines mentioning this task"""
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting what the ZipFile writes."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def select_log_files(logs_directory: pathlib.Path, cascade_job_id: str, logs_filter: LogsFilter) -> list[pathlib.Path]:
+    """List the log files of the job matching the filter, in a stable order."""
+    job_prefix = f"job_{cascade_job_id}."
+    selected: list[pathlib.Path] = []
+    for name in sorted(os.listdir(logs_directory)):
+        if logs_filter.host is None:
+            if name.startswith("gateway") or name.startswith(job_prefix):
+                selected.append(logs_directory / name)
+        elif name.startswith(f"{job_prefix}{logs_filter.host}."):
+            selected.append(logs_directory / name)
+    return selected
+
+
+def _read_chunks(path: pathlib.Path, task: str | None) -> Iterator[bytes]:
+    with path.open("rb") as f:
+        if task is None:
+            while chunk := f.read(chunk_size):
+                yield chunk
+            return
+        needle = task.encode()
+        batch: list[bytes] = []
+        batch_size = 0
+        for line in f:
+            if needle in line:
+                batch.append(line)
+                batch_size += len(line)
+                if batch_size >= chunk_size:
+                    yield b"".join(batch)
+                    batch, batch_size = [], 0
+        if batch:
+            yield b"".join(batch)
+
+
+def iter_logs_archive(
+    entries: dict[str, bytes],
+    logs_directory: pathlib.Path | None,
+    cascade_job_id: str,
+    logs_filter: LogsFilter,
+    compression_level: int,
+) -> Generator[bytes, None, None]:
+    """Yield consecutive chunks of a zip archive with the given in-memory ``entries`` and the job's log files.
+
+    Failures to read the log files are reported in a ``logs_directory.error.txt`` member rather than
+    raised, because by then a part of the archive may have already been sent out. Compression level 0
+    stores the members uncompressed.
+    """
+    sink = _ChunkSink()
+    compression = zipfile.ZIP_STORED if compression_level == 0 else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(sink, "w", compression=compression, compresslevel=compression_level or None) as zf:  # type: ignore[arg-type]
+        for arcname, content in entries.items():
+            zf.writestr(arcname, content)
+            yield sink.drain()
+        if logs_directory is not None:
+            current = ""
+            try:
+                for path in select_log_files(logs_directory, cascade_job_id, logs_filter):
+                    current = path.name
+                    with zf.open(current, "w", force_zip64=True) as member:
+                        for chunk in _read_chunks(path, logs_filter.task):
+                            member.write(chunk)
+                            if data := sink.drain():
+                                yield data
+            except Exception as e:
+                logger.warning(f"failed to package logs of job {cascade_job_id} at {current!r}: {repr(e)}")
+                zf.writestr("logs_directory.error.txt", f"{current} => {repr(e)}")
+    yield sink.drain()
@@ -0,0 +1,206 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Local on-disk cache of Run outputs retrieved from the gateway.
+
+Entries are keyed by (run_id, attempt_count, task_id) -- a given attempt never changes its
+outputs, so entries are never invalidated, only evicted when the configured size is exceeded
+(least recently used first) or dropped when the Run gets deleted. Serving from a file allows
+streaming and range requests without holding the whole output in memory, and without contacting
+the gateway again.
+
+The sizes and the access order of the entries are kept in memory, built from a single walk of the
+cache directory on first use, so that neither lookups nor stores scan the directory. Entries
+returned by ``lookup`` and ``store`` are pinned until ``release``d, and eviction skips pinned
+entries, so that a file is not removed while being served.
+
+All functions here except ``release`` do blocking filesystem io and are expected to run in a pool.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from cascade.low.core import TaskId
+
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class _Index:
+    """Process-local singleton state, guarded by ``lock``"""
+
+    lock = threading.Lock()
+    root: Path | None = None
+    """The directory the entries were loaded from, reloaded when the configured one differs"""
+    entries: OrderedDict[Path, int] = OrderedDict()
+    """Entry sizes, from the least to the most recently used"""
+    total: int = 0
+    pinned: Counter[Path] = Counter()
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class CachedOutput:
+    path: Path
+    size: int
+    etag: str
+    """Strong validator of the content -- stable because the content of an entry never changes"""
+
+
+def is_enabled() -> bool:
+    return config.backend.output_cache.max_size_mb > 0
+
+
+def _root() -> Path:
+    return Path(config.backend.output_cache.path)
+
+
+def _run_dir(run_id: RunId) -> Path:
+    return _root() / hashlib.sha256(run_id.encode()).hexdigest()[:32]
+
+
+def _entry_key(run_id: RunId, attempt_count: int, task_id: TaskId) -> str:
+    return hashlib.sha256(f"{run_id}/{attempt_count}/{task_id}".encode()).hexdigest()
+
+
+def _entry_path(run_id: RunId, attempt_count: int, task_id: TaskId) -> Path:
+    # NOTE task ids may contain characters unsuitable for filenames, thus the hashing
+    return _run_dir(run_id) / str(attempt_count) / _entry_key(run_id, attempt_count, task_id)
+
+
+def _to_cached(run_id: RunId, attempt_count: int, task_id: TaskId, path: Path, size: int) -> CachedOutput:
+    return CachedOutput(path=path, size=size, etag=f'"{_entry_key(run_id, attempt_count, task_id)[:32]}-{size}"')
+
+
+def _ensure_loaded() -> None:
+    """Must be called under the lock. Entries found on disk are ordered by their modification time"""
+    root = _root()
+    if _Index.root == root:
+        return
+    found: list[tuple[float, int, Path]] = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.startswith(".tmp"):
+                continue
+            entry = Path(dirpath) / filename
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, stat.st_size, entry))
+    _Index.entries = OrderedDict((entry, size) for _, size, entry in sorted(found, key=lambda e: e[0]))
+    _Index.total = sum(_Index.entries.values())
+    _Index.pinned = Counter()
+    _Index.root = root
+
+
+def _forget(entry: Path) -> None:
+    """Must be called under the lock"""
+    _Index.total -= _Index.entries.pop(entry, 0)
+
+
+def lookup(run_id: RunId, attempt_count: int, task_id: TaskId) -> CachedOutput | None:
+    """Return the cached output if present, pinned until ``release``d."""
+    if not is_enabled():
+        return None
+    path = _entry_path(run_id, attempt_count, task_id)
+    with _Index.lock:
+        _ensure_loaded()
+        size = _Index.entries.get(path)
+        if size is None:
+            return None
+        if not path.exists():
+            # NOTE removed behind our back, eg by hand
+            _forget(path)
+            return None
+        _Index.entries.move_to_end(path)
+        _Index.pinned[path] += 1
+    return _to_cached(run_id, attempt_count, task_id, path, size)
+
+
+def store(run_id: RunId, attempt_count: int, task_id: TaskId, content: bytes) -> CachedOutput | None:
+    """Atomically persist an output and evict the least recently used entries if over capacity.
+
+    Returns None if the cache is disabled or the content exceeds the whole capacity, otherwise the
+    stored output, pinned until ``release``d. Raises ``OSError`` if the content cannot be written.
+    """
+    if not is_enabled() or len(content) > _max_size_bytes():
+        return None
+    path = _entry_path(run_id, attempt_count, task_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    with _Index.lock:
+        _ensure_loaded()
+        _forget(path)
+        _Index.entries[path] = len(content)
+        _Index.total += len(content)
+        _Index.pinned[path] += 1
+        _evict_over_capacity()
+    return _to_cached(run_id, attempt_count, task_id, path, len(content))
+
+
+def release(cached: CachedOutput) -> None:
+    """Unpin an output returned by ``lookup`` or ``store`` once it has been served. Does no io."""
+    with _Index.lock:
+        if _Index.pinned[cached.path] <= 1:
+            _Index.pinned.pop(cached.path, None)
+        else:
+            _Index.pinned[cached.path] -= 1
+
+
+def drop_run(run_id: RunId) -> None:
+    """Remove all cached outputs of all attempts of a Run."""
+    _drop_dir(_run_dir(run_id))
+
+
+def drop_attempt(run_id: RunId, attempt_count: int) -> None:
+    """Remove all cached outputs of a single attempt of a Run."""
+    _drop_dir(_run_dir(run_id) / str(attempt_count))
+
+
+def _drop_dir(directory: Path) -> None:
+    with _Index.lock:
+        _ensure_loaded()
+        for entry in [entry for entry in _Index.entries if entry.is_relative_to(directory)]:
+            _forget(entry)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _max_size_bytes() -> int:
+    return config.backend.output_cache.max_size_mb * 1024 * 1024
+
+
+def _evict_over_capacity() -> None:
+    """Must be called under the lock. Pinned entries are skipped, and evicted by a later store once released"""
+    limit = _max_size_bytes()
+    if _Index.total <= limit:
+        return
+    for entry in list(_Index.entries):
+        if _Index.total <= limit:
+            break
+        if _Index.pinned[entry]:
+            continue
+        entry.unlink(missing_ok=True)
+        _forget(entry)
+        logger.debug(f"evicted {entry} from output cache")
@@ -12,10 +12,10 @@
 Owns:
 - compile-and-submit flow (execute),
 - restart flow,
-- status polling with cascade,
+- status polling with cascade, single or batched over many Runs,
 - linked-blueprint lookup,
-- output availability / content lookups,
-- logs packaging.
+- output availability / content lookups, backed by the local output cache,
+- logs packaging, streamed chunk by chunk.
 
 No HTTP exceptions are raised here; callers are responsible for mapping domain
 exceptions (``RunNotFound``, ``RunAccessDenied``) to HTTP responses.
@@ -24,12 +24,17 @@ Authorization is enforced via ``domain.run.db`` which filters / rejects
 based on the supplied ``AuthContext``.
 """
 
+import asyncio
 import logging
+import pathlib
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import asdict
 from functools import partial
 from typing import cast
 
+import orjson
 from cascade.controller.report import JobId
-from cascade.gateway import api, client
+from cascade.gateway import api
 from cascade.low.core import DatasetId, TaskId
 from cascade.low.func import Either
 from fiab_core.fable import BlockInstanceId, is_textual
@@ -40,13 +45,16 @@ import forecastbox.domain.run.db as run_db
 from forecastbox.domain.blueprint.db import BlueprintRecord
 from forecastbox.domain.blueprint.types import BlueprintId
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
-from forecastbox.domain.gateway.exceptions import GatewayExited, GatewayNotStarted
-from forecastbox.domain.gateway.service import get_current_cascade_proc, get_gateway_url
+from forecastbox.domain.gateway import client
+from forecastbox.domain.gateway.exceptions import GatewayError, GatewayExited, GatewayNotStarted
+from forecastbox.domain.gateway.service import get_current_cascade_proc, get_gateway_url, get_logs_directory
+from forecastbox.domain.run import output_cache
 from forecastbox.domain.run.background import execute_background
 from forecastbox.domain.run.cascade import RunOutputCharacteristic, RunOutputs, stored_output_max_length
 from forecastbox.domain.run.db import CompilerRuntimeContext, RunRecord
 from forecastbox.domain.run.detail import retrieve_compilation_detail
 from forecastbox.domain.run.exceptions import CompilationDetailCorrupted, CompilationDetailNotFound, RunNotFound
+from forecastbox.domain.run.logs import LogsFilter, iter_logs_archive
 from forecastbox.domain.run.types import RunId
 from forecastbox.schemata.run import RunStatus
 from forecastbox.utility.auth import AuthContext
@@ -122,11 +130,97 @@ def get_mime_of_output(execution: RunRecord, dataset_id: DatasetId) -> Either[st
     return Either.ok(characteristic.mime_type)
 
 
+async def get_output_content(
+    execution: RunRecord, cascade_job_id: str, dataset_id: DatasetId
+) -> Either[output_cache.CachedOutput | bytes, str]:  # type: ignore[invalid-argument]
+    """Return the content of a Run output, preferably as a file from the local output cache.
+
+    On a cache miss the output is retrieved from the gateway and stored in the cache; the raw
+    bytes are returned only when the cache is disabled or cannot hold the output.
+    """
+    task_id = dataset_id.task
+    cached = await execution_manager.awaitable_submit(
+        ConcurrentPools.Io,
+        TaskName("run.output.lookup"),
+        partial(output_cache.lookup, execution.run_id, execution.attempt_count, task_id),
+    )
+    if cached is not None:
+        return Either.ok(cached)
+
+    try:
+        response = await client.request_response(
+            api.ResultRetrievalRequest(job_id=JobId(cascade_job_id), dataset_id=dataset_id),
+            get_gateway_url(),
+        )
+    except GatewayError as e:
+        return Either.error(f"Result retrieval failed: {e}")
+    response = cast(api.ResultRetrievalResponse, response)
+    if response.error:
+        return Either.error(f"Result retrieval failed: {response.error}")
+    try:
+        decoded = api.decoded_result(response, job=None)  # type: ignore[attr-defined]
+    except Exception as e:
+        return Either.error(f"Result decoding failed: {e}")
+    if not isinstance(decoded, bytes):
+        return Either.error(f"Result decoding failed: expected bytes, got {type(decoded).__name__}")
+
+    try:
+        stored = await execution_manager.awaitable_submit(
+            ConcurrentPools.Io,
+            TaskName("run.output.store"),
+            partial(output_cache.store, execution.run_id, execution.attempt_count, task_id, decoded),
+        )
+    except OSError as e:
+        logger.warning(f"failed to store output {task_id!r} of run {execution.run_id!r} in the cache: {repr(e)}")
+        stored = None
+    return Either.ok(stored if stored is not None else decoded)
+
+
+async def stream_logs_archive(
+    execution: RunRecord, cascade_job_id: str, logs_filter: LogsFilter, compression_level: int
+) -> AsyncIterator[bytes]:
+    """Yield a zip archive with the Run entity, the gateway state of the job, and the job's logs, chunk by chunk.
+
+    Every chunk is produced in the io pool, so that neither the event loop nor the memory holds more
+    than a single chunk of the logs at a time.
+    """
+    try:
+        request = api.JobProgressRequest(job_ids=[JobId(cascade_job_id)])
+        gw_state = (await client.request_response(request, get_gateway_url())).model_dump()
+    except TimeoutError:
+        gw_state = {"progresses": {}, "datasets": {}, "error": "TimeoutError"}
+    except Exception as e:
+        gw_state = {"progresses": {}, "datasets": {}, "error": repr(e)}
+
+    entries = {"db_entity.json": orjson.dumps(asdict(execution)), "gw_state.json": orjson.dumps(gw_state)}
+    maybe_logs_directory = get_logs_directory()
+    if maybe_logs_directory.t is None:
+        entries["logs_directory.error.txt"] = f"logs directory missing: {maybe_logs_directory.e}".encode()
+        logs_directory = None
+    else:
+        logs_directory = pathlib.Path(maybe_logs_directory.t.name)
+
+    chunks = iter_logs_archive(entries, logs_directory, cascade_job_id, logs_filter, compression_level)
+    try:
+        while True:
+            chunk = await execution_manager.awaitable_submit(ConcurrentPools.Io, TaskName("run.logs.chunk"), partial(next, chunks, None))
+            if chunk is None:
+                break
+            if chunk:
+                yield chunk
+    finally:
+        try:
+            chunks.close()
+        except ValueError:
+            # NOTE the consumer went away while a chunk was being produced -- the generator gets closed once collected
+            pass
+
+
 async def get_blueprint_for_execution(blueprint_id: BlueprintId, blueprint_version: int | None) -> BlueprintRecord | None:
     """Retrieve a Blueprint from the jobs store by id and optional version."""
     return cast(
         BlueprintRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "blueprint.get",
             partial(blueprint_db.get_blueprint, blueprint_id, blueprint_version),
         ),
@@ -141,6 +235,7 @@ def submit_run_sync(
     experiment_version: int | None = None,
     compiler_runtime_context: CompilerRuntimeContext = CompilerRuntimeContext(),
     experiment_context: str | None = None,
+    on_finished: Callable[[], None] | None = None,
 ) -> Either[ExecuteResult, str]:  # type: ignore[invalid-argument]
     """Always creates a Run linked to the given Blueprint.
 
@@ -149,7 +244,8 @@ def submit_run_sync(
     When ``run_id`` is supplied the new attempt is appended under
     that existing id (restart semantics); otherwise a fresh id is generated by the
     database layer.  Experiment metadata is stored on the row when provided and
-    preserved on restart.
+    preserved on restart. The ``on_finished`` is called once the background
+    submission completes, successfully or not, or gets cancelled, eg to bound the submissions in flight.
     """
     logger.debug(f"starting blueprint execution {blueprint.blueprint_id}")
     if not blueprint.builder:
@@ -168,19 +264,19 @@ def submit_run_sync(
     )
 
     logger.debug(f"submitting blueprint execution {blueprint.blueprint_id}")
-    execution_manager.submit_monitored(
-        ConcurrentPools.RunSubmission,
-        TaskName("run.submit.execute"),
-        partial(
-            execute_background,
-            new_run_id,
-            attempt_count,
-            created_at,
-            blueprint,
-            compiler_runtime_context,
-            auth_context,
-        ),
+    task = partial(
+        execute_background,
+        new_run_id,
+        attempt_count,
+        created_at,
+        blueprint,
+        compiler_runtime_context,
+        auth_context,
     )
+    future = execution_manager._submit_monitored_receipt(ConcurrentPools.RunSubmission, TaskName("run.submit.execute"), task)
+    if on_finished is not None:
+        # NOTE a done callback rather than within the task, so that it is called also if the task gets cancelled
+        future.add_done_callback(lambda _: on_finished())
 
     return Either.ok(ExecuteResult(run_id=new_run_id, attempt_count=attempt_count))
 
@@ -219,7 +315,7 @@ async def restart_run(run_id: RunId, auth_context: AuthContext) -> Either[Execut
     """
     existing = cast(
         RunRecord,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "run.get",
             partial(run_db.get_run, run_id, auth_context=auth_context),
         ),
@@ -227,7 +323,7 @@ async def restart_run(run_id: RunId, auth_context: AuthContext) -> Either[Execut
 
     blueprint = cast(
         BlueprintRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "blueprint.get",
             partial(blueprint_db.get_blueprint, existing.blueprint_id, existing.blueprint_version),
         ),
@@ -248,8 +344,68 @@ async def restart_run(run_id: RunId, auth_context: AuthContext) -> Either[Execut
     )
 
 
+_pollable_statuses: tuple[RunStatus, ...] = ("submitted", "preparing", "running", "unknown")
+
+
+def _is_pollable(execution: RunRecord) -> bool:
+    return execution.status in _pollable_statuses and bool(execution.cascade_job_id)
+
+
+async def _request_progress(job_ids: list[JobId], detailed_report: bool) -> Either[api.JobProgressResponse, str]:  # type: ignore[invalid-argument]
+    # NOTE dont call with empty job_ids -- the gateway would then report on *all* jobs it knows of
+    try:
+        response = await client.request_response(
+            api.JobProgressRequest(job_ids=job_ids, detailed_report=detailed_report),
+            get_gateway_url(),
+        )
+        return Either.ok(cast(api.JobProgressResponse, response))
+    except TimeoutError:
+        return Either.error("failed to communicate with gateway")
+    except Exception as e:
+        return Either.error(f"internal cascade failure: {repr(e)}")
+
+
 async def poll_and_update(execution: RunRecord, detailed_report: bool = False) -> RunDetail:
     """Poll cascade for a Run's status, update db if changed, and return current detail."""
+    if not _is_pollable(execution):
+        return await _reconcile_with_progress(execution, None)
+
+    task_to_block: dict[TaskId, BlockInstanceId] | None = None
+    warning_error: str | None = None
+    if detailed_report:
+        try:
+            compilation_detail = await asyncio.to_thread(retrieve_compilation_detail, execution.run_id)
+            task_to_block = {task_id: td.block for task_id, td in compilation_detail.task_detail.items()}
+        except (CompilationDetailNotFound, CompilationDetailCorrupted) as e:
+            detailed_report = False
+            warning_error = f"unable to provide completed/planned tasks: {repr(e)}"
+
+    progress = await _request_progress([JobId(cast(str, execution.cascade_job_id))], detailed_report)
+    return await _reconcile_with_progress(execution, progress, task_to_block=task_to_block, warning_error=warning_error)
+
+
+async def poll_and_update_many(executions: Iterable[RunRecord]) -> list[RunDetail]:
+    """Batched variant of ``poll_and_update``, used for listings.
+
+    All non-terminal Runs among ``executions`` are polled with a single gateway request, whose
+    response is then fanned out to each Run exactly as ``poll_and_update`` would do -- so the
+    number of gateway round trips does not grow with the page size. Detailed reports are not
+    supported here. The returned details are in the same order as ``executions``.
+    """
+    executions = list(executions)
+    job_ids = list(dict.fromkeys(JobId(cast(str, e.cascade_job_id)) for e in executions if _is_pollable(e)))
+    progress = await _request_progress(job_ids, detailed_report=False) if job_ids else None
+    return [await _reconcile_with_progress(e, progress if _is_pollable(e) else None) for e in executions]
+
+
+async def _reconcile_with_progress(
+    execution: RunRecord,
+    progress: Either[api.JobProgressResponse, str] | None,  # type: ignore[invalid-argument]
+    task_to_block: dict[TaskId, BlockInstanceId] | None = None,
+    warning_error: str | None = None,
+) -> RunDetail:
+    # progress is None for Runs which were not polled, otherwise it may cover more jobs than just this one.
+    # task_to_block is given iff a detailed report was requested
     run_id = execution.run_id
     actual_attempt = execution.attempt_count
     cascade_job_id = execution.cascade_job_id
@@ -317,116 +473,98 @@ async def poll_and_update(execution: RunRecord, detailed_report: bool = False) -
             resolution=execution.compiler_runtime_context.get("resolution") or None,
         )
 
-    if status in ("submitted", "preparing", "running", "unknown") and cascade_job_id:
-        job_id = JobId(cascade_job_id)
-        warning_error: str | None = None
-        task_to_block: dict[TaskId, BlockInstanceId] | None = None
-        if detailed_report:
-            try:
-                compilation_detail = retrieve_compilation_detail(run_id)
-                task_to_block = {task_id: td.block for task_id, td in compilation_detail.task_detail.items()}
-            except (CompilationDetailNotFound, CompilationDetailCorrupted) as e:
-                detailed_report = False
-                warning_error = f"unable to provide completed/planned tasks: {repr(e)}"
+    if progress is None or not cascade_job_id:
+        return _build()
+    if progress.t is None:
+        return _build(status_override="unknown", error_override=progress.e)
+    response = progress.t
+    job_id = JobId(cascade_job_id)
 
-        try:
-            response = client.request_response(
-                api.JobProgressRequest(job_ids=[job_id], detailed_report=detailed_report),
-                get_gateway_url(),
-            )
-            response = cast(api.JobProgressResponse, response)
-        except TimeoutError:
-            return _build(status_override="unknown", error_override="failed to communicate with gateway")
-        except Exception as e:
-            return _build(status_override="unknown", error_override=f"internal cascade failure: {repr(e)}")
-
-        if job_id in response.datasets:
-            available_task_ids = [x.task for x in response.datasets[job_id]]
+    if job_id in response.datasets:
+        available_task_ids = [x.task for x in response.datasets[job_id]]
 
-        if response.error:
-            return _build(status_override="unknown", error_override=response.error)
+    if response.error:
+        return _build(status_override="unknown", error_override=response.error)
 
-        updated_outputs: RunOutputs | None = None
-        # Fetch and store values for newly available textual outputs.
-        # We compare what cascade reports as available against what is already stored locally,
-        # and fetch any textual (text/plain) outputs that have not been fetched yet.
-        if raw_outputs is not None and job_id in response.datasets:
-            try:
-                outputs_model = RunOutputs.model_validate(raw_outputs)
-                already_fetched = {tid for tid, char in outputs_model.outputs.items() if char.value is not None}
-                cascade_available = {d.task for d in response.datasets[job_id]}
-                for task_id in cascade_available - already_fetched:
-                    char = outputs_model.outputs.get(task_id)
-                    if char is None or not is_textual(char.mime_type):
+    updated_outputs: RunOutputs | None = None
+    # Fetch and store values for newly available textual outputs.
+    # We compare what cascade reports as available against what is already stored locally,
+    # and fetch any textual (text/plain) outputs that have not been fetched yet.
+    if raw_outputs is not None and job_id in response.datasets:
+        try:
+            outputs_model = RunOutputs.model_validate(raw_outputs)
+            already_fetched = {tid for tid, char in outputs_model.outputs.items() if char.value is not None}
+            cascade_available = {d.task for d in response.datasets[job_id]}
+            for task_id in cascade_available - already_fetched:
+                char = outputs_model.outputs.get(task_id)
+                if char is None or not is_textual(char.mime_type):
+                    continue
+                try:
+                    fetch_resp = await client.request_response(
+                        api.ResultRetrievalRequest(job_id=job_id, dataset_id=DatasetId(task=task_id, output="0")),
+                        get_gateway_url(),
+                    )
+                    fetch_resp = cast(api.ResultRetrievalResponse, fetch_resp)  # type: ignore[attr-defined]
+                    if fetch_resp.error:
+                        logger.warning("Failed to fetch value for task %r: %s", task_id, fetch_resp.error)
                         continue
-                    try:
-                        fetch_resp = client.request_response(
-                            api.ResultRetrievalRequest(job_id=job_id, dataset_id=DatasetId(task=task_id, output="0")),
-                            get_gateway_url(),
-                        )
-                        fetch_resp = cast(api.ResultRetrievalResponse, fetch_resp)  # type: ignore[attr-defined]
-                        if fetch_resp.error:
-                            logger.warning("Failed to fetch value for task %r: %s", task_id, fetch_resp.error)
-                            continue
-                        decoded = api.decoded_result(fetch_resp, job=None)  # type: ignore[attr-defined]
-                        if isinstance(decoded, bytes):
-                            char.value = _decode_textual_output(decoded, char.mime_type)
-                            updated_outputs = outputs_model
-                    except Exception as e:
-                        logger.warning("Failed to fetch value for task %r: %r", task_id, e)
-            except Exception as e:
-                logger.warning("Failed to process textual outputs for run %r: %r", run_id, e)
-        if updated_outputs is not None:
-            raw_outputs = updated_outputs.model_dump()
-
-        # NOTE we should check more carefuly in the None branch -- the job_id may not be part of the response
-        # if the job has not started yet -- but we should verify that in the status, etc
-        if task_to_block is not None and response.planned_task_ids is not None and job_id in response.planned_task_ids:
-            # any block that has a task planned is a planned block
-            planned_block_ids = {task_to_block[task_id] for task_id in response.planned_task_ids[job_id]}
-        else:
-            planned_block_ids = None
-        if task_to_block is not None and response.completed_task_ids is not None and job_id in response.completed_task_ids:
-            # any block that has all tasks completed is a completed block
-            uncompleted_task_to_block = {k: v for k, v in task_to_block.items() if k not in response.completed_task_ids[job_id]}
-            completed_block_ids = set(task_to_block.values()) - set(uncompleted_task_to_block.values())
-        else:
-            completed_block_ids = None
-        jobprogress = response.progresses.get(job_id)
-        outputs_kwargs = {"outputs": raw_outputs} if updated_outputs is not None else {}
-        if jobprogress is None:
-            await execution_manager.await_jobs_db(
-                "run.runtime.update",
-                partial(run_db.update_run_runtime, run_id, actual_attempt, status="failed", error="evicted from gateway", **outputs_kwargs),
-            )
-            available_task_ids = [tid for tid, char in updated_outputs.outputs.items() if char.value is not None] if updated_outputs else []
-            pop_memcache(run_id)
-            return _build(status_override="failed", error_override="evicted from gateway")
-        elif jobprogress.failure:
-            await execution_manager.await_jobs_db(
-                "run.runtime.update",
-                partial(run_db.update_run_runtime, run_id, actual_attempt, status="failed", error=jobprogress.failure, **outputs_kwargs),
-            )
-            available_task_ids = [tid for tid, char in updated_outputs.outputs.items() if char.value is not None] if updated_outputs else []
-            pop_memcache(run_id)
-            return _build(status_override="failed", error_override=jobprogress.failure)
-        elif jobprogress.completed or jobprogress.pct == "100.00":
-            await execution_manager.await_jobs_db(
-                "run.runtime.update",
-                partial(run_db.update_run_runtime, run_id, actual_attempt, status="completed", progress="100.00", **outputs_kwargs),
-            )
-            return _build(status_override="completed", progress_override="100.00")
-        else:
-            await execution_manager.await_jobs_db(
-                "run.runtime.update",
-                partial(run_db.update_run_runtime, run_id, actual_attempt, status="running", progress=jobprogress.pct, **outputs_kwargs),
-            )
-            return _build(
-                status_override="running",
-                error_override=warning_error,
-                progress_override=jobprogress.pct,
-                completed_block_ids=completed_block_ids,
-                planned_block_ids=planned_block_ids,
-            )
-
-    return _build()
+                    decoded = api.decoded_result(fetch_resp, job=None)  # type: ignore[attr-defined]
+                    if isinstance(decoded, bytes):
+                        char.value = _decode_textual_output(decoded, char.mime_type)
+                        updated_outputs = outputs_model
+                except Exception as e:
+                    logger.warning("Failed to fetch value for task %r: %r", task_id, e)
+        except Exception as e:
+            logger.warning("Failed to process textual outputs for run %r: %r", run_id, e)
+    if updated_outputs is not None:
+        raw_outputs = updated_outputs.model_dump()
+
+    # NOTE we should check more carefuly in the None branch -- the job_id may not be part of the response
+    # if the job has not started yet -- but we should verify that in the status, etc
+    if task_to_block is not None and response.planned_task_ids is not None and job_id in response.planned_task_ids:
+        # any block that has a task planned is a planned block
+        planned_block_ids = {task_to_block[task_id] for task_id in response.planned_task_ids[job_id]}
+    else:
+        planned_block_ids = None
+    if task_to_block is not None and response.completed_task_ids is not None and job_id in response.completed_task_ids:
+        # any block that has all tasks completed is a completed block
+        uncompleted_task_to_block = {k: v for k, v in task_to_block.items() if k not in response.completed_task_ids[job_id]}
+        completed_block_ids = set(task_to_block.values()) - set(uncompleted_task_to_block.values())
+    else:
+        completed_block_ids = None
+    jobprogress = response.progresses.get(job_id)
+    outputs_kwargs = {"outputs": raw_outputs} if updated_outputs is not None else {}
+    if jobprogress is None:
+        await execution_manager.await_jobs_db(
+            "run.runtime.update",
+            partial(run_db.update_run_runtime, run_id, actual_attempt, status="failed", error="evicted from gateway", **outputs_kwargs),
+        )
+        available_task_ids = [tid for tid, char in updated_outputs.outputs.items() if char.value is not None] if updated_outputs else []
+        await asyncio.to_thread(pop_memcache, run_id)
+        return _build(status_override="failed", error_override="evicted from gateway")
+    elif jobprogress.failure:
+        await execution_manager.await_jobs_db(
+            "run.runtime.update",
+            partial(run_db.update_run_runtime, run_id, actual_attempt, status="failed", error=jobprogress.failure, **outputs_kwargs),
+        )
+        available_task_ids = [tid for tid, char in updated_outputs.outputs.items() if char.value is not None] if updated_outputs else []
+        await asyncio.to_thread(pop_memcache, run_id)
+        return _build(status_override="failed", error_override=jobprogress.failure)
+    elif jobprogress.completed or jobprogress.pct == "100.00":
+        await execution_manager.await_jobs_db(
+            "run.runtime.update",
+            partial(run_db.update_run_runtime, run_id, actual_attempt, status="completed", progress="100.00", **outputs_kwargs),
+        )
+        return _build(status_override="completed", progress_override="100.00")
+    else:
+        await execution_manager.await_jobs_db(
+            "run.runtime.update",
+            partial(run_db.update_run_runtime, run_id, actual_attempt, status="running", progress=jobprogress.pct, **outputs_kwargs),
+        )
+        return _build(
+            status_override="running",
+            error_override=warning_error,
+            progress_override=jobprogress.pct,
+            completed_block_ids=completed_block_ids,
+            planned_block_ids=planned_block_ids,
+        )
@@ -38,9 +38,12 @@ from forecastbox.domain.artifact.manager import ArtifactManager, join_artifact_m
 from forecastbox.domain.experiment.scheduling.background import start_scheduler, stop_scheduler
 from forecastbox.domain.gateway.service import shutdown_processes
 from forecastbox.domain.lens.manager import shutdown_all_lens_instances
+from forecastbox.domain.maintenance.garbage_collector import garbage_collector_entrypoint
+from forecastbox.domain.maintenance.garbage_collector import status as garbage_collector_status
 from forecastbox.domain.notification.service import init_broadcaster
 from forecastbox.domain.plugin.store import submit_initialize_stores
 from forecastbox.domain.plugin.submit import submit_load_all as submit_load_plugins
+from forecastbox.domain.run.db import backfill_latest_attempts, fail_waiting_runs
 from forecastbox.utility.concurrency.manager import execution_manager
 from forecastbox.utility.config import ConcurrentThreads, config, validate_runtime
 from forecastbox.utility.dispatcher import (
@@ -56,9 +59,13 @@ from forecastbox.utility.dispatcher import (
     stop_request as dispatcher_stop_request,
 )
 from forecastbox.utility.fastapi import register_common_exception_handling
+from forecastbox.utility.memcache import flush as flush_memcache
+from forecastbox.utility.metrics import Histogram
+from forecastbox.utility.startup import Phase, StartupPhases, is_ready, run_phases, start_phases, stop_phases
 from forecastbox.utility.tunnel import shutdown as shutdown_tunnels
 
 logger = logging.getLogger(__name__)
+http_latency = Histogram("fiab_http_request_seconds", "Latency of HTTP requests, per route template", ("method", "route", "status"))
 
 
 def _discover_dispatchers() -> None:
@@ -100,55 +107,89 @@ def _start_execution_runtime() -> None:
         stop_request=dispatcher_stop_request,
         stage=0,
     )
+    if config.backend.garbage_collector.enabled:
+        logger.debug("registering database garbage collector thread")
+        execution_manager.register_thread(
+            ConcurrentThreads.DatabaseGarbageCollector,
+            garbage_collector_entrypoint,
+            status_provider=garbage_collector_status,
+            stage=2,
+        )
     execution_manager.start(timeout=config.backend.concurrency.startup_timeout_seconds)
 
 
+async def _create_db_and_tables() -> None:
+    # Import every schemata submodule first, and only then call any discovered
+    # create_db_and_tables. Several domain schema modules share a single Base/engine
+    # (see forecastbox.schemata.jobs) and declare cross-module foreign keys, so all of
+    # them must have registered their ORM classes on that shared metadata before any
+    # create_db_and_tables runs -- calling it mid-iteration could create the database
+    # with tables missing simply because their module hadn't been imported yet.
+    pending_create_db_and_tables = []
+    for module_info in pkgutil.iter_modules(forecastbox.schemata.__path__):
+        module = importlib.import_module(f"forecastbox.schemata.{module_info.name}")
+        if hasattr(module, "create_db_and_tables"):
+            pending_create_db_and_tables.append(module.create_db_and_tables)
+    for create_db_and_tables in pending_create_db_and_tables:
+        result = create_db_and_tables()  # type: ignore[call-non-callable] # NOTE no module protocol
+        if inspect.isawaitable(result):
+            result = await result
+        if result is not None:
+            logger.warning(f"unexpected result from create_db_and_tables: {result.__class__}")
+
+
+def _recover_runs() -> None:
+    if fixed := backfill_latest_attempts():
+        logger.info(f"backfilled latest attempt markers of {fixed} runs")
+    if failed := fail_waiting_runs("Interrupted by a restart while waiting for runtime artifacts"):
+        logger.warning(f"failed {failed} runs left waiting for runtime artifacts by a restart")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.debug(f"Starting FIAB with config: {config}")
     validate_runtime(config)
-    # generic and autodiscoverable inits
+    # generic and autodiscoverable inits -- nothing can be served without these
     try:
-        # Import every schemata submodule first, and only then call any discovered
-        # create_db_and_tables. Several domain schema modules share a single Base/engine
-        # (see forecastbox.schemata.jobs) and declare cross-module foreign keys, so all of
-        # them must have registered their ORM classes on that shared metadata before any
-        # create_db_and_tables runs -- calling it mid-iteration could create the database
-        # with tables missing simply because their module hadn't been imported yet.
-        pending_create_db_and_tables = []
-        for module_info in pkgutil.iter_modules(forecastbox.schemata.__path__):
-            module = importlib.import_module(f"forecastbox.schemata.{module_info.name}")
-            if hasattr(module, "create_db_and_tables"):
-                pending_create_db_and_tables.append(module.create_db_and_tables)
-        for create_db_and_tables in pending_create_db_and_tables:
-            result = create_db_and_tables()  # type: ignore[call-non-callable] # NOTE no module protocol
-            if inspect.isawaitable(result):
-                result = await result
-            if result is not None:
-                logger.warning(f"unexpected result from create_db_and_tables: {result.__class__}")
-        _start_execution_runtime()
+        await run_phases(
+            (
+                Phase(StartupPhases.Database, _create_db_and_tables, inline=True),
+                Phase(StartupPhases.Runtime, _start_execution_runtime, requires=(StartupPhases.Database,), inline=True),
+            )
+        )
     except BaseException:
         execution_manager.shutdown(timeout=config.backend.concurrency.shutdown_timeout_seconds)
         raise
 
-    # domain-specific inits
+    # domain-specific inits -- served while they run, see utility.startup.requires_phases
     try:
         init_broadcaster(asyncio.get_running_loop())
-        if config.backend.allow_scheduler:
-            start_scheduler()
         release_time, release_version = get_local_release()
         app.version = f"{release_version}@{release_time}"
-        submit_initialize_stores()
         ArtifactsProvider.register_get_artifacts_lookup(lambda: ArtifactManager.catalog)
         ArtifactsProvider.register_get_artifact_local_path(
             lambda composite_id: get_artifact_local_path(composite_id, config.backend.data_path)
         )
+        # NOTE submitted right away rather than as phases, so that the plugin operation is
+        # reserved, ie, reported as running, before the first request is served
         catalog_ready = submit_refresh_catalog()
-        submit_load_plugins(start_after=catalog_ready)
+        plugins_loaded = submit_load_plugins(start_after=catalog_ready)
+        phases = [Phase(StartupPhases.Runs, _recover_runs)]
+        if config.backend.allow_scheduler:
+            # NOTE inline, as only starting a thread -- thus never left running on a worker thread past stop_phases
+            phases.append(Phase(StartupPhases.Scheduler, start_scheduler, requires=(StartupPhases.Runs,), inline=True))
+        phases += [
+            Phase(StartupPhases.PluginStores, submit_initialize_stores),
+            Phase(StartupPhases.ArtifactCatalog, lambda: catalog_ready),
+            Phase(StartupPhases.Plugins, lambda: plugins_loaded, requires=(StartupPhases.ArtifactCatalog,)),
+        ]
+        start_phases(phases)
         yield
     finally:
         try:
-            if config.backend.allow_scheduler:
+            await stop_phases()
+            # NOTE the scheduler phase runs inline, so once it has started it is also finished, and ready iff there is a scheduler
+            if config.backend.allow_scheduler and is_ready(StartupPhases.Scheduler):
                 stop_scheduler()
             shutdown_all_lens_instances()
             await shutdown_processes()
@@ -156,6 +197,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             join_artifact_manager(timeout_sec=10)
         finally:
             execution_manager.shutdown(timeout=config.backend.concurrency.shutdown_timeout_seconds)
+            flush_memcache()
 
 
 app = FastAPI(
@@ -195,9 +237,18 @@ app.add_middleware(
 
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
-    start_time = time.time()
-    response = await call_next(request)
-    logger.debug(f"Request took {time.time() - start_time:0.2f} sec")
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start_time
+        # NOTE the route template rather than the path, to keep the label cardinality bounded. Requests
+        # matching no api route are served by the frontend mount
+        route = getattr(request.scope.get("route"), "path", None) or "static"
+        http_latency.observe(elapsed, method=request.method, route=route, status=str(status_code))
+    logger.debug(f"Request took {elapsed:0.2f} sec")
     return response
 
 
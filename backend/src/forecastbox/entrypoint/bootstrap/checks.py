@@ -9,6 +9,7 @@ from cascade.low.func import assert_never
 
 from forecastbox.entrypoint.bootstrap.procs import ChildProcessGroup
 from forecastbox.utility.config import FIABConfig, StatusMessage, _default_plugins
+from forecastbox.utility.startup import StartupPhases
 
 logger = logging.getLogger(__name__)
 
@@ -69,10 +70,38 @@ def check_backend_ready(
         raise
 
 
+def _wait_for_phases(client: httpx.Client, url: str, attempts: int, phases: tuple[StartupPhases, ...]) -> None:
+    """Calls /status/ready endpoint until the phases are finished, for as long as they are pending or
+    running -- only the calls not reaching the backend count against the attempts"""
+    failures = 0
+    while True:
+        try:
+            response: CallResult = client.get(url)
+        except httpx.HTTPError as e:
+            response = e
+        if isinstance(response, httpx.Response) and response.status_code == 503:
+            states = response.json()["phases"]
+            waiting = [phase for phase in phases if states.get(phase, {}).get("state") in ("pending", "running")]
+            if not waiting:
+                return
+            logger.debug(f"waiting for {url}, with phases {waiting} not finished")
+        elif _call_succ(response, url):
+            return
+        else:
+            failures += 1
+            logger.debug(f"waiting for {url}, with {failures}/{attempts} attempts")
+            if failures >= attempts:
+                raise StartupError(f"failure on {url}: no more retries")
+        time.sleep(2)
+
+
 def install_default_plugins(config: FIABConfig) -> None:
-    """Installs default plugins as specified by configs. Log-swallows all exceptions"""
+    """Installs default plugins as specified by configs, once the backend has loaded the plugin stores
+    and the plugins already installed. Log-swallows all exceptions"""
     try:
         with httpx.Client(follow_redirects=True) as client:
+            ready_url = config.backend.local_url() + "/api/v1/status/ready"
+            _wait_for_phases(client, ready_url, 20, (StartupPhases.PluginStores, StartupPhases.Plugins))
             for pluginId in _default_plugins().keys():
                 url = config.backend.local_url() + "/api/v1/plugin/install"
                 try:
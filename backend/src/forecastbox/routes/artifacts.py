@@ -16,9 +16,16 @@ Contains CRUD routes for artifacts (models): list, get, download (which is effec
 from fastapi import APIRouter, Depends, HTTPException
 
 from forecastbox.domain.artifact.base import CompositeArtifactId, MlModelDetail, MlModelOverview
-from forecastbox.domain.artifact.manager import delete_model, get_model_details, list_models, submit_artifact_download
+from forecastbox.domain.artifact.manager import (
+    delete_model,
+    get_artifact_download_progress,
+    get_model_details,
+    list_models,
+    submit_artifact_download,
+)
 from forecastbox.domain.auth.users import UserRead
 from forecastbox.routes.admin import get_admin_user
+from forecastbox.utility.startup import StartupPhases, requires_phases
 
 PREFIX = "/api/v1/artifacts"
 
@@ -28,7 +35,7 @@ router = APIRouter(
 )
 
 
-@router.get("/list_models")
+@router.get("/list_models", dependencies=[Depends(requires_phases(StartupPhases.ArtifactCatalog))])
 def list_models_endpoint() -> list[MlModelOverview]:
     """List all available ML models with overview information."""
     try:
@@ -37,7 +44,7 @@ def list_models_endpoint() -> list[MlModelOverview]:
         raise HTTPException(status_code=503, detail=f"Corresponding internal component is busy")
 
 
-@router.post("/model_details")
+@router.post("/model_details", dependencies=[Depends(requires_phases(StartupPhases.ArtifactCatalog))])
 def get_model_details_endpoint(composite_id: CompositeArtifactId) -> MlModelDetail:
     """Get detailed information for a specific ML model."""
     try:
@@ -49,7 +56,7 @@ def get_model_details_endpoint(composite_id: CompositeArtifactId) -> MlModelDeta
     return detail
 
 
-@router.post("/download_model")
+@router.post("/download_model", dependencies=[Depends(requires_phases(StartupPhases.ArtifactCatalog))])
 def download_model_endpoint(composite_id: CompositeArtifactId, admin: UserRead | None = Depends(get_admin_user)) -> dict[str, str | int]:
     """Submit a download request for a specific ML model or get status of ongoing download."""
     result = submit_artifact_download(composite_id)
@@ -59,7 +66,10 @@ def download_model_endpoint(composite_id: CompositeArtifactId, admin: UserRead |
         elif result.t == 0:
             return {"status": "download submitted", "progress": 0, "composite_id": str(composite_id)}
         else:
-            return {"status": "download in progress", "progress": result.t, "composite_id": str(composite_id)}
+            response: dict[str, str | int] = {"status": "download in progress", "progress": result.t, "composite_id": str(composite_id)}
+            if (detail := get_artifact_download_progress(composite_id)) is not None:
+                response |= {"bytes_per_second": int(detail.bytes_per_second), "retries": detail.retries}
+            return response
     else:
         raise HTTPException(status_code=400, detail=result.e)
 
@@ -68,7 +68,7 @@ from forecastbox.domain.plugin.status import catalogue_view, plugins_ready
 from forecastbox.schemata.blueprint import BlueprintSource
 from forecastbox.utility.auth import AuthContext
 from forecastbox.utility.concurrency.manager import execution_manager
-from forecastbox.utility.pagination import PaginationSpec
+from forecastbox.utility.pagination import KeysetCursor, PaginationSpec
 from forecastbox.utility.pydantic import FiabBaseModel
 from forecastbox.utility.time import value_dt2str
 
@@ -148,6 +148,8 @@ class BlueprintListResponse(FiabBaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: str | None = None
+    """Pass as ``cursor`` to get the next page by keyset; None on the last page"""
 
 
 class BlueprintUpdateRequest(FiabBaseModel):
@@ -331,17 +333,22 @@ async def list_blueprints(
     - ``created_by``: restrict to blueprints owned by this user or plugin.
     - ``source``: restrict to blueprints with this source (``plugin_template``,
       ``user_defined``, or ``oneoff_execution``).  Returns 422 for unknown values.
+    - ``cursor``: paginate by keyset from the ``next_cursor`` of a previous page, instead of by ``page``.
     """
+    try:
+        after = pagination.keyset()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     total = cast(
         int,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "blueprint.count", partial(db.count_blueprints, auth_context=auth_context, created_by=filters.created_by, source=filters.source)
         ),
     )
-    start = pagination.start()
+    start = pagination.start() if after is None else 0
     page_defs = cast(
         list[db.BlueprintLatest],
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "blueprint.list",
             partial(
                 db.list_blueprints,
@@ -350,6 +357,7 @@ async def list_blueprints(
                 limit=pagination.page_size,
                 created_by=filters.created_by,
                 source=filters.source,
+                after=after,
             ),
         ),
     )
@@ -374,7 +382,14 @@ async def list_blueprints(
                 user=defn.created_by,
             )
         )
-    return BlueprintListResponse(blueprints=items, total=total, page=pagination.page, page_size=pagination.page_size)
+    last = KeysetCursor(page_defs[-1].blueprint.created_at, page_defs[-1].blueprint.blueprint_id) if page_defs else None
+    return BlueprintListResponse(
+        blueprints=items,
+        total=total,
+        page=pagination.page,
+        page_size=pagination.page_size,
+        next_cursor=pagination.next_cursor(len(page_defs), last),
+    )
 
 
 @router.post("/update")
@@ -553,12 +568,13 @@ async def list_available_glyphs(
     global_total = 0
     if want_global:
         global_total = cast(
-            int, await execution_manager.await_jobs_db("glyph.count", partial(global_db.count_global_glyphs, auth_context, key=glyph_key))
+            int,
+            await execution_manager.await_jobs_db_read("glyph.count", partial(global_db.count_global_glyphs, auth_context, key=glyph_key)),
         )
         if remainder.current_page_remaining > 0:
             rows = cast(
                 list[global_db.GlobalGlyphRecord],
-                await execution_manager.await_jobs_db(
+                await execution_manager.await_jobs_db_read(
                     "glyph.list",
                     partial(
                         global_db.list_global_glyphs,
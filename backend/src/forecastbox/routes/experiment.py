@@ -33,7 +33,7 @@ from forecastbox.domain.experiment.scheduling.background import start_scheduler,
 from forecastbox.domain.experiment.types import ExperimentDefinitionId
 from forecastbox.domain.run.types import RunId
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.pagination import PaginationSpec
+from forecastbox.utility.pagination import KeysetCursor, PaginationSpec
 from forecastbox.utility.pydantic import FiabBaseModel
 from forecastbox.utility.time import current_time, value_dt2str
 
@@ -100,6 +100,8 @@ class ExperimentListResponse(FiabBaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
+    """Pass as ``cursor`` to get the next page by keyset; None on the last page"""
 
 
 class ExperimentUpdateRequest(FiabBaseModel):
@@ -135,6 +137,8 @@ class ExperimentRunsResponse(FiabBaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
+    """Pass as ``cursor`` to get the next page by keyset; None on the last page"""
 
 
 # ---------------------------------------------------------------------------
@@ -217,8 +221,14 @@ async def list_experiments(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     items = [_experiment_to_detail(row.experiment, row.created_at) for row in experiments]
+    last = KeysetCursor(experiments[-1].experiment.created_at, experiments[-1].experiment.experiment_definition_id) if experiments else None
     return ExperimentListResponse(
-        experiments=items, total=total, page=pagination.page, page_size=pagination.page_size, total_pages=total_pages
+        experiments=items,
+        total=total,
+        page=pagination.page,
+        page_size=pagination.page_size,
+        total_pages=total_pages,
+        next_cursor=pagination.next_cursor(len(experiments), last),
     )
 
 
@@ -310,6 +320,7 @@ async def list_experiment_runs(
     """Return paginated execution rows linked to a cron-schedule experiment."""
     try:
         executions, total, total_pages = await service.get_schedule_runs(auth_context, spec.experiment_id, pagination)
+        executions = list(executions)
     except ExperimentNotFound as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -325,7 +336,15 @@ async def list_experiment_runs(
         )
         for ex in executions
     ]
-    return ExperimentRunsResponse(runs=runs, total=total, page=pagination.page, page_size=pagination.page_size, total_pages=total_pages)
+    last = KeysetCursor(executions[-1].created_at, executions[-1].run_id) if executions else None
+    return ExperimentRunsResponse(
+        runs=runs,
+        total=total,
+        page=pagination.page,
+        page_size=pagination.page_size,
+        total_pages=total_pages,
+        next_cursor=pagination.next_cursor(len(runs), last),
+    )
 
 
 @router.get("/runs/next")
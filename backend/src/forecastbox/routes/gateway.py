@@ -11,7 +11,8 @@
 Gateway operations routes — /gateway/*. Corresponds to operational functions in
 `domain.gateway`, not a persisted user-managed entity.
 
-All routes are purely operational, no ids -- gateway start, status, kill.
+All routes are purely operational, no ids -- gateway start, status, kill. The underlying
+operations block on process management or tunnel commands, so they are offloaded from the loop.
 """
 
 from fastapi import APIRouter, HTTPException
@@ -23,7 +24,8 @@ from forecastbox.domain.gateway.exceptions import (
     GatewayNotStarted,
 )
 from forecastbox.domain.gateway.service import launch_gateway, status_gateway, stop_gateway
-from forecastbox.utility.config import UnmanagedGateway, config
+from forecastbox.utility.concurrency.manager import TaskName, execution_manager
+from forecastbox.utility.config import ConcurrentPools, UnmanagedGateway, config
 
 PREFIX = "/api/v1/gateway"
 
@@ -38,7 +40,7 @@ async def start_gateway() -> str:
     if isinstance(config.cascade.gateway, UnmanagedGateway):
         raise HTTPException(400, "This instance does not manage the gateway")
     try:
-        launch_gateway()
+        await execution_manager.awaitable_submit(ConcurrentPools.General, TaskName("gateway.launch"), launch_gateway)
     except GatewayAlreadyRunning:
         raise HTTPException(400, "Process already running.")
     return "started"
@@ -50,7 +52,7 @@ async def get_status() -> str:
     if isinstance(config.cascade.gateway, UnmanagedGateway):
         return "not managed"
     try:
-        return status_gateway()
+        return await execution_manager.awaitable_submit(ConcurrentPools.General, TaskName("gateway.status"), status_gateway)
     except GatewayNotStarted:
         return "not started"
     except GatewayExited as e:
@@ -62,7 +64,7 @@ async def kill_gateway() -> str:
     if isinstance(config.cascade.gateway, UnmanagedGateway):
         raise HTTPException(400, "This instance does not manage the gateway")
     try:
-        stop_gateway()
+        await execution_manager.awaitable_submit(ConcurrentPools.General, TaskName("gateway.stop"), stop_gateway)
     except GatewayNotRunning:
         raise HTTPException(400, "Gateway is not running")
     return "killed"
@@ -259,14 +259,14 @@ async def list_lens_metadata(
     _validate_lens_id(filters.lens_id)
     total = cast(
         int,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "lens_metadata.count",
             partial(metadata_db.count_lens_metadata, filters.lens_id, auth_context, lens_metadata_id=filters.lens_metadata_id),
         ),
     )
     rows = cast(
         list[metadata_db.LensMetadataRecord],
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "lens_metadata.list",
             partial(
                 metadata_db.list_lens_metadata,
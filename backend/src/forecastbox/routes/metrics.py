@@ -0,0 +1,25 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Metrics route — the process metrics in the Prometheus text format, for scraping"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from forecastbox.utility import metrics
+
+PREFIX = "/metrics"
+
+router = APIRouter(tags=["status"])
+
+
+@router.get("", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    """Latency histograms, counters and gauges of the pools, jobs database, gateway client, dispatcher, caches, plugin imports and HTTP handlers."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.content_type)
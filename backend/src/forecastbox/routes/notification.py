@@ -11,7 +11,8 @@
 
 Contains:
  - a websocket endpoint that clients connect to in order to receive broadcast ClientNotification
-   messages; registration is implicit (connect => registered, disconnect => unregistered),
+   messages; registration is implicit (connect => registered, disconnect => unregistered), and
+   clients may narrow the notifications down to some topics by sending SubscriptionRequest messages,
  - a POST test endpoint that publishes a PlaceholderNotificationEvent through the event dispatcher, purely
    to exercise the dispatch-to-websocket path end to end (used by integration tests).
 """
@@ -19,9 +20,10 @@ Contains:
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import Field, ValidationError
 
 from forecastbox.domain.notification.events import PlaceholderNotificationEvent
-from forecastbox.domain.notification.service import register_client, unregister_client
+from forecastbox.domain.notification.service import register_client, subscribe, unregister_client, unsubscribe
 from forecastbox.utility.dispatcher import Event, EventName, submit_event
 from forecastbox.utility.pydantic import FiabBaseModel
 
@@ -40,13 +42,29 @@ class PlaceholderNotificationResponse(FiabBaseModel):
     status: str
 
 
+class SubscriptionRequest(FiabBaseModel):
+    """Message a websocket client may send to change the topics it receives notifications about."""
+
+    subscribe: list[str] = Field(default_factory=list)
+    unsubscribe: list[str] = Field(default_factory=list)
+
+
 @router.websocket("/ws")
-async def notification_ws(websocket: WebSocket) -> None:
+async def notification_ws(websocket: WebSocket, topics: str | None = None) -> None:
+    """Without any subscribed topics -- given comma-separated in `topics` or later sent in a
+    SubscriptionRequest -- the client receives all notifications."""
     await websocket.accept()
-    register_client(websocket)
+    register_client(websocket, [t for t in (topics or "").split(",") if t])
     try:
         while True:
-            await websocket.receive_text()
+            message = await websocket.receive_text()
+            try:
+                request = SubscriptionRequest.model_validate_json(message)
+            except ValidationError as e:
+                logger.debug(f"ignoring malformed notification websocket message: {repr(e)}")
+                continue
+            subscribe(websocket, request.subscribe)
+            unsubscribe(websocket, request.unsubscribe)
     except WebSocketDisconnect:
         pass
     finally:
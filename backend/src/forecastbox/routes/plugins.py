@@ -37,6 +37,7 @@ from forecastbox.utility.concurrency.manager import execution_manager
 from forecastbox.utility.config import PluginSettings, config
 from forecastbox.utility.packages import get_package_versions
 from forecastbox.utility.pydantic import FiabBaseModel
+from forecastbox.utility.startup import StartupPhases, requires_phases
 
 logger = logging.getLogger(__name__)
 
@@ -145,7 +146,7 @@ def get_plugin_versions(pluginCompositeId: Annotated[PluginCompositeId, Depends(
     return _settings2Versions(*settings_and_source)
 
 
-@router.post("/install")
+@router.post("/install", dependencies=[Depends(requires_phases(StartupPhases.PluginStores))])
 async def install_plugin(pluginCompositeId: PluginCompositeId, admin: UserRead | None = Depends(get_admin_user)) -> Response:
     # TODO possibly add optional version parameter
     await submit_install_single(pluginCompositeId)
@@ -232,7 +233,7 @@ async def get_template_example_values(
     plugin_id_str = PluginCompositeId.to_str(pluginCompositeId)
     plugin_state = cast(
         PluginStateRecord | None,
-        await execution_manager.await_jobs_db(
+        await execution_manager.await_jobs_db_read(
             "plugin.state.get",
             partial(get_plugin_state, plugin_id_str),
         ),
@@ -16,37 +16,36 @@ Contains three categories of routes:
 """
 
 import asyncio
-import io
 import logging
-import os
-import pathlib
-import zipfile
-from dataclasses import asdict
 from functools import partial
 from typing import Annotated, Literal, cast
 
-import orjson
-from cascade.controller.report import JobId
-from cascade.gateway import api, client
+from cascade.gateway import api
 from cascade.low.core import DatasetId, TaskId
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from fastapi.exceptions import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from fiab_core.fable import BlockInstanceId
 from pydantic import Field
+from starlette.types import Receive, Scope, Send
 
 from forecastbox.domain.auth.users import get_auth_context
 from forecastbox.domain.blueprint.types import BlueprintId
-from forecastbox.domain.gateway.service import get_gateway_url, get_logs_directory
-from forecastbox.domain.run import db, service
+from forecastbox.domain.gateway import client
+from forecastbox.domain.gateway.service import get_gateway_url
+from forecastbox.domain.run import db, output_cache, service
 from forecastbox.domain.run.cascade import RunOutputs
 from forecastbox.domain.run.detail import retrieve_compilation_detail
 from forecastbox.domain.run.exceptions import CompilationDetailCorrupted, CompilationDetailNotFound, RunAccessDenied, RunNotFound
+from forecastbox.domain.run.logs import LogsFilter
 from forecastbox.domain.run.types import RunId
 from forecastbox.utility.auth import AuthContext
-from forecastbox.utility.concurrency.manager import execution_manager
+from forecastbox.utility.concurrency.manager import TaskName, execution_manager
+from forecastbox.utility.config import ConcurrentPools
 from forecastbox.utility.httpx import get_encoding
-from forecastbox.utility.pagination import PaginationSpec
+from forecastbox.utility.pagination import KeysetCursor, PaginationSpec
 from forecastbox.utility.pydantic import FiabBaseModel
+from forecastbox.utility.startup import StartupPhases, requires_phases
 
 PREFIX = "/api/v1/run"
 
@@ -55,6 +54,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(
     tags=["execution"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(requires_phases(StartupPhases.Runs))],
 )
 
 
@@ -95,7 +95,7 @@ class RunOutputsResponse(FiabBaseModel):
 
 
 # duplicated from db.py for domain separation
-RunDetailStatus = Literal["submitted", "preparing", "running", "completed", "failed", "unknown"]
+RunDetailStatus = Literal["submitted", "preparing", "waiting", "running", "completed", "failed", "unknown"]
 
 
 class RunDetailResponse(FiabBaseModel):
@@ -123,6 +123,8 @@ class RunListResponse(FiabBaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: str | None = None
+    """Pass as ``cursor`` to get the next page by keyset; None on the last page"""
 
 
 class RunRestartRequest(FiabBaseModel):
@@ -211,7 +213,7 @@ async def _resolve_run_with_cascade(
     try:
         execution = cast(
             db.RunRecord,
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "run.get", partial(db.get_run, execution_spec.run_id, execution_spec.attempt_count, auth_context=auth_context)
             ),
         )
@@ -225,44 +227,25 @@ async def _resolve_run_with_cascade(
     return execution, cascade_job_id
 
 
-async def _build_run_logs_response(cascade_job_id: str, db_entity_ser: bytes) -> Response:
-    try:
-        request = api.JobProgressRequest(job_ids=[JobId(cascade_job_id)])
-        gw_state = client.request_response(request, get_gateway_url()).model_dump()
-    except TimeoutError:
-        gw_state = {"progresses": {}, "datasets": {}, "error": "TimeoutError"}
-    except Exception as e:
-        gw_state = {"progresses": {}, "datasets": {}, "error": repr(e)}
+class _CachedOutputResponse(FileResponse):
+    """Keeps the cached output pinned while streaming it, also if the client disconnects midway"""
+
+    def __init__(self, cached: output_cache.CachedOutput, media_type: str, headers: dict[str, str]) -> None:
+        super().__init__(cached.path, media_type=media_type, headers=headers)
+        self.cached = cached
 
-    def _build_zip() -> tuple[bytes, str]:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         try:
-            buffer = io.BytesIO()
-            with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as zf:
-                zf.writestr("db_entity.json", db_entity_ser)
-                zf.writestr("gw_state.json", orjson.dumps(gw_state))
-                maybe_logs_directory = get_logs_directory()
-                if maybe_logs_directory.t is None:
-                    zf.writestr("logs_directory.error.txt", "logs directory missing: {maybe_logs_directory.e}")
-                else:
-                    p = pathlib.Path(maybe_logs_directory.t.name)
-                    f = ""
-                    try:
-                        for f in os.listdir(p):
-                            j_pref = f"job_{cascade_job_id}"
-                            if f.startswith("gateway") or f.startswith(j_pref):
-                                zf.write(f"{p / f}", arcname=f)
-                    except Exception as e:
-                        zf.writestr("logs_directory.error.txt", f"{f} => {repr(e)}")
-            return buffer.getvalue(), ""
-        except Exception as e:
-            logger.exception("building zip")
-            return b"", repr(e)
-
-    loop = asyncio.get_running_loop()
-    bytez, error = await loop.run_in_executor(None, _build_zip)
-    if not error:
-        return Response(content=bytez, status_code=200, media_type="application/zip")
-    return Response(content=error, status_code=500, media_type="text/plain")
+            await super().__call__(scope, receive, send)
+        finally:
+            output_cache.release(self.cached)
+
+
+def _matches_etag(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
 
 # ---------------------------------------------------------------------------
@@ -296,23 +279,37 @@ async def list_runs(
 ) -> RunListResponse:
     """List the latest attempt of every execution visible to the caller, with pagination.
 
-    Admins see all executions; regular users see only their own.
+    Admins see all executions; regular users see only their own. Non-terminal executions
+    on the page are polled with a single gateway request. Paginated either by ``page`` or
+    by ``cursor``, the latter being cheaper for deep pages.
     """
-    total = cast(int, await execution_manager.await_jobs_db("run.count", partial(db.count_runs, auth_context=auth_context)))
-    start = pagination.start()
+    try:
+        after = pagination.keyset()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = cast(int, await execution_manager.await_jobs_db_read("run.count", partial(db.count_runs, auth_context=auth_context)))
+    start = pagination.start() if after is None else 0
     total_pages = pagination.total_pages(total)
     if start >= total and total > 0:
         raise HTTPException(status_code=404, detail="Page number out of range.")
     executions = list(
         cast(
             list[db.RunRecord],
-            await execution_manager.await_jobs_db(
-                "run.list", partial(db.list_runs, auth_context=auth_context, offset=start, limit=pagination.page_size)
+            await execution_manager.await_jobs_db_read(
+                "run.list", partial(db.list_runs, auth_context=auth_context, offset=start, limit=pagination.page_size, after=after)
             ),
         )
     )
-    details = [_to_run_detail(await service.poll_and_update(e)) for e in executions]
-    return RunListResponse(runs=details, total=total, page=pagination.page, page_size=pagination.page_size, total_pages=total_pages)
+    last = KeysetCursor(executions[-1].created_at, executions[-1].run_id) if executions else None
+    details = [_to_run_detail(d) for d in await service.poll_and_update_many(executions)]
+    return RunListResponse(
+        runs=details,
+        total=total,
+        page=pagination.page,
+        page_size=pagination.page_size,
+        total_pages=total_pages,
+        next_cursor=pagination.next_cursor(len(executions), last),
+    )
 
 
 @router.get("/get")
@@ -323,7 +320,7 @@ async def get_run(
     try:
         execution = cast(
             db.RunRecord,
-            await execution_manager.await_jobs_db(
+            await execution_manager.await_jobs_db_read(
                 "run.get", partial(db.get_run, spec.run_id, spec.attempt_count, auth_context=auth_context)
             ),
         )
@@ -348,7 +345,7 @@ async def get_compilation_detail(
     or cache entry expired).
     """
     try:
-        detail = retrieve_compilation_detail(spec.run_id)
+        detail = await asyncio.to_thread(retrieve_compilation_detail, spec.run_id)
     except CompilationDetailNotFound:
         raise HTTPException(status_code=404, detail=f"Compilation detail for run {spec.run_id!r} not found.")
     except CompilationDetailCorrupted:
@@ -381,7 +378,8 @@ async def delete_run(
     """
     try:
         current = cast(
-            db.RunRecord, await execution_manager.await_jobs_db("run.get", partial(db.get_run, request.run_id, auth_context=auth_context))
+            db.RunRecord,
+            await execution_manager.await_jobs_db_read("run.get", partial(db.get_run, request.run_id, auth_context=auth_context)),
         )
     except RunNotFound:
         raise HTTPException(status_code=404, detail=f"Run {request.run_id!r} not found.")
@@ -398,7 +396,7 @@ async def delete_run(
     spec = RunLookup(run_id=request.run_id, attempt_count=request.attempt_count)
     _, cascade_job_id = await _resolve_run_with_cascade(spec, auth_context)
     try:
-        client.request_response(
+        await client.request_response(
             api.ResultDeletionRequest(datasets={cascade_job_id: []}),  # type: ignore[invalid-argument-type]
             get_gateway_url(),
         )
@@ -409,6 +407,7 @@ async def delete_run(
             await execution_manager.await_jobs_db("run.delete", partial(db.soft_delete_run, request.run_id, auth_context=auth_context))
         except (RunNotFound, RunAccessDenied):
             pass
+        execution_manager.submit_monitored(ConcurrentPools.Io, TaskName("run.output.drop"), partial(output_cache.drop_run, request.run_id))
 
 
 @router.post("/restart")
@@ -423,7 +422,8 @@ async def restart_run(
     """
     try:
         current = cast(
-            db.RunRecord, await execution_manager.await_jobs_db("run.get", partial(db.get_run, request.run_id, auth_context=auth_context))
+            db.RunRecord,
+            await execution_manager.await_jobs_db_read("run.get", partial(db.get_run, request.run_id, auth_context=auth_context)),
         )
     except RunNotFound:
         raise HTTPException(status_code=404, detail=f"Run {request.run_id!r} not found.")
@@ -457,9 +457,14 @@ async def restart_run(
 async def get_run_output_content(
     spec: Annotated[RunLookup, Depends()],
     dataset_id: str,
+    request: Request,
     auth_context: AuthContext = Depends(get_auth_context),
 ) -> Response:
-    """Retrieve the result of a specific output task, encoded as bytes."""
+    """Retrieve the result of a specific output task, encoded as bytes.
+
+    Outputs are served from the local output cache whenever possible, with support for ``Range``
+    requests and ``ETag`` revalidation.
+    """
     execution, cascade_job_id = await _resolve_run_with_cascade(spec, auth_context)
     dataset = DatasetId(task=TaskId(dataset_id), output="0")
 
@@ -478,28 +483,39 @@ async def get_run_output_content(
     mime_result = service.get_mime_of_output(execution, dataset)
     if mime_result.t is None:
         raise HTTPException(500, f"Result mime lookup failed: {mime_result.e}")
-    response = client.request_response(
-        api.ResultRetrievalRequest(job_id=JobId(cascade_job_id), dataset_id=dataset),
-        get_gateway_url(),
-    )
-    response = cast(api.ResultRetrievalResponse, response)
-    if response.error:
-        raise HTTPException(500, f"Result retrieval failed: {response.error}")
-    try:
-        decoded = api.decoded_result(response, job=None)  # type: ignore[attr-defined]
-    except Exception as e:
-        raise HTTPException(500, f"Result decoding failed: {e}")
-    if not isinstance(decoded, bytes):
-        raise HTTPException(500, f"Result decoding failed: expected bytes, got {type(decoded).__name__}")
-    return Response(decoded, media_type=mime_result.t)
+    content = await service.get_output_content(execution, cascade_job_id, dataset)
+    if content.t is None:
+        raise HTTPException(500, content.e)
+    if isinstance(content.t, bytes):
+        return Response(content.t, media_type=mime_result.t)
+    cached = content.t
+    headers = {"etag": cached.etag, "cache-control": "private, no-cache"}
+    if _matches_etag(request.headers.get("if-none-match"), cached.etag):
+        output_cache.release(cached)
+        return Response(status_code=304, headers=headers)
+    # NOTE FileResponse streams the file in chunks, and handles Range and If-Range headers on its own
+    return _CachedOutputResponse(cached, media_type=mime_result.t, headers=headers)
 
 
 @router.get("/logs")
 async def get_run_logs(
     spec: Annotated[RunLookup, Depends()],
+    host: str | None = None,
+    task: str | None = None,
+    compression_level: Annotated[int, Query(ge=0, le=9)] = 6,
     auth_context: AuthContext = Depends(get_auth_context),
-) -> Response:
-    """Return a zip archive of logs for the given execution attempt."""
+) -> StreamingResponse:
+    """Return a zip archive of logs for the given execution attempt.
+
+    The archive is streamed as it is being built. Optionally restricted to the processes of a single
+    ``host`` (eg ``host0``, or ``host0.w1`` for a single worker), and to the log lines mentioning a
+    ``task``. Compression level 0 disables compression.
+    """
     db_entity, cascade_job_id = await _resolve_run_with_cascade(spec, auth_context)
-    entity_dict = asdict(db_entity)
-    return await _build_run_logs_response(cascade_job_id, orjson.dumps(entity_dict))
+    logs_filter = LogsFilter(host=host, task=task)
+    filename = f"logs_{db_entity.run_id}_{db_entity.attempt_count}.zip"
+    return StreamingResponse(
+        service.stream_logs_archive(db_entity, cascade_job_id, logs_filter, compression_level),
+        media_type="application/zip",
+        headers={"content-disposition": f'attachment; filename="{filename}"'},
+    )
@@ -14,13 +14,14 @@ from dataclasses import dataclass
 
 import requests
 from cascade.gateway import api, client
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Response
 
 from forecastbox.domain.experiment.scheduling.background import status_scheduler
 from forecastbox.domain.gateway.service import get_gateway_url
 from forecastbox.domain.plugin.status import status_brief
 from forecastbox.utility.concurrency.manager import ExecutionStatus, execution_manager
 from forecastbox.utility.config import config
+from forecastbox.utility.startup import PhaseStatus, StartupPhases, is_finished, phase_status
 
 PREFIX = "/api/v1/status"
 
@@ -40,6 +41,13 @@ class StatusResponse:
     concurrency: ExecutionStatus
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class ReadinessResponse:
+    ready: bool
+    """Whether every startup phase has finished -- some may have failed, see their states"""
+    phases: dict[StartupPhases, PhaseStatus]
+
+
 @router.get("")
 def get_status(request: Request) -> StatusResponse:
     """Overall system status endpoint."""
@@ -75,3 +83,13 @@ def get_status(request: Request) -> StatusResponse:
         status["ecmwf"] = "down"
 
     return StatusResponse(**status, concurrency=execution_manager.status())
+
+
+@router.get("/ready", responses={503: {"model": ReadinessResponse}})
+def get_readiness(response: Response) -> ReadinessResponse:
+    """States of the startup phases, answering 503 until all have finished."""
+    phases = phase_status()
+    ready = all(is_finished(name) for name in phases)
+    if not ready:
+        response.status_code = 503
+    return ReadinessResponse(ready=ready, phases=phases)
@@ -15,7 +15,7 @@ Shares the jobs database with the other schemata modules in this package -- see
 
 from typing import Literal
 
-from sqlalchemy import JSON, Boolean, Column, Integer, String
+from sqlalchemy import JSON, Boolean, Column, Index, Integer, String
 
 from forecastbox.schemata.jobs import Base
 from forecastbox.utility.time import UTCDateTime
@@ -54,3 +54,8 @@ class Blueprint(Base):
     fiabcore_major = Column(Integer, nullable=False)
 
     is_deleted = Column(Boolean, nullable=False, default=False)
+
+
+# NOTE added after the table itself, thus created for existing databases by ``create_db_and_tables``
+Index("ix_blueprint_latest_version", Blueprint.is_deleted, Blueprint.blueprint_id, Blueprint.version, Blueprint.created_at)
+Index("ix_blueprint_created_at", Blueprint.created_at, Blueprint.blueprint_id)
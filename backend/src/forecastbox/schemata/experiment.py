@@ -19,7 +19,7 @@ declaration.
 
 from typing import Literal
 
-from sqlalchemy import JSON, Boolean, Column, ForeignKeyConstraint, Integer, String
+from sqlalchemy import JSON, Boolean, Column, ForeignKeyConstraint, Index, Integer, String
 
 from forecastbox.schemata.jobs import Base
 from forecastbox.utility.time import UTCDateTime
@@ -63,6 +63,17 @@ class ExperimentDefinition(Base):
     )
 
 
+# NOTE added after the table itself, thus created for existing databases by ``create_db_and_tables``
+Index(
+    "ix_experiment_definition_latest_version",
+    ExperimentDefinition.is_deleted,
+    ExperimentDefinition.experiment_definition_id,
+    ExperimentDefinition.version,
+    ExperimentDefinition.created_at,
+)
+Index("ix_experiment_definition_created_at", ExperimentDefinition.created_at, ExperimentDefinition.experiment_definition_id)
+
+
 class ExperimentNext(Base):
     """Mutable table tracking the next scheduled run time for an experiment.
 
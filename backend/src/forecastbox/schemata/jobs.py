@@ -22,10 +22,16 @@ schemata iteration. See ``entrypoint/app.py`` for why it defers calling any disc
 ``create_db_and_tables`` until *all* schemata submodules have been imported: only then is
 it guaranteed that every ORM class in this package has registered its table on this
 module's ``Base.metadata``.
-# TODO for later: implement garbage collection
+
+Every connection runs in WAL mode with ``synchronous=NORMAL``, so that readers neither block nor
+get blocked by the single writer -- see ``utility/db.py`` for how the writes are serialized.
+The database is created with ``auto_vacuum=INCREMENTAL``, so that the space freed by the garbage
+collector (``domain/maintenance``) can be returned to the filesystem without a full VACUUM.
 """
 
-from sqlalchemy import create_engine
+from typing import Any
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from forecastbox.utility.config import config
@@ -41,6 +47,24 @@ sync_engine = create_engine(
     pool_pre_ping=True,
     connect_args={"check_same_thread": False},
 )
+
+
+@event.listens_for(sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        # NOTE takes effect only for a database without tables yet, see the garbage collector
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={config.db.sqlite_jobdb_busy_timeout_ms}")
+        cursor.execute(f"PRAGMA mmap_size={config.db.sqlite_jobdb_mmap_size_mb * 1024 * 1024}")
+        # NOTE negative value means KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{config.db.sqlite_jobdb_cache_size_mb * 1024}")
+    finally:
+        cursor.close()
+
+
 sync_session_maker = sessionmaker(sync_engine, expire_on_commit=False)
 
 
@@ -50,5 +74,11 @@ def create_db_and_tables() -> None:
     Relies on every per-domain schemata module having already been imported (and thus
     having registered its ORM classes on ``Base.metadata``) by the time this is called --
     see the entrypoint's schemata discovery for how that is guaranteed.
+
+    Indexes declared later than their table are created here too -- ``create_all`` creates indexes
+    only together with tables which do not exist yet.
     """
     Base.metadata.create_all(sync_engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_engine, checkfirst=True)
@@ -15,12 +15,12 @@ Shares the jobs database with the other schemata modules in this package -- see
 
 from typing import Literal
 
-from sqlalchemy import JSON, Boolean, Column, ForeignKeyConstraint, Integer, String
+from sqlalchemy import JSON, Boolean, Column, ForeignKeyConstraint, Index, Integer, String
 
 from forecastbox.schemata.jobs import Base
 from forecastbox.utility.time import UTCDateTime
 
-RunStatus = Literal["submitted", "preparing", "running", "completed", "failed", "unknown"]
+RunStatus = Literal["submitted", "preparing", "waiting", "running", "completed", "failed", "unknown"]
 
 
 class Run(Base):
@@ -67,3 +67,31 @@ class Run(Base):
             ["blueprint.blueprint_id", "blueprint.version"],
         ),
     )
+
+
+# NOTE added after the table itself, thus created for existing databases by ``create_db_and_tables``
+Index("ix_run_status_updated_at", Run.status, Run.updated_at)
+
+
+class RunLatestAttempt(Base):
+    """Materialized pointer to the latest attempt of every Run.
+
+    Lets Runs be listed without aggregating over all their attempts. Maintained by
+    ``domain.run.db`` in the same transaction as every new attempt or deletion, and carries
+    copies of those columns of the latest attempt which the listings filter and order by.
+    """
+
+    __tablename__ = "run_latest_attempt"
+
+    run_id = Column(String(255), primary_key=True, nullable=False)
+    attempt_count = Column(Integer, nullable=False)
+    created_by = Column(String(255), nullable=False)
+    created_at = Column(UTCDateTime, nullable=False)
+    experiment_id = Column(String(255), nullable=True)
+    is_deleted = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_run_latest_attempt_listing", "is_deleted", "created_at", "run_id"),
+        Index("ix_run_latest_attempt_created_by", "created_by", "is_deleted", "created_at", "run_id"),
+        Index("ix_run_latest_attempt_experiment", "experiment_id", "is_deleted", "created_at", "run_id"),
+    )
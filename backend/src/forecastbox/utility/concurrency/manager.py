@@ -24,6 +24,7 @@ from typing import Any, NewType, Protocol, TypeVar, cast, runtime_checkable
 from pydantic import BaseModel, ConfigDict, SerializeAsAny
 
 from forecastbox.utility.config import ConcurrentPools, ConcurrentThreads, config
+from forecastbox.utility.metrics import Gauge, Histogram
 from forecastbox.utility.pydantic import FiabBaseModel
 from forecastbox.utility.structural import freeze_mapping
 
@@ -161,6 +162,8 @@ class ExecutionStatus(StatusModel):
 
 
 _worker_context = threading.local()
+_queue_wait = Histogram("fiab_pool_queue_wait_seconds", "Time from submission to a managed pool until the task starts", ("pool",))
+_execution_time = Histogram("fiab_pool_execution_seconds", "Execution time of tasks in a managed pool", ("pool",))
 
 
 class ManagedPool:
@@ -232,12 +235,15 @@ class ManagedPool:
                 raise SubmissionRejected(f"pool is not accepting submissions: {self.pool_name.value}")
             self._submitted += 1
             self._pending += 1
+        submitted_at = time.monotonic()
 
         def wrapped() -> T:
             _worker_context.pool_name = self.pool_name
             with self._lock:
                 self._pending -= 1
                 self._active += 1
+            started_at = time.monotonic()
+            _queue_wait.observe(started_at - submitted_at, pool=self.pool_name.value)
             try:
                 result = task()
                 if inspect.iscoroutine(result):
@@ -245,6 +251,7 @@ class ManagedPool:
                     raise TypeError(f"task returned a coroutine: {task_name}")
                 return cast(T, result)
             finally:
+                _execution_time.observe(time.monotonic() - started_at, pool=self.pool_name.value)
                 with self._lock:
                     self._active -= 1
 
@@ -584,6 +591,14 @@ class ExecutionManager:
         """
         return await self.awaitable_submit(ConcurrentPools.JobsDb, TaskName(task_name), task)
 
+    async def await_jobs_db_read(self, task_name: str, task: SyncTask[T]) -> T:
+        """Like ``await_jobs_db``, but for jobs-DB calls that only read, submitted to ``ConcurrentPools.JobsDbRead``.
+
+        Reads do not take the jobs-DB write lock, so they run concurrently with each other and
+        with the writer. Submitting a call which writes here is a bug.
+        """
+        return await self.awaitable_submit(ConcurrentPools.JobsDbRead, TaskName(task_name), task)
+
     def submit_after(
         self,
         dependency: Future[Any],
@@ -666,3 +681,13 @@ class FutureCancelledError(RuntimeError):
 
 
 execution_manager = ExecutionManager(config.backend.concurrency.failure_history_size)
+
+
+def _pool_tasks() -> dict[tuple[str, ...], float]:
+    pools = execution_manager.status().pools
+    return {(pool_name.value, state): getattr(pool, state) for pool_name, pool in pools.items() for state in ("pending", "active")} | {
+        (pool_name.value, "capacity"): pool.max_pending for pool_name, pool in pools.items()
+    }
+
+
+Gauge("fiab_pool_tasks", "Tasks pending and running in a managed pool, and its admission capacity", _pool_tasks, ("pool", "state"))
@@ -48,6 +48,7 @@ class ConcurrentPools(StrEnum):
     ArtifactIo = "artifact-io"
     PluginManagement = "plugin-management"
     JobsDb = "jobs-db"
+    JobsDbRead = "jobs-db-read"
 
 
 class ConcurrentThreads(StrEnum):
@@ -69,6 +70,7 @@ def _default_concurrency_pools() -> dict[ConcurrentPools, PoolSettings]:
         ConcurrentPools.ArtifactIo: PoolSettings(max_workers=1, max_pending=64),
         ConcurrentPools.PluginManagement: PoolSettings(max_workers=1, max_pending=16),
         ConcurrentPools.JobsDb: PoolSettings(max_workers=1, max_pending=128),
+        ConcurrentPools.JobsDbRead: PoolSettings(max_workers=4, max_pending=128),
     }
 
 
@@ -78,6 +80,12 @@ class ConcurrencySettings(FiabBaseModel):
     startup_timeout_seconds: float = Field(default=10, gt=0)
     shutdown_timeout_seconds: float = Field(default=10, gt=0)
 
+    @model_validator(mode="after")
+    def default_missing_pools(self) -> Self:
+        """Pools added in later versions get their defaults in configs listing the pools explicitly"""
+        self.pools = _default_concurrency_pools() | self.pools
+        return self
+
     # TODO this actually can be default pydantic validator, not needed to be runtime-only
     def validate_runtime(self) -> list[str]:
         errors: list[str] = []
@@ -86,7 +94,7 @@ class ConcurrencySettings(FiabBaseModel):
         if configured_pools != required_pools:
             missing = sorted(pool.value for pool in required_pools - configured_pools)
             unexpected = sorted(pool.value for pool in configured_pools - required_pools)
-            errors.append(f"pools must contain exactly the six required identifiers: missing={missing}, unexpected={unexpected}")
+            errors.append(f"pools must contain exactly the required identifiers: missing={missing}, unexpected={unexpected}")
         for pool_name in (ConcurrentPools.JobsDb, ConcurrentPools.ArtifactIo, ConcurrentPools.PluginManagement):
             pool = self.pools.get(pool_name)
             if pool is not None and pool.max_workers != 1:
@@ -96,6 +104,85 @@ class ConcurrencySettings(FiabBaseModel):
 
 class DispatcherSettings(FiabBaseModel):
     queue_capacity: int = Field(default=1024, gt=0)
+    max_in_flight_events: int = Field(default=8, gt=0)
+    """Events whose handlers may run at the same time, the intake queue is not drained further until one finishes"""
+
+
+class OutputCacheSettings(FiabBaseModel):
+    path: str = str(fiab_home / "output_cache")
+    """Local directory where retrieved Run outputs are kept, so that repeated downloads skip the gateway"""
+    max_size_mb: int = Field(default=4096, ge=0)
+    """Total size of the cached outputs, least recently stored are evicted beyond it. Zero disables the cache"""
+
+
+class ArtifactDownloadSettings(FiabBaseModel):
+    segments: int = Field(default=4, gt=0)
+    """Parallel ranged requests a single artifact download is split into, if the server supports them"""
+    min_segment_mb: int = Field(default=64, gt=0)
+    """Artifacts are not split into segments smaller than this"""
+    retries: int = Field(default=5, ge=0)
+    """Retries of a segment after transient network or server errors, each resuming where the previous attempt stopped"""
+
+
+class NotificationSettings(FiabBaseModel):
+    client_queue_size: int = Field(default=256, gt=0)
+    """Notifications queued for a single websocket client, the oldest are dropped beyond it"""
+    coalesce_interval_seconds: float = Field(default=1.0, gt=0)
+    """Notifications with a coalescing key are delivered at most this often, only the latest one per key"""
+    send_timeout_seconds: float = Field(default=10.0, gt=0)
+    """A websocket client not accepting a notification within this time is disconnected"""
+
+
+class PluginImportSettings(FiabBaseModel):
+    lazy: bool = True
+    """Whether plugins imported before are registered from their stored catalogue, and imported only once their blocks are used"""
+    manifest_path: str = str(fiab_home / "plugin_manifests")
+    """Local directory where the catalogues and templates of imported plugins are kept"""
+    workers: int = Field(default=8, gt=0)
+    """Plugins imported at the same time during the initial load"""
+
+
+class MemcacheSettings(FiabBaseModel):
+    max_size_mb: int = Field(default=1024, gt=0)
+    """Estimated total size of the in-memory cache entries, least recently used are evicted beyond it"""
+    spill_path: str = str(fiab_home / "memcache")
+    """Local directory of the disk tier, keeping serializable entries across evictions and restarts"""
+    spill_max_size_mb: int = Field(default=256, ge=0)
+    """Total size of the disk tier, least recently used are evicted beyond it. Zero disables the disk tier"""
+
+
+class GarbageCollectorSettings(FiabBaseModel):
+    enabled: bool = True
+    """Whether the database garbage collector thread should be started"""
+    interval_seconds: float = Field(default=3600, gt=0)
+    """Pause between two consecutive collection passes"""
+    batch_size: int = Field(default=200, gt=0)
+    """Rows affected by a single transaction -- the write lock is released between batches"""
+    batch_pause_seconds: float = Field(default=0.05, ge=0)
+    """Pause between batches, to let other writers in"""
+    purge_deleted: bool = True
+    """Hard-delete soft-deleted Runs, and soft-deleted Blueprints once nothing references them"""
+    run_max_age_days: int = Field(default=0, ge=0)
+    """Delete finished Runs whose latest attempt is older than this. Zero keeps them forever"""
+    run_max_attempts: int = Field(default=0, ge=0)
+    """Keep only this many latest attempts of every Run. Zero keeps all of them"""
+    output_purge_after_days: int = Field(default=0, ge=0)
+    """Drop the stored textual outputs of Run attempts not updated for this long. Zero keeps them forever"""
+    output_purge_min_kb: int = Field(default=64, ge=0)
+    """Only outputs of attempts whose stored outputs are larger than this are dropped"""
+    vacuum_pages: int = Field(default=1000, ge=0)
+    """Free pages returned to the filesystem by the incremental vacuum after every pass. Zero disables it"""
+
+
+class SchedulerSettings(FiabBaseModel):
+    catch_up: Literal["skip", "latest", "all"] = "all"
+    """Which of the runs of an experiment due while the scheduler was not running to submit -- all,
+    only the most recent one, or none. Runs older than the experiment's max acceptable delay are never submitted"""
+    catch_up_max_runs: int = Field(default=100, ge=0)
+    """Upper bound on the runs of a single experiment submitted at once under the `all` policy, most recent are kept"""
+    max_concurrent_submissions: int = Field(default=16, gt=0)
+    """Scheduled runs being compiled and submitted at once on the run-submission pool -- keep below its max_pending
+    to leave room for interactive submissions"""
 
 
 class DatabaseSettings(FiabBaseModel):
@@ -103,6 +190,12 @@ class DatabaseSettings(FiabBaseModel):
     """Location of the sqlite file for user auth+info"""
     sqlite_jobdb_path: str = str(fiab_home / "job.db")
     """Location of the sqlite file for the jobs persistence layer: experiments, schedules, executions"""
+    sqlite_jobdb_mmap_size_mb: int = Field(default=256, ge=0)
+    """Memory-mapped io window of the jobs database connections, zero disables it"""
+    sqlite_jobdb_cache_size_mb: int = Field(default=32, gt=0)
+    """Page cache size of each of the jobs database connections"""
+    sqlite_jobdb_busy_timeout_ms: int = Field(default=5000, ge=0)
+    """How long a connection waits for a lock held by another connection or process, before failing"""
 
     def validate_runtime(self) -> list[str]:
         errors = []
@@ -209,6 +302,26 @@ def _default_plugin_stores() -> PluginStoresConfig:
     }
 
 
+class PackageIndexSettings(FiabBaseModel):
+    url: str = "https://pypi.org/pypi"
+    """Base of the package index JSON API, queried as `{url}/{package}/json` for the versions of plugins"""
+    local_path: str | None = None
+    """Local directory in the simple repository layout -- a subdirectory per normalized package name with its
+    distribution files. When set, versions are discovered there only, without any network access"""
+    cache_path: str = str(fiab_home / "package_index")
+    """Local directory where the index responses are kept"""
+    cache_ttl_seconds: float = Field(default=3600, ge=0)
+    """Cached responses younger than this are used without asking the index, older are revalidated by their
+    ETag and Last-Modified. Zero always revalidates"""
+    max_concurrent_lookups: int = Field(default=8, gt=0)
+    """Packages whose versions are looked up at the same time"""
+
+    def validate_runtime(self) -> list[str]:
+        if self.local_path is not None and not os.path.isdir(self.local_path):
+            return [f"not a directory: local_path={self.local_path}"]
+        return []
+
+
 class ArtifactStoreConfig(FiabBaseModel):
     url: str
     method: Literal["file", "gittag"]
@@ -260,6 +373,7 @@ class ProductSettings(FiabBaseModel):
 class ExternalServicesSettings(FiabBaseModel):
     plugins: PluginsSettings = Field(default_factory=_default_plugins)
     plugin_stores: PluginStoresConfig = Field(default_factory=_default_plugin_stores)
+    package_index: PackageIndexSettings = Field(default_factory=PackageIndexSettings)
     artifact_stores: ArtifactStoresConfig = Field(default_factory=_default_artifact_stores)
     model_repository: str = "https://sites.ecmwf.int/repository/fiab"
     """URL to the model repository."""
@@ -282,11 +396,22 @@ class BackendSettings(FiabBaseModel):
     """Whether we assume that a system-level service has been registered. Affects entrypoint.main behaviour"""
     allow_scheduler: bool = False
     """Whether scheduler thread should be started. Best combine with allow_service=True"""
+    scheduler: SchedulerSettings = Field(default_factory=SchedulerSettings)
     launch_browser: bool = True
     """Whether a browser window should be opened after start. Used only when
     entrypoint.main.launch_all module is used"""
     concurrency: ConcurrencySettings = Field(default_factory=ConcurrencySettings)
     dispatcher: DispatcherSettings = Field(default_factory=DispatcherSettings)
+    output_cache: OutputCacheSettings = Field(default_factory=OutputCacheSettings)
+    memcache: MemcacheSettings = Field(default_factory=MemcacheSettings)
+    artifact_download: ArtifactDownloadSettings = Field(default_factory=ArtifactDownloadSettings)
+    notification: NotificationSettings = Field(default_factory=NotificationSettings)
+    plugin_import: PluginImportSettings = Field(default_factory=PluginImportSettings)
+    compilation_cache: bool = True
+    """Whether compiled blueprints are reused by later runs with the same resolved configuration and plugin versions"""
+    validation_cache_size: int = Field(default=4096, ge=0)
+    """Max number of block validation results kept for incremental blueprint re-validation, 0 disables"""
+    garbage_collector: GarbageCollectorSettings = Field(default_factory=GarbageCollectorSettings)
 
     def local_url(self) -> str:
         return f"http://localhost:{self.uvicorn_port}"
@@ -366,11 +491,19 @@ class CascadeConstraints(FiabBaseModel):
     """Max number of workers per host for Cascade."""
 
 
+class GatewayClientSettings(FiabBaseModel):
+    timeout_ms: int = Field(default=1000, gt=0)
+    """How long the backend waits for a gateway response before considering the request failed."""
+    max_idle_sockets: int = Field(default=8, gt=0)
+    """How many connected sockets are kept around for reuse by subsequent gateway requests."""
+
+
 class CascadeSettings(FiabBaseModel):
     gateway: UnmanagedGateway | LocalGateway | RemoteGateway = Field(
         discriminator="gateway_type", default_factory=lambda: LocalGateway(gateway_type="local")
     )
     constraints: CascadeConstraints = Field(default_factory=CascadeConstraints)
+    client: GatewayClientSettings = Field(default_factory=GatewayClientSettings)
 
     def validate_runtime(self) -> list[str]:
         errors = []
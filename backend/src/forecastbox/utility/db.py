@@ -10,8 +10,12 @@
 """Synchronous locking, retries, and session helpers for jobs persistence.
 
 The lock in this module is a synchronous ``threading.RLock`` that serializes all
-in-process access to the jobs SQLite database. The administrative users database
-has its own separate async lock and retry helper in ``domain.auth.db``.
+in-process writes to the jobs SQLite database -- sqlite supports only a single writer.
+Reads do not take the lock: the database runs in WAL mode, in which readers see the
+last committed state without waiting for the writer. Any function which writes, even
+if it reads first, must go through ``dbRetry``; purely reading functions should use
+``dbRetryRead``. The administrative users database has its own separate async lock
+and retry helper in ``domain.auth.db``.
 """
 
 import logging
@@ -20,13 +24,18 @@ import time
 from collections.abc import Callable
 from typing import Any, TypeVar
 
+import sqlalchemy
 import sqlalchemy.exc
 
+from forecastbox.utility.metrics import Histogram
+
 logger = logging.getLogger(__name__)
 retries = 3
-# This lock is for jobs persistence only. The users database has a separate lock.
+# This lock is for jobs persistence writes only. The users database has a separate lock.
 lock = threading.RLock()
 T = TypeVar("T")
+lock_wait = Histogram("fiab_jobs_db_lock_wait_seconds", "Time spent waiting for the jobs database write lock")
+query_time = Histogram("fiab_jobs_db_query_seconds", "Duration of a jobs database call, per attempt, excluding the lock wait", ("kind",))
 
 # TODO integrate with sqlalchemy typing system
 
@@ -34,7 +43,22 @@ T = TypeVar("T")
 def dbRetry(func: Callable[[int], T]) -> T:
     for i in range(retries, -1, -1):
         try:
+            waiting_since = time.perf_counter()
             with lock:
+                lock_wait.observe(time.perf_counter() - waiting_since)
+                with query_time.time(kind="write"):
+                    return func(i)
+        except sqlalchemy.exc.OperationalError:
+            if i == 0:
+                raise
+            time.sleep(0.1)
+    raise ValueError  # NOTE in case of retries misconfig, we dont want implicit None
+
+
+def dbRetryRead(func: Callable[[int], T]) -> T:
+    for i in range(retries, -1, -1):
+        try:
+            with query_time.time(kind="read"):
                 return func(i)
         except sqlalchemy.exc.OperationalError:
             if i == 0:
@@ -68,6 +92,24 @@ def querySingle(query: Any, session_maker: Any) -> Any:
             maybe_row = result.first()
             return maybe_row if maybe_row is None else maybe_row[0]
 
+    return dbRetryRead(func)
+
+
+def incrementalVacuum(pages: int, session_maker: Any) -> int:
+    """Return up to ``pages`` free pages to the filesystem, returning how many were freed.
+
+    Frees nothing unless the database was created with ``auto_vacuum=INCREMENTAL``.
+    """
+
+    def func(i: int) -> int:
+        with session_maker() as session:
+            before = session.execute(sqlalchemy.text("PRAGMA freelist_count")).scalar_one()
+            session.commit()
+            # NOTE the pragma frees a single page per step, and only the script execution steps it to completion
+            session.connection().connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+            after = session.execute(sqlalchemy.text("PRAGMA freelist_count")).scalar_one()
+            return int(before) - int(after)
+
     return dbRetry(func)
 
 
@@ -6,7 +6,15 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
-"""Process-local event dispatcher with bounded intake."""
+"""Process-local event dispatcher with bounded intake.
+
+Handlers are resolved per payload type, once -- a payload type is matched against every
+registration on its first occurrence only, and later events of the same type reuse the result.
+Events are pipelined: the dispatcher thread submits the handlers of an event and moves on to the
+next one without waiting for them, up to ``max_in_flight_events`` events at a time. Invocations of
+the same handler thus run concurrently, unless its registration is ``ordered`` -- then they run one
+at a time, in the order of the events.
+"""
 
 import asyncio
 import inspect
@@ -14,7 +22,7 @@ import logging
 import threading
 import time
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from concurrent.futures import Future
 from dataclasses import dataclass
 from functools import partial
@@ -28,6 +36,7 @@ from forecastbox.utility.concurrency.manager import (
     execution_manager,
 )
 from forecastbox.utility.config import ConcurrentPools, DispatcherSettings, config
+from forecastbox.utility.metrics import Gauge
 from forecastbox.utility.structural import freeze_recursively
 
 logger = logging.getLogger(__name__)
@@ -54,6 +63,19 @@ class DispatcherRegistrationError(DispatcherError):
     """Raised for invalid dispatcher registrations."""
 
 
+_freezing: dict[type, bool] = {}
+_container_types = (Mapping, list, tuple, set, frozenset)
+
+
+def _freeze_payload(payload: object) -> object:
+    # NOTE payloads are typically frozen dataclasses, which freezing returns as they are
+    payload_type = type(payload)
+    needs_freezing = _freezing.get(payload_type)
+    if needs_freezing is None:
+        needs_freezing = _freezing[payload_type] = issubclass(payload_type, _container_types)
+    return freeze_recursively(payload) if needs_freezing else payload
+
+
 @dataclass(frozen=True, eq=True, slots=True)
 class Event:
     """An event payload containing stable plain data, never runtime resources.
@@ -67,7 +89,7 @@ class Event:
     payload: object
 
     def __post_init__(self) -> None:
-        object.__setattr__(self, "payload", freeze_recursively(self.payload))
+        object.__setattr__(self, "payload", _freeze_payload(self.payload))
 
 
 @dataclass(frozen=True, eq=True, slots=True)
@@ -76,6 +98,8 @@ class DispatcherRegistration:
     handler_type: type
     pool_name: ConcurrentPools
     handler: Callable[[Event], None]
+    ordered: bool = False
+    """Whether invocations for successive events must not overlap, running in the order of the events"""
 
 
 @dataclass(frozen=True, eq=True, slots=True)
@@ -97,6 +121,20 @@ class AggregateDispatchError(DispatcherError):
         super().__init__(f"handlers failed for event {result.event_name}: {', '.join(result.failed_handlers)}")
 
 
+class HandlerStatus(StatusModel):
+    handler_id: str
+    pool_name: ConcurrentPools
+    ordered: bool
+    queue_depth: int
+    """Invocations submitted but not yet started"""
+    running: int
+    completed: int
+    failed: int
+    latency_seconds_total: float
+    """Summed over the finished invocations, from the dispatch of the event to the end of the handler"""
+    latency_seconds_max: float
+
+
 class DispatcherStatus(StatusModel):
     state: str
     accepting: bool
@@ -109,8 +147,10 @@ class DispatcherStatus(StatusModel):
     completed: int
     failed: int
     in_flight_handlers: int
+    in_flight_events: int
     queue_failures: tuple[str, ...]
     aggregate_failures: tuple[str, ...]
+    handlers: tuple[HandlerStatus, ...]
 
     def is_ready(self) -> bool:
         return self.running
@@ -125,6 +165,61 @@ class _QueuedEvent:
 _SENTINEL = object()
 
 
+def _supports_subclass_check(handler_type: type) -> bool:
+    # NOTE runtime_checkable protocols with data members only support isinstance checks
+    try:
+        issubclass(object, handler_type)
+    except TypeError:
+        return False
+    return True
+
+
+class _Handler:
+    """A registration with its invocation metrics, and the backlog if it is ordered. Guarded by the dispatcher lock."""
+
+    def __init__(self, registration: DispatcherRegistration) -> None:
+        self.registration = registration
+        self.by_subclass = _supports_subclass_check(registration.handler_type)
+        self.backlog: deque[_Invocation] = deque()
+        self.draining = False
+        self.queue_depth = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def status(self) -> HandlerStatus:
+        return HandlerStatus(
+            handler_id=self.registration.handler_id,
+            pool_name=self.registration.pool_name,
+            ordered=self.registration.ordered,
+            queue_depth=self.queue_depth,
+            running=self.running,
+            completed=self.completed,
+            failed=self.failed,
+            latency_seconds_total=self.latency_total,
+            latency_seconds_max=self.latency_max,
+        )
+
+
+@dataclass
+class _PendingDispatch:
+    """An event whose handlers have not all finished yet. Guarded by the dispatcher lock."""
+
+    queued: _QueuedEvent
+    handler_ids: tuple[str, ...]
+    dispatched_at: float
+    remaining: int
+    failures: list[str]
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class _Invocation:
+    handler: _Handler
+    pending: _PendingDispatch
+
+
 class EventDispatcher:
     """Owns registration, queueing, and dispatch for one process-local runtime."""
 
@@ -133,7 +228,12 @@ class EventDispatcher:
         self.settings = settings
         self._queue: Queue[_QueuedEvent | object] = Queue(maxsize=settings.queue_capacity)
         self._lock = threading.RLock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = threading.BoundedSemaphore(settings.max_in_flight_events)
         self._registrations: dict[str, DispatcherRegistration] = {}
+        self._handlers: dict[str, _Handler] = {}
+        self._by_payload_type: dict[type, tuple[_Handler, ...]] = {}
+        self._instance_checked: tuple[_Handler, ...] = ()
         self._frozen = False
         self._state = "new"
         self._stop_event: threading.Event | None = None
@@ -143,6 +243,7 @@ class EventDispatcher:
         self._completed = 0
         self._failed = 0
         self._in_flight_handlers = 0
+        self._in_flight_events = 0
         self._queue_failures: deque[str] = deque(maxlen=100)
         self._aggregate_failures: deque[str] = deque(maxlen=100)
 
@@ -161,6 +262,10 @@ class EventDispatcher:
             if registration.handler_id in self._registrations:
                 raise DispatcherRegistrationError(f"duplicate dispatcher handler id: {registration.handler_id}")
             self._registrations[registration.handler_id] = registration
+            handler = _Handler(registration)
+            self._handlers[registration.handler_id] = handler
+            if not handler.by_subclass:
+                self._instance_checked += (handler,)
 
     def freeze(self) -> None:
         with self._lock:
@@ -192,50 +297,131 @@ class EventDispatcher:
         receipt = self.submit(event)
         return await asyncio.wrap_future(receipt)
 
+    def _resolve(self, payload: object) -> tuple[_Handler, ...]:
+        """Assumes lock held"""
+        payload_type = type(payload)
+        handlers = self._by_payload_type.get(payload_type)
+        if handlers is None:
+            handlers = tuple(
+                handler
+                for handler in self._handlers.values()
+                if handler.by_subclass and issubclass(payload_type, handler.registration.handler_type)
+            )
+            self._by_payload_type[payload_type] = handlers
+        if self._instance_checked:
+            handlers += tuple(handler for handler in self._instance_checked if isinstance(payload, handler.registration.handler_type))
+        return handlers
+
     def _dispatch(self, queued: _QueuedEvent) -> None:
+        """Submit the handlers of the event, without waiting for them unless too many events are in flight."""
+        self._in_flight.acquire()
         event = queued.event
         with self._lock:
-            registrations = tuple(
-                registration for registration in self._registrations.values() if isinstance(event.payload, registration.handler_type)
+            handlers = self._resolve(event.payload)
+            self._in_flight_handlers += len(handlers)
+            self._dispatched += len(handlers)
+            self._in_flight_events += 1
+            pending = _PendingDispatch(
+                queued=queued,
+                handler_ids=tuple(handler.registration.handler_id for handler in handlers),
+                dispatched_at=time.monotonic(),
+                remaining=len(handlers),
+                failures=[],
             )
-            self._in_flight_handlers += len(registrations)
-            self._dispatched += len(registrations)
-
-        failures: list[str] = []
-        futures: list[tuple[str, Future[object]]] = []
-        for registration in registrations:
-            try:
-                handler_task = partial(registration.handler, event)
-                future = self.manager._submit_monitored_receipt(
-                    registration.pool_name,
-                    TaskName(f"dispatch:{registration.handler_id}"),
-                    handler_task,
-                )
-                futures.append((registration.handler_id, cast(Future[object], future)))
-            except BaseException as error:
-                failures.append(registration.handler_id)
+            for handler in handlers:
+                handler.queue_depth += 1
+        if not handlers:
+            self._finish(pending)
+            return
+
+        for handler in handlers:
+            invocation = _Invocation(handler, pending)
+            if handler.registration.ordered:
                 with self._lock:
-                    self._aggregate_failures.append(f"{registration.handler_id}: {error!r}")
-
-        for handler_id, future in futures:
+                    handler.backlog.append(invocation)
+                    if handler.draining:
+                        continue
+                    handler.draining = True
+                task = partial(self._drain, handler)
+            else:
+                task = partial(self._invoke, invocation)
             try:
-                future.result()
+                self.manager._submit_monitored_receipt(
+                    handler.registration.pool_name,
+                    TaskName(f"dispatch:{handler.registration.handler_id}"),
+                    task,
+                )
             except BaseException as error:
-                failures.append(handler_id)
-                with self._lock:
-                    self._aggregate_failures.append(f"{handler_id}: {error!r}")
+                if handler.registration.ordered:
+                    with self._lock:
+                        failed = list(handler.backlog)
+                        handler.backlog.clear()
+                        handler.draining = False
+                else:
+                    failed = [invocation]
+                for failed_invocation in failed:
+                    with self._lock:
+                        handler.queue_depth -= 1
+                    self._complete(failed_invocation, time.monotonic(), error)
+
+    def _invoke(self, invocation: _Invocation) -> None:
+        handler = invocation.handler
+        with self._lock:
+            handler.queue_depth -= 1
+            handler.running += 1
+        error: BaseException | None = None
+        try:
+            handler.registration.handler(invocation.pending.queued.event)
+        except BaseException as e:
+            error = e
+            logger.debug(f"dispatcher handler {handler.registration.handler_id} failed: {repr(e)}")
+        with self._lock:
+            handler.running -= 1
+        self._complete(invocation, time.monotonic(), error)
 
-        result = DispatchResult(event.name, tuple(registration.handler_id for registration in registrations), tuple(failures))
+    def _drain(self, handler: _Handler) -> None:
+        while True:
+            with self._lock:
+                if not handler.backlog:
+                    handler.draining = False
+                    return
+                invocation = handler.backlog.popleft()
+            self._invoke(invocation)
+
+    def _complete(self, invocation: _Invocation, finished_at: float, error: BaseException | None) -> None:
+        handler, pending = invocation.handler, invocation.pending
+        handler_id = handler.registration.handler_id
+        latency = finished_at - pending.dispatched_at
         with self._lock:
-            self._in_flight_handlers -= len(registrations)
-            if failures:
+            handler.latency_total += latency
+            handler.latency_max = max(handler.latency_max, latency)
+            self._in_flight_handlers -= 1
+            if error is None:
+                handler.completed += 1
+            else:
+                handler.failed += 1
+                pending.failures.append(handler_id)
+                self._aggregate_failures.append(f"{handler_id}: {error!r}")
+            pending.remaining -= 1
+            finished = pending.remaining == 0
+        if finished:
+            self._finish(pending)
+
+    def _finish(self, pending: _PendingDispatch) -> None:
+        event = pending.queued.event
+        result = DispatchResult(event.name, pending.handler_ids, tuple(pending.failures))
+        with self._lock:
+            if pending.failures:
                 self._failed += 1
             else:
                 self._completed += 1
-        if failures:
-            queued.receipt.set_exception(AggregateDispatchError(result))
+            self._in_flight_events -= 1
+            self._idle.notify_all()
+        self._in_flight.release()
+        if pending.failures:
+            pending.queued.receipt.set_exception(AggregateDispatchError(result))
         else:
-            queued.receipt.set_result(result)
+            pending.queued.receipt.set_result(result)
 
     def entrypoint(self, stop_event: threading.Event) -> None:
         with self._lock:
@@ -266,6 +452,9 @@ class EventDispatcher:
             finally:
                 self._queue.task_done()
         with self._lock:
+            # NOTE the handlers of already dispatched events are given until the drain deadline
+            timeout = None if self._drain_deadline is None else max(self._drain_deadline - time.monotonic(), 0)
+            self._idle.wait_for(lambda: self._in_flight_events == 0, timeout=timeout)
             self._state = "stopped"
             self._stop_event = None
 
@@ -295,8 +484,10 @@ class EventDispatcher:
                 completed=self._completed,
                 failed=self._failed,
                 in_flight_handlers=self._in_flight_handlers,
+                in_flight_events=self._in_flight_events,
                 queue_failures=tuple(self._queue_failures),
                 aggregate_failures=tuple(self._aggregate_failures),
+                handlers=tuple(handler.status() for handler in self._handlers.values()),
             )
 
 
@@ -336,3 +527,19 @@ def stop_request(timeout: float) -> None:
 
 def status() -> DispatcherStatus:
     return _current_dispatcher().status()
+
+
+def _queue_metrics() -> dict[tuple[str, ...], float]:
+    current = status()
+    return {("depth",): current.queue_depth, ("capacity",): current.queue_capacity, ("in_flight",): current.in_flight_events}
+
+
+Gauge(
+    "fiab_event_dispatcher_queue", "Events queued in the dispatcher, its capacity, and the events being handled", _queue_metrics, ("state",)
+)
+Gauge(
+    "fiab_event_handler_queue",
+    "Handler invocations submitted but not yet started",
+    lambda: {(handler.handler_id,): handler.queue_depth for handler in status().handlers},
+    ("handler",),
+)
@@ -7,28 +7,67 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
-"""Backend-global size-limited in-memory cache."""
-
+"""Backend-global size-limited in-memory cache, with an optional disk tier.
+
+The in-memory tier is an LRU -- both ``insert`` and ``get`` make the entry the most recently
+used one -- with optional per-entry expiry. Entry sizes are estimates, computed once at insert
+by walking the value and sampling large containers, so that the cost does not grow with them.
+
+Entries whose value is a pydantic model are written to the disk tier, if it is enabled, when
+evicted from memory -- and by ``flush`` at backend shutdown. A ``get`` missing in memory falls back
+to the disk tier, validating the stored json against the requested type -- thus such entries
+survive both evictions and backend restarts. The disk tier is size-limited too, evicting the least
+recently used files, and cleared when written by another version of the backend, as the models of
+its entries may have changed since. Its sizes and recency are read from the directory once, and
+then kept in memory.
+"""
+
+import hashlib
 import logging
+import os
 import sys
+import tempfile
 import threading
+import time
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 from collections.abc import Set as AbstractSet
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, TypeVar, cast
 
-from pyrsistent import pmap
-from pyrsistent.typing import PMap
+import orjson
+from pydantic import BaseModel
+
+from forecastbox.utility.config import config
+from forecastbox.utility.metrics import Counter
+from forecastbox.utility.packages import try_version
 
 T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
+# NOTE containers larger than this have their size extrapolated from this many of their items
+sample_size = 32
+
+lookups = Counter(
+    "fiab_memcache_lookups", "Memcache lookups by the tier they were found in, the ratio of hits to all is the hit ratio", ("result",)
+)
+
 
 class TooLargeEntry(ValueError):
     """Raised when a single cache entry exceeds cache capacity."""
 
 
+def _children_size(children: Sequence[Any] | list[Any], total: int, seen: set[int]) -> int:
+    if total <= sample_size:
+        return sum(_deep_sizeof(child, seen) for child in children)
+    sampled = sum(_deep_sizeof(child, seen) for child in children[:sample_size])
+    return sampled * total // sample_size
+
+
 def _deep_sizeof(value: Any, seen: set[int] | None = None) -> int:
+    """Estimate the memory used by the value and everything reachable from it."""
     if seen is None:
         seen = set()
 
@@ -39,24 +78,18 @@ def _deep_sizeof(value: Any, seen: set[int] | None = None) -> int:
 
     size = sys.getsizeof(value)
 
-    if isinstance(value, Mapping):
-        for key, child in value.items():
-            size += _deep_sizeof(key, seen)
-            size += _deep_sizeof(child, seen)
-        return size
-
     if isinstance(value, (str, bytes, bytearray, memoryview)):
         return size
 
+    if isinstance(value, Mapping):
+        items = list(value.items()) if len(value) <= sample_size else [item for _, item in zip(range(sample_size), value.items())]
+        return size + _children_size([part for item in items for part in item], 2 * len(value), seen)
+
     if isinstance(value, Sequence):
-        for child in value:
-            size += _deep_sizeof(child, seen)
-        return size
+        return size + _children_size(value, len(value), seen)
 
     if isinstance(value, AbstractSet):
-        for child in value:
-            size += _deep_sizeof(child, seen)
-        return size
+        return size + _children_size([child for _, child in zip(range(sample_size), value)], len(value), seen)
 
     if hasattr(value, "__dict__"):
         size += _deep_sizeof(vars(value), seen)
@@ -71,63 +104,274 @@ def _deep_sizeof(value: Any, seen: set[int] | None = None) -> int:
     return size
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float | None
+    """Wall clock time, so that it stays meaningful for the disk tier across restarts"""
+    spill: bool = False
+    """Whether to write the entry to the disk tier once evicted from memory"""
+
+    def is_expired(self, now: float) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
+
 class _MemoryCache:
     def __init__(self) -> None:
         self.lock = threading.Lock()
-        self.lookup: PMap[Any, Any] = pmap()
-        self.sizes: PMap[Any, int] = pmap()
-        self.lru: list[Any] = []
-        self.max_size = 1024 * 1024 * 1024
+        self.entries: OrderedDict[Any, _Entry] = OrderedDict()
+        """Ordered from the least to the most recently used"""
+        self.max_size = config.backend.memcache.max_size_mb * 1024 * 1024
         self.current_size = 0
 
-    def _remove_key(self, key: Any) -> None:
-        try:
-            value_size = self.sizes[key]
-            self.current_size -= value_size
-            self.sizes = self.sizes.remove(key)
-            self.lookup = self.lookup.remove(key)
-            self.lru.remove(key)
-        except Exception as e:
-            logger.warning(f"failure during cache removal of {key}, cache may be inconsistent! {repr(e)}")
+    @property
+    def lru(self) -> list[Any]:
+        """Keys ordered from the most to the least recently used"""
+        with self.lock:
+            return list(reversed(self.entries))
+
+    def _remove_key(self, key: Any) -> _Entry | None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.current_size -= entry.size
+        return entry
+
+    def _put(self, key: Any, entry: _Entry) -> list[tuple[Any, _Entry]]:
+        """Returns the evicted entries, for the caller to write to the disk tier once the lock is released"""
+        self._remove_key(key)
+        evicted: list[tuple[Any, _Entry]] = []
+        while self.current_size + entry.size > self.max_size:
+            if not self.entries:
+                raise RuntimeError("cache eviction failed: no entries left but capacity is still exceeded")
+            evict_key, evict_entry = self.entries.popitem(last=False)
+            self.current_size -= evict_entry.size
+            evicted.append((evict_key, evict_entry))
+            logger.debug(f"evicted {evict_key!r} from memcache")
+        self.entries[key] = entry
+        self.current_size += entry.size
+        return evicted
 
 
 _CACHE = _MemoryCache()
+_spill_lock = threading.Lock()
+
 
+def _spill_enabled() -> bool:
+    return config.backend.memcache.spill_max_size_mb > 0
 
-def insert(key: Any, value: Any) -> None:
+
+class _SpillDir:
+    checked: Path | None = None
+    """The disk tier directory already checked to be written by this version of the backend"""
+    sizes: OrderedDict[str, int] = OrderedDict()
+    """Sizes of the files in the checked directory, ordered from the least to the most recently used"""
+    total: int = 0
+
+
+def _spill_dir() -> Path:
+    directory = Path(config.backend.memcache.spill_path)
+    if _SpillDir.checked != directory:
+        with _spill_lock:
+            if _SpillDir.checked != directory:
+                _clear_other_version(directory)
+                _index_spill_dir(directory)
+                _SpillDir.checked = directory
+    return directory
+
+
+def _index_spill_dir(directory: Path) -> None:
+    entries: list[tuple[float, str, int]] = []
+    for path in directory.iterdir():
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, path.name, stat.st_size))
+    _SpillDir.sizes = OrderedDict((name, size) for _, name, size in sorted(entries))
+    _SpillDir.total = sum(_SpillDir.sizes.values())
+
+
+def _clear_other_version(directory: Path) -> None:
+    marker = directory / ".version"
+    version = try_version("forecast-in-a-box", "forecastbox")
+    try:
+        if marker.read_text() == version:
+            return
+    except FileNotFoundError:
+        pass
+    if directory.exists():
+        logger.info(f"clearing disk memcache {directory}, written by another version of the backend")
+        for path in directory.iterdir():
+            path.unlink(missing_ok=True)
+    directory.mkdir(parents=True, exist_ok=True)
+    marker.write_text(version)
+
+
+def _spill_path(key: Any) -> Path:
+    # NOTE keys are arbitrary hashables, their repr is expected to be stable across restarts
+    return _spill_dir() / hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def _spill(key: Any, entry: _Entry) -> None:
+    path = _spill_path(key)
+    with _spill_lock:
+        if path.name in _SpillDir.sizes:
+            # NOTE the file holds this very value, as inserting a key drops its file
+            _SpillDir.sizes.move_to_end(path.name)
+            return
+    header = orjson.dumps({"key": repr(key), "expires_at": entry.expires_at})
+    content = header + b"\n" + cast(BaseModel, entry.value).model_dump_json().encode()
+    if len(content) > config.backend.memcache.spill_max_size_mb * 1024 * 1024:
+        return
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    with _spill_lock:
+        _SpillDir.total += len(content) - _SpillDir.sizes.pop(path.name, 0)
+        _SpillDir.sizes[path.name] = len(content)
+        _evict_spilled_over_capacity(path.parent)
+
+
+def _evict_spilled_over_capacity(directory: Path) -> None:
+    """Expects the spill lock to be held. Keeps the most recently used file even if over capacity"""
+    limit = config.backend.memcache.spill_max_size_mb * 1024 * 1024
+    while _SpillDir.total > limit and len(_SpillDir.sizes) > 1:
+        name, size = _SpillDir.sizes.popitem(last=False)
+        _SpillDir.total -= size
+        (directory / name).unlink(missing_ok=True)
+
+
+def _spill_all(entries: list[tuple[Any, _Entry]]) -> None:
+    now = time.time()
+    for key, entry in entries:
+        if not entry.spill or entry.is_expired(now):
+            continue
+        try:
+            _spill(key, entry)
+        except OSError as e:
+            logger.warning(f"failed to write {key!r} to the disk memcache: {repr(e)}")
+
+
+def _drop_spilled(path: Path) -> None:
+    with _spill_lock:
+        size = _SpillDir.sizes.pop(path.name, None)
+        if size is None:
+            return
+        _SpillDir.total -= size
+    path.unlink(missing_ok=True)
+
+
+def _unspill(key: Any, value_type: type[T]) -> _Entry | None:
+    path = _spill_path(key)
+    with _spill_lock:
+        if path.name not in _SpillDir.sizes:
+            return None
+        _SpillDir.sizes.move_to_end(path.name)
+    try:
+        header, body = path.read_bytes().split(b"\n", 1)
+        meta = orjson.loads(header)
+        if meta["key"] != repr(key):
+            return None
+        entry = _Entry(value=cast(type[BaseModel], value_type).model_validate_json(body), size=0, expires_at=meta["expires_at"], spill=True)
+    except FileNotFoundError:
+        _drop_spilled(path)
+        return None
+    except Exception as e:
+        logger.warning(f"dropping unreadable disk memcache entry for {key!r}: {repr(e)}")
+        _drop_spilled(path)
+        return None
+    if entry.is_expired(time.time()):
+        _drop_spilled(path)
+        return None
+    # NOTE for the recency to survive restarts, when the index is read from the directory again
+    os.utime(path)
+    return entry
+
+
+def insert(key: Any, value: Any, ttl_seconds: float | None = None, spill: bool = True) -> None:
+    """Insert or replace an entry, making it the most recently used one.
+
+    If ``ttl_seconds`` is given, the entry is treated as missing once that time elapses. Pydantic
+    model values are written to the disk tier once evicted from memory, unless ``spill`` is False.
+    Raises ``TooLargeEntry`` if the entry would not fit in the cache even when empty.
+    """
     entry_size = _deep_sizeof((key, value))
     if entry_size > _CACHE.max_size:
         raise TooLargeEntry(f"value is too large for cache capacity: {entry_size} > {_CACHE.max_size}")
+    entry = _Entry(
+        value=value,
+        size=entry_size,
+        expires_at=None if ttl_seconds is None else time.time() + ttl_seconds,
+        spill=spill and isinstance(value, BaseModel),
+    )
 
     with _CACHE.lock:
-        if key in _CACHE.lookup:
-            _CACHE._remove_key(key)
+        evicted = _CACHE._put(key, entry)
 
-        while _CACHE.current_size + entry_size > _CACHE.max_size:
-            if not _CACHE.lru:
-                raise RuntimeError("cache eviction failed: no entries left but capacity is still exceeded")
-            evict_key = _CACHE.lru[-1]
-            _CACHE._remove_key(evict_key)
-
-        _CACHE.lookup = _CACHE.lookup.set(key, value)
-        _CACHE.sizes = _CACHE.sizes.set(key, entry_size)
-        _CACHE.lru.insert(0, key)
-        _CACHE.current_size += entry_size
+    if _spill_enabled():
+        # NOTE the disk tier may hold a previous value of the key
+        _drop_spilled(_spill_path(key))
+        _spill_all(evicted)
 
 
 def pop(key: Any) -> Any | None:
-    if key in _CACHE.lookup:
-        with _CACHE.lock:
-            if key in _CACHE.lookup:
-                value = _CACHE.lookup[key]
-                _CACHE._remove_key(key)
-                return value
-            else:
-                return None
+    """Remove an entry from both tiers, returning its in-memory value if present."""
+    if _spill_enabled():
+        _drop_spilled(_spill_path(key))
+    with _CACHE.lock:
+        entry = _CACHE._remove_key(key)
+    if entry is None or entry.is_expired(time.time()):
+        return None
+    return entry.value
 
 
 def get(key: Any, value_type: type[T]) -> T:
-    value = _CACHE.lookup[key]
+    """Return the entry, making it the most recently used one.
+
+    Raises ``KeyError`` if the entry is neither in memory nor in the disk tier, or has expired,
+    and ``TypeError`` if it is not of the ``value_type``.
+    """
+    with _CACHE.lock:
+        entry = _CACHE.entries.get(key)
+        if entry is not None:
+            if entry.is_expired(time.time()):
+                _CACHE._remove_key(key)
+                entry = None
+            else:
+                _CACHE.entries.move_to_end(key)
+                lookups.inc(result="memory")
+    if entry is None:
+        if not (_spill_enabled() and isinstance(value_type, type) and issubclass(value_type, BaseModel)):
+            lookups.inc(result="miss")
+            raise KeyError(key)
+        entry = _unspill(key, value_type)
+        if entry is None:
+            lookups.inc(result="miss")
+            raise KeyError(key)
+        lookups.inc(result="disk")
+        entry = _Entry(value=entry.value, size=_deep_sizeof((key, entry.value)), expires_at=entry.expires_at, spill=True)
+        if entry.size <= _CACHE.max_size:
+            with _CACHE.lock:
+                evicted = _CACHE._put(key, entry)
+            _spill_all(evicted)
+    value = entry.value
     if not isinstance(value, value_type):
         raise TypeError(f"cache entry for {key!r} has type {type(value).__name__}, expected {value_type.__name__}")
     return cast(T, value)
+
+
+def flush() -> None:
+    """Write the entries still in memory to the disk tier, for them to survive a restart of the backend."""
+    if not _spill_enabled():
+        return
+    with _CACHE.lock:
+        entries = list(_CACHE.entries.items())
+    _spill_all(entries)
@@ -0,0 +1,204 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Process-local counters, histograms and gauges, rendered in the Prometheus text exposition format.
+
+Counters and histograms are updated by the instrumented code itself, from any thread, each under
+its own lock. Gauges are not stored -- they are computed by a callback at rendering time from
+the status snapshots the components already provide. All metrics register themselves at
+construction, which is expected to happen at module import.
+"""
+
+import contextlib
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+
+LabelValues = tuple[str, ...]
+
+# NOTE in seconds, spanning a sub-millisecond db read to a minutes-long plugin install
+default_buckets: tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _Metric:
+    kind: str
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        _registry.register(self)
+
+    def _label_values(self, labels: Mapping[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> Iterator[tuple[str, LabelValues, tuple[tuple[str, str], ...], float]]:
+        """Yields the suffix, label values, extra labels and value of every sample"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape_help(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self._samples():
+            pairs = [*zip(self.labelnames, values), *extra]
+            labels = "{" + ",".join(f'{name}="{_escape_label(label)}"' for name, label in pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Exposed with the conventional ``_total`` suffix appended to its name"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(f"{name}_total", documentation, labelnames)
+        self.values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self.lock:
+            return self.values.get(self._label_values(labels), 0.0)
+
+    def _samples(self) -> Iterator[tuple[str, LabelValues, tuple[tuple[str, str], ...], float]]:
+        with self.lock:
+            values = dict(self.values)
+        for key, value in sorted(values.items()):
+            yield "", key, (), value
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self, buckets: int) -> None:
+        self.bucket_counts = [0] * buckets
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = default_buckets) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = _HistogramSeries(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.bucket_counts[i] += 1
+                    break
+            series.count += 1
+            series.sum += value
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the enclosed block, also if it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self.lock:
+            series = self.series.get(self._label_values(labels))
+            return 0 if series is None else series.count
+
+    def _samples(self) -> Iterator[tuple[str, LabelValues, tuple[tuple[str, str], ...], float]]:
+        with self.lock:
+            snapshot = {key: (list(s.bucket_counts), s.count, s.sum) for key, s in self.series.items()}
+        for key, (bucket_counts, count, total) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield "_bucket", key, (("le", _format_value(bound)),), cumulative
+            yield "_bucket", key, (("le", "+Inf"),), count
+            yield "_sum", key, (), total
+            yield "_count", key, (), count
+
+
+class Gauge(_Metric):
+    """Computed by ``collect`` at rendering time, returning the value for every label combination"""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, collect: Callable[[], Mapping[LabelValues, float]], labelnames: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def _samples(self) -> Iterator[tuple[str, LabelValues, tuple[tuple[str, str], ...], float]]:
+        for key, value in sorted(self.collect().items()):
+            yield "", key, (), value
+
+
+class _Registry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self.metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        rendered = []
+        for metric in metrics:
+            try:
+                rendered.append(metric.render())
+            except Exception as e:
+                # NOTE a failing gauge callback must not take the other metrics down with it
+                rendered.append(f"# failed to collect {metric.name}: {_escape_help(repr(e))}")
+        return "\n".join(rendered) + "\n"
+
+
+_registry = _Registry()
+
+
+def render() -> str:
+    """All registered metrics in the text exposition format, version 0.0.4"""
+    return _registry.render()
+
+
+content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,186 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Discovery of the versions of packages published on a package index, such as PyPI.
+
+Index responses are kept on disk together with their ETag and Last-Modified headers. Within the
+configured TTL they are used without contacting the index at all, afterwards they are revalidated
+by a conditional request, and if the index cannot be reached they are used regardless of their
+age. Alternatively, a local directory in the simple repository layout serves as the index, with
+no network access whatsoever -- see ``PackageIndexSettings``.
+
+Lookups of many packages run concurrently, bounded by ``max_concurrent_lookups``. All functions
+here do blocking io and are expected to run in a pool. Cache entries are replaced atomically, so
+concurrent lookups of the same package at worst both ask the index.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import httpx
+from packaging.utils import InvalidSdistFilename, InvalidWheelFilename, canonicalize_name, parse_sdist_filename, parse_wheel_filename
+from packaging.version import Version
+
+from forecastbox.utility.config import config
+
+logger = logging.getLogger(__name__)
+
+_project_name = re.compile(r"^([A-Z0-9]|[A-Z0-9][A-Z0-9._-]*[A-Z0-9])$", re.IGNORECASE)
+_anchor_href = re.compile(r"""<a\s[^>]*href=["']([^"']+)["']""", re.IGNORECASE)
+
+
+def _is_project_name(pip_source: str) -> bool:
+    # NOTE local paths, git urls, and the like are not on any index -- not even worth a request
+    return _project_name.match(pip_source) is not None
+
+
+def _cache_path(name: str) -> Path:
+    return Path(config.external.package_index.cache_path) / f"{name}.json"
+
+
+def _read_cached(name: str) -> dict[str, Any] | None:
+    try:
+        with open(_cache_path(name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"ignoring unreadable package index cache entry of {name!r}: {e!r}")
+        return None
+
+
+def _write_cached(name: str, entry: dict[str, Any]) -> None:
+    path = _cache_path(name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        logger.warning(f"failed to cache package index response of {name!r}: {e!r}")
+
+
+def get_project(pip_source: str, client: httpx.Client) -> dict[str, Any] | None:
+    """The JSON API document of the package, from the cache or the index. None if not available."""
+    if not _is_project_name(pip_source):
+        return None
+    name = canonicalize_name(pip_source)
+    settings = config.external.package_index
+    cached = _read_cached(name)
+    if cached is not None and time.time() - cached["fetched_at"] < settings.cache_ttl_seconds:
+        return cached["data"]
+
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        response = client.get(f"{settings.url}/{name}/json", headers=headers)
+    except Exception as e:
+        if cached is not None:
+            logger.warning(f"failed to reach the package index for {pip_source!r}, using cached response: {e!r}")
+            return cached["data"]
+        logger.exception(f"failed to reach the package index for {pip_source!r}")
+        return None
+    if response.status_code == 304 and cached is not None:
+        _write_cached(name, cached | {"fetched_at": time.time()})
+        return cached["data"]
+    if response.status_code != 200:
+        logger.warning(f"package index returned {response.status_code} for {pip_source!r}")
+        return None
+    try:
+        data = response.json()
+    except Exception:
+        logger.exception(f"failed to parse package index response for {pip_source!r}")
+        return None
+    entry = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "data": data,
+    }
+    _write_cached(name, entry)
+    return data
+
+
+def _local_versions(local_path: str, pip_source: str) -> list[str]:
+    if not _is_project_name(pip_source):
+        return []
+    project_dir = Path(local_path) / canonicalize_name(pip_source)
+    try:
+        filenames = {entry.name for entry in project_dir.iterdir() if entry.is_file()}
+    except FileNotFoundError:
+        return []
+    if "index.html" in filenames:
+        html = (project_dir / "index.html").read_text(encoding="utf-8", errors="replace")
+        filenames.update(href.split("#", 1)[0].rsplit("/", 1)[-1] for href in _anchor_href.findall(html))
+    versions: set[Version] = set()
+    for filename in filenames:
+        try:
+            if filename.endswith(".whl"):
+                versions.add(parse_wheel_filename(filename)[1])
+            elif filename.endswith((".tar.gz", ".zip")):
+                versions.add(parse_sdist_filename(filename)[1])
+        except (InvalidWheelFilename, InvalidSdistFilename):
+            logger.debug(f"skipping {filename!r} in local package index, not a distribution filename")
+    return [str(version) for version in sorted(versions)]
+
+
+def get_versions(pip_source: str, client: httpx.Client) -> list[str]:
+    """All published versions of the package, empty if not available."""
+    local_path = config.external.package_index.local_path
+    if local_path is not None:
+        return _local_versions(local_path, pip_source)
+    project = get_project(pip_source, client)
+    if project is None:
+        return []
+    return list(project.get("releases", {}).keys())
+
+
+def get_latest_version(pip_source: str, client: httpx.Client) -> str | None:
+    """The latest published version of the package, preferring final releases. None if not available."""
+    local_path = config.external.package_index.local_path
+    if local_path is not None:
+        versions = [Version(v) for v in _local_versions(local_path, pip_source)]
+        final = [v for v in versions if not v.is_prerelease]
+        return str(max(final or versions)) if versions else None
+    project = get_project(pip_source, client)
+    if project is None:
+        return None
+    try:
+        return project["info"]["version"]
+    except (KeyError, TypeError):
+        logger.warning(f"package index response for {pip_source!r} has no version")
+        return None
+
+
+def get_latest_versions(pip_sources: Iterable[str]) -> dict[str, str | None]:
+    """``get_latest_version`` of every package, looked up concurrently."""
+    unique = list(dict.fromkeys(pip_sources))
+    if not unique:
+        return {}
+    workers = min(config.external.package_index.max_concurrent_lookups, len(unique))
+    with httpx.Client() as client, ThreadPoolExecutor(max_workers=workers) as executor:
+        latest = executor.map(lambda pip_source: get_latest_version(pip_source, client), unique)
+        return dict(zip(unique, latest))
@@ -23,6 +23,7 @@ import contextlib
 import datetime as dt
 import importlib
 import importlib.metadata
+import importlib.util
 import json
 import logging
 import os
@@ -39,37 +40,19 @@ from packaging.requirements import InvalidRequirement, Requirement
 from packaging.utils import canonicalize_name
 from packaging.version import Version
 
+from forecastbox.utility import package_index
 from forecastbox.utility.time import from_timestamp, value_dt2str
 
 logger = logging.getLogger(__name__)
 
 
 def get_package_versions(pip_source: str) -> Iterator[str]:
-    """Return all versions of *pip_source* available on PyPI.
+    """Return all versions of *pip_source* available on the package index.
 
-    Fetches ``https://pypi.org/pypi/{pip_source}/json`` and yields every key
-    from the ``releases`` mapping.  PyPI does not paginate this endpoint, but
-    if a ``next`` link is ever introduced the loop below handles it.
+    Served from the on-disk cache of index responses when fresh, see ``utility.package_index``.
     """
-    url: str | None = f"https://pypi.org/pypi/{pip_source}/json"
     with httpx.Client() as client:
-        while url is not None:
-            try:
-                response = client.get(url)
-            except Exception:
-                logger.exception(f"Failed to reach PyPI for {pip_source!r}")
-                return
-            if response.status_code != 200:
-                logger.warning(f"PyPI returned {response.status_code} for {pip_source!r}")
-                return
-            try:
-                data = response.json()
-            except Exception:
-                logger.exception(f"Failed to parse PyPI JSON for {pip_source!r}")
-                return
-            yield from data.get("releases", {}).keys()
-            # PyPI JSON API does not currently paginate; guard for the future.
-            url = data.get("next", None)
+        yield from package_index.get_versions(pip_source, client)
 
 
 def try_import(module_name: str) -> ModuleType | None:
@@ -80,6 +63,14 @@ def try_import(module_name: str) -> ModuleType | None:
         return None
 
 
+def is_installed(module_name: str) -> bool:
+    """Whether the module can be imported, without importing it -- only its parent packages, if any."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
 def try_version(pip_source: str, module_name: str) -> str:
     """Return the installed version of a package, falling back to a module attribute or "unknown"."""
     try:
@@ -100,6 +91,40 @@ def try_version(pip_source: str, module_name: str) -> str:
         return "unknown"
 
 
+def try_install_fingerprint(pip_source: str, module_name: str) -> str | None:
+    """Identify the installed code of a package beyond its version, from its PEP 610 ``direct_url.json``.
+
+    Returns "" for installs from an index, the commit or archive hash for vcs and archive installs,
+    and None when the code cannot be identified -- editable or local directory installs, archives
+    without a hash, or no distribution found at all.
+    """
+    try:
+        dist = importlib.metadata.distribution(pip_source)
+    except importlib.metadata.PackageNotFoundError:
+        # NOTE the pip_source may be a url or a path rather than a distribution name
+        names = importlib.metadata.packages_distributions().get(module_name.split(".")[0], [])
+        if len(set(names)) != 1:
+            return None
+        try:
+            dist = importlib.metadata.distribution(names[0])
+        except importlib.metadata.PackageNotFoundError:
+            return None
+    direct_url = dist.read_text("direct_url.json")
+    if direct_url is None:
+        return ""
+    try:
+        info = json.loads(direct_url)
+    except json.JSONDecodeError:
+        return None
+    if commit_id := info.get("vcs_info", {}).get("commit_id"):
+        return f"vcs:{commit_id}"
+    archive_info = info.get("archive_info", {})
+    hashes = sorted((archive_info.get("hashes") or {}).items())
+    if archive_hash := archive_info.get("hash") or next((f"{name}={value}" for name, value in hashes), None):
+        return f"archive:{archive_hash}"
+    return None
+
+
 def try_updatedatetime(pip_source: str) -> str:
     """Return the install datetime of a package as ``YYYY-MM-DDTHH:MM:SS``, or "unknown".
 
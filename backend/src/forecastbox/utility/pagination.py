@@ -7,12 +7,24 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
-"""Shared pagination contract used across routes and service layers."""
+"""Shared pagination contract used across routes and service layers.
 
+Two modes are supported -- offset pagination via ``page``, and keyset pagination via an
+opaque ``cursor`` pointing after the last item of the previous page. The latter is meant
+for listings ordered by (creation time, entity id) descending, and its cost does not grow
+with how deep the page is.
+"""
+
+import base64
+import binascii
+import datetime as dt
 from dataclasses import dataclass
-from typing import TypeVar
+from typing import Any, TypeVar
 
+import orjson
 from pydantic import ConfigDict, Field
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
 
 from forecastbox.utility.pydantic import FiabBaseModel
 
@@ -34,18 +46,56 @@ class PaginationSpecRemainder:
     current_page_remaining: int
 
 
+@dataclass(frozen=True, eq=True, slots=True)
+class KeysetCursor:
+    """Position right after an item of a listing ordered by (created_at, entity_id) descending."""
+
+    created_at: dt.datetime
+    entity_id: str
+
+    def encode(self) -> str:
+        payload = orjson.dumps([self.created_at.astimezone(dt.UTC).isoformat(), self.entity_id])
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    @classmethod
+    def decode(cls, raw: str) -> "KeysetCursor":
+        """Raises ``ValueError`` if ``raw`` is not a cursor produced by ``encode``."""
+        try:
+            created_at, entity_id = orjson.loads(base64.urlsafe_b64decode(raw.encode("ascii")))
+            return cls(created_at=dt.datetime.fromisoformat(created_at).astimezone(dt.UTC), entity_id=str(entity_id))
+        except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+            raise ValueError(f"invalid pagination cursor: {raw!r}") from e
+
+    def follows(self, created_at: Any, entity_id: Any) -> ColumnElement[bool]:
+        """SQL predicate selecting the rows which come after this cursor in the descending order."""
+        return or_(created_at < self.created_at, and_(created_at == self.created_at, entity_id < self.entity_id))
+
+
 class PaginationSpec(FiabBaseModel):
     """Query-parameter group for paginated list endpoints.
 
     Use with ``Depends()`` in FastAPI route signatures to accept ``page`` and
     ``page_size`` as individual query parameters while keeping handlers clean.
     FastAPI converts validation errors (e.g. page < 1) into 422 responses.
+
+    When ``cursor`` is given, the listing is paginated by keyset instead and ``page`` is ignored.
     """
 
     model_config = ConfigDict(frozen=True)
 
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=10, ge=1)
+    cursor: str | None = None
+
+    def keyset(self) -> KeysetCursor | None:
+        """Return the decoded cursor, if in keyset mode. Raises ``ValueError`` on a malformed cursor."""
+        return None if self.cursor is None else KeysetCursor.decode(self.cursor)
+
+    def next_cursor(self, items_on_page: int, last: KeysetCursor | None) -> str | None:
+        """Return the cursor of the next page, or None if this page was the last one."""
+        if last is None or items_on_page < self.page_size:
+            return None
+        return last.encode()
 
     def start(self) -> int:
         """Return the zero-based row offset for this page."""
@@ -0,0 +1,171 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Application startup as a graph of phases.
+
+Every phase starts once all the phases it requires are ready, so independent phases run in parallel.
+The lifespan awaits only the phases without which nothing can be served, via ``run_phases``, and
+leaves the rest to run in the background via ``start_phases`` while the server already answers.
+Routes which cannot answer before some phase has finished declare it via ``requires_phases``, and
+get a 503 with a Retry-After until then -- a failed phase does not hold its routes back, they are
+expected to handle the missing state as they would at any later time.
+
+A phase whose required phase failed is skipped. The states of all phases are published as a
+pyrsistent map, replaced only on the event loop thread, and readable from any thread without a lock.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from enum import StrEnum
+from typing import Any, Literal
+
+from fastapi import HTTPException, status
+from pyrsistent import pmap
+from pyrsistent.typing import PMap
+
+logger = logging.getLogger(__name__)
+
+
+class StartupPhases(StrEnum):
+    Database = "database"
+    Runtime = "runtime"
+    Runs = "runs"
+    Scheduler = "scheduler"
+    PluginStores = "plugin_stores"
+    ArtifactCatalog = "artifact_catalog"
+    Plugins = "plugins"
+
+
+PhaseState = Literal["pending", "running", "ready", "failed", "skipped"]
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class Phase:
+    name: StartupPhases
+    run: Callable[[], Awaitable[Any] | Future[Any] | None]
+    """Starts the phase. The phase is ready once it returns, or once the awaitable or future it returns completes"""
+    requires: tuple[StartupPhases, ...] = ()
+    inline: bool = False
+    """Whether to call ``run`` on the event loop thread instead of a worker thread -- for quick calls only"""
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class PhaseStatus:
+    state: PhaseState
+    requires: tuple[StartupPhases, ...]
+    seconds: float | None = None
+    """Duration of the phase, once finished"""
+    error: str | None = None
+
+
+class Startup:
+    """Process-local singleton state. See module docstring for the concurrency reasoning."""
+
+    phases: PMap[StartupPhases, PhaseStatus] = pmap()
+    tasks: dict[StartupPhases, asyncio.Task[bool]] = {}
+    """Touched only on the event loop thread"""
+
+
+def _publish(name: StartupPhases, phase_status: PhaseStatus) -> None:
+    Startup.phases = Startup.phases.set(name, phase_status)
+
+
+async def _run(phase: Phase) -> bool:
+    for required in phase.requires:
+        if not await Startup.tasks[required]:
+            logger.warning(f"skipping startup phase {phase.name}, as it requires the failed {required}")
+            _publish(phase.name, replace(Startup.phases[phase.name], state="skipped", error=f"{required} failed"))
+            return False
+    _publish(phase.name, replace(Startup.phases[phase.name], state="running"))
+    start = time.monotonic()
+    try:
+        result = phase.run() if phase.inline else await asyncio.to_thread(phase.run)
+        if isinstance(result, Future):
+            await asyncio.wrap_future(result)
+        elif inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.exception(f"startup phase {phase.name} failed: {repr(e)}")
+        _publish(phase.name, replace(Startup.phases[phase.name], state="failed", seconds=time.monotonic() - start, error=repr(e)))
+        return False
+    logger.debug(f"startup phase {phase.name} ready after {time.monotonic() - start:.3f}s")
+    _publish(phase.name, replace(Startup.phases[phase.name], state="ready", seconds=time.monotonic() - start))
+    return True
+
+
+def _schedule(phases: Iterable[Phase]) -> list[asyncio.Task[bool]]:
+    """Must be called from the event loop thread. Phases must be given after those they require"""
+    loop = asyncio.get_running_loop()
+    scheduled = []
+    for phase in phases:
+        missing = [required for required in phase.requires if required not in Startup.tasks]
+        if missing:
+            raise ValueError(f"startup phase {phase.name} requires {missing}, not declared before it")
+        _publish(phase.name, PhaseStatus(state="pending", requires=phase.requires))
+        Startup.tasks[phase.name] = loop.create_task(_run(phase), name=f"startup-{phase.name}")
+        scheduled.append(Startup.tasks[phase.name])
+    return scheduled
+
+
+async def run_phases(phases: Iterable[Phase]) -> None:
+    """Run the phases to completion, raising if any fails"""
+    phases = list(phases)
+    results = await asyncio.gather(*_schedule(phases))
+    failed = [phase.name for phase, ready in zip(phases, results) if not ready]
+    if failed:
+        raise RuntimeError(f"startup phases failed: {failed}")
+
+
+def start_phases(phases: Iterable[Phase]) -> None:
+    """Run the phases in the background, see ``phase_status`` for their progress"""
+    _schedule(phases)
+
+
+async def stop_phases() -> None:
+    """Cancel the background phases still waiting or running. A phase running on a worker thread is
+    not interrupted, only no longer awaited"""
+    tasks, Startup.tasks = list(Startup.tasks.values()), {}
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def phase_status() -> dict[StartupPhases, PhaseStatus]:
+    return dict(Startup.phases)
+
+
+def is_ready(name: StartupPhases) -> bool:
+    phase_status = Startup.phases.get(name)
+    return phase_status is not None and phase_status.state == "ready"
+
+
+def is_finished(name: StartupPhases) -> bool:
+    """Whether the phase is no longer pending or running. Phases not declared at all count as finished"""
+    phase_status = Startup.phases.get(name)
+    return phase_status is None or phase_status.state not in ("pending", "running")
+
+
+def requires_phases(*names: StartupPhases) -> Callable[[], None]:
+    """Route dependency answering 503 until all the phases have finished"""
+
+    def check() -> None:
+        waiting = [name for name in names if not is_finished(name)]
+        if waiting:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Starting up, waiting for {', '.join(waiting)}",
+                headers={"Retry-After": "1"},
+            )
+
+    return check
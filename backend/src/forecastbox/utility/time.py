@@ -26,6 +26,7 @@ TimeQueryReason = Literal[
     "glyph_resolution",  # eg when a cascade job starts executing
     "dbref",  # for db inserts and created_at/updated_at
     "pylock_save",  # for creating the pylock.toml.timestamp file utilized by the installer
+    "retention",  # for deciding which database rows have expired, by the garbage collector
 ]
 
 
@@ -9,11 +9,21 @@
 
 """Unit tests for blueprint service helpers."""
 
+from unittest.mock import MagicMock
+
+import pytest
+from cascade.low.func import Either
+from fiab_core.artifacts import ArtifactLocalId, ArtifactStoreId, CompositeArtifactId
 from fiab_core.fable import (
+    BlockConfigurationOption,
+    BlockExpansion,
     BlockFactory,
+    BlockFactoryCatalogue,
     BlockFactoryId,
     BlockInstance,
     BlockInstanceId,
+    BlockInstanceOutput,
+    BlockKind,
     BlueprintTemplate,
     BlueprintTemplateBlock,
     BlueprintTemplateEnvironment,
@@ -22,8 +32,14 @@ from fiab_core.fable import (
     PluginCompositeId,
     PluginId,
     PluginStoreId,
+    RawOutput,
 )
+from fiab_core.plugin import BlockValidation, Plugin
+from fiab_core.types.definitions import StringType
+from pyrsistent import pmap
 
+from forecastbox.domain.artifact.manager import ArtifactManager
+from forecastbox.domain.blueprint import validation_cache
 from forecastbox.domain.blueprint.service import (
     BlueprintBuilder,
     RoutableBlock,
@@ -34,6 +50,7 @@ from forecastbox.domain.blueprint.service import (
 )
 from forecastbox.domain.glyphs.global_db import GlyphResolutionBuckets
 from forecastbox.domain.glyphs.intrinsic import get_values_and_examples
+from forecastbox.domain.plugin.state import PluginManager
 from forecastbox.utility.auth import AuthContext
 
 _REAL_PLUGIN_ID = PluginCompositeId(store=PluginStoreId("myStore"), local=PluginId("myPlugin"))
@@ -249,3 +266,124 @@ def test_validate_expand_multiple_bad_local_glyphs_both_flagged() -> None:
     assert len(result.global_errors) == 2
     assert any(intrinsic_name in err for err in result.global_errors)
     assert any("timedelta" in err for err in result.global_errors)
+
+
+# ---------------------------------------------------------------------------
+# _validate_expand_with_buckets -- incremental re-validation
+# ---------------------------------------------------------------------------
+
+_LABEL = ConfigurationOptionId("label")
+
+
+def _chain_plugin(validated: list[str]) -> Plugin:
+    def _validator(factory_id: BlockFactoryId, instance: BlockInstance, inputs: dict[str, BlockInstanceOutput]) -> BlockValidation:
+        del factory_id
+        label = instance.configuration_values[_LABEL]
+        validated.append(label)
+        parent = inputs["input"].mime_type if inputs else ""
+        return BlockValidation(Either.ok(RawOutput(mime_type=f"{parent}/{label}")))
+
+    def _factory(kind: BlockKind, inputs: list[str]) -> BlockFactory:
+        return BlockFactory(
+            kind=kind,
+            title="",
+            description="",
+            configuration_options={_LABEL: BlockConfigurationOption(title="", description="", value_type=StringType())},
+            inputs=inputs,
+        )
+
+    return Plugin(
+        catalogue=BlockFactoryCatalogue(
+            factories={BlockFactoryId("source"): _factory("source", []), BlockFactoryId("transform"): _factory("transform", ["input"])}
+        ),
+        validator=_validator,
+        expander=lambda output: [BlockExpansion(factory=BlockFactoryId("transform"))],
+        compiler=lambda lookup, factory_id, instance: Either.error("not compilable"),
+    )
+
+
+def _chain(labels: list[str]) -> BlueprintBuilder:
+    blocks = []
+    for i, label in enumerate(labels):
+        blocks.append(
+            RoutableBlock(
+                instance_id=BlockInstanceId(f"b{i}"),
+                plugin=_REAL_PLUGIN_ID,
+                factory=BlockFactoryId("transform" if i else "source"),
+                instance=BlockInstance(
+                    configuration_values={_LABEL: label}, input_ids={"input": BlockInstanceId(f"b{i - 1}")} if i else {}
+                ),
+            )
+        )
+    return BlueprintBuilder(blocks=blocks, local_glyphs={"suffix": "x"})
+
+
+def test_validate_expand_revalidates_only_downstream_cone(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Unchanged blocks upstream of an edit reuse their results, the edited block and its descendants are validated again."""
+    validated: list[str] = []
+    monkeypatch.setattr(PluginManager, "plugins", pmap({_REAL_PLUGIN_ID: _chain_plugin(validated)}))
+
+    first = _validate_expand_with_buckets(_chain(["a", "b", "c", "d"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["a", "b", "c", "d"]
+    assert first.block_errors == {}
+    assert set(first.possible_expansions) == {"b0", "b1", "b2", "b3"}
+
+    validated.clear()
+    again = _validate_expand_with_buckets(_chain(["a", "b", "c", "d"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == []
+    assert again == first
+
+    edited = _validate_expand_with_buckets(_chain(["a", "B", "c", "d"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["B", "c", "d"]
+    assert edited.possible_expansions == first.possible_expansions
+
+    # NOTE the validate_only results are shared with the expand ones
+    validated.clear()
+    _validate_expand_with_buckets(_chain(["a", "B", "c", "d"]), _AUTH, _EMPTY_BUCKETS, validate_only=True)
+    assert validated == []
+
+
+def test_validate_expand_revalidates_on_glyph_and_plugin_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Blocks referencing a changed glyph are validated again, and so is everything after a plugin change."""
+    validated: list[str] = []
+    monkeypatch.setattr(PluginManager, "plugins", pmap({_REAL_PLUGIN_ID: _chain_plugin(validated)}))
+
+    _validate_expand_with_buckets(_chain(["a", "${suffix}", "c"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["a", "x", "c"]
+
+    validated.clear()
+    builder = _chain(["a", "${suffix}", "c"])
+    builder.local_glyphs["suffix"] = "y"
+    result = _validate_expand_with_buckets(builder, _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["y", "c"]
+    assert result.resolved_configuration_options[BlockInstanceId("b1")] == {_LABEL: "y"}
+
+    validated.clear()
+    builder = _chain(["a", "${suffix}", "c"])
+    builder.local_glyphs["suffix"] = "y"
+    _validate_expand_with_buckets(builder, AuthContext(user_id="other", is_admin=False), _EMPTY_BUCKETS)
+    assert validated == ["a", "y", "c"]
+
+    validated.clear()
+    monkeypatch.setattr(PluginManager, "plugins", pmap({_REAL_PLUGIN_ID: _chain_plugin(validated)}))
+    _validate_expand_with_buckets(_chain(["a", "${suffix}", "c"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["a", "x", "c"]
+
+
+def test_validate_expand_revalidates_on_artifact_catalog_change(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Validators may depend on the available artifacts, thus a catalog refresh drops the memoized results."""
+    validated: list[str] = []
+    monkeypatch.setattr(PluginManager, "plugins", pmap({_REAL_PLUGIN_ID: _chain_plugin(validated)}))
+    monkeypatch.setattr(ArtifactManager, "catalog", pmap())
+
+    _validate_expand_with_buckets(_chain(["a", "b"]), _AUTH, _EMPTY_BUCKETS)
+    validated.clear()
+    _validate_expand_with_buckets(_chain(["a", "b"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == []
+
+    hits = validation_cache.lookups.value(result="hit")
+    checkpoint = CompositeArtifactId(artifact_store_id=ArtifactStoreId("store"), artifact_local_id=ArtifactLocalId("model"))
+    monkeypatch.setattr(ArtifactManager, "catalog", pmap({checkpoint: MagicMock()}))
+    _validate_expand_with_buckets(_chain(["a", "b"]), _AUTH, _EMPTY_BUCKETS)
+    assert validated == ["a", "b"]
+    assert validation_cache.lookups.value(result="hit") == hits
@@ -0,0 +1,102 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import orjson
+import pytest
+import pytest_asyncio
+import zmq
+import zmq.asyncio
+from cascade.gateway import api
+from cascade.low.exceptions import CascadeInfrastructureError
+
+from forecastbox.domain.gateway import client
+from forecastbox.domain.gateway.exceptions import GatewayRequestFailed, GatewayTimeout
+
+
+@pytest_asyncio.fixture
+async def gateway_socket() -> AsyncIterator[tuple[zmq.asyncio.Socket, str]]:
+    context = zmq.asyncio.Context()
+    socket = context.socket(zmq.REP)
+    port = socket.bind_to_random_port("tcp://127.0.0.1")
+    client.reset_pool()
+    try:
+        yield socket, f"tcp://127.0.0.1:{port}"
+    finally:
+        client.reset_pool()
+        socket.close(linger=0)
+        context.term()
+
+
+async def _respond(socket: zmq.asyncio.Socket, response: api.CascadeGatewayAPI) -> dict:
+    request = orjson.loads(await socket.recv())
+    payload = response.model_dump(mode="json")
+    payload["clazz"] = type(response).__name__
+    await socket.send(orjson.dumps(payload))
+    return request
+
+
+@pytest.mark.asyncio
+async def test_request_response_roundtrip_reuses_socket(gateway_socket: tuple[zmq.asyncio.Socket, str]) -> None:
+    socket, url = gateway_socket
+    response = api.JobProgressResponse(progresses={}, datasets={}, queue_length=3, error=None)
+
+    for _ in range(2):
+        server = asyncio.create_task(_respond(socket, response))
+        result = await client.request_response(api.JobProgressRequest(job_ids=[]), url)
+        request = await server
+        assert request["clazz"] == "JobProgressRequest"
+        assert isinstance(result, api.JobProgressResponse)
+        assert result.queue_length == 3
+        assert client._pool.idle_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_request_response_timeout_discards_socket(gateway_socket: tuple[zmq.asyncio.Socket, str]) -> None:
+    _, url = gateway_socket
+
+    with pytest.raises(GatewayTimeout):
+        await client.request_response(api.JobProgressRequest(job_ids=[]), url, timeout_ms=10)
+
+    assert client._pool.idle_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_request_response_cancellation_discards_socket(gateway_socket: tuple[zmq.asyncio.Socket, str]) -> None:
+    _, url = gateway_socket
+
+    task = asyncio.create_task(client.request_response(api.JobProgressRequest(job_ids=[]), url, timeout_ms=10_000))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert client._pool.idle_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_request_response_rejects_mismatched_response(gateway_socket: tuple[zmq.asyncio.Socket, str]) -> None:
+    socket, url = gateway_socket
+
+    server = asyncio.create_task(_respond(socket, api.ShutdownResponse(error=None)))
+    with pytest.raises(GatewayRequestFailed):
+        await client.request_response(api.JobProgressRequest(job_ids=[]), url)
+    await server
+
+
+def test_request_response_sync_observes_latency(monkeypatch: pytest.MonkeyPatch) -> None:
+    request = api.JobProgressRequest(job_ids=[])
+    response = api.JobProgressResponse(progresses={}, datasets={}, queue_length=1, error=None)
+    before = {outcome: client._latency.count(request="JobProgressRequest", outcome=outcome) for outcome in ("ok", "timeout")}
+
+    monkeypatch.setattr(client, "cascade_request_response", lambda m, url, timeout_ms: response)
+    assert client.request_response_sync(request, "tcp://gateway") is response
+
+    def _timeout(m: api.CascadeGatewayAPI, url: str, timeout_ms: int) -> api.CascadeGatewayAPI:
+        raise CascadeInfrastructureError(f"timed out on {url=}", parent=TimeoutError())
+
+    monkeypatch.setattr(client, "cascade_request_response", _timeout)
+    with pytest.raises(CascadeInfrastructureError):
+        client.request_response_sync(request, "tcp://gateway")
+
+    after = {outcome: client._latency.count(request="JobProgressRequest", outcome=outcome) for outcome in ("ok", "timeout")}
+    assert {outcome: after[outcome] - before[outcome] for outcome in after} == {"ok": 1, "timeout": 1}
@@ -0,0 +1,63 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for the parse caches of domain/glyphs/jinja_interpolation."""
+
+from collections.abc import Generator
+
+import pytest
+
+from forecastbox.domain.glyphs import jinja_interpolation
+from forecastbox.domain.glyphs.jinja_interpolation import _ParseCache, extract_glyph_names, get_parse_cache_stats, render_expression
+from forecastbox.utility import metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    jinja_interpolation._template_cache.clear()
+    jinja_interpolation._glyph_names_cache.clear()
+    yield
+
+
+def test_render_reuses_compiled_template() -> None:
+    assert render_expression("a_${x}", {"x": "1"}) == "a_1"
+    assert render_expression("a_${x}", {"x": "2"}) == "a_2"
+
+    stats = get_parse_cache_stats()["templates"]
+    assert (stats.size, stats.hits, stats.misses) == (1, 1, 1)
+    assert 'fiab_glyph_parse_cache{cache="templates",stat="hits"} 1' in metrics.render().splitlines()
+
+
+def test_extract_returns_independent_copies() -> None:
+    first = extract_glyph_names("${a}_${b | add_days(c)}").get_or_raise()
+    first.add("mutated")
+    second = extract_glyph_names("${a}_${b | add_days(c)}").get_or_raise()
+
+    assert second == {"a", "b", "c"}
+    assert get_parse_cache_stats()["glyph_names"].hits == 1
+
+
+def test_extract_caches_syntax_errors() -> None:
+    assert extract_glyph_names("${a +}").e is not None
+    assert extract_glyph_names("${a +}").e is not None
+
+    stats = get_parse_cache_stats()["glyph_names"]
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_parse_cache_evicts_least_recently_used() -> None:
+    cache: _ParseCache[str] = _ParseCache(2)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("b", str.upper)
+    cache.get_or_compute("a", str.upper)
+    cache.get_or_compute("c", str.upper)
+
+    assert cache.get_or_compute("a", lambda raw: "recomputed") == "A"
+    assert cache.get_or_compute("b", lambda raw: "recomputed") == "recomputed"
+    assert cache.stats().size == 2
@@ -0,0 +1,77 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from forecastbox.domain.maintenance.garbage_collector import GarbageCollector
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.config import GarbageCollectorSettings, config
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> GarbageCollectorSettings:
+    settings = GarbageCollectorSettings(batch_size=2, batch_pause_seconds=0, run_max_attempts=3, vacuum_pages=10)
+    monkeypatch.setattr(config.backend, "garbage_collector", settings)
+    return settings
+
+
+def test_collect_runs_steps_in_batches(settings: GarbageCollectorSettings) -> None:
+    deleted = MagicMock(side_effect=[[RunId("r1"), RunId("r2")], [RunId("r3")]])
+    attempts = MagicMock(side_effect=[[(RunId("r4"), 1), (RunId("r4"), 2)], [(RunId("r5"), 1), (RunId("r5"), 2)], []])
+    drop_run = MagicMock()
+    drop_attempt = MagicMock()
+    with (
+        patch("forecastbox.domain.maintenance.garbage_collector.run_db.purge_deleted_runs", new=deleted),
+        patch("forecastbox.domain.maintenance.garbage_collector.run_db.purge_expired_runs") as expired,
+        patch("forecastbox.domain.maintenance.garbage_collector.run_db.purge_excess_attempts", new=attempts),
+        patch("forecastbox.domain.maintenance.garbage_collector.run_db.purge_stored_outputs") as outputs,
+        patch("forecastbox.domain.maintenance.garbage_collector.blueprint_db.purge_deleted_blueprints", return_value=1),
+        patch("forecastbox.domain.maintenance.garbage_collector.scheduling_db.purge_stale_experiment_next", return_value=0),
+        patch("forecastbox.domain.maintenance.garbage_collector.incrementalVacuum", return_value=7),
+        patch("forecastbox.domain.maintenance.garbage_collector.output_cache.drop_run", new=drop_run),
+        patch("forecastbox.domain.maintenance.garbage_collector.output_cache.drop_attempt", new=drop_attempt),
+    ):
+        collector = GarbageCollector()
+        collector.collect(threading.Event())
+
+    # policies disabled by default are not applied
+    expired.assert_not_called()
+    outputs.assert_not_called()
+    assert [c.args[0] for c in drop_run.call_args_list] == ["r1", "r2", "r3"]
+    assert attempts.call_count == 3
+    assert [c.args for c in drop_attempt.call_args_list] == [("r4", 1), ("r4", 2), ("r5", 1), ("r5", 2)]
+    status = collector.status()
+    assert (status.passes, status.runs_purged, status.attempts_purged, status.blueprints_purged, status.pages_vacuumed) == (1, 3, 4, 1, 7)
+    assert status.last_error is None
+
+
+def test_collect_survives_failure(settings: GarbageCollectorSettings) -> None:
+    with patch(
+        "forecastbox.domain.maintenance.garbage_collector.run_db.purge_deleted_runs",
+        side_effect=RuntimeError("database is locked"),
+    ):
+        collector = GarbageCollector()
+        collector.collect(threading.Event())
+
+    status = collector.status()
+    assert status.passes == 1
+    assert status.last_error is not None and "database is locked" in status.last_error
+
+
+def test_entrypoint_reports_running_until_stopped(settings: GarbageCollectorSettings) -> None:
+    collector = GarbageCollector()
+    stop_event = threading.Event()
+    thread = threading.Thread(target=collector.entrypoint, args=(stop_event,))
+    thread.start()
+    try:
+        for _ in range(100):
+            if collector.status().is_ready():
+                break
+            threading.Event().wait(0.01)
+        assert collector.status().is_ready()
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+    assert not collector.status().is_ready()
+    # the first pass waits for the interval, so none happened
+    assert collector.status().passes == 0
@@ -7,12 +7,14 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
-"""Unit tests for NotificationBroadcaster: uninitialized-publish failure, and register/broadcast/prune."""
+"""Unit tests for NotificationBroadcaster: uninitialized-publish failure, register/broadcast/prune,
+per-client queues, topic subscriptions and coalescing."""
 
 import asyncio
 import threading
-from collections.abc import Generator
-from typing import cast
+import time
+from collections.abc import Callable, Generator
+from typing import Any, cast
 
 import pytest
 from fastapi import WebSocket
@@ -23,11 +25,14 @@ from forecastbox.domain.notification.service import (
     NotificationBroadcasterNotInitialized,
     publish,
     register_client,
+    status,
+    subscribe,
     unregister_client,
 )
+from forecastbox.utility.config import NotificationSettings, config
 
 
-def _notification(identifier: str) -> ClientNotification:
+def _notification(identifier: str, topics: list[str] | None = None, coalesce_key: str | None = None) -> ClientNotification:
     return ClientNotification(
         text=identifier,
         sourceDomainName="notification",
@@ -35,27 +40,79 @@ def _notification(identifier: str) -> ClientNotification:
         context={"identifier": identifier},
         detailRoute=None,
         refreshRoutes=[],
+        topics=topics or [],
+        coalesceKey=coalesce_key,
     )
 
 
 class _FakeClient:
     def __init__(self, fail: bool = False) -> None:
         self.received: list[str] = []
+        self.attempted = 0
         self.fail = fail
+        self.unblocked = asyncio.Event()
+        self.unblocked.set()
+        self.closed = False
 
     async def send_text(self, data: str) -> None:
         if self.fail:
             raise RuntimeError("boom")
+        self.attempted += 1
+        await self.unblocked.wait()
         self.received.append(data)
 
+    async def close(self) -> None:
+        self.closed = True
+
+    @property
+    def texts(self) -> list[str]:
+        return [ClientNotification.model_validate_json(data).text for data in self.received]
+
 
 @pytest.fixture(autouse=True)
 def _reset_broadcaster() -> Generator[None, None, None]:
     original_loop = NotificationBroadcaster._loop
     original_clients = NotificationBroadcaster._clients
+    original_dropped = NotificationBroadcaster._dropped
     yield
     NotificationBroadcaster._loop = original_loop
     NotificationBroadcaster._clients = original_clients
+    NotificationBroadcaster._dropped = original_dropped
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    NotificationBroadcaster._loop = loop
+    try:
+        yield loop
+    finally:
+        _on_loop(loop, lambda: [unregister_client(client) for client in NotificationBroadcaster._clients])
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=2)
+        loop.close()
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop, action: Callable[[], Any]) -> Any:
+    async def run() -> Any:
+        return action()
+
+    return asyncio.run_coroutine_threadsafe(run(), loop).result(timeout=2)
+
+
+def _wait_until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def _client(loop: asyncio.AbstractEventLoop, topics: list[str] | None = None, **kwargs: Any) -> _FakeClient:
+    client = cast(_FakeClient, _on_loop(loop, lambda: _FakeClient(**kwargs)))
+    _on_loop(loop, lambda: register_client(cast(WebSocket, client), topics or []))
+    return client
 
 
 def test_publish_before_init_raises_and_does_not_hang() -> None:
@@ -64,27 +121,66 @@ def test_publish_before_init_raises_and_does_not_hang() -> None:
         publish(_notification("x"))
 
 
-def test_publish_broadcasts_to_registered_clients_and_prunes_dead() -> None:
-    loop = asyncio.new_event_loop()
-    thread = threading.Thread(target=loop.run_forever, daemon=True)
-    thread.start()
-    try:
-        NotificationBroadcaster._loop = loop
-        good = _FakeClient()
-        bad = _FakeClient(fail=True)
-        register_client(cast(WebSocket, good))
-        register_client(cast(WebSocket, bad))
+def test_publish_broadcasts_to_registered_clients_and_prunes_dead(loop: asyncio.AbstractEventLoop) -> None:
+    good = _client(loop)
+    bad = _client(loop, fail=True)
 
-        publish(_notification("abc"))
+    publish(_notification("abc"))
 
-        assert len(good.received) == 1
-        assert "abc" in good.received[0]
-        assert bad not in NotificationBroadcaster._clients
-        assert good in NotificationBroadcaster._clients
+    _wait_until(lambda: len(good.received) == 1 and bad not in NotificationBroadcaster._clients)
+    assert "abc" in good.received[0]
+    assert bad.closed
+    assert good in NotificationBroadcaster._clients
 
-        unregister_client(cast(WebSocket, good))
-        assert good not in NotificationBroadcaster._clients
-    finally:
-        loop.call_soon_threadsafe(loop.stop)
-        thread.join(timeout=2)
-        loop.close()
+    _on_loop(loop, lambda: unregister_client(cast(WebSocket, good)))
+    assert good not in NotificationBroadcaster._clients
+
+
+def test_slow_client_does_not_delay_others(loop: asyncio.AbstractEventLoop, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.backend, "notification", NotificationSettings(client_queue_size=2))
+    fast = _client(loop)
+    slow = _client(loop)
+    _on_loop(loop, slow.unblocked.clear)
+
+    publish(_notification("n0"))
+    _wait_until(lambda: slow.attempted == 1)
+    for i in range(1, 5):
+        publish(_notification(f"n{i}"))
+        _wait_until(lambda: len(fast.received) == i + 1)
+
+    assert fast.texts == ["n0", "n1", "n2", "n3", "n4"]
+    # NOTE the slow client is stuck sending the first one, of the rest only the latest two are kept
+    assert status().dropped == 2
+
+    _on_loop(loop, slow.unblocked.set)
+    _wait_until(lambda: len(slow.received) == 3)
+    assert slow.texts == ["n0", "n3", "n4"]
+
+
+def test_topic_subscriptions(loop: asyncio.AbstractEventLoop) -> None:
+    everything = _client(loop)
+    run_only = _client(loop, topics=["run:r1"])
+
+    publish(_notification("other run", topics=["run:r2"]))
+    publish(_notification("this run", topics=["run:r1", "experiment:e1"]))
+    publish(_notification("global"))
+    _on_loop(loop, lambda: subscribe(cast(WebSocket, run_only), ["experiment:e2"]))
+    publish(_notification("other experiment", topics=["experiment:e2"]))
+
+    _wait_until(lambda: len(everything.received) == 4 and len(run_only.received) == 3)
+    assert run_only.texts == ["this run", "global", "other experiment"]
+
+
+def test_coalesced_notifications_keep_latest_per_key(loop: asyncio.AbstractEventLoop, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.backend, "notification", NotificationSettings(coalesce_interval_seconds=0.2))
+    client = _client(loop)
+
+    publish(_notification("first", coalesce_key="progress:a"))
+    _wait_until(lambda: len(client.received) == 1)
+    for i in range(10):
+        publish(_notification(f"a{i}", coalesce_key="progress:a"))
+        publish(_notification(f"b{i}", coalesce_key="progress:b"))
+    publish(_notification("plain"))
+
+    _wait_until(lambda: len(client.received) == 4)
+    assert client.texts == ["first", "plain", "a9", "b9"]
@@ -19,6 +19,7 @@ from forecastbox.domain.plugin.compatibility import (
     check_environment_baseline,
     get_compatible_versions,
     install_plugin_compatibly,
+    install_plugins_compatibly,
     plugin_default_specifier,
 )
 from forecastbox.domain.plugin.exceptions import PluginEnvironmentAlreadyBroken
@@ -270,6 +271,70 @@ def test_ambiguous_local_target_identity_raises_identify_error(monkeypatch: pyte
     assert "identify" in result.e
 
 
+# ---------------------------------------------------------------------------
+# install_plugins_compatibly batching
+# ---------------------------------------------------------------------------
+
+_OTHER_PLUGIN = PluginSettings(pip_source="other-plugin", module_name="other_plugin")
+
+
+def test_batch_installs_all_plugins_in_one_resolution(monkeypatch: pytest.MonkeyPatch) -> None:
+    install_calls = _patch_all(
+        monkeypatch,
+        freeze_lines=["my-plugin==2.0.0", "other-plugin==1.0.0", "other-pkg==1.0.0"],
+        real_install=_ok(stderr="  + my-plugin==2.5.0\n  + other-plugin==1.1.0\n"),
+    )
+    with patch("forecastbox.domain.plugin.compatibility.get_fiabcore_version", return_value=Version("1.2.3")):
+        results = install_plugins_compatibly({"a": _PLUGIN, "b": _OTHER_PLUGIN})
+    assert len(install_calls) == 2
+    _python, constraints_text, _extra_args, plugin_args, _dry, _path = install_calls[0]
+    assert plugin_args == ["my-plugin<2.0.0,>=1.0.0", "other-plugin<2.0.0,>=1.0.0"]
+    assert "my-plugin" not in constraints_text and "other-plugin" not in constraints_text
+    assert "other-pkg==1.0.0" in constraints_text
+    assert results["a"].t == results["b"].t == {"my-plugin": "2.5.0", "other-plugin": "1.1.0"}
+
+
+def test_batch_dry_run_failure_falls_back_to_single_installs(monkeypatch: pytest.MonkeyPatch) -> None:
+    install_calls = _patch_all(monkeypatch)
+    recorded_install = install_calls.append
+
+    def fake_run_pip_install(
+        python: str, constraints_path: str, extra_args: list[str], plugin_args: list[str], dry_run: bool
+    ) -> CommandResult:
+        recorded_install((list(plugin_args), dry_run))
+        if any(arg.startswith("other-plugin") for arg in plugin_args):
+            return _fail(stderr="conflicting dependency")
+        return _ok(stderr="  + my-plugin==2.5.0\n")
+
+    monkeypatch.setattr("forecastbox.domain.plugin.compatibility.run_pip_install", fake_run_pip_install)
+    with patch("forecastbox.domain.plugin.compatibility.get_fiabcore_version", return_value=Version("1.2.3")):
+        results = install_plugins_compatibly({"a": _PLUGIN, "b": _OTHER_PLUGIN})
+    assert results["a"].t == {"my-plugin": "2.5.0"}
+    assert results["b"].e is not None and "conflicting dependency" in results["b"].e
+    # joint dry run, then the dry run and install of the first plugin, then the dry run of the second
+    assert [dry for _args, dry in install_calls] == [True, True, False, True]
+
+
+def test_batch_install_failure_is_attributed_to_every_plugin(monkeypatch: pytest.MonkeyPatch) -> None:
+    install_calls = _patch_all(monkeypatch, real_install=_fail(stderr="disk full"))
+    results = install_plugins_compatibly({"a": _PLUGIN, "b": _OTHER_PLUGIN})
+    assert len(install_calls) == 2
+    for result in results.values():
+        assert result.e is not None and "disk full" in result.e
+
+
+def test_batch_identify_failure_does_not_block_other_plugins(monkeypatch: pytest.MonkeyPatch) -> None:
+    install_calls = _patch_all(monkeypatch)
+    monkeypatch.setattr(
+        "forecastbox.domain.plugin.compatibility.query_module_distribution_map",
+        lambda python: {"my_plugin": ["my-plugin-a", "my-plugin-b"]},
+    )
+    results = install_plugins_compatibly({"a": PluginSettings(pip_source="-e /some/path", module_name="my_plugin"), "b": _OTHER_PLUGIN})
+    assert results["a"].e is not None and "identify" in results["a"].e
+    assert results["b"].t == {"my-plugin": "2.5.0"}
+    assert len(install_calls) == 2
+
+
 def test_get_compatible_versions_filters_by_major() -> None:
     versions = ["1.0.0", "1.1.0", "2.0.0", "0.9.0"]
     with patch("forecastbox.domain.plugin.compatibility.get_fiabcore_version", return_value=Version("1.0.0")):
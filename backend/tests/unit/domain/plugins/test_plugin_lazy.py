@@ -0,0 +1,210 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for domain.plugin.lazy -- manifests, deferred imports and import stats."""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from cascade.low.func import Either
+from fiab_core.artifacts import ArtifactLocalId, ArtifactsProvider, ArtifactStoreId, CompositeArtifactId
+from fiab_core.fable import (
+    BlockConfigurationOption,
+    BlockFactory,
+    BlockFactoryCatalogue,
+    BlockFactoryId,
+    BlockInstance,
+    BlueprintTemplate,
+    ConfigurationOptionId,
+    NoOutput,
+    PluginCompositeId,
+)
+from fiab_core.plugin import BlockValidation, Plugin
+from fiab_core.types import IntType
+from fiab_core.types.definitions import ArtifactType, ClosedEnumType, FableType
+
+from forecastbox.domain.plugin import lazy, loading
+from forecastbox.utility.config import PluginImportSettings, PluginSettings, config
+
+_SETTINGS = PluginSettings(pip_source="my-plugin", module_name="my_plugin")
+_BLOCK = BlockInstance(configuration_values={}, input_ids={})
+
+
+def _plugin(value_type: FableType = IntType()) -> Plugin:
+    catalogue = BlockFactoryCatalogue(
+        factories={
+            BlockFactoryId("source"): BlockFactory(
+                kind="source",
+                title="Source",
+                description="",
+                configuration_options={
+                    ConfigurationOptionId("steps"): BlockConfigurationOption(title="", description="", value_type=value_type)
+                },
+                inputs=[],
+            )
+        }
+    )
+    return Plugin(
+        catalogue=catalogue,
+        validator=lambda factory_id, block, inputs: BlockValidation(Either.ok(NoOutput())),
+        expander=lambda output: [],
+        compiler=lambda lookup, factory_id, block: Either.error("not compilable"),
+        blueprint_templates=(BlueprintTemplate(display_name="template", display_description="", blocks={}),),
+    )
+
+
+class _Loader:
+    def __init__(self, result: Either) -> None:  # type: ignore[type-arg]
+        self.result = result
+        self.calls = 0
+
+    def __call__(self) -> Either:  # type: ignore[type-arg]
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def manifest_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(config.backend, "plugin_import", PluginImportSettings(manifest_path=str(tmp_path)))
+    monkeypatch.setattr(lazy, "_static_version", lambda pip_source: "1.0.0")
+    return tmp_path
+
+
+def test_deferred_plugin_imports_on_first_use(manifest_dir: Path) -> None:
+    plugin = _plugin()
+    lazy.write_manifest(_SETTINGS, plugin)
+    loader = _Loader(Either.ok(plugin))
+
+    deferred = lazy.deferred_plugin(_SETTINGS, loader)
+    assert deferred is not None
+    assert deferred.catalogue.model_dump_json() == plugin.catalogue.model_dump_json()
+    assert [t.display_name for t in deferred.blueprint_templates] == ["template"]
+    assert loader.calls == 0
+
+    assert deferred.validator(BlockFactoryId("source"), _BLOCK, {}).result.t == NoOutput()
+    assert deferred.compiler({}, BlockFactoryId("source"), _BLOCK).e == "not compilable"
+    assert deferred.compile_with_output({}, BlockFactoryId("source"), _BLOCK, {}).e == "not compilable"
+    assert deferred.expander(NoOutput()) == []
+    assert loader.calls == 1
+
+
+def test_failed_deferred_import_is_reported_and_drops_manifest(manifest_dir: Path) -> None:
+    lazy.write_manifest(_SETTINGS, _plugin())
+    loader = _Loader(Either.error("failed to import plugin my_plugin"))
+
+    deferred = lazy.deferred_plugin(_SETTINGS, loader)
+    assert deferred is not None
+    validation = deferred.validator(BlockFactoryId("source"), _BLOCK, {}).result
+    assert validation.e is not None and validation.e.is_hard
+    assert validation.e.reason == "failed to import plugin my_plugin"
+    assert deferred.compiler({}, BlockFactoryId("source"), _BLOCK).e == "failed to import plugin my_plugin"
+    assert deferred.expander(NoOutput()) == []
+    assert loader.calls == 1
+    assert lazy.deferred_plugin(_SETTINGS, loader) is None
+
+
+def test_no_manifest_without_static_version(manifest_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lazy, "_static_version", lambda pip_source: None)
+    lazy.write_manifest(_SETTINGS, _plugin())
+    assert not list(manifest_dir.iterdir())
+    assert lazy.deferred_plugin(_SETTINGS, _Loader(Either.ok(_plugin()))) is None
+
+
+def test_manifest_ignored_on_other_versions(manifest_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    lazy.write_manifest(_SETTINGS, _plugin())
+    (path,) = manifest_dir.iterdir()
+    assert lazy.read_manifest(_SETTINGS) is not None
+
+    monkeypatch.setattr(lazy, "_static_version", lambda pip_source: "1.1.0")
+    assert lazy.read_manifest(_SETTINGS) is None
+
+    monkeypatch.setattr(lazy, "_static_version", lambda pip_source: "1.0.0")
+    path.write_text(json.dumps(json.loads(path.read_text()) | {"fiab_core_version": "0.0.1"}))
+    assert lazy.read_manifest(_SETTINGS) is None
+
+    path.write_text("{")
+    assert lazy.read_manifest(_SETTINGS) is None
+
+
+def test_manifest_with_artifact_options_ignored_once_catalog_changes(manifest_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    checkpoints = [CompositeArtifactId(ArtifactStoreId("store"), ArtifactLocalId("aifs"))]
+    monkeypatch.setattr(ArtifactsProvider, "_get_artifacts_lookup", lambda: dict.fromkeys(checkpoints))
+    enum = ClosedEnumType(["store:aifs"], subtype=ArtifactType())
+    lazy.write_manifest(_SETTINGS, _plugin(enum))
+    assert lazy.read_manifest(_SETTINGS) is not None
+
+    checkpoints.append(CompositeArtifactId(ArtifactStoreId("store"), ArtifactLocalId("aifs-new")))
+    assert lazy.read_manifest(_SETTINGS) is None
+
+    # NOTE catalogues without artifact options do not depend on the artifact catalog
+    lazy.write_manifest(_SETTINGS, _plugin())
+    checkpoints.pop()
+    assert lazy.read_manifest(_SETTINGS) is not None
+
+
+@pytest.mark.parametrize(
+    "direct_url",
+    [
+        '{"url": "https://github.com/ecmwf/plugin", "vcs_info": {"vcs": "git", "commit_id": "abc"}}',
+        '{"url": "file:///src/plugin", "dir_info": {}}',
+    ],
+)
+def test_no_static_version_unless_installed_from_index(direct_url: str) -> None:
+    distribution = MagicMock(version="1.0.0")
+    distribution.read_text.return_value = direct_url
+    with patch("importlib.metadata.distribution", return_value=distribution):
+        assert lazy._static_version("my-plugin") is None
+        distribution.read_text.return_value = None
+        assert lazy._static_version("my-plugin") == "1.0.0"
+
+
+def test_lazy_import_disabled(manifest_dir: Path) -> None:
+    lazy.write_manifest(_SETTINGS, _plugin())
+    config.backend.plugin_import.lazy = False
+    assert lazy.deferred_plugin(_SETTINGS, _Loader(Either.ok(_plugin()))) is None
+
+
+def test_measured_import_records_stats() -> None:
+    with lazy.measured_import("my_plugin_stats"):
+        pass
+    stats = lazy.import_stats()["my_plugin_stats"]
+    assert stats.seconds >= 0
+    assert stats.rss_bytes >= 0
+
+
+def test_load_plugins_does_not_import_plugin_with_manifest(manifest_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    site = manifest_dir / "site"
+    (site / "my_lazy_plugin").mkdir(parents=True)
+    (site / "my_lazy_plugin" / "__init__.py").write_text("raise RuntimeError('must not be imported')\n")
+    (site / "my_lazy_plugin-1.0.0.dist-info").mkdir()
+    (site / "my_lazy_plugin-1.0.0.dist-info" / "METADATA").write_text("Metadata-Version: 2.1\nName: my-lazy-plugin\nVersion: 1.0.0\n")
+    monkeypatch.syspath_prepend(str(site))
+    settings = PluginSettings(pip_source="my-lazy-plugin", module_name="my_lazy_plugin")
+    lazy.write_manifest(settings, _plugin())
+
+    published: dict = {}
+    monkeypatch.setattr(loading, "check_environment_baseline", lambda: None)
+    monkeypatch.setattr(loading, "get_plugin_state", lambda plugin_id: SimpleNamespace(enabled=True, plugin_version="1.0.0"))
+    monkeypatch.setattr(loading, "upsert_plugin_state", MagicMock())
+    monkeypatch.setattr(loading, "publish_bulk_snapshot", lambda lookup, errors: published.update(lookup=lookup, errors=errors) or True)
+    monkeypatch.setattr(loading, "ingest_plugin_templates", MagicMock())
+    install = MagicMock()
+    monkeypatch.setattr(loading, "install_plugins_compatibly", install)
+
+    key = PluginCompositeId.from_str("store:my_lazy_plugin")
+    loading.load_plugins({key: settings})
+
+    install.assert_not_called()
+    assert "my_lazy_plugin" not in sys.modules
+    assert published["lookup"][key].catalogue.factories.keys() == {BlockFactoryId("source")}
+    assert published["errors"] == {}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from fiab_core.artifacts import ArtifactLocalId, ArtifactStoreId, CompositeArtifactId
+from pyrsistent import pmap, pset
+
+import forecastbox.domain.run.artifact_wait as artifact_wait
+from forecastbox.domain.artifact.base import DownloadProgress
+from forecastbox.domain.artifact.events import ArtifactDownloadFinishedEvent
+from forecastbox.domain.artifact.manager import ArtifactManager
+from forecastbox.domain.run.dispatchers import dispatchers
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.dispatcher import Event, EventName
+
+checkpoint = CompositeArtifactId(ArtifactStoreId("store"), ArtifactLocalId("checkpoint"))
+other = CompositeArtifactId(ArtifactStoreId("store"), ArtifactLocalId("other"))
+
+
+class _Run:
+    def __init__(self) -> None:
+        self.resumed = 0
+        self.errors: list[str] = []
+
+    def resume(self) -> None:
+        self.resumed += 1
+
+    def fail(self, error: str) -> None:
+        self.errors.append(error)
+
+    def park(self, run_id: str, *artifacts: CompositeArtifactId) -> bool:
+        return artifact_wait.park(RunId(run_id), 1, set(artifacts), resume=self.resume, fail=self.fail)
+
+
+@pytest.fixture(autouse=True)
+def artifact_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(ArtifactManager, "locally_available", pset())
+    monkeypatch.setattr(ArtifactManager, "ongoing_downloads", pmap())
+    monkeypatch.setattr(artifact_wait, "_parked", {})
+
+
+def _downloading(*artifacts: CompositeArtifactId) -> None:
+    for artifact in artifacts:
+        ArtifactManager.ongoing_downloads = ArtifactManager.ongoing_downloads.set(artifact, DownloadProgress(percent=10))
+
+
+def _downloaded(artifact: CompositeArtifactId) -> None:
+    ArtifactManager.ongoing_downloads = ArtifactManager.ongoing_downloads.remove(artifact)
+    ArtifactManager.locally_available = ArtifactManager.locally_available.add(artifact)
+    (registration,) = dispatchers
+    registration.handler(Event(EventName("artifact.downloaded"), ArtifactDownloadFinishedEvent(artifact, is_success=True)))
+
+
+def test_park_not_needed_when_available() -> None:
+    ArtifactManager.locally_available = pset([checkpoint])
+    run = _Run()
+    assert not run.park("r1", checkpoint)
+    assert artifact_wait.parked_count() == 0
+    assert run.resumed == 0 and not run.errors
+
+
+def test_parked_run_resumes_once_all_artifacts_downloaded() -> None:
+    _downloading(checkpoint, other)
+    run = _Run()
+    assert run.park("r1", checkpoint, other)
+
+    _downloaded(checkpoint)
+    assert run.resumed == 0
+    assert artifact_wait.parked_count() == 1
+
+    _downloaded(other)
+    assert run.resumed == 1
+    assert artifact_wait.parked_count() == 0
+    assert not run.errors
+
+
+def test_parked_run_fails_on_download_failure() -> None:
+    _downloading(checkpoint)
+    run, unrelated = _Run(), _Run()
+    assert run.park("r1", checkpoint)
+    _downloading(other)
+    assert unrelated.park("r2", other)
+
+    ArtifactManager.ongoing_downloads = ArtifactManager.ongoing_downloads.set(checkpoint, "ConnectError()")
+    artifact_wait.settle()
+    assert run.resumed == 0
+    assert run.errors == ["Failed to download runtime artifact store:checkpoint: ConnectError()"]
+    assert not unrelated.errors
+    assert artifact_wait.parked_count() == 1
+
+
+def test_park_fails_right_away_on_failed_download() -> None:
+    ArtifactManager.ongoing_downloads = pmap({checkpoint: "ConnectError()"})
+    run = _Run()
+    assert run.park("r1", checkpoint)
+    assert run.errors == ["Failed to download runtime artifact store:checkpoint: ConnectError()"]
+    assert artifact_wait.parked_count() == 0
+
+
+def test_parked_run_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    _downloading(checkpoint)
+    run = _Run()
+    monkeypatch.setattr(artifact_wait, "max_wait_seconds", -1)
+    assert run.park("r1", checkpoint)
+    artifact_wait.settle()
+    assert run.errors == ["Timeout waiting for runtime artifacts to download"]
+
+
+def test_stalled_download_times_out_without_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    _downloading(checkpoint)
+    run = _Run()
+    monkeypatch.setattr(artifact_wait, "max_wait_seconds", 0.05)
+    assert run.park("r1", checkpoint)
+    assert not run.errors
+
+    deadline = time.monotonic() + 5
+    while not run.errors and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run.errors == ["Timeout waiting for runtime artifacts to download"]
+    assert artifact_wait.parked_count() == 0
+
+
+def test_settled_run_cancels_its_expiry() -> None:
+    _downloading(checkpoint)
+    run = _Run()
+    assert run.park("r1", checkpoint)
+    (parked,) = artifact_wait._parked.values()
+
+    _downloaded(checkpoint)
+    assert run.resumed == 1
+    parked.expiry.join(timeout=5)
+    assert not parked.expiry.is_alive()
@@ -77,7 +77,7 @@ def patch_submit_stack(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
     monkeypatch.setattr(run_cascade, "JobSpec", _FakeJobSpec)
     monkeypatch.setattr(run_cascade, "SubmitJobRequest", _FakeSubmitJobRequest)
     monkeypatch.setattr(run_cascade, "JobInstanceRich", _FakeJobInstanceRich)
-    monkeypatch.setattr(run_cascade, "request_response", _fake_request_response)
+    monkeypatch.setattr(run_cascade, "request_response_sync", _fake_request_response)
     monkeypatch.setattr(run_cascade, "get_gateway_url", lambda: "tcp://gateway")
 
     return captures
@@ -193,3 +193,30 @@ def test_execute_cascade_ssh_cluster_uses_gateway_spec(patch_submit_stack: dict[
     assert request.job.infra_spec.controller_url == "ssh://controller"
     assert request.job.infra_spec.worker_urls == ["ssh://worker-1", "ssh://worker-2"]
     assert request.job.infra_spec.workers_per_host == 3
+
+
+def test_request_runtime_artifacts_returns_missing(monkeypatch: pytest.MonkeyPatch) -> None:
+    from cascade.low.func import Either
+    from fiab_core.artifacts import CompositeArtifactId
+    from pyrsistent import pset
+
+    available, downloading, fresh = (CompositeArtifactId.from_str(f"store:{name}") for name in ("available", "downloading", "fresh"))
+    progress = {downloading: 40, fresh: 0}
+    requested: list[CompositeArtifactId] = []
+
+    def _submit(artifact_id: CompositeArtifactId) -> Either:
+        requested.append(artifact_id)
+        return Either.ok(progress[artifact_id])
+
+    monkeypatch.setattr(run_cascade.ArtifactManager, "locally_available", pset([available]))
+    monkeypatch.setattr(run_cascade, "submit_artifact_download", _submit)
+    environment = EnvironmentSpecification(runtime_artifacts=[available, downloading, fresh])
+
+    result = run_cascade.request_runtime_artifacts(_spec_with_environment(environment))
+
+    assert result.t == {downloading, fresh}
+    assert requested == [downloading, fresh]
+
+    monkeypatch.setattr(run_cascade, "submit_artifact_download", lambda artifact_id: Either.error("not in catalog"))
+    result = run_cascade.request_runtime_artifacts(_spec_with_environment(environment))
+    assert result.e == "Failed to submit download for store:downloading: not in catalog"
@@ -1,5 +1,9 @@
+from dataclasses import replace
+from pathlib import Path
+
 import pytest
 from cascade.low.func import Either
+from earthkit.workflows import fluent
 from earthkit.workflows.fluent import Action
 from fiab_core.fable import (
     ActionLookup,
@@ -14,15 +18,19 @@ from fiab_core.fable import (
     ConfigurationOptionId,
     NoOutput,
     PluginCompositeId,
+    RawOutput,
 )
-from fiab_core.plugin import BlockValidation, Plugin
-from fiab_core.types.definitions import IntType
+from fiab_core.plugin import BlockCompilation, BlockValidation, Plugin
+from fiab_core.types.definitions import IntType, StringType
 from pyrsistent import pmap
 
 from forecastbox.domain.blueprint.service import BlueprintBuilder, RoutableBlock
 from forecastbox.domain.glyphs.resolution import merge_glyph_values
 from forecastbox.domain.plugin.state import PluginManager
+from forecastbox.domain.run import compile_cache
 from forecastbox.domain.run.compile import compile_builder
+from forecastbox.utility import memcache
+from forecastbox.utility.config import MemcacheSettings, PluginSettings, config
 
 # ---------------------------------------------------------------------------
 # merge_glyph_values
@@ -184,3 +192,143 @@ def test_compile_builder_fails_missing_config_before_plugin_compile(monkeypatch:
     with pytest.raises(ValueError, match="missing configuration options"):
         compile_builder(blueprint, {})
     assert not compiler_called
+
+
+def _label_sink_plugin(compiled: list[str]) -> Plugin:
+    def _compiler(lookup: ActionLookup, factory_id: BlockFactoryId, instance: BlockInstance) -> Either[Action, str]:  # type:ignore[invalid-type-arguments] # semigroup
+        del lookup, factory_id
+        label = instance.configuration_values[ConfigurationOptionId("label")]
+        compiled.append(label)
+        return Either.ok(fluent.from_source([lambda: label]))
+
+    def _validator(factory_id: BlockFactoryId, instance: BlockInstance, inputs: dict[str, BlockInstanceOutput]) -> BlockValidation:
+        del factory_id, instance, inputs
+        return BlockValidation(Either.ok(RawOutput(mime_type="text/plain")))
+
+    return Plugin(
+        catalogue=BlockFactoryCatalogue(
+            factories={
+                BlockFactoryId("label"): BlockFactory(
+                    kind="sink",
+                    title="",
+                    description="",
+                    configuration_options={
+                        ConfigurationOptionId("label"): BlockConfigurationOption(title="", description="", value_type=StringType()),
+                    },
+                    inputs=[],
+                )
+            }
+        ),
+        validator=_validator,
+        expander=lambda output: [],
+        compiler=_compiler,
+    )
+
+
+def _label_blueprint(plugin_id: PluginCompositeId) -> BlueprintBuilder:
+    return BlueprintBuilder(
+        blocks=[
+            RoutableBlock(
+                instance_id=BlockInstanceId("sink"),
+                plugin=plugin_id,
+                factory=BlockFactoryId("label"),
+                instance=BlockInstance(configuration_values={ConfigurationOptionId("label"): "${region}"}, input_ids={}),
+            )
+        ]
+    )
+
+
+def test_compile_builder_reuses_compilation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    plugin_id = PluginCompositeId.from_str("local:labels")
+    compiled: list[str] = []
+    version, library_version, fingerprint = "1.0", "2.0", ""
+    monkeypatch.setattr(PluginManager, "plugins", pmap({plugin_id: _label_sink_plugin(compiled)}))
+    monkeypatch.setattr(config.external, "plugins", {plugin_id: PluginSettings(pip_source="labels", module_name="labels")})
+    monkeypatch.setattr(
+        compile_cache, "try_version", lambda pip_source, module_name: version if pip_source == "labels" else library_version
+    )
+    monkeypatch.setattr(compile_cache, "try_install_fingerprint", lambda pip_source, module_name: fingerprint)
+    monkeypatch.setattr(config.backend, "memcache", MemcacheSettings(spill_path=str(tmp_path)))
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+
+    first = compile_builder(_label_blueprint(plugin_id), {"region": "europe", "runId": "r1"})
+    second = compile_builder(_label_blueprint(plugin_id), {"region": "europe", "runId": "r2"})
+    assert compiled == ["europe"]
+    assert second.execution_spec == first.execution_spec
+    assert second.resolved_configuration_options == {BlockInstanceId("sink"): {ConfigurationOptionId("label"): "europe"}}
+    # the cached entry is not shared with the callers
+    second.execution_spec.job.job_instance.ext_outputs.clear()
+    assert compile_builder(_label_blueprint(plugin_id), {"region": "europe"}).execution_spec == first.execution_spec
+    # served from the disk tier after a restart
+    memcache.flush()
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    assert compile_builder(_label_blueprint(plugin_id), {"region": "europe"}).execution_spec == first.execution_spec
+    assert compiled == ["europe"]
+
+    compile_builder(_label_blueprint(plugin_id), {"region": "africa"})
+    version = "1.1"
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    assert compiled == ["europe", "africa", "europe"]
+    library_version = "2.1"
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    fingerprint = "vcs:abc"
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    assert compiled == ["europe", "africa", "europe", "europe", "europe"]
+    # NOTE editable installs may change their code in place
+    fingerprint = None
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    assert len(compiled) == 7
+
+
+def test_compile_builder_skips_cache_for_unknown_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    plugin_id = PluginCompositeId.from_str("local:labels")
+    compiled: list[str] = []
+    monkeypatch.setattr(PluginManager, "plugins", pmap({plugin_id: _label_sink_plugin(compiled)}))
+    monkeypatch.setattr(config.external, "plugins", {plugin_id: PluginSettings(pip_source="labels", module_name="labels")})
+    monkeypatch.setattr(compile_cache, "try_version", lambda pip_source, module_name: "unknown")
+
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    assert compiled == ["europe", "europe"]
+
+
+def test_compile_builder_uses_output_compiler(monkeypatch: pytest.MonkeyPatch) -> None:
+    plugin_id = PluginCompositeId.from_str("local:labels")
+    compiled: list[str] = []
+    legacy = _label_sink_plugin(compiled)
+
+    def _validator(factory_id: BlockFactoryId, instance: BlockInstance, inputs: dict[str, BlockInstanceOutput]) -> BlockValidation:
+        raise AssertionError("validator should not be called when compiling")
+
+    def _output_compiler(
+        lookup: ActionLookup, factory_id: BlockFactoryId, instance: BlockInstance, inputs: dict[str, BlockInstanceOutput]
+    ) -> Either[BlockCompilation, str]:  # type:ignore[invalid-type-arguments] # semigroup
+        action = legacy.compiler(lookup, factory_id, instance).get_or_raise()
+        return Either.ok(BlockCompilation(action=action, output=RawOutput(mime_type="text/csv")))
+
+    plugin = replace(legacy, validator=_validator, output_compiler=_output_compiler)
+    monkeypatch.setattr(PluginManager, "plugins", pmap({plugin_id: plugin}))
+    monkeypatch.setattr(config.backend, "compilation_cache", False)
+
+    result = compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
+    assert compiled == ["europe"]
+    assert [output.mime_type for output in result.run_outputs.outputs.values()] == ["text/csv"]
+
+
+def test_compile_builder_fails_on_raising_validator(monkeypatch: pytest.MonkeyPatch) -> None:
+    plugin_id = PluginCompositeId.from_str("local:labels")
+
+    def _validator(factory_id: BlockFactoryId, instance: BlockInstance, inputs: dict[str, BlockInstanceOutput]) -> BlockValidation:
+        raise KeyError("region")
+
+    plugin = replace(_label_sink_plugin([]), validator=_validator)
+    monkeypatch.setattr(PluginManager, "plugins", pmap({plugin_id: plugin}))
+    monkeypatch.setattr(config.backend, "compilation_cache", False)
+
+    assert (
+        plugin.compile_with_output({}, BlockFactoryId("label"), _label_blueprint(plugin_id).blocks[0].instance, {}).e
+        == "KeyError('region')"
+    )
+    with pytest.raises(ValueError, match="compile failed at"):
+        compile_builder(_label_blueprint(plugin_id), {"region": "europe"})
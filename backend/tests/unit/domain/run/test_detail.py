@@ -7,6 +7,7 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -24,6 +25,7 @@ from forecastbox.domain.run.detail import (
 )
 from forecastbox.domain.run.exceptions import CompilationDetailCorrupted, CompilationDetailNotFound
 from forecastbox.domain.run.types import RunId
+from forecastbox.utility.config import MemcacheSettings, config
 
 # ---------------------------------------------------------------------------
 # TaskDetail
@@ -108,7 +110,8 @@ def test_compilation_detail_with_task_detail() -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_store_and_retrieve_round_trip() -> None:
+def test_store_and_retrieve_round_trip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.backend, "memcache", MemcacheSettings(spill_path=str(tmp_path)))
     run_id = RunId("test-run-id-2")
     task_detail = {TaskId("task-a"): TaskDetail(block=BlockInstanceId("block-a"), display_name="func:hash", parents=[])}
     detail = CompilationDetail(task_detail=task_detail)
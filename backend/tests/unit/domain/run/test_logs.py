@@ -0,0 +1,64 @@
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from forecastbox.domain.run import logs
+from forecastbox.domain.run.logs import LogsFilter, iter_logs_archive
+
+
+@pytest.fixture
+def logs_directory(tmp_path: Path) -> Path:
+    (tmp_path / "gateway.logs.txt").write_text("gateway started\n")
+    (tmp_path / "job_j1.controller.logs.txt").write_text("controller line\n")
+    (tmp_path / "job_j1.host0.logs.txt").write_text("task:a started\nunrelated\ntask:b started\n")
+    (tmp_path / "job_j1.host0.w1.logs.txt").write_text("task:a finished\n")
+    (tmp_path / "job_j1.host1.w1.logs.txt").write_text("task:b finished\n")
+    (tmp_path / "job_j2.host0.logs.txt").write_text("other job\n")
+    return tmp_path
+
+
+def _unzip(chunks: list[bytes]) -> dict[str, bytes]:
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+def test_archive_contains_entries_and_job_logs(logs_directory: Path) -> None:
+    members = _unzip(list(iter_logs_archive({"db_entity.json": b"{}"}, logs_directory, "j1", LogsFilter(), 6)))
+
+    assert sorted(members) == [
+        "db_entity.json",
+        "gateway.logs.txt",
+        "job_j1.controller.logs.txt",
+        "job_j1.host0.logs.txt",
+        "job_j1.host0.w1.logs.txt",
+        "job_j1.host1.w1.logs.txt",
+    ]
+    assert members["job_j1.host0.w1.logs.txt"] == b"task:a finished\n"
+
+
+def test_archive_filters_by_host_and_task(logs_directory: Path) -> None:
+    archive = iter_logs_archive({}, logs_directory, "j1", LogsFilter(host="host0", task="task:a"), 0)
+    members = _unzip(list(archive))
+
+    assert members == {
+        "job_j1.host0.logs.txt": b"task:a started\n",
+        "job_j1.host0.w1.logs.txt": b"task:a finished\n",
+    }
+
+
+def test_archive_is_produced_in_bounded_chunks(logs_directory: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logs, "chunk_size", 1024)
+    (logs_directory / "job_j1.host0.w2.logs.txt").write_bytes(b"x" * 100 * 1024)
+
+    chunks = list(iter_logs_archive({}, logs_directory, "j1", LogsFilter(host="host0.w2"), 0))
+
+    assert max(len(chunk) for chunk in chunks) < 2 * 1024
+    assert _unzip(chunks)["job_j1.host0.w2.logs.txt"] == b"x" * 100 * 1024
+
+
+def test_archive_reports_missing_logs_directory(tmp_path: Path) -> None:
+    members = _unzip(list(iter_logs_archive({}, tmp_path / "missing", "j1", LogsFilter(), 6)))
+
+    assert list(members) == ["logs_directory.error.txt"]
@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import cast
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from cascade.low.core import DatasetId, TaskId
+
+from forecastbox.domain.run import output_cache, service
+from forecastbox.domain.run.db import RunRecord
+from forecastbox.domain.run.types import RunId
+from forecastbox.utility.config import OutputCacheSettings, config
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(config.backend, "output_cache", OutputCacheSettings(path=str(tmp_path), max_size_mb=1))
+    return tmp_path
+
+
+def test_store_then_lookup_roundtrip(cache_dir: Path) -> None:
+    assert output_cache.lookup(RunId("run-1"), 1, TaskId("task:a")) is None
+
+    stored = output_cache.store(RunId("run-1"), 1, TaskId("task:a"), b"grib bytes")
+
+    assert stored is not None
+    assert stored.path.read_bytes() == b"grib bytes"
+    assert output_cache.lookup(RunId("run-1"), 1, TaskId("task:a")) == stored
+    # attempts are cached independently
+    assert output_cache.lookup(RunId("run-1"), 2, TaskId("task:a")) is None
+
+
+def test_etag_depends_on_key_and_size(cache_dir: Path) -> None:
+    a = output_cache.store(RunId("run-1"), 1, TaskId("task-a"), b"x")
+    b = output_cache.store(RunId("run-1"), 1, TaskId("task-b"), b"x")
+
+    assert a is not None and b is not None
+    assert a.etag != b.etag
+    assert a.etag.startswith('"') and a.etag.endswith('-1"')
+
+
+def _store_released(run_id: str, task_id: str, content: bytes) -> output_cache.CachedOutput:
+    stored = output_cache.store(RunId(run_id), 1, TaskId(task_id), content)
+    assert stored is not None
+    output_cache.release(stored)
+    return stored
+
+
+def test_store_evicts_least_recently_used_over_capacity(cache_dir: Path) -> None:
+    half = b"0" * (512 * 1024)
+    _store_released("run-1", "old", half)
+    _store_released("run-2", "new", half)
+    looked_up = output_cache.lookup(RunId("run-1"), 1, TaskId("old"))
+    assert looked_up is not None
+    output_cache.release(looked_up)
+    _store_released("run-3", "newest", b"1")
+
+    assert output_cache.lookup(RunId("run-1"), 1, TaskId("old")) is not None
+    assert output_cache.lookup(RunId("run-2"), 1, TaskId("new")) is None
+    assert output_cache.lookup(RunId("run-3"), 1, TaskId("newest")) is not None
+
+
+def test_eviction_skips_entries_being_served(cache_dir: Path) -> None:
+    half = b"0" * (512 * 1024)
+    served = output_cache.store(RunId("run-1"), 1, TaskId("served"), half)
+    assert served is not None
+    _store_released("run-2", "idle", half)
+    _store_released("run-3", "newest", b"1")
+
+    assert served.path.exists()
+    assert output_cache.lookup(RunId("run-2"), 1, TaskId("idle")) is None
+
+    output_cache.release(served)
+    _store_released("run-4", "newer", half)
+    assert not served.path.exists()
+
+
+def test_index_is_loaded_from_disk_oldest_first(cache_dir: Path) -> None:
+    half = b"0" * (512 * 1024)
+    old = _store_released("run-1", "old", half)
+    _store_released("run-2", "new", half)
+    os.utime(old.path, (0, 0))
+    output_cache._Index.root = None  # NOTE as after a restart
+
+    _store_released("run-3", "newest", b"1")
+
+    assert not old.path.exists()
+    assert output_cache.lookup(RunId("run-2"), 1, TaskId("new")) is not None
+
+
+def test_store_skips_entries_larger_than_capacity(cache_dir: Path) -> None:
+    assert output_cache.store(RunId("run-1"), 1, TaskId("huge"), b"0" * (1024 * 1024 + 1)) is None
+
+
+def test_disabled_cache_stores_nothing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.backend, "output_cache", OutputCacheSettings(path=str(tmp_path), max_size_mb=0))
+
+    assert output_cache.store(RunId("run-1"), 1, TaskId("task"), b"x") is None
+    assert output_cache.lookup(RunId("run-1"), 1, TaskId("task")) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_drop_run_removes_all_attempts(cache_dir: Path) -> None:
+    output_cache.store(RunId("run-1"), 1, TaskId("task"), b"x")
+    output_cache.store(RunId("run-1"), 2, TaskId("task"), b"x")
+    output_cache.store(RunId("run-2"), 1, TaskId("task"), b"x")
+
+    output_cache.drop_run(RunId("run-1"))
+
+    assert output_cache.lookup(RunId("run-1"), 1, TaskId("task")) is None
+    assert output_cache.lookup(RunId("run-1"), 2, TaskId("task")) is None
+    assert output_cache.lookup(RunId("run-2"), 1, TaskId("task")) is not None
+    assert output_cache._Index.total == 1
+
+
+@pytest.mark.asyncio
+async def test_get_output_content_contacts_gateway_only_on_miss(cache_dir: Path) -> None:
+    execution = cast(RunRecord, SimpleNamespace(run_id=RunId("run-1"), attempt_count=1))
+    dataset = DatasetId(task=TaskId("task-a"), output="0")
+    request_mock = AsyncMock(return_value=SimpleNamespace(error=None))
+
+    with (
+        patch("forecastbox.domain.run.service.client.request_response", new=request_mock),
+        patch("forecastbox.domain.run.service.get_gateway_url", return_value="tcp://gw"),
+        patch("forecastbox.domain.run.service.api.decoded_result", return_value=b"payload"),
+    ):
+        first = await service.get_output_content(execution, "job-1", dataset)
+        second = await service.get_output_content(execution, "job-1", dataset)
+
+    assert request_mock.await_count == 1
+    assert isinstance(first.t, output_cache.CachedOutput)
+    assert first.t == second.t
+    assert first.t.path.read_bytes() == b"payload"
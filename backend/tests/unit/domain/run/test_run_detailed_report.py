@@ -179,7 +179,8 @@ async def test_get_run_asks_for_detailed_report_while_list_runs_does_not() -> No
 
     with (
         patch("forecastbox.routes.run.db.get_run", new=AsyncMock(return_value=execution)),
-        patch("forecastbox.routes.run.service.poll_and_update", new=AsyncMock(side_effect=[detailed, detailed])) as mock_poll,
+        patch("forecastbox.routes.run.service.poll_and_update", new=AsyncMock(return_value=detailed)) as mock_poll,
+        patch("forecastbox.routes.run.service.poll_and_update_many", new=AsyncMock(return_value=[detailed])) as mock_poll_many,
         patch("forecastbox.routes.run.db.count_runs", new=AsyncMock(return_value=1)),
         patch("forecastbox.routes.run.db.list_runs", new=AsyncMock(return_value=[execution])),
     ):
@@ -189,4 +190,6 @@ async def test_get_run_asks_for_detailed_report_while_list_runs_does_not() -> No
         assert mock_poll.await_args_list[0].kwargs == {"detailed_report": True}
 
         await list_runs(PaginationSpec(page=1, page_size=10), AuthContext(user_id="user", is_admin=True))
-        assert mock_poll.await_args_list[1].kwargs == {}
+        # listing polls the whole page at once, which never asks for detailed reports
+        mock_poll_many.assert_awaited_once_with([execution])
+        assert mock_poll.await_count == 1
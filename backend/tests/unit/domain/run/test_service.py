@@ -289,3 +289,76 @@ async def test_poll_and_update_completed_job_with_changed_gateway_exposes_cached
     assert detail.status == "completed"
     assert detail.available_task_ids == [TaskId("task-text")]
     assert detail.lost_task_ids == {TaskId("task-image"): "Gateway Proc changed"}
+
+
+# ---------------------------------------------------------------------------
+# poll_and_update_many — batched polling for listings
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_poll_and_update_many_uses_single_gateway_request() -> None:
+    running_a = _make_running_execution(None)
+    running_b = _make_running_execution(None)
+    running_b.run_id = "run-2"
+    running_b.cascade_job_id = "job-2"
+    failed = _make_running_execution(None)
+    failed.run_id = "run-3"
+    failed.status = "failed"
+    cascade_response = SimpleNamespace(
+        progresses={
+            JobId("job-1"): SimpleNamespace(completed=False, pct="10.00", failure=None),
+            JobId("job-2"): SimpleNamespace(completed=True, pct="100.00", failure=None),
+        },
+        datasets={},
+        error=None,
+        completed_task_ids=None,
+        planned_task_ids=None,
+    )
+    request_mock = AsyncMock(return_value=cascade_response)
+    update_mock = AsyncMock()
+
+    with (
+        patch("forecastbox.domain.run.service.client.request_response", new=request_mock),
+        patch("forecastbox.domain.run.service.get_gateway_url", return_value="tcp://gw"),
+        patch("forecastbox.domain.run.service.run_db.update_run_runtime", new=update_mock),
+    ):
+        details = await service.poll_and_update_many([cast(RunRecord, e) for e in (running_a, failed, running_b)])
+
+    assert request_mock.call_count == 1
+    assert request_mock.call_args.args[0].job_ids == [JobId("job-1"), JobId("job-2")]
+    assert [d.run_id for d in details] == ["run-1", "run-3", "run-2"]
+    assert [d.status for d in details] == ["running", "failed", "completed"]
+    assert update_mock.call_args_list == [
+        call("run-1", 1, status="running", progress="10.00"),
+        call("run-2", 1, status="completed", progress="100.00"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_poll_and_update_many_skips_gateway_without_pollable_runs() -> None:
+    failed = _make_running_execution(None)
+    failed.status = "failed"
+    request_mock = AsyncMock()
+
+    with patch("forecastbox.domain.run.service.client.request_response", new=request_mock):
+        details = await service.poll_and_update_many([cast(RunRecord, failed)])
+
+    request_mock.assert_not_called()
+    assert details[0].status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_poll_and_update_many_marks_all_unknown_on_gateway_failure() -> None:
+    running_a = _make_running_execution(None)
+    running_b = _make_running_execution(None)
+    running_b.cascade_job_id = "job-2"
+
+    with (
+        patch("forecastbox.domain.run.service.client.request_response", side_effect=TimeoutError),
+        patch("forecastbox.domain.run.service.get_gateway_url", return_value="tcp://gw"),
+    ):
+        details = await service.poll_and_update_many([cast(RunRecord, e) for e in (running_a, running_b)])
+
+    assert [d.status for d in details] == ["unknown", "unknown"]
+    assert all(d.error == "failed to communicate with gateway" for d in details)
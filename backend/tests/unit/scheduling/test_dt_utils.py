@@ -1,10 +1,17 @@
 import re
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import pytest
 
-from forecastbox.domain.experiment.scheduling.dt_utils import calculate_next_run, parse_crontab
+from forecastbox.domain.experiment.scheduling.dt_utils import (
+    CatchUpPlan,
+    calculate_next_run,
+    calculate_next_runs,
+    calculate_runs_between,
+    parse_crontab,
+    plan_catch_up,
+)
 from forecastbox.utility.time import current_time
 
 
@@ -83,11 +90,74 @@ def test_next_run_invalid_crontab() -> None:
 
 def test_next_run_no_future_run() -> None:
     after = datetime(2025, 10, 20, 10, 0, 0)
-    cron_tab = "0 0 1 1 1"
+    cron_tab = "0 0 30 2 *"
     with pytest.raises(ValueError):
         calculate_next_run(after, cron_tab)
 
 
+def test_next_run_years_ahead() -> None:
+    # NOTE days of week are as in datetime.weekday, ie, 1 is Tuesday
+    after = datetime(2025, 10, 20, 10, 0, 0)
+    cron_tab = "0 0 1 1 1"
+    expected = datetime(2030, 1, 1, 0, 0, 0)
+    assert calculate_next_run(after, cron_tab) == expected
+
+
+def test_next_run_leap_day() -> None:
+    after = datetime(2025, 3, 1, 0, 0, 0)
+    cron_tab = "30 6 29 2 *"
+    expected = datetime(2028, 2, 29, 6, 30, 0)
+    assert calculate_next_run(after, cron_tab) == expected
+
+
+def test_next_run_keeps_timezone_and_skips_seconds() -> None:
+    after = datetime(2025, 10, 20, 10, 14, 30, tzinfo=UTC)
+    cron_tab = "*/15 * * * *"
+    expected = datetime(2025, 10, 20, 10, 15, 0, tzinfo=UTC)
+    assert calculate_next_run(after, cron_tab) == expected
+    assert calculate_next_run(expected, cron_tab) == datetime(2025, 10, 20, 10, 30, 0, tzinfo=UTC)
+
+
+def test_next_runs_and_window() -> None:
+    after = datetime(2025, 12, 30, 12, 0, 0)
+    cron_tab = "0 0,12 * * *"
+    expected = [datetime(2025, 12, 31, 0), datetime(2025, 12, 31, 12), datetime(2026, 1, 1, 0)]
+    assert calculate_next_runs(after, cron_tab, 3) == expected
+    assert calculate_runs_between(after, datetime(2026, 1, 1, 0), cron_tab) == expected
+    assert calculate_runs_between(after, datetime(2026, 1, 1, 0), cron_tab, limit=2) == expected[:2]
+    assert calculate_runs_between(after, after, cron_tab) == []
+    assert calculate_next_runs(after, "0 0 30 2 *", 3) == []
+
+
+def test_plan_catch_up(subtests: Any) -> None:
+    scheduled_at = datetime(2025, 10, 20, 0, 0)
+    now = datetime(2025, 10, 20, 3, 30)
+    cron_tab = "0 * * * *"
+    max_delay = timedelta(hours=24)
+    due = [datetime(2025, 10, 20, hour) for hour in range(4)]
+    next_run_at = datetime(2025, 10, 20, 4)
+
+    with subtests.test(msg="all"):
+        assert plan_catch_up(scheduled_at, now, cron_tab, max_delay, "all", 100) == CatchUpPlan(due, 0, next_run_at)
+    with subtests.test(msg="all bounded"):
+        assert plan_catch_up(scheduled_at, now, cron_tab, max_delay, "all", 2) == CatchUpPlan(due[2:], 2, next_run_at)
+    with subtests.test(msg="latest"):
+        assert plan_catch_up(scheduled_at, now, cron_tab, max_delay, "latest", 100) == CatchUpPlan(due[3:], 3, next_run_at)
+    with subtests.test(msg="skip"):
+        assert plan_catch_up(scheduled_at, now, cron_tab, max_delay, "skip", 100) == CatchUpPlan([], 4, next_run_at)
+    with subtests.test(msg="skip on time"):
+        on_time = datetime(2025, 10, 20, 0, 1)
+        expected = CatchUpPlan([scheduled_at], 0, datetime(2025, 10, 20, 1))
+        assert plan_catch_up(scheduled_at, on_time, cron_tab, max_delay, "skip", 100) == expected
+    with subtests.test(msg="max delay"):
+        assert plan_catch_up(scheduled_at, now, cron_tab, timedelta(minutes=90), "all", 100) == CatchUpPlan(due[2:], 1, next_run_at)
+    with subtests.test(msg="off-grid first run"):
+        first = datetime(2025, 10, 20, 2, 45)
+        assert plan_catch_up(first, now, cron_tab, max_delay, "all", 100) == CatchUpPlan([first, due[3]], 0, next_run_at)
+    with subtests.test(msg="no crontab"):
+        assert plan_catch_up(scheduled_at, now, None, max_delay, "all", 100) == CatchUpPlan([scheduled_at], 0, None)
+
+
 def test_next_run_step_value() -> None:
     after = datetime(2025, 10, 20, 10, 0, 0)
     cron_tab = "*/15 * * * *"
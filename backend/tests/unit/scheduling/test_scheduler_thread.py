@@ -0,0 +1,159 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Thread-level tests of the scheduler loop -- the submission cap, the wake-ups and the stop."""
+
+import datetime as dt
+import threading
+import time
+from collections.abc import Callable, Generator
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+from cascade.low.func import Either
+
+from forecastbox.domain.experiment.scheduling import background
+from forecastbox.domain.experiment.scheduling.background import SchedulerThread, _Submission
+from forecastbox.domain.experiment.scheduling.job_utils import RunnableExperiment
+from forecastbox.domain.experiment.types import ExperimentDefinitionId
+from forecastbox.utility.config import config
+from forecastbox.utility.time import current_time
+
+
+class _Submitter:
+    """Stands in for submit_run_sync, keeping the submissions in flight until finished explicitly"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.submitted: list[str] = []
+        self.in_flight: list[Callable[[], None]] = []
+
+    def __call__(self, blueprint: object, auth_context: object, **kwargs: Any) -> Either:
+        with self.lock:
+            self.submitted.append(cast(str, kwargs["experiment_context"]))
+            self.in_flight.append(kwargs["on_finished"])
+        return Either.ok(SimpleNamespace(run_id="run"))
+
+    def finish_one(self) -> None:
+        with self.lock:
+            on_finished = self.in_flight.pop(0)
+        on_finished()
+
+
+def _submission(experiment_id: str, hour: int) -> _Submission:
+    runnable = RunnableExperiment(
+        blueprint=cast(Any, None),
+        created_by="user",
+        next_run_at=None,
+        scheduled_at=dt.datetime(2026, 1, 1, hour),
+        experiment_id=ExperimentDefinitionId(experiment_id),
+        blueprint_id=cast(Any, "blueprint"),
+        blueprint_version=1,
+        max_acceptable_delay_hours=24,
+        compiler_runtime_context=cast(Any, None),
+    )
+    return _Submission(runnable, experiment_version=1)
+
+
+def _eventually(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def submitter(monkeypatch: pytest.MonkeyPatch) -> _Submitter:
+    submitter = _Submitter()
+    monkeypatch.setattr(background, "submit_run_sync", submitter)
+    monkeypatch.setattr(config.backend, "scheduler", config.backend.scheduler.model_copy(update={"max_concurrent_submissions": 2}))
+    return submitter
+
+
+@pytest.fixture
+def scheduler() -> Generator[SchedulerThread, None, None]:
+    scheduler = SchedulerThread()
+    yield scheduler
+    scheduler.stop()
+    if scheduler.is_alive():
+        scheduler.join(5)
+
+
+def test_submissions_capped_and_pending_restored_on_stop(
+    submitter: _Submitter, scheduler: SchedulerThread, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    restored: list[dict[ExperimentDefinitionId, dt.datetime]] = []
+    monkeypatch.setattr(background.db, "restore_experiment_next", lambda pending: restored.append(dict(pending)))
+    submissions = [_submission("a", 1), _submission("a", 2), _submission("b", 3), _submission("a", 4), _submission("b", 5)]
+    submitting = threading.Thread(target=scheduler._submit_all, args=(submissions,))
+    submitting.start()
+
+    assert _eventually(lambda: len(submitter.submitted) == 2)
+    time.sleep(0.1)
+    assert len(submitter.submitted) == 2
+
+    submitter.finish_one()
+    assert _eventually(lambda: len(submitter.submitted) == 3)
+
+    scheduler.stop_event.set()
+    submitting.join(5)
+    assert not submitting.is_alive()
+    assert len(submitter.submitted) == 3
+    assert restored == [{ExperimentDefinitionId("a"): dt.datetime(2026, 1, 1, 4), ExperimentDefinitionId("b"): dt.datetime(2026, 1, 1, 5)}]
+
+
+def test_failed_submission_releases_its_slot(submitter: _Submitter, scheduler: SchedulerThread, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(background, "submit_run_sync", lambda *args, **kwargs: Either.error("no blueprint"))
+    scheduler._submit_all([_submission("a", hour) for hour in range(5)])
+    # NOTE all slots free again
+    for _ in range(2):
+        assert scheduler.in_flight.acquire(timeout=0)
+
+
+def test_wakes_exactly_when_next_run_due(scheduler: SchedulerThread, monkeypatch: pytest.MonkeyPatch) -> None:
+    passes: list[float] = []
+
+    def try_schedule() -> tuple[list[_Submission], dt.datetime | None]:
+        passes.append(time.monotonic())
+        return [], current_time("scheduling") + dt.timedelta(seconds=0.3)
+
+    monkeypatch.setattr(scheduler, "_try_schedule", try_schedule)
+    scheduler.start()
+
+    assert _eventually(lambda: len(passes) >= 2)
+    assert 0.25 <= passes[1] - passes[0] < 2
+
+
+def test_prod_wakes_sleeping_scheduler(scheduler: SchedulerThread, monkeypatch: pytest.MonkeyPatch) -> None:
+    passes: list[float] = []
+    monkeypatch.setattr(scheduler, "_try_schedule", lambda: (passes.append(time.monotonic()), ([], None))[1])
+    scheduler.start()
+    assert _eventually(lambda: len(passes) == 1)
+    time.sleep(0.1)
+    assert len(passes) == 1
+
+    scheduler.prod()
+    assert _eventually(lambda: len(passes) == 2)
+
+
+def test_prod_during_pass_is_not_slept_through(scheduler: SchedulerThread, monkeypatch: pytest.MonkeyPatch) -> None:
+    passes: list[float] = []
+
+    def try_schedule() -> tuple[list[_Submission], dt.datetime | None]:
+        passes.append(time.monotonic())
+        if len(passes) == 1:
+            scheduler.prod()
+        return [], None
+
+    monkeypatch.setattr(scheduler, "_try_schedule", try_schedule)
+    scheduler.start()
+    assert _eventually(lambda: len(passes) == 2)
@@ -7,11 +7,15 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
+import hashlib
 import importlib.metadata
 import json
+import os
 import subprocess
 import tempfile
-from collections.abc import Generator
+import threading
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -23,9 +27,11 @@ from fiab_core.artifacts import AnemoiCheckpoint, ArtifactLocalId, ArtifactResol
 from packaging.version import Version
 from pyrsistent import pmap
 
+import forecastbox.domain.artifact.io as artifact_io
 from forecastbox.domain.artifact.base import (
     ArtifactCatalog,
     CompositeArtifactId,
+    DownloadProgress,
     get_artifact_local_path,
 )
 from forecastbox.domain.artifact.catalog import get_artifacts_catalog
@@ -34,7 +40,7 @@ from forecastbox.domain.artifact.io import (
     download_artifact,
     list_storage,
 )
-from forecastbox.utility.config import ArtifactStoreConfig, ArtifactStoresConfig
+from forecastbox.utility.config import ArtifactDownloadSettings, ArtifactStoreConfig, ArtifactStoresConfig, config
 from forecastbox.utility.tunnel import CommandHandle
 
 
@@ -551,6 +557,194 @@ def test_download_artifact_chunked_download(tmpdir_path: Path, sample_artifact:
         assert artifact_path.read_bytes() == total_content
 
 
+class _RangedServer:
+    """Serves `content` with range support through httpx.MockTransport, failing requests on demand."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.ranges: list[str | None] = []
+        self.fail_statuses: list[int] = []
+        self.break_after: int | None = None
+        self.lock = threading.Lock()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        headers = {"Accept-Ranges": "bytes", "ETag": '"v1"'}
+        if request.method == "HEAD":
+            return httpx.Response(200, headers=headers | {"Content-Length": str(len(self.content))})
+        with self.lock:
+            self.ranges.append(request.headers.get("Range"))
+            if self.fail_statuses:
+                return httpx.Response(self.fail_statuses.pop(0))
+            break_after, self.break_after = self.break_after, None
+        start, end = (int(e) for e in request.headers["Range"].removeprefix("bytes=").split("-"))
+        body = self.content[start : end + 1]
+
+        def stream() -> Iterator[bytes]:
+            if break_after is None:
+                yield body
+            else:
+                yield body[:break_after]
+                raise httpx.ReadError("connection reset")
+
+        return httpx.Response(206, headers=headers, stream=httpx.ByteStream(body) if break_after is None else _IteratorStream(stream()))
+
+    @contextmanager
+    def patched(self) -> Iterator[None]:
+        client = httpx.Client
+        with patch("httpx.Client", lambda **kwargs: client(transport=httpx.MockTransport(self.handle), **kwargs)):
+            yield
+
+
+class _IteratorStream(httpx.SyncByteStream):
+    def __init__(self, iterator: Iterator[bytes]) -> None:
+        self.iterator = iterator
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iterator
+
+
+@pytest.fixture
+def fast_download(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.backend, "artifact_download", ArtifactDownloadSettings(segments=4, min_segment_mb=1, retries=2))
+    monkeypatch.setattr(artifact_io, "_retry_backoff_seconds", 0.0)
+
+
+def test_download_artifact_parallel_segments_verified(tmpdir_path: Path, sample_artifact: Any, fast_download: None) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    content = os.urandom(4 * 1024 * 1024 + 7)
+    sample_artifact.common = sample_artifact.common.model_copy(update={"sha256": hashlib.sha256(content).hexdigest()})
+    server = _RangedServer(content)
+    server.fail_statuses = [503]
+    progresses: list[DownloadProgress] = []
+
+    with server.patched():
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}", progress_callback=progresses.append)
+
+    artifact_path = get_artifact_local_path(composite_id, f"file://{tmpdir_path}")
+    assert artifact_path.read_bytes() == content
+    assert sorted(artifact_path.parent.iterdir()) == [artifact_path]
+    # NOTE four segments, one of which retried after the 503
+    assert len(server.ranges) == 5
+    assert len(set(server.ranges)) == 4
+    assert f"bytes=0-{len(content) // 4 - 1}" in server.ranges
+    assert progresses[-1].retries == 1
+    assert all(p.percent < 100 and p.total_bytes == len(content) for p in progresses)
+
+
+def test_download_artifact_resumes_partial(tmpdir_path: Path, sample_artifact: Any, fast_download: None) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    content = os.urandom(1024 * 1024 + 100)
+    server = _RangedServer(content)
+    # NOTE the response is consumed in 1MB chunks, thus only the first of them is kept
+    server.break_after = 1024 * 1024 + 10
+    config.backend.artifact_download.retries = 0
+
+    with server.patched(), pytest.raises(httpx.ReadError):
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}")
+    artifact_path = get_artifact_local_path(composite_id, f"file://{tmpdir_path}")
+    assert not artifact_path.exists()
+    assert list_storage(pmap({composite_id: sample_artifact}), f"file://{tmpdir_path}") == []
+
+    with server.patched():
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}")
+    assert server.ranges == [f"bytes=0-{len(content) - 1}", f"bytes={1024 * 1024}-{len(content) - 1}"]
+    assert artifact_path.read_bytes() == content
+
+
+def test_download_artifact_checksum_mismatch(tmpdir_path: Path, sample_artifact: Any, fast_download: None) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    sample_artifact.common = sample_artifact.common.model_copy(update={"sha256": "0" * 64})
+
+    with _RangedServer(b"fake checkpoint data").patched(), pytest.raises(ValueError, match="checksum mismatch"):
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}")
+
+    artifact_path = get_artifact_local_path(composite_id, f"file://{tmpdir_path}")
+    assert not artifact_path.parent.exists() or list(artifact_path.parent.iterdir()) == []
+
+
+def test_download_artifact_syncs_part_before_saving_offsets(
+    tmpdir_path: Path, sample_artifact: Any, fast_download: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    server = _RangedServer(os.urandom(1024 * 1024 + 100))
+    server.break_after = 1024 * 1024 + 10
+    config.backend.artifact_download.retries = 0
+    calls: list[str] = []
+    fsync = os.fsync
+    monkeypatch.setattr(artifact_io, "_fsync", lambda path: calls.append(path.name))
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append("state") or fsync(fd))
+
+    with server.patched(), pytest.raises(httpx.ReadError):
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}")
+
+    assert calls and calls[::2] == ["model1.ckpt.part"] * (len(calls) // 2)
+    assert calls[1::2] == ["state"] * (len(calls) // 2)
+    state = json.loads(get_artifact_local_path(composite_id, f"file://{tmpdir_path}").with_name("model1.ckpt.part.json").read_text())
+    assert state["segments"][0]["done"] == 1024 * 1024
+
+
+def test_download_artifact_discards_partial_not_resumable(tmpdir_path: Path, sample_artifact: Any, fast_download: None) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        # NOTE without ranges the download starts from scratch on every attempt, thus is not resumable
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Content-Length": "20"})
+        return httpx.Response(200, stream=_IteratorStream(_broken_stream()))
+
+    def _broken_stream() -> Iterator[bytes]:
+        yield b"fake"
+        raise httpx.ReadError("connection reset")
+
+    client = httpx.Client
+    with (
+        patch("httpx.Client", lambda **kwargs: client(transport=httpx.MockTransport(handle), **kwargs)),
+        pytest.raises(httpx.ReadError),
+    ):
+        download_artifact(composite_id, sample_artifact, f"file://{tmpdir_path}")
+
+    artifact_path = get_artifact_local_path(composite_id, f"file://{tmpdir_path}")
+    assert list(artifact_path.parent.iterdir()) == []
+
+
+def test_delete_artifact_local_removes_partial(tmpdir_path: Path) -> None:
+    composite_id = CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    artifact_path = get_artifact_local_path(composite_id, f"file://{tmpdir_path}")
+    artifact_path.parent.mkdir(parents=True)
+    for name in ("model1.ckpt", "model1.ckpt.part", "model1.ckpt.part.json", "model2.ckpt.part"):
+        (artifact_path.parent / name).write_bytes(b"data")
+
+    delete_artifact(composite_id, f"file://{tmpdir_path}")
+
+    assert [p.name for p in artifact_path.parent.iterdir()] == ["model2.ckpt.part"]
+
+
+def test_list_local_storage_discards_abandoned_partials(tmpdir_path: Path, sample_artifact: Any) -> None:
+    catalog: ArtifactCatalog = pmap(
+        {
+            CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt")): sample_artifact,
+            CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model2.ckpt")): sample_artifact,
+            CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model3.ckpt")): sample_artifact,
+        }
+    )
+    store_dir = tmpdir_path / "artifacts" / "store1"
+    other_dir = tmpdir_path / "artifacts" / "store2"
+    store_dir.mkdir(parents=True)
+    other_dir.mkdir(parents=True)
+    names = ["model1.ckpt", "model1.ckpt.part", "model2.ckpt.part", "model2.ckpt.part.json", "removed.ckpt.part", "removed.ckpt.part.json"]
+    for name in names:
+        (store_dir / name).write_bytes(b"data")
+    (other_dir / "model1.ckpt.part").write_bytes(b"data")
+
+    assert list_storage(catalog, f"file://{tmpdir_path}") == [
+        CompositeArtifactId(ArtifactStoreId("store1"), ArtifactLocalId("model1.ckpt"))
+    ]
+
+    # NOTE kept are only the download in progress, and the one of a store possibly missing for now
+    assert sorted(p.name for p in store_dir.iterdir()) == ["model1.ckpt", "model2.ckpt.part", "model2.ckpt.part.json"]
+    assert [p.name for p in other_dir.iterdir()] == ["model1.ckpt.part"]
+
+
 # ---------------------------------------------------------------------------
 # SSH remote tests (mock tunnel.run)
 # ---------------------------------------------------------------------------
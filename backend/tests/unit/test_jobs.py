@@ -18,11 +18,13 @@ work in-memory.  The ``mem_session_maker_all`` fixture applies all patches at on
 """
 
 import datetime as dt
+import threading
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any, cast
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -37,8 +39,11 @@ from forecastbox.domain.experiment.types import ExperimentDefinitionId
 from forecastbox.domain.run.db import CompilerRuntimeContext
 from forecastbox.domain.run.exceptions import RunAccessDenied, RunNotFound
 from forecastbox.domain.run.types import RunId
-from forecastbox.schemata.jobs import Base
+from forecastbox.schemata.jobs import Base, _set_sqlite_pragmas
+from forecastbox.schemata.run import RunLatestAttempt
+from forecastbox.utility import db as utility_db
 from forecastbox.utility.auth import PASSTHROUGH_USER_ID, AuthContext
+from forecastbox.utility.pagination import KeysetCursor
 
 
 @pytest.fixture
@@ -561,6 +566,55 @@ def test_jobs_experiment_next_upsert(mem_session_maker_both: sessionmaker[Sessio
     assert result2.experiment_next_id == result.experiment_next_id
 
 
+def test_jobs_schedulable_experiments_batch(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    exp_ids = []
+    for _ in range(3):
+        exp_id, _ = experiment_db.upsert_experiment_definition(
+            auth_context=_user1, blueprint_id=job_id, blueprint_version=job_v, experiment_type="cron_schedule", created_by="user1"
+        )
+        exp_ids.append(exp_id)
+    t0 = dt.datetime(2026, 1, 1, 12, 0, tzinfo=dt.timezone.utc)
+    scheduling_db.replace_experiment_next({exp_ids[0]: t0 + dt.timedelta(minutes=1), exp_ids[1]: t0, exp_ids[2]: t0 + dt.timedelta(days=1)})
+
+    due = scheduling_db.get_schedulable_experiments(t0 + dt.timedelta(hours=1))
+    assert [item.experiment_next.experiment_id for item in due] == [exp_ids[1], exp_ids[0]]
+    assert all(item.blueprint is not None and item.blueprint.blueprint_id == job_id for item in due)
+    assert scheduling_db.next_schedulable_experiment() == t0
+
+    # NOTE a single transaction both advancing and clearing entries
+    scheduling_db.replace_experiment_next({exp_ids[0]: None, exp_ids[1]: t0 + dt.timedelta(hours=2)})
+    assert scheduling_db.get_experiment_next(exp_ids[0]) is None
+    entry = scheduling_db.get_experiment_next(exp_ids[1])
+    assert entry is not None and entry.scheduled_at == t0 + dt.timedelta(hours=2)
+    assert scheduling_db.get_schedulable_experiments(t0 + dt.timedelta(hours=1)) == []
+
+    blueprint_db.soft_delete_blueprint(job_id, expected_version=job_v, auth_context=_user1)
+    (due,) = scheduling_db.get_schedulable_experiments(t0 + dt.timedelta(hours=2))
+    assert due.experiment_next.experiment_id == exp_ids[1]
+    assert due.blueprint is None
+
+
+def test_restore_experiment_next_moves_only_existing_entries_earlier(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    exp_ids = []
+    for _ in range(3):
+        exp_id, _ = experiment_db.upsert_experiment_definition(
+            auth_context=_user1, blueprint_id=job_id, blueprint_version=job_v, experiment_type="cron_schedule", created_by="user1"
+        )
+        exp_ids.append(exp_id)
+    t0 = dt.datetime(2026, 1, 1, 12, 0, tzinfo=dt.timezone.utc)
+    scheduling_db.replace_experiment_next({exp_ids[0]: t0 + dt.timedelta(hours=1), exp_ids[1]: t0 - dt.timedelta(hours=1)})
+
+    scheduling_db.restore_experiment_next({exp_id: t0 for exp_id in exp_ids})
+
+    assert [getattr(scheduling_db.get_experiment_next(exp_id), "scheduled_at", None) for exp_id in exp_ids] == [
+        t0,
+        t0 - dt.timedelta(hours=1),
+        None,
+    ]
+
+
 # ---------------------------------------------------------------------------
 # id-provided guard (ExperimentDefinition and Run only;
 # Blueprint guard is covered in the auth tests above)
@@ -703,3 +757,203 @@ def test_run_delete_admin_can_delete_any(mem_session_maker_both: sessionmaker[Se
     run_db.soft_delete_run(exec_id, auth_context=_admin)
     with pytest.raises(RunNotFound):
         run_db.get_run(exec_id, auth_context=_admin)
+
+
+def test_jobs_engine_pragmas(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'job.db'}")
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NOTE 1 is NORMAL
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+    engine.dispose()
+
+
+def test_reads_do_not_wait_for_the_write_lock(mem_session_maker_both: sessionmaker[Session]) -> None:
+    """Listing proceeds while another thread holds the jobs-DB write lock."""
+    blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    lock_held = threading.Event()
+    release = threading.Event()
+
+    def hold_lock() -> None:
+        with utility_db.lock:
+            lock_held.set()
+            release.wait(timeout=5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert lock_held.wait(timeout=5)
+        assert blueprint_db.count_blueprints(auth_context=_user1) == 1
+    finally:
+        release.set()
+        holder.join()
+
+
+def test_run_list_keyset_pagination_matches_offset(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    for _ in range(5):
+        run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="submitted")
+    expected = [r.run_id for r in run_db.list_runs(auth_context=_admin)]
+
+    seen: list[RunId] = []
+    after: KeysetCursor | None = None
+    while page := list(run_db.list_runs(auth_context=_admin, limit=2, after=after)):
+        seen.extend(r.run_id for r in page)
+        after = KeysetCursor(page[-1].created_at, page[-1].run_id)
+
+    assert seen == expected
+    assert len(seen) == 5
+
+
+def test_run_list_shows_latest_attempt_only(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    exec_id, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    run_db.upsert_run(run_id=exec_id, blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="submitted")
+
+    runs = list(run_db.list_runs(auth_context=_user1))
+    assert [(r.run_id, r.attempt_count) for r in runs] == [(exec_id, 2)]
+    assert run_db.count_runs(auth_context=_user1) == 1
+
+    run_db.soft_delete_run(exec_id, auth_context=_user1)
+    assert list(run_db.list_runs(auth_context=_user1)) == []
+    assert run_db.count_runs(auth_context=_user1) == 0
+
+
+def test_backfill_latest_attempts(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    exec_id, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    run_db.upsert_run(run_id=exec_id, blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="submitted")
+    # NOTE simulates a database written before the markers existed
+    with mem_session_maker_both() as session:
+        session.query(RunLatestAttempt).delete()
+        session.commit()
+    assert list(run_db.list_runs(auth_context=_user1)) == []
+
+    assert run_db.backfill_latest_attempts() == 1
+    assert [(r.run_id, r.attempt_count) for r in run_db.list_runs(auth_context=_user1)] == [(exec_id, 2)]
+    assert run_db.backfill_latest_attempts() == 0
+
+
+def test_fail_waiting_runs(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    waiting, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="waiting")
+    running, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="running")
+
+    assert run_db.fail_waiting_runs("restarted") == 1
+    failed = run_db.get_run(waiting, auth_context=_user1)
+    assert (failed.status, failed.error) == ("failed", "restarted")
+    assert run_db.get_run(running, auth_context=_user1).status == "running"
+    assert run_db.fail_waiting_runs("restarted") == 0
+
+
+# ---------------------------------------------------------------------------
+# garbage collection helpers
+# ---------------------------------------------------------------------------
+
+
+def test_purge_deleted_runs(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    deleted, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    run_db.upsert_run(run_id=deleted, blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    kept, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    run_db.soft_delete_run(deleted, auth_context=_user1)
+
+    assert run_db.purge_deleted_runs(10) == [deleted]
+    assert run_db.purge_deleted_runs(10) == []
+    with mem_session_maker_both() as session:
+        assert session.execute(text("select distinct run_id from run")).scalars().all() == [kept]
+        assert session.execute(text("select run_id from run_latest_attempt")).scalars().all() == [kept]
+
+
+def test_purge_expired_runs_and_excess_attempts(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    run_id, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    run_db.upsert_run(run_id=run_id, blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="running")
+    for _ in range(2):
+        run_db.upsert_run(run_id=run_id, blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="failed")
+    running, _, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="running")
+
+    # NOTE the second attempt is excess, but kept while still running
+    assert run_db.purge_excess_attempts(2, 10) == [(run_id, 1)]
+    with mem_session_maker_both() as session:
+        assert session.execute(text(f"select attempt_count from run where run_id = '{run_id}'")).scalars().all() == [2, 3, 4]
+
+    future = dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=1)
+    assert run_db.purge_expired_runs(future, 10) == [run_id]
+    assert [r.run_id for r in run_db.list_runs(auth_context=_user1)] == [running]
+
+
+def test_purge_stored_outputs(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    outputs = {"outputs": {"task:a": {"mime_type": "text/plain", "original_block": "b1", "value": "x" * 100}}}
+    run_ids = []
+    for _ in range(3):
+        run_id, attempt, __ = run_db.upsert_run(blueprint_id=job_id, blueprint_version=job_v, created_by="user1", status="completed")
+        run_db.update_run_runtime(run_id, attempt, outputs=outputs)
+        run_ids.append(run_id)
+    future = dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=1)
+
+    purged, after = run_db.purge_stored_outputs(future, 50, 2)
+    assert purged == 2 and after is not None
+    purged, after = run_db.purge_stored_outputs(future, 50, 2, after)
+    assert purged == 1 and after is None
+    for run_id in run_ids:
+        run = run_db.get_run(run_id, auth_context=_user1)
+        assert run.outputs == {"outputs": {"task:a": {"mime_type": "text/plain", "original_block": "b1", "value": None}}}
+    # already stripped attempts are not rewritten
+    assert run_db.purge_stored_outputs(future, 50, 10) == (0, None)
+
+
+def test_purge_deleted_blueprints_keeps_referenced(mem_session_maker_both: sessionmaker[Session]) -> None:
+    unused_id, _ = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    blueprint_db.upsert_blueprint(blueprint_id=unused_id, auth_context=_user1, source="user_defined", created_by="user1")
+    used_id, used_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    live_id, _ = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    run_db.upsert_run(blueprint_id=used_id, blueprint_version=used_v, created_by="user1", status="completed")
+    blueprint_db.soft_delete_blueprint(unused_id, expected_version=2, auth_context=_user1)
+    blueprint_db.soft_delete_blueprint(used_id, expected_version=used_v, auth_context=_user1)
+
+    assert blueprint_db.purge_deleted_blueprints(10) == 1
+    with mem_session_maker_both() as session:
+        remaining = set(session.execute(text("select blueprint_id from blueprint")).scalars().all())
+    assert remaining == {used_id, live_id}
+
+
+def test_purge_stale_experiment_next(mem_session_maker_both: sessionmaker[Session]) -> None:
+    job_id, job_v = blueprint_db.upsert_blueprint(auth_context=_user1, source="user_defined", created_by="user1")
+    exp_ids = []
+    for _ in range(2):
+        exp_id, _ = experiment_db.upsert_experiment_definition(
+            auth_context=_user1, blueprint_id=job_id, blueprint_version=job_v, experiment_type="cron_schedule", created_by="user1"
+        )
+        scheduling_db.upsert_experiment_next(experiment_id=exp_id, scheduled_at=dt.datetime(2026, 1, 1, tzinfo=dt.timezone.utc))
+        exp_ids.append(exp_id)
+    with mem_session_maker_both() as session:
+        session.execute(text(f"update experiment_definition set is_deleted = 1 where experiment_definition_id = '{exp_ids[0]}'"))
+        session.commit()
+
+    assert scheduling_db.purge_stale_experiment_next(10) == 1
+    assert scheduling_db.get_experiment_next(exp_ids[0]) is None
+    assert scheduling_db.get_experiment_next(exp_ids[1]) is not None
+
+
+def test_incremental_vacuum_frees_pages(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    maker = sessionmaker(engine)
+    with maker() as session:
+        session.execute(text("create table filler (payload text)"))
+        session.execute(
+            text(
+                "insert into filler select hex(randomblob(2000)) from (with recursive c(x) as (select 1 union all select x + 1 from c where x < 200) select x from c)"
+            )
+        )
+        session.commit()
+        session.execute(text("delete from filler"))
+        session.commit()
+
+    assert utility_db.incrementalVacuum(10, maker) == 10
+    assert utility_db.incrementalVacuum(10_000, maker) > 0
+    assert utility_db.incrementalVacuum(10_000, maker) == 0
+    engine.dispose()
@@ -0,0 +1,22 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for utility.config."""
+
+from forecastbox.utility.config import ConcurrencySettings, ConcurrentPools
+
+
+def test_explicit_pools_missing_a_newer_pool_get_its_default() -> None:
+    explicit = {pool: {"max_workers": 1, "max_pending": 8} for pool in ConcurrentPools if pool != ConcurrentPools.JobsDbRead}
+    settings = ConcurrencySettings.model_validate({"pools": explicit})
+
+    assert set(settings.pools) == set(ConcurrentPools)
+    assert settings.pools[ConcurrentPools.Io].max_pending == 8
+    assert settings.pools[ConcurrentPools.JobsDbRead].max_workers == 4
+    assert settings.validate_runtime() == []
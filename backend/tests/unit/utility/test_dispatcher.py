@@ -7,10 +7,12 @@
 # granted to it by virtue of its status as an intergovernmental organisation
 # nor does it submit to any jurisdiction.
 
-"""Unit tests for the protocol-based dispatch matching in utility/dispatcher.py."""
+"""Unit tests for the protocol-based dispatch matching, pipelining and metrics in utility/dispatcher.py."""
 
-from concurrent.futures import Future
-from typing import Callable, cast
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Protocol, cast, runtime_checkable
 
 import pytest
 
@@ -37,10 +39,46 @@ class _FakeManager:
         return future
 
 
+class _ThreadedManager:
+    """Runs handler tasks on real threads, so that slow handlers can overlap."""
+
+    def __init__(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=4)
+
+    def _submit_monitored_receipt(self, pool_name: object, task_name: object, task: Callable[[], object]) -> Future:
+        return self.executor.submit(task)
+
+
 class _Matching:
     pass
 
 
+class _MatchingChild(_Matching):
+    pass
+
+
+@dataclass(frozen=True, eq=True, slots=True)
+class _Numbered:
+    i: int
+
+
+@runtime_checkable
+class _Named(Protocol):
+    def name(self) -> str: ...
+
+
+@runtime_checkable
+class _Labelled(Protocol):
+    label: str
+
+
+class _NamedLabelled:
+    label = "label"
+
+    def name(self) -> str:
+        return "name"
+
+
 class _NotMatching:
     pass
 
@@ -118,3 +156,84 @@ def test_dispatch_records_failed_handlers() -> None:
 
     with pytest.raises(Exception):
         receipt.result(timeout=1)
+
+
+def _registration(handler_id: str, handler_type: type, handler: Callable[[Event], None], ordered: bool = False) -> DispatcherRegistration:
+    return DispatcherRegistration(
+        handler_id=handler_id, handler_type=handler_type, pool_name=ConcurrentPools.General, handler=handler, ordered=ordered
+    )
+
+
+def _run(dispatcher: EventDispatcher, *payloads: object) -> list[Future]:
+    dispatcher.freeze()
+    dispatcher._state = "running"
+    receipts = [dispatcher.submit(Event(name=EventName("some.event"), payload=payload)) for payload in payloads]
+    for _ in payloads:
+        dispatcher._dispatch(cast(_QueuedEvent, dispatcher._queue.get_nowait()))
+    return receipts
+
+
+def test_dispatch_resolves_subclasses_and_protocols_once_per_type() -> None:
+    dispatcher = _dispatcher()
+    calls: list[str] = []
+    for handler_id, handler_type in (("base", _Matching), ("named", _Named), ("labelled", _Labelled)):
+        dispatcher.register(_registration(handler_id, handler_type, lambda event, handler_id=handler_id: calls.append(handler_id)))
+
+    receipts = _run(dispatcher, _MatchingChild(), _NamedLabelled(), _MatchingChild())
+
+    assert [receipt.result(timeout=1).matched_handlers for receipt in receipts] == [("base",), ("named", "labelled"), ("base",)]
+    assert calls == ["base", "named", "labelled", "base"]
+    # NOTE protocols with data members support isinstance checks only, thus are not part of the index
+    assert dispatcher._by_payload_type[_MatchingChild] == (dispatcher._handlers["base"],)
+    assert dispatcher._by_payload_type[_NamedLabelled] == (dispatcher._handlers["named"],)
+
+
+def test_slow_handler_does_not_block_later_events() -> None:
+    manager = _ThreadedManager()
+    dispatcher = EventDispatcher(cast(object, manager), DispatcherSettings())  # ty: ignore[invalid-argument-type]
+    release = threading.Event()
+    dispatcher.register(_registration("slow", _Matching, lambda event: release.wait(timeout=5)))
+    dispatcher.register(_registration("fast", _NotMatching, lambda event: None))
+
+    try:
+        slow, fast = _run(dispatcher, _Matching(), _NotMatching())
+        assert fast.result(timeout=1).succeeded
+        assert not slow.done()
+        status = dispatcher.status()
+        assert status.in_flight_events == 1
+        assert {handler.handler_id: handler.running for handler in status.handlers} == {"slow": 1, "fast": 0}
+    finally:
+        release.set()
+        manager.executor.shutdown(wait=True)
+    assert slow.result(timeout=1).succeeded
+    handlers = {handler.handler_id: handler for handler in dispatcher.status().handlers}
+    assert handlers["slow"].completed == 1 and handlers["fast"].completed == 1
+    assert handlers["slow"].latency_seconds_max >= handlers["fast"].latency_seconds_max
+
+
+def test_ordered_handler_runs_events_in_sequence() -> None:
+    manager = _ThreadedManager()
+    dispatcher = EventDispatcher(cast(object, manager), DispatcherSettings())  # ty: ignore[invalid-argument-type]
+    lock = threading.Lock()
+    active: list[int] = []
+    overlaps: list[int] = []
+    seen: list[int] = []
+
+    def _handler(event: Event) -> None:
+        with lock:
+            active.append(1)
+            overlaps.append(len(active))
+        threading.Event().wait(0.01)
+        with lock:
+            seen.append(cast(_Numbered, event.payload).i)
+            active.pop()
+
+    dispatcher.register(_registration("ordered", _Numbered, _handler, ordered=True))
+    try:
+        receipts = _run(dispatcher, *(_Numbered(i) for i in range(5)))
+        for receipt in receipts:
+            assert receipt.result(timeout=2).succeeded
+    finally:
+        manager.executor.shutdown(wait=True)
+    assert seen == [0, 1, 2, 3, 4]
+    assert max(overlaps) == 1
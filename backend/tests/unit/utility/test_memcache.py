@@ -1,12 +1,21 @@
+import sys
+from pathlib import Path
 from typing import Any
 
 import pytest
 
 import forecastbox.utility.memcache as memcache
+from forecastbox.utility.config import MemcacheSettings, config
+from forecastbox.utility.pydantic import FiabBaseModel
+
+
+class _Detail(FiabBaseModel):
+    names: list[str]
 
 
 @pytest.fixture
-def fresh_cache(monkeypatch: pytest.MonkeyPatch) -> memcache._MemoryCache:
+def fresh_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> memcache._MemoryCache:
+    monkeypatch.setattr(config.backend, "memcache", MemcacheSettings(spill_path=str(tmp_path / "memcache")))
     cache = memcache._MemoryCache()
     monkeypatch.setattr(memcache, "_CACHE", cache)
     return cache
@@ -62,3 +71,152 @@ def test_insert_rejects_oversized_value(fresh_cache: memcache._MemoryCache) -> N
     fresh_cache.max_size = 1
     with pytest.raises(memcache.TooLargeEntry):
         memcache.insert("k", {"payload": "x" * 10})
+
+
+def test_get_refreshes_recency(fresh_cache: memcache._MemoryCache) -> None:
+    v1: dict[str, Any] = {"payload": "A" * 2048}
+    v2: dict[str, Any] = {"payload": "B" * 2048}
+    v3: dict[str, Any] = {"payload": "C" * 2048}
+    fresh_cache.max_size = memcache._deep_sizeof(("k1", v1)) * 2 + 100
+
+    memcache.insert("k1", v1)
+    memcache.insert("k2", v2)
+    memcache.get("k1", dict)
+    memcache.insert("k3", v3)
+
+    assert fresh_cache.lru == ["k3", "k1"]
+
+
+def test_entries_expire(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(memcache.time, "time", lambda: now)
+    memcache.insert("k", {"a": 1}, ttl_seconds=10)
+    memcache.insert("forever", {"a": 1})
+
+    now += 10
+    with pytest.raises(KeyError):
+        memcache.get("k", dict)
+    assert memcache.get("forever", dict) == {"a": 1}
+    assert fresh_cache.lru == ["forever"]
+
+
+def test_size_estimate_extrapolates_large_containers() -> None:
+    large = [f"{i:010d}" for i in range(memcache.sample_size * 100)]
+    exact = sys.getsizeof(large) + sum(sys.getsizeof(item) for item in large)
+
+    assert memcache._deep_sizeof(large) == exact
+
+
+def test_models_survive_eviction_and_restart(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    detail = _Detail(names=["a", "b"])
+    memcache.insert("run-1", detail)
+    # NOTE written to the disk tier only once evicted from memory
+    assert list(memcache._SpillDir.sizes) == []
+    fresh_cache.max_size = memcache._deep_sizeof(("other", {"payload": "x"}))
+    memcache.insert("other", {"payload": "x"})
+    assert fresh_cache.lru == ["other"]
+    assert len(memcache._SpillDir.sizes) == 1
+
+    fresh_cache.max_size = 1024 * 1024
+    assert memcache.get("run-1", _Detail) == detail
+    assert fresh_cache.lru == ["run-1", "other"]
+
+    # NOTE a new instance stands for the cache after a restart
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    monkeypatch.setattr(memcache._SpillDir, "checked", None)
+
+    assert memcache.get("run-1", _Detail) == detail
+    assert memcache._CACHE.lru == ["run-1"]
+    # plain values are not written to the disk tier
+    memcache.insert("plain", {"a": 1})
+    memcache.flush()
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    with pytest.raises(KeyError):
+        memcache.get("plain", dict)
+
+
+def test_flush_writes_entries_in_memory(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    del fresh_cache
+    memcache.insert("run-1", _Detail(names=["a"]))
+    memcache.flush()
+
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    monkeypatch.setattr(memcache._SpillDir, "checked", None)
+    assert memcache.get("run-1", _Detail) == _Detail(names=["a"])
+
+
+def test_reinsert_drops_previous_disk_value(fresh_cache: memcache._MemoryCache) -> None:
+    memcache.insert("run-1", _Detail(names=["a"]))
+    memcache.flush()
+    memcache.insert("run-1", _Detail(names=["b"]))
+    memcache.flush()
+
+    fresh_cache._remove_key("run-1")
+    assert memcache.get("run-1", _Detail) == _Detail(names=["b"])
+
+
+def test_disk_tier_evicts_least_recently_used(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    for key in ("run-1", "run-2", "run-3"):
+        memcache.insert(key, _Detail(names=[key]))
+    memcache.flush()
+    directory = Path(config.backend.memcache.spill_path)
+    size = memcache._SpillDir.total // 3
+    monkeypatch.setattr(config.backend.memcache, "spill_max_size_mb", 2 * size / (1024 * 1024))
+    for key in ("run-1", "run-2", "run-3"):
+        fresh_cache._remove_key(key)
+    memcache.get("run-1", _Detail)
+
+    memcache.insert("run-4", _Detail(names=["run-4"]))
+    memcache.flush()
+
+    assert memcache._SpillDir.total <= 2 * size
+    assert {path.name for path in directory.iterdir() if not path.name.startswith(".")} == set(memcache._SpillDir.sizes)
+    for key in ("run-2", "run-3"):
+        with pytest.raises(KeyError):
+            memcache.get(key, _Detail)
+
+
+def test_disk_tier_cleared_on_backend_version_change(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    memcache.insert("run-1", _Detail(names=["a"]))
+    memcache.flush()
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    assert memcache.get("run-1", _Detail) == _Detail(names=["a"])
+
+    # NOTE a restart of an upgraded backend
+    monkeypatch.setattr(memcache, "_CACHE", memcache._MemoryCache())
+    monkeypatch.setattr(memcache._SpillDir, "checked", None)
+    monkeypatch.setattr(memcache, "try_version", lambda pip_source, module_name: "99.0")
+    with pytest.raises(KeyError):
+        memcache.get("run-1", _Detail)
+    assert (Path(config.backend.memcache.spill_path) / ".version").read_text() == "99.0"
+
+
+def test_pop_removes_disk_entry(fresh_cache: memcache._MemoryCache) -> None:
+    memcache.insert("run-1", _Detail(names=["a"]))
+    memcache.flush()
+    memcache.pop("run-1")
+
+    with pytest.raises(KeyError):
+        memcache.get("run-1", _Detail)
+
+
+def test_disk_tier_disabled(fresh_cache: memcache._MemoryCache, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(config.backend, "memcache", MemcacheSettings(spill_path=str(tmp_path / "off"), spill_max_size_mb=0))
+    memcache.insert("run-1", _Detail(names=["a"]))
+    memcache.flush()
+
+    assert not (tmp_path / "off").exists()
+
+
+def test_lookups_counted_per_tier(fresh_cache: memcache._MemoryCache) -> None:
+    del fresh_cache
+    before = {result: memcache.lookups.value(result=result) for result in ("memory", "disk", "miss")}
+    memcache.insert("k", _Detail(names=["a"]))
+    memcache.get("k", _Detail)
+    memcache.flush()
+    memcache._CACHE._remove_key("k")
+    memcache.get("k", _Detail)
+    with pytest.raises(KeyError):
+        memcache.get("other", _Detail)
+    after = {result: memcache.lookups.value(result=result) for result in ("memory", "disk", "miss")}
+    assert {result: after[result] - before[result] for result in after} == {"memory": 1, "disk": 1, "miss": 1}
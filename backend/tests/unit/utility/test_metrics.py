@@ -0,0 +1,89 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for utility.metrics -- the text exposition rendering, and the pool instrumentation."""
+
+from collections.abc import Generator
+
+import pytest
+
+from forecastbox.utility import metrics
+from forecastbox.utility.concurrency import manager
+from forecastbox.utility.concurrency.manager import ManagedPool, TaskName
+from forecastbox.utility.config import ConcurrentPools
+
+
+@pytest.fixture
+def registered() -> Generator[list[str], None, None]:
+    """Names of the metrics created by the test, removed from the registry afterwards"""
+    names: list[str] = []
+    yield names
+    for name in names:
+        metrics._registry.metrics.pop(name, None)
+
+
+def _lines(name: str) -> list[str]:
+    return [line for line in metrics.render().splitlines() if line.startswith(name)]
+
+
+def test_counter_and_histogram_exposition(registered: list[str]) -> None:
+    counter = metrics.Counter("test_lookups", "Lookups", ("result",))
+    histogram = metrics.Histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    registered += [counter.name, histogram.name]
+
+    counter.inc(result="hit")
+    counter.inc(2, result='mi"ss')
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5.0, route="/a")
+
+    assert counter.name == "test_lookups_total"
+    assert _lines("test_lookups_total") == ['test_lookups_total{result="hit"} 1', 'test_lookups_total{result="mi\\"ss"} 2']
+    assert _lines("test_latency_seconds") == [
+        'test_latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_latency_seconds_bucket{route="/a",le="1"} 2',
+        'test_latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_latency_seconds_sum{route="/a"} 5.55',
+        'test_latency_seconds_count{route="/a"} 3',
+    ]
+    assert "# TYPE test_latency_seconds histogram" in metrics.render()
+    with pytest.raises(ValueError):
+        counter.inc(route="/a")
+    with pytest.raises(ValueError):
+        metrics.Counter("test_lookups", "Lookups again")
+
+
+def test_failing_gauge_does_not_break_rendering(registered: list[str]) -> None:
+    def broken() -> dict[tuple[str, ...], float]:
+        raise RuntimeError("component gone")
+
+    registered += [
+        metrics.Gauge("test_broken", "Broken", broken).name,
+        metrics.Gauge("test_depth", "Depth", lambda: {("a",): 3}, ("queue",)).name,
+    ]
+    rendered = metrics.render()
+    assert "# failed to collect test_broken: RuntimeError('component gone')" in rendered
+    assert 'test_depth{queue="a"} 3' in rendered
+
+
+def test_managed_pool_records_queue_wait_and_execution() -> None:
+    def boom() -> None:
+        raise RuntimeError("boom")
+
+    wait_before, execution_before = manager._queue_wait.count(pool="io"), manager._execution_time.count(pool="io")
+    pool = ManagedPool(ConcurrentPools.Io, max_workers=1, max_pending=4, stage=0)
+    pool.start(timeout=5)
+    try:
+        pool.submit(TaskName("test.metrics"), lambda: None).result(timeout=5)
+        with pytest.raises(RuntimeError):
+            pool.submit(TaskName("test.metrics"), boom).result(timeout=5)
+    finally:
+        pool.close()
+    assert manager._queue_wait.count(pool="io") == wait_before + 2
+    assert manager._execution_time.count(pool="io") == execution_before + 2
@@ -0,0 +1,126 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for utility.package_index."""
+
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from forecastbox.utility import package_index
+from forecastbox.utility.config import PackageIndexSettings, config
+
+_DOCUMENT = {"info": {"version": "1.1.0"}, "releases": {"1.0.0": [], "1.1.0": []}}
+
+
+@pytest.fixture
+def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PackageIndexSettings:
+    settings = PackageIndexSettings(url="https://index.test/pypi", cache_path=str(tmp_path / "cache"))
+    monkeypatch.setattr(config.external, "package_index", settings)
+    return settings
+
+
+class _Index:
+    """Serves ``document`` with an ETag, answering conditional requests with 304 when it matches."""
+
+    def __init__(self, document: dict, etag: str = '"v1"') -> None:
+        self.document = document
+        self.etag = etag
+        self.requests: list[httpx.Request] = []
+        self.unreachable = False
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.unreachable:
+            raise httpx.ConnectError("offline", request=request)
+        if request.url.path != "/pypi/my-plugin/json":
+            return httpx.Response(404)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=self.document, headers={"ETag": self.etag, "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"})
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(transport=httpx.MockTransport(self.handle))
+
+
+def test_fresh_cache_skips_the_index(settings: PackageIndexSettings) -> None:
+    index = _Index(_DOCUMENT)
+    with index.client() as client:
+        assert package_index.get_versions("My_Plugin", client) == ["1.0.0", "1.1.0"]
+        assert package_index.get_latest_version("my-plugin", client) == "1.1.0"
+    assert len(index.requests) == 1
+
+
+def test_stale_cache_is_revalidated(settings: PackageIndexSettings) -> None:
+    settings.cache_ttl_seconds = 0
+    index = _Index(_DOCUMENT)
+    with index.client() as client:
+        assert package_index.get_latest_version("my-plugin", client) == "1.1.0"
+        assert package_index.get_latest_version("my-plugin", client) == "1.1.0"
+
+        index.document, index.etag = {"info": {"version": "1.2.0"}, "releases": {}}, '"v2"'
+        assert package_index.get_latest_version("my-plugin", client) == "1.2.0"
+    revalidation = index.requests[1]
+    assert revalidation.headers["If-None-Match"] == '"v1"'
+    assert revalidation.headers["If-Modified-Since"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+    assert len(index.requests) == 3
+
+
+def test_unreachable_index_falls_back_to_cache(settings: PackageIndexSettings) -> None:
+    settings.cache_ttl_seconds = 0
+    index = _Index(_DOCUMENT)
+    with index.client() as client:
+        assert package_index.get_latest_version("my-plugin", client) == "1.1.0"
+        index.unreachable = True
+        assert package_index.get_latest_version("my-plugin", client) == "1.1.0"
+        assert package_index.get_latest_version("other-plugin", client) is None
+
+
+def test_unknown_package_and_non_index_sources(settings: PackageIndexSettings) -> None:
+    index = _Index(_DOCUMENT)
+    with index.client() as client:
+        assert package_index.get_versions("other-plugin", client) == []
+        assert package_index.get_versions("/home/user/my-plugin", client) == []
+        assert package_index.get_latest_version("git+https://github.com/ecmwf/my-plugin", client) is None
+    assert len(index.requests) == 1
+
+
+def test_local_simple_index(settings: PackageIndexSettings, tmp_path: Path) -> None:
+    project = tmp_path / "simple" / "my-plugin"
+    project.mkdir(parents=True)
+    (project / "my_plugin-1.0.0-py3-none-any.whl").touch()
+    (project / "my_plugin-2.0.0rc1.tar.gz").touch()
+    (project / "README.txt").touch()
+    (project / "index.html").write_text('<a href="../../files/my_plugin-1.5.0-py3-none-any.whl#sha256=00">my_plugin-1.5.0</a>')
+    settings.local_path = str(tmp_path / "simple")
+
+    index = _Index(_DOCUMENT)
+    with index.client() as client:
+        assert package_index.get_versions("My.Plugin", client) == ["1.0.0", "1.5.0", "2.0.0rc1"]
+        assert package_index.get_latest_version("my-plugin", client) == "1.5.0"
+        assert package_index.get_latest_version("other-plugin", client) is None
+    assert not index.requests
+
+
+def test_latest_versions_looked_up_concurrently(settings: PackageIndexSettings, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings.max_concurrent_lookups = 2
+    both_started = threading.Barrier(2, timeout=5)
+    looked_up: list[str] = []
+
+    def fake_latest(pip_source: str, client: httpx.Client) -> str:
+        looked_up.append(pip_source)
+        both_started.wait()
+        return f"{pip_source}-latest"
+
+    monkeypatch.setattr(package_index, "get_latest_version", fake_latest)
+    result = package_index.get_latest_versions(["a", "b", "a"])
+    assert result == {"a": "a-latest", "b": "b-latest"}
+    assert sorted(looked_up) == ["a", "b"]
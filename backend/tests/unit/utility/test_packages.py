@@ -9,6 +9,7 @@
 
 import importlib.metadata
 import json
+import pathlib
 import subprocess
 from datetime import UTC
 from types import ModuleType
@@ -18,6 +19,7 @@ import pytest
 from packaging.version import Version
 
 from forecastbox.domain.plugin.compatibility import get_fiabcore_version
+from forecastbox.utility.config import PackageIndexSettings, config
 from forecastbox.utility.packages import (
     CommandResult,
     EnvironmentSnapshot,
@@ -35,6 +37,7 @@ from forecastbox.utility.packages import (
     run_pip_install,
     temporary_constraints_file,
     try_import,
+    try_install_fingerprint,
     try_updatedatetime,
     try_version,
 )
@@ -190,6 +193,38 @@ def test_try_updatedatetime_stat_raises_returns_unknown(tmp_path: pytest.TempPat
     assert result == "unknown"
 
 
+# ---------------------------------------------------------------------------
+# try_install_fingerprint
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "direct_url,expected",
+    [
+        (None, ""),
+        ({"url": "https://github.com/ecmwf/plugin", "vcs_info": {"vcs": "git", "commit_id": "abc123"}}, "vcs:abc123"),
+        ({"url": "file:///tmp/plugin.whl", "archive_info": {"hashes": {"sha256": "ff"}}}, "archive:sha256=ff"),
+        ({"url": "file:///tmp/plugin.whl", "archive_info": {}}, None),
+        ({"url": "file:///src/plugin", "dir_info": {"editable": True}}, None),
+    ],
+)
+def test_try_install_fingerprint(direct_url: dict | None, expected: str | None) -> None:
+    fake_dist = MagicMock()
+    fake_dist.read_text.return_value = None if direct_url is None else json.dumps(direct_url)
+
+    with patch("importlib.metadata.distribution", return_value=fake_dist):
+        assert try_install_fingerprint("some-package", "some_package") == expected
+    fake_dist.read_text.assert_called_once_with("direct_url.json")
+
+
+def test_try_install_fingerprint_package_not_found() -> None:
+    with (
+        patch("importlib.metadata.distribution", side_effect=importlib.metadata.PackageNotFoundError),
+        patch("importlib.metadata.packages_distributions", return_value={}),
+    ):
+        assert try_install_fingerprint("git+https://github.com/ecmwf/plugin", "some_package") is None
+
+
 # ---------------------------------------------------------------------------
 # parse_install_output
 # ---------------------------------------------------------------------------
@@ -613,10 +648,16 @@ def test_get_fiabcore_version_current_install() -> None:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def package_index_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config.external, "package_index", PackageIndexSettings(cache_path=str(tmp_path / "package_index")))
+
+
 def _make_pypi_response(releases: dict) -> MagicMock:
     """Build a fake httpx.Response-like mock for the PyPI JSON API."""
     mock = MagicMock()
     mock.status_code = 200
+    mock.headers = {}
     mock.json.return_value = {"releases": releases}
     return mock
 
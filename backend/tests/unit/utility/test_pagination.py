@@ -9,9 +9,11 @@
 
 """Unit tests for PaginationSpec, focusing on extract_and_shift."""
 
+import datetime as dt
+
 import pytest
 
-from forecastbox.utility.pagination import PaginationSpec, PaginationSpecRemainder
+from forecastbox.utility.pagination import KeysetCursor, PaginationSpec, PaginationSpecRemainder
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -193,3 +195,31 @@ def test_spec_page_deep_beyond_both_sources() -> None:
     items, remainder = spec.extract_and_shift(intrinsic)
     assert items == []
     assert remainder == PaginationSpecRemainder(offset_shifted=986, current_page_remaining=10)
+
+
+# ---------------------------------------------------------------------------
+# Keyset cursor
+# ---------------------------------------------------------------------------
+
+
+def test_cursor_roundtrip() -> None:
+    cursor = KeysetCursor(created_at=dt.datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=dt.UTC), entity_id="run-1")
+    assert PaginationSpec(cursor=cursor.encode()).keyset() == cursor
+
+
+def test_cursor_absent_in_offset_mode() -> None:
+    assert _spec(page=2, page_size=10).keyset() is None
+
+
+@pytest.mark.parametrize("raw", ["not-base64!", "bm90IGpzb24=", "WzFd"])
+def test_malformed_cursor_rejected(raw: str) -> None:
+    with pytest.raises(ValueError):
+        PaginationSpec(cursor=raw).keyset()
+
+
+def test_next_cursor_only_for_full_pages() -> None:
+    last = KeysetCursor(created_at=dt.datetime(2025, 1, 1, tzinfo=dt.UTC), entity_id="x")
+    spec = _spec(page=1, page_size=2)
+    assert spec.next_cursor(2, last) == last.encode()
+    assert spec.next_cursor(1, last) is None
+    assert spec.next_cursor(0, None) is None
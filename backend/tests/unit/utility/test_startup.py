@@ -0,0 +1,125 @@
+# (C) Copyright 2024- ECMWF.
+#
+# This software is licensed under the terms of the Apache Licence Version 2.0
+# which can be obtained at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# In applying this licence, ECMWF does not waive the privileges and immunities
+# granted to it by virtue of its status as an intergovernmental organisation
+# nor does it submit to any jurisdiction.
+
+"""Unit tests for utility.startup -- the phase graph, its states and the route dependency."""
+
+import asyncio
+import threading
+from collections.abc import Generator
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+from pyrsistent import pmap
+
+from forecastbox.utility import startup
+from forecastbox.utility.startup import Phase, StartupPhases
+
+
+@pytest.fixture(autouse=True)
+def clean_startup() -> Generator[None, None, None]:
+    startup.Startup.phases = pmap()
+    startup.Startup.tasks = {}
+    yield
+    startup.Startup.phases = pmap()
+    startup.Startup.tasks = {}
+
+
+def _states() -> dict[StartupPhases, str]:
+    return {name: phase_status.state for name, phase_status in startup.phase_status().items()}
+
+
+@pytest.mark.asyncio
+async def test_independent_phases_run_concurrently() -> None:
+    both_started = threading.Barrier(2, timeout=5)
+    order: list[str] = []
+
+    def independent() -> None:
+        both_started.wait()
+
+    await startup.run_phases(
+        (
+            Phase(StartupPhases.Runs, independent),
+            Phase(StartupPhases.PluginStores, independent),
+            Phase(StartupPhases.Scheduler, lambda: order.append("scheduler"), requires=(StartupPhases.Runs,)),
+        )
+    )
+    assert order == ["scheduler"]
+    assert set(_states().values()) == {"ready"}
+    assert startup.phase_status()[StartupPhases.Scheduler].requires == (StartupPhases.Runs,)
+
+
+@pytest.mark.asyncio
+async def test_phase_waits_for_returned_future_and_skips_dependents_on_failure() -> None:
+    catalog_ready: Future[None] = Future()
+    startup.start_phases(
+        (
+            Phase(StartupPhases.ArtifactCatalog, lambda: catalog_ready),
+            Phase(StartupPhases.Plugins, lambda: None, requires=(StartupPhases.ArtifactCatalog,)),
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert _states() == {StartupPhases.ArtifactCatalog: "running", StartupPhases.Plugins: "pending"}
+    assert not startup.is_finished(StartupPhases.Plugins)
+
+    catalog_ready.set_exception(RuntimeError("registry unreachable"))
+    await asyncio.gather(*startup.Startup.tasks.values())
+    phases = startup.phase_status()
+    assert phases[StartupPhases.ArtifactCatalog].state == "failed"
+    assert "registry unreachable" in (phases[StartupPhases.ArtifactCatalog].error or "")
+    assert phases[StartupPhases.Plugins].state == "skipped"
+    assert startup.is_finished(StartupPhases.Plugins)
+
+
+@pytest.mark.asyncio
+async def test_run_phases_raises_on_failure() -> None:
+    def boom() -> None:
+        raise RuntimeError("no database")
+
+    with pytest.raises(RuntimeError, match="database"):
+        await startup.run_phases((Phase(StartupPhases.Database, boom, inline=True),))
+
+
+@pytest.mark.asyncio
+async def test_requirements_must_be_declared_first() -> None:
+    with pytest.raises(ValueError):
+        startup.start_phases((Phase(StartupPhases.Plugins, lambda: None, requires=(StartupPhases.ArtifactCatalog,)),))
+
+
+@pytest.mark.asyncio
+async def test_requires_phases_answers_503_until_finished() -> None:
+    catalog_ready: Future[None] = Future()
+    check = startup.requires_phases(StartupPhases.ArtifactCatalog, StartupPhases.Runs)
+    check()  # NOTE phases not declared at all, eg without the lifespan, do not hold routes back
+
+    startup.start_phases((Phase(StartupPhases.ArtifactCatalog, lambda: catalog_ready),))
+    with pytest.raises(HTTPException) as error:
+        check()
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "1"}
+
+    catalog_ready.set_result(None)
+    await asyncio.gather(*startup.Startup.tasks.values())
+    check()
+    assert startup.is_ready(StartupPhases.ArtifactCatalog)
+
+
+@pytest.mark.asyncio
+async def test_stop_phases_cancels_waiting_phases() -> None:
+    never: Future[None] = Future()
+    startup.start_phases(
+        (
+            Phase(StartupPhases.ArtifactCatalog, lambda: never),
+            Phase(StartupPhases.Plugins, lambda: None, requires=(StartupPhases.ArtifactCatalog,)),
+        )
+    )
+    await asyncio.sleep(0.05)
+    await startup.stop_phases()
+    assert not startup.Startup.tasks
+    assert not startup.is_ready(StartupPhases.Plugins)
@@ -40,6 +40,7 @@ function computeCounts(data: JobExecutionList): JobStatusCounts {
   const counts: Record<JobStatus, number> = {
     submitted: 0,
     preparing: 0,
+    waiting: 0,
     running: 0,
     completed: 0,
     failed: 0,
@@ -78,6 +79,7 @@ const EMPTY_COUNTS: JobStatusCounts = {
   counts: {
     submitted: 0,
     preparing: 0,
+    waiting: 0,
     running: 0,
     completed: 0,
     failed: 0,
@@ -92,7 +94,7 @@ const EMPTY_COUNTS: JobStatusCounts = {
 
 export function useJobStatusCounts() {
   // Share the run-list query key (and cache entry) with useJobsStatus, and
-  // compute the 6 counts in `select` so the reduction runs only when data
+  // compute the per-status counts in `select` so the reduction runs only when data
   // changes — not on every render.
   const query = useQuery({
     queryKey: jobKeys.list(1, COUNTS_PAGE_SIZE),
@@ -22,6 +22,7 @@ import i18n from 'i18next'
 export const JobStatusSchema = z.enum([
   'submitted',
   'preparing',
+  'waiting',
   'running',
   'completed',
   'failed',
@@ -172,6 +173,12 @@ export const JOB_STATUS_META: Record<
     },
     color: 'blue',
   },
+  waiting: {
+    get label() {
+      return i18n.t('executions:status.waiting')
+    },
+    color: 'blue',
+  },
   running: {
     get label() {
       return i18n.t('executions:status.running')
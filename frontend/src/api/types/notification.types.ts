@@ -29,6 +29,10 @@ export const clientNotificationSchema = z.object({
   detailRoute: z.string().nullable(),
   /** Backend routes whose data this event staled, e.g. "api/v1/artifacts/list_models". */
   refreshRoutes: z.array(z.string()),
+  /** Subjects of the event, e.g. "run:<id>"; the socket may subscribe to some only. */
+  topics: z.array(z.string()).optional(),
+  /** Events sharing a key supersede each other, e.g. progress of one download. */
+  coalesceKey: z.string().nullable().optional(),
 })
 
 export type ClientNotification = z.infer<typeof clientNotificationSchema>
@@ -35,6 +35,7 @@ interface RunStatusDetailsPopoverProps {
 const PRIMARY_STATUSES: ReadonlyArray<JobStatus> = [
   'running',
   'preparing',
+  'waiting',
   'submitted',
   'completed',
   'failed',
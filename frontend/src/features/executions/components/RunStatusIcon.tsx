@@ -27,6 +27,7 @@ export function RunStatusIcon({ status }: { status: JobStatus }) {
   switch (status) {
     case 'submitted':
     case 'preparing':
+    case 'waiting':
       return <Hourglass className="h-5 w-5 text-blue-500" />
     case 'running':
       return <Loader2 className="h-5 w-5 animate-spin text-amber-500" />
@@ -22,6 +22,7 @@ const JOB_STATUS_VARIANT: Record<
 > = {
   submitted: 'available',
   preparing: 'available',
+  waiting: 'available',
   running: 'warning',
   completed: 'active',
   failed: 'error',
@@ -146,6 +146,7 @@ describe('useJobStatusCounts', () => {
     expect(capturedData!.counts.failed).toBe(1)
     expect(capturedData!.counts.submitted).toBe(1)
     expect(capturedData!.counts.preparing).toBe(0)
+    expect(capturedData!.counts.waiting).toBe(0)
   })
 
   it('returns correct runningCount', async () => {
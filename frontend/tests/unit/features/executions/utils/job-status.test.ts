@@ -18,6 +18,7 @@ import {
 const ALL_STATUSES: Array<JobStatus> = [
   'submitted',
   'preparing',
+  'waiting',
   'running',
   'completed',
   'failed',
@@ -32,6 +33,10 @@ describe('getStatusBadgeClasses', () => {
     expect(getStatusBadgeClasses('preparing')).toContain('bg-blue-50')
   })
 
+  it('returns blue classes for waiting', () => {
+    expect(getStatusBadgeClasses('waiting')).toContain('bg-blue-50')
+  })
+
   it('returns amber classes for running', () => {
     expect(getStatusBadgeClasses('running')).toContain('bg-amber-100')
   })